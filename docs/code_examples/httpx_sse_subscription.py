@@ -0,0 +1,32 @@
+import asyncio
+
+from gql import Client, gql
+from gql.transport.httpx_sse import HTTPXSSETransport
+
+
+async def main():
+
+    transport = HTTPXSSETransport(url="https://SERVER_URL:SERVER_PORT/graphql/stream")
+
+    # Using `async with` on the client will start a connection on the transport
+    # and provide a `session` variable to execute queries on this connection
+    async with Client(
+        transport=transport,
+    ) as session:
+
+        # Request subscription
+        subscription = gql("""
+            subscription {
+              book {
+                title
+                author
+              }
+            }
+        """)
+
+        # Each result is received in an event of the stream
+        async for result in session.subscribe(subscription):
+            print(f"Received: {result}")
+
+
+asyncio.run(main())
@@ -10,7 +10,7 @@ which are optional:
 from .__version__ import __version__
 from .client import Client
 from .gql import gql
-from .graphql_request import GraphQLRequest
+from .graphql_request import GraphQLRequest, PreparedRequest
 from .transport.file_upload import FileVar
 
 __all__ = [
@@ -18,5 +18,6 @@ __all__ = [
     "gql",
     "Client",
     "GraphQLRequest",
+    "PreparedRequest",
     "FileVar",
 ]
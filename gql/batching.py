@@ -0,0 +1,215 @@
+"""Policy deciding when the requests waiting in the batch queue
+of a session are sent. See :ref:`batching_requests`."""
+
+import json
+import threading
+import time
+from typing import Any, Literal, Optional
+
+from .graphql_request import GraphQLRequest
+from .json_codec import JSONCodec
+
+BatchPriority = Literal["high", "normal", "low"]
+"""Priority of a request when batching is enabled:
+
+* :code:`"high"`: the request is executed directly, without waiting in the
+  batch queue
+* :code:`"normal"`: the request waits at most :code:`batch_interval` seconds
+  for other requests
+* :code:`"low"`: the request waits at most
+  :code:`batch_low_priority_interval` seconds, to be sent in larger batches
+"""
+
+BATCH_PRIORITIES = ("high", "normal", "low")
+
+# Weight of the last observation in the moving averages
+_EWMA_ALPHA = 0.2
+
+
+class BatchItem:
+    """Request waiting in the batch queue of a session."""
+
+    __slots__ = ("request", "future", "arrival", "deadline", "size", "priority")
+
+    def __init__(
+        self,
+        request: GraphQLRequest,
+        future: Any,
+        *,
+        arrival: float,
+        deadline: Optional[float],
+        size: int,
+        priority: BatchPriority = "normal",
+    ):
+        self.request = request
+        self.future = future
+
+        # Times as returned by time.monotonic
+        self.arrival: float = arrival
+        self.deadline: Optional[float] = deadline
+
+        # Size of the encoded payload, 0 if not computed
+        self.size: int = size
+
+        self.priority: BatchPriority = priority
+
+
+class BatchFlushPolicy:
+    """Decide when a batch should be sent.
+
+    A batch is sent after :code:`interval` seconds from its first request
+    (:code:`low_priority_interval` seconds for low priority requests,
+    the earliest time of its requests being used),
+    or before if it contains :code:`max_requests` requests or if the next
+    request would make its payload larger than :code:`max_bytes`.
+
+    If :code:`adaptive` is True:
+
+    * the time to wait for other requests is reduced to the time needed
+      to fill the batch at the observed arrival rate of the requests,
+      and a request is sent alone without waiting if no other request
+      is expected during the interval
+    * the batch is sent as soon as no request arrived during twice the
+      average time between requests
+    * the batch is sent early enough for the requests to be answered before
+      their deadline, using the observed round trip time of the batches
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float,
+        max_requests: int,
+        max_bytes: Optional[int] = None,
+        adaptive: bool = False,
+        low_priority_interval: Optional[float] = None,
+        json_codec: Optional[JSONCodec] = None,
+    ):
+        self.interval = interval
+        self.low_priority_interval = (
+            interval if low_priority_interval is None else low_priority_interval
+        )
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.adaptive = adaptive
+
+        # Codec of the transport, used to compute the size of the payloads
+        self.json_codec = json_codec
+
+        # Moving averages of the time between requests and of the round trip time
+        self.arrival_gap: Optional[float] = None
+        self.round_trip: float = 0.0
+
+        self._last_arrival: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def create_item(
+        self,
+        request: GraphQLRequest,
+        future: Any,
+        *,
+        timeout: Optional[float],
+        priority: BatchPriority = "normal",
+    ) -> BatchItem:
+        """Create the item to put in the batch queue for a new request.
+
+        :param request: the request to execute
+        :param future: the future receiving the result
+        :param timeout: the time in seconds the request has to be executed,
+            or None
+        :param priority: the :data:`priority <gql.batching.BatchPriority>`
+            of the request
+        """
+        now = time.monotonic()
+
+        if self.adaptive:
+            with self._lock:
+                if self._last_arrival is not None:
+                    self.arrival_gap = _ewma(self.arrival_gap, now - self._last_arrival)
+                self._last_arrival = now
+
+        deadline = now + timeout if self.adaptive and timeout is not None else None
+        size = (
+            self.get_size(request, self.json_codec) if self.max_bytes is not None else 0
+        )
+
+        return BatchItem(
+            request,
+            future,
+            arrival=now,
+            deadline=deadline,
+            size=size,
+            priority=priority,
+        )
+
+    @staticmethod
+    def get_size(
+        request: GraphQLRequest, json_codec: Optional[JSONCodec] = None
+    ) -> int:
+        """Size in bytes of the payload of the request, with its separator.
+
+        :param request: the request
+        :param json_codec: the codec encoding the payload of the transport
+        """
+        if json_codec is not None:
+            try:
+                return len(json_codec.encode(request.payload)) + 1
+            except (TypeError, ValueError):
+                # Values which are not serialized yet
+                pass
+
+        return len(json.dumps(request.payload, default=str).encode("utf-8")) + 1
+
+    def fits(self, batch_size: int, item: BatchItem) -> bool:
+        """Returns True if the item can be added to a non-empty batch
+        with an encoded payload of :code:`batch_size` bytes."""
+        return self.max_bytes is None or batch_size + item.size <= self.max_bytes
+
+    def get_flush_time(self, item: BatchItem) -> float:
+        """Time at which a batch containing this item should be sent."""
+        if item.priority == "high":
+            interval = 0.0
+        elif item.priority == "low":
+            interval = self.low_priority_interval
+        else:
+            interval = self.interval
+
+        if self.adaptive:
+            gap = self.arrival_gap
+
+            if gap is None or gap > interval:
+                # No other request is expected during the interval
+                interval = 0
+            else:
+                interval = min(interval, gap * (self.max_requests - 1))
+
+        flush_time = item.arrival + interval
+
+        if item.deadline is not None:
+            flush_time = min(flush_time, item.deadline - self.round_trip)
+
+        return flush_time
+
+    def update_flush_time(self, flush_time: float, item: BatchItem) -> float:
+        """Send the batch earlier if needed by an item added to the batch."""
+        return min(flush_time, self.get_flush_time(item))
+
+    @property
+    def idle_timeout(self) -> Optional[float]:
+        """Time after which the batch is sent if no request has arrived."""
+        if not self.adaptive or self.arrival_gap is None:
+            return None
+
+        return 2 * self.arrival_gap
+
+    def record_round_trip(self, duration: float) -> None:
+        """Update the average round trip time with the duration of a batch."""
+        if self.adaptive:
+            with self._lock:
+                self.round_trip = _ewma(self.round_trip or None, duration)
+
+
+def _ewma(average: Optional[float], value: float) -> float:
+    if average is None:
+        return value
+    return _EWMA_ALPHA * value + (1 - _EWMA_ALPHA) * average
@@ -0,0 +1,712 @@
+"""Client-side cache of the results of the GraphQL queries.
+
+A cache can be provided to the :class:`Client <gql.Client>` with its
+:code:`cache` argument. See :ref:`response_cache`.
+"""
+
+import abc
+import copy
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Literal, Optional, Sequence
+
+from graphql import (
+    DocumentNode,
+    ExecutionResult,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLObjectType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    NamedTypeNode,
+    OperationType,
+    SelectionNode,
+    SelectionSetNode,
+    is_abstract_type,
+    value_from_ast_untyped,
+)
+
+from .graphql_request import GraphQLRequest
+from .utilities.serialize_variable_values import (
+    _get_request_operation,
+    _is_query_request,
+)
+from .utils import LRUCache
+
+CachePolicy = Literal[
+    "cache-first",
+    "network-only",
+    "no-cache",
+    "stale-while-revalidate",
+]
+"""Policy used to decide if a query result is taken from the cache:
+
+* :code:`cache-first`: use the cached result if it has not expired,
+  otherwise execute the query and save its result in the cache
+* :code:`network-only`: always execute the query and save its result in the cache
+* :code:`no-cache`: always execute the query without using the cache
+* :code:`stale-while-revalidate`: use the cached result even if it has expired,
+  and in that case execute the query in the background to refresh the cache
+"""
+
+CACHE_POLICIES = (
+    "cache-first",
+    "network-only",
+    "no-cache",
+    "stale-while-revalidate",
+)
+
+
+class CacheEntry:
+    """Result of a query saved in a cache."""
+
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        *,
+        extensions: Optional[Dict[str, Any]] = None,
+        expires_at: Optional[float] = None,
+    ):
+        """:param data: the data of the result
+        :param extensions: the extensions of the result
+        :param expires_at: time (as returned by :func:`time.time`) after which
+            the entry is expired. None means that the entry never expires.
+        """
+        self.data: Dict[str, Any] = data
+        self.extensions: Optional[Dict[str, Any]] = extensions
+        self.expires_at: Optional[float] = expires_at
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.time() >= self.expires_at
+
+    def get_result(self) -> ExecutionResult:
+        """Returns a copy of the saved result."""
+        return ExecutionResult(
+            data=copy.deepcopy(self.data),
+            extensions=copy.deepcopy(self.extensions),
+        )
+
+
+class BaseCache(abc.ABC):
+    """Base class of the caches which can be provided to the
+    :class:`Client <gql.Client>`."""
+
+    def __init__(self, *, ttl: Optional[float] = 60):
+        """:param ttl: time in seconds after which the saved results expire.
+        None means that the results never expire.
+        """
+        self.ttl: Optional[float] = ttl
+
+    def _get_expiration(self) -> Optional[float]:
+        return None if self.ttl is None else time.time() + self.ttl
+
+    @abc.abstractmethod
+    def read(
+        self,
+        request: GraphQLRequest,
+        key: str,
+        *,
+        schema: Optional[GraphQLSchema] = None,
+    ) -> Optional[CacheEntry]:
+        """Returns the cached result of a query, or None if not found.
+
+        :param request: the query request
+        :param key: the cache key of the request
+        :param schema: the schema of the client, if available
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    @abc.abstractmethod
+    def write(
+        self,
+        request: GraphQLRequest,
+        key: str,
+        result: ExecutionResult,
+        *,
+        schema: Optional[GraphQLSchema] = None,
+    ) -> None:
+        """Save the result of a request without errors.
+
+        This method is called for the results of the queries
+        but also of the mutations.
+
+        :param request: the executed request
+        :param key: the cache key of the request
+        :param result: the result received from the server
+        :param schema: the schema of the client, if available
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Remove all the entries."""
+        raise NotImplementedError  # pragma: no cover
+
+
+class ResponseCache(BaseCache):
+    """Base class of the caches saving the whole query results by cache key.
+
+    Subclasses only need to implement the storage of the entries
+    with the :meth:`get`, :meth:`set`, :meth:`delete` and :meth:`clear` methods.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Returns the entry saved for this key, or None."""
+        raise NotImplementedError  # pragma: no cover
+
+    @abc.abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Save an entry for this key."""
+        raise NotImplementedError  # pragma: no cover
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove the entry saved for this key, if any."""
+        raise NotImplementedError  # pragma: no cover
+
+    def set_result(self, key: str, result: ExecutionResult) -> None:
+        """Save a copy of the result received from the server for this key."""
+        assert result.data is not None
+
+        self.set(
+            key,
+            CacheEntry(
+                copy.deepcopy(result.data),
+                extensions=copy.deepcopy(result.extensions),
+                expires_at=self._get_expiration(),
+            ),
+        )
+
+    def read(
+        self,
+        request: GraphQLRequest,
+        key: str,
+        *,
+        schema: Optional[GraphQLSchema] = None,
+    ) -> Optional[CacheEntry]:
+        return self.get(key)
+
+    def write(
+        self,
+        request: GraphQLRequest,
+        key: str,
+        result: ExecutionResult,
+        *,
+        schema: Optional[GraphQLSchema] = None,
+    ) -> None:
+        if is_cacheable(request):
+            self.set_result(key, result)
+
+
+class InMemoryCache(ResponseCache):
+    """Cache keeping the query results in memory.
+
+    The least recently used entries are discarded when the cache is full.
+    """
+
+    def __init__(self, *, maxsize: int = 1000, ttl: Optional[float] = 60):
+        """:param maxsize: maximum number of entries in the cache
+        :param ttl: time in seconds after which the saved results expire.
+            None means that the results never expire.
+        """
+        super().__init__(ttl=ttl)
+        self.entries: LRUCache[str, CacheEntry] = LRUCache(maxsize=maxsize)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        return self.entries.get(key)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self.entries.set(key, entry)
+
+    def delete(self, key: str) -> None:
+        self.entries.discard(key)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def is_cacheable(request: GraphQLRequest) -> bool:
+    """Returns True if the operation executed by the request is a query."""
+    return _is_query_request(request)
+
+
+def get_cache_key(request: GraphQLRequest) -> str:
+    """Returns the key used to save the result of a request in a cache.
+
+    The key is computed from the hash of the printed query, which does not
+    depend on the formatting of the query, from the operation name,
+    the variable values and the extensions.
+    """
+    variables, extensions = (
+        json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+        for value in (request.variable_values, request.extensions)
+    )
+
+    key = "\n".join(
+        [request.query_hash, request.operation_name or "", variables, extensions],
+    )
+
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+ROOT_QUERY = "ROOT_QUERY"
+
+# Value returned by the reader when a field is not in the cache
+_MISSING: Any = object()
+
+
+class _Record:
+    """Fields of an object saved in a NormalizedCache, by storage key."""
+
+    __slots__ = ("fields", "expires_at")
+
+    def __init__(self) -> None:
+        self.fields: Dict[str, Any] = {}
+        self.expires_at: Dict[str, Optional[float]] = {}
+
+
+class _Reference:
+    """Reference to an entity saved in a NormalizedCache."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: str):
+        self.key: str = key
+
+
+def _get_fragments(document: DocumentNode) -> Dict[str, FragmentDefinitionNode]:
+    return {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+
+
+def _should_include(node: SelectionNode, variables: Dict[str, Any]) -> bool:
+    """Evaluate the @skip and @include directives of a selection."""
+
+    for directive in node.directives or ():
+        name = directive.name.value
+
+        if name not in ("skip", "include"):
+            continue
+
+        condition = None
+        for argument in directive.arguments or ():
+            if argument.name.value == "if":
+                condition = value_from_ast_untyped(argument.value, variables)
+
+        if name == "skip" and condition is True:
+            return False
+        if name == "include" and condition is not True:
+            return False
+
+    return True
+
+
+def _get_storage_key(field: FieldNode, variables: Dict[str, Any]) -> str:
+    """Returns the key of a field in a record: the field name and its arguments."""
+    name = field.name.value
+
+    if not field.arguments:
+        return name
+
+    arguments = {
+        argument.name.value: value_from_ast_untyped(argument.value, variables)
+        for argument in field.arguments
+    }
+
+    serialized_arguments = json.dumps(
+        arguments, sort_keys=True, separators=(",", ":"), default=str
+    )
+
+    return f"{name}({serialized_arguments})"
+
+
+def _merge_value(result: Dict[str, Any], key: str, value: Any) -> None:
+    """Merge a value read for a response key with the value already read
+    for the same response key in another fragment."""
+    existing = result.get(key)
+
+    if isinstance(existing, dict) and isinstance(value, dict):
+        for sub_key, sub_value in value.items():
+            _merge_value(existing, sub_key, sub_value)
+
+    elif (
+        isinstance(existing, list)
+        and isinstance(value, list)
+        and len(existing) == len(value)
+    ):
+        for index, item in enumerate(value):
+            if isinstance(existing[index], dict) and isinstance(item, dict):
+                for sub_key, sub_value in item.items():
+                    _merge_value(existing[index], sub_key, sub_value)
+
+    else:
+        result[key] = value
+
+
+class _NormalizedWriter:
+    """Split the data of a result into the records of a NormalizedCache."""
+
+    def __init__(self, cache: "NormalizedCache", request: GraphQLRequest):
+        self.cache = cache
+        self.fragments = _get_fragments(request.document)
+        self.variables: Dict[str, Any] = request.variable_values or {}
+        self.expires_at = cache._get_expiration()
+
+    def write_selection_set(
+        self, selection_set: SelectionSetNode, data: Dict[str, Any], record: _Record
+    ) -> None:
+
+        for selection in selection_set.selections:
+            if not _should_include(selection, self.variables):
+                continue
+
+            if isinstance(selection, FieldNode):
+                response_key = (
+                    selection.alias.value if selection.alias else selection.name.value
+                )
+
+                # Fields of the fragments which do not match the type are missing
+                if response_key not in data:
+                    continue
+
+                storage_key = _get_storage_key(selection, self.variables)
+                record.fields[storage_key] = self.write_value(
+                    selection, data[response_key]
+                )
+                record.expires_at[storage_key] = self.expires_at
+
+            elif isinstance(selection, InlineFragmentNode):
+                self.write_selection_set(selection.selection_set, data, record)
+
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments.get(selection.name.value)
+                if fragment is not None:
+                    self.write_selection_set(fragment.selection_set, data, record)
+
+    def write_value(self, field: FieldNode, value: Any) -> Any:
+
+        if isinstance(value, list):
+            return [self.write_value(field, item) for item in value]
+
+        if not isinstance(value, dict) or field.selection_set is None:
+            return copy.deepcopy(value)
+
+        entity_key = self.cache.identify(value)
+
+        if entity_key is None:
+            # Objects which cannot be identified are saved inside their parent
+            embedded_record = _Record()
+            self.write_selection_set(field.selection_set, value, embedded_record)
+            return embedded_record
+
+        record = self.cache.records.get(entity_key)
+
+        if record is None:
+            record = _Record()
+            self.cache.records.set(entity_key, record)
+
+        self.write_selection_set(field.selection_set, value, record)
+
+        return _Reference(entity_key)
+
+
+class _NormalizedReader:
+    """Build the data of a query from the records of a NormalizedCache."""
+
+    def __init__(
+        self,
+        cache: "NormalizedCache",
+        request: GraphQLRequest,
+        schema: Optional[GraphQLSchema],
+    ):
+        self.cache = cache
+        self.schema = schema
+        self.fragments = _get_fragments(request.document)
+        self.variables: Dict[str, Any] = request.variable_values or {}
+
+        # Earliest expiration of the fields read
+        self.expires_at: Optional[float] = None
+
+    def read_selection_set(
+        self, selection_set: SelectionSetNode, record: _Record
+    ) -> Optional[Dict[str, Any]]:
+        """Returns the data of the selection set, or None if a field is missing."""
+
+        result: Dict[str, Any] = {}
+        typename = record.fields.get("__typename")
+
+        for selection in selection_set.selections:
+            if not _should_include(selection, self.variables):
+                continue
+
+            if isinstance(selection, FieldNode):
+                storage_key = _get_storage_key(selection, self.variables)
+
+                if storage_key not in record.fields:
+                    return None
+
+                expires_at = record.expires_at[storage_key]
+                if expires_at is not None and (
+                    self.expires_at is None or expires_at < self.expires_at
+                ):
+                    self.expires_at = expires_at
+
+                value = self.read_value(selection, record.fields[storage_key])
+                if value is _MISSING:
+                    return None
+
+                response_key = (
+                    selection.alias.value if selection.alias else selection.name.value
+                )
+                _merge_value(result, response_key, value)
+
+            else:
+                if isinstance(selection, InlineFragmentNode):
+                    type_condition = selection.type_condition
+                    fragment_selection_set = selection.selection_set
+                else:
+                    assert isinstance(selection, FragmentSpreadNode)
+                    fragment = self.fragments.get(selection.name.value)
+                    if fragment is None:
+                        return None
+                    type_condition = fragment.type_condition
+                    fragment_selection_set = fragment.selection_set
+
+                fragment_result = self.read_fragment(
+                    type_condition, fragment_selection_set, record, typename
+                )
+                if fragment_result is None:
+                    return None
+
+                for key, value in fragment_result.items():
+                    _merge_value(result, key, value)
+
+        return result
+
+    def read_fragment(
+        self,
+        type_condition: Optional[NamedTypeNode],
+        selection_set: SelectionSetNode,
+        record: _Record,
+        typename: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Returns the data of the fragment, an empty dict if the fragment
+        does not apply to the record, or None if a field is missing."""
+
+        if type_condition is None or type_condition.name.value == typename:
+            return self.read_selection_set(selection_set, record)
+
+        if self.schema is not None and typename is not None:
+            condition_type = self.schema.get_type(type_condition.name.value)
+            object_type = self.schema.get_type(typename)
+
+            if (
+                is_abstract_type(condition_type)
+                and isinstance(object_type, GraphQLObjectType)
+                and self.schema.is_sub_type(condition_type, object_type)
+            ):
+                return self.read_selection_set(selection_set, record)
+
+            return {}
+
+        # Without the schema, consider that the fragment applies
+        # only if all its fields are in the cache
+        fragment_result = self.read_selection_set(selection_set, record)
+
+        return {} if fragment_result is None else fragment_result
+
+    def read_value(self, field: FieldNode, value: Any) -> Any:
+
+        if isinstance(value, list):
+            items = [self.read_value(field, item) for item in value]
+            return _MISSING if _MISSING in items else items
+
+        if isinstance(value, _Reference):
+            value = self.cache.records.get(value.key)
+            if value is None:
+                return _MISSING
+
+        if isinstance(value, _Record):
+            if field.selection_set is None:
+                return _MISSING
+
+            data = self.read_selection_set(field.selection_set, value)
+            return _MISSING if data is None else data
+
+        return value
+
+
+class NormalizedCache(BaseCache):
+    """Cache splitting the query results into entities, like the normalized
+    cache of the Apollo client.
+
+    Each object of a result containing a :code:`__typename` and an :code:`id`
+    is saved as a single entity identified by :code:`Typename:id`
+    (see :meth:`identify`). A query can then be answered from the cache if all
+    its fields are known, even if it was never executed before, and the
+    entities returned by a mutation update all the cached queries using them.
+
+    Fields with arguments are saved separately for each value of the arguments.
+
+    The least recently used entities are discarded when the cache is full,
+    and the expired fields are removed at most once per ttl, when a result
+    is written.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: Optional[float] = 60,
+        key_fields: Sequence[str] = ("id",),
+        maxsize: int = 10000,
+    ):
+        """:param ttl: time in seconds after which the saved fields expire.
+            None means that the fields never expire.
+        :param key_fields: the fields identifying an entity, in order of preference
+        :param maxsize: maximum number of entities in the cache
+        """
+        super().__init__(ttl=ttl)
+        self.key_fields: Sequence[str] = key_fields
+
+        self.records: LRUCache[str, _Record] = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+        # Time of the next removal of the expired fields
+        self._next_cleanup: Optional[float] = self._get_expiration()
+
+    def identify(self, value: Dict[str, Any]) -> Optional[str]:
+        """Returns the key of the entity for an object of a result,
+        or None if the object cannot be identified."""
+        typename = value.get("__typename")
+
+        if typename is None:
+            return None
+
+        for key_field in self.key_fields:
+            key_value = value.get(key_field)
+            if key_value is not None:
+                return f"{typename}:{key_value}"
+
+        return None
+
+    def read(
+        self,
+        request: GraphQLRequest,
+        key: str,
+        *,
+        schema: Optional[GraphQLSchema] = None,
+    ) -> Optional[CacheEntry]:
+
+        operation = _get_request_operation(request)
+
+        if operation is None or operation.operation != OperationType.QUERY:
+            return None
+
+        reader = _NormalizedReader(self, request, schema)
+
+        with self._lock:
+            root = self.records.get(ROOT_QUERY)
+
+            if root is None:
+                return None
+
+            data = reader.read_selection_set(operation.selection_set, root)
+
+        if data is None:
+            return None
+
+        return CacheEntry(data, expires_at=reader.expires_at)
+
+    def write(
+        self,
+        request: GraphQLRequest,
+        key: str,
+        result: ExecutionResult,
+        *,
+        schema: Optional[GraphQLSchema] = None,
+    ) -> None:
+
+        operation = _get_request_operation(request)
+
+        if operation is None or result.data is None:
+            return
+
+        writer = _NormalizedWriter(self, request)
+
+        with self._lock:
+            if self._next_cleanup is not None and time.time() >= self._next_cleanup:
+                self._remove_expired()
+                self._next_cleanup = self._get_expiration()
+
+            if operation.operation == OperationType.QUERY:
+                root = self.records.get(ROOT_QUERY) or _Record()
+            else:
+                # Only the entities returned by the mutations are saved
+                root = _Record()
+
+            writer.write_selection_set(operation.selection_set, result.data, root)
+
+            # Saved last so that it is not discarded by the entities of the result
+            if operation.operation == OperationType.QUERY:
+                self.records.set(ROOT_QUERY, root)
+
+    def _remove_expired(self) -> None:
+        """Remove the expired fields, and the entities without any field left."""
+        now = time.time()
+
+        for entity_key, record in self.records.items():
+            for storage_key, expires_at in list(record.expires_at.items()):
+                if expires_at is not None and expires_at <= now:
+                    del record.fields[storage_key]
+                    del record.expires_at[storage_key]
+
+            if not record.fields:
+                self.records.discard(entity_key)
+
+    def get_entity(self, entity_key: str) -> Optional[Dict[str, Any]]:
+        """Returns the fields saved for an entity, by storage key.
+
+        The other entities are returned as :code:`{"__ref": key}` dicts.
+        """
+        with self._lock:
+            record = self.records.get(entity_key)
+            return None if record is None else _export_record(record)
+
+    def evict(self, entity_key: str) -> None:
+        """Remove an entity from the cache.
+
+        The queries using this entity will be executed again."""
+        with self._lock:
+            self.records.discard(entity_key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records.clear()
+
+    def __contains__(self, entity_key: object) -> bool:
+        return entity_key in self.records
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_export_value(item) for item in value]
+    if isinstance(value, _Reference):
+        return {"__ref": value.key}
+    if isinstance(value, _Record):
+        return _export_record(value)
+    return copy.deepcopy(value)
+
+
+def _export_record(record: _Record) -> Dict[str, Any]:
+    return {key: _export_value(value) for key, value in record.fields.items()}
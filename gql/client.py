@@ -1,19 +1,27 @@
 import asyncio
+import copy
+import functools
 import logging
 import time
 import warnings
-from concurrent.futures import Future
-from queue import Queue
-from threading import Event, Thread
+import weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from queue import Empty, Queue
+from threading import Event, Lock, Semaphore, Thread
 from typing import (
     Any,
     AsyncGenerator,
+    AsyncIterable,
     Callable,
+    ContextManager,
     Dict,
     Generator,
+    Iterable,
     List,
     Literal,
     Optional,
+    Sequence,
+    Set,
     Tuple,
     TypeVar,
     Union,
@@ -22,8 +30,10 @@ from typing import (
 )
 
 from anyio import fail_after
+from anyio.from_thread import BlockingPortal, start_blocking_portal
 from graphql import (
     ExecutionResult,
+    GraphQLError,
     GraphQLSchema,
     IntrospectionQuery,
     build_ast_schema,
@@ -38,17 +48,75 @@ from tenacity import (
     wait_exponential,
 )
 
-from .graphql_request import GraphQLRequest, support_deprecated_request
+from .batching import BATCH_PRIORITIES, BatchFlushPolicy, BatchItem, BatchPriority
+from .cache import (
+    CACHE_POLICIES,
+    BaseCache,
+    CachePolicy,
+    get_cache_key,
+    is_cacheable,
+)
+from .graphql_request import (
+    GraphQLRequest,
+    PreparedRequest,
+    support_deprecated_request,
+)
+from .json_codec import JSONCodec
 from .transport.async_transport import AsyncTransport
+from .transport.common.incremental import IncrementalExecutionResult
 from .transport.exceptions import TransportConnectionFailed, TransportQueryError
 from .transport.local_schema import LocalSchemaTransport
 from .transport.transport import Transport
-from .utilities import build_client_schema, get_introspection_query_ast
+from .utilities import (
+    build_client_schema,
+    can_merge_request,
+    get_introspection_query_ast,
+    merge_requests,
+)
 from .utilities import parse_result as parse_result_fn
-from .utils import str_first_element
+from .utilities import split_result
+from .utils import LRUCache, str_first_element
 
 log = logging.getLogger(__name__)
 
+# Validation results shared by all the clients of the process, with a cache
+# of the validation errors keyed by query hash for each schema still alive
+_VALIDATION_CACHE_SIZE = 1024
+_ValidationCaches = weakref.WeakKeyDictionary[GraphQLSchema, LRUCache[str, List]]
+_validation_caches: _ValidationCaches = weakref.WeakKeyDictionary()
+
+
+def _copy_result(result: ExecutionResult) -> ExecutionResult:
+    """Returns a copy of a result shared by several requests,
+    keeping its class and its other attributes like the HTTP metadata."""
+    copied = copy.copy(result)
+    copied.data = copy.deepcopy(result.data)
+    copied.errors = copy.deepcopy(result.errors)
+    copied.extensions = copy.deepcopy(result.extensions)
+    return copied
+
+
+async def _anext(generator: AsyncGenerator) -> Any:
+    """Returns the next item of an async generator from a coroutine."""
+    return await generator.__anext__()
+
+
+async def _aclose(generator: AsyncGenerator) -> None:
+    """Close an async generator from a coroutine."""
+    await generator.aclose()
+
+
+class _InFlightRequest:
+    """Execution on the transport shared by identical requests."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[ExecutionResult]"):
+        self.task = task
+
+        # Number of requests waiting for the result
+        self.waiters = 0
+
 
 class Client:
     """The Client class is the main entrypoint to execute GraphQL requests
@@ -81,8 +149,20 @@ class Client:
         execute_timeout: Optional[Union[int, float]] = 10,
         serialize_variables: bool = False,
         parse_results: bool = False,
+        parse_only_custom_types: bool = False,
         batch_interval: float = 0,
         batch_max: int = 10,
+        batch_max_concurrency: int = 1,
+        batch_queue_size: int = 0,
+        batch_max_bytes: Optional[int] = None,
+        batch_adaptive: bool = False,
+        batch_low_priority_interval: Optional[float] = None,
+        batch_merge_queries: bool = False,
+        validation_cache_size: Optional[int] = None,
+        cache: Optional[BaseCache] = None,
+        cache_policy: CachePolicy = "cache-first",
+        deduplicate_requests: bool = False,
+        json_codec: Optional[JSONCodec] = None,
     ):
         """Initialize the client with the given parameters.
 
@@ -100,9 +180,46 @@ class Client:
             serialized. Used for custom scalars and/or enums. Default: False.
         :param parse_results: Whether gql will try to parse the serialized output
                 sent by the backend. Can be used to deserialize custom scalars or enums.
+        :param parse_only_custom_types: Whether only the custom scalars and enums
+                of the results are parsed, keeping the rest of the results unchanged,
+                without coercing the built-in scalars nor removing the fields
+                which were not requested. Default: False.
         :param batch_interval: Time to wait in seconds for batching requests together.
                 Batching is disabled (by default) if 0.
         :param batch_max: Maximum number of requests in a single batch.
+        :param batch_max_concurrency: Maximum number of batches executed
+                at the same time.
+        :param batch_queue_size: Maximum number of requests waiting to be batched.
+                If the queue is full, new requests wait for a free place.
+                Unlimited (by default) if 0.
+        :param batch_max_bytes: Maximum size in bytes of the payload of a batch.
+                Unlimited (by default) if None.
+        :param batch_adaptive: Whether the time to wait for other requests should
+                adapt to the arrival rate of the requests and to their deadline.
+                See :ref:`adaptive_batching`.
+        :param batch_low_priority_interval: Time to wait in seconds for batching
+                the requests executed with the "low" priority.
+                Default: 4 times the batch_interval.
+        :param batch_merge_queries: Whether the queries of a batch should be merged
+                in a single query, for servers which do not accept batches.
+                See :ref:`merging_queries`.
+        :param validation_cache_size: Size of the LRU cache of the validation results
+                of a schema. By default (None), use a cache shared by all the clients
+                of the process. Use 0 to disable the cache or a positive number
+                to use a cache of that size only for this client.
+        :param cache: an optional cache of the query results,
+                for example an :class:`InMemoryCache <gql.cache.InMemoryCache>`
+                or a :class:`NormalizedCache <gql.cache.NormalizedCache>`.
+                See :ref:`response_cache`.
+        :param cache_policy: The default :data:`cache policy <gql.cache.CachePolicy>`
+                used if a cache is provided. Default: "cache-first".
+        :param deduplicate_requests: Whether identical queries executed at the
+                same time in an async session should share a single execution
+                on the transport. See :ref:`deduplicate_requests`.
+        :param json_codec: The :ref:`JSON codec <json_codecs>` used by the
+                transport to encode the requests and decode the answers,
+                for example an :class:`OrjsonCodec <gql.json_codec.OrjsonCodec>`.
+                By default, the codec of the transport is not changed.
         """
 
         if introspection:
@@ -141,6 +258,9 @@ class Client:
         ), "You need to provide either a transport or a schema to the Client."
         self.transport: Union[Transport, AsyncTransport] = transport
 
+        if json_codec is not None:
+            self.transport.json_codec = json_codec
+
         # Flag to indicate that we need to fetch the schema from the transport
         # On async transports, we fetch the schema before executing the first query
         self.fetch_schema_from_transport: bool = fetch_schema_from_transport
@@ -153,22 +273,213 @@ class Client:
 
         self.serialize_variables = serialize_variables
         self.parse_results = parse_results
+        self.parse_only_custom_types = parse_only_custom_types
         self.batch_interval = batch_interval
         self.batch_max = batch_max
 
+        assert batch_max_concurrency > 0, "batch_max_concurrency should be positive"
+        self.batch_max_concurrency = batch_max_concurrency
+        self.batch_queue_size = batch_queue_size
+        self.batch_max_bytes = batch_max_bytes
+        self.batch_adaptive = batch_adaptive
+        self.batch_low_priority_interval = (
+            4 * batch_interval
+            if batch_low_priority_interval is None
+            else batch_low_priority_interval
+        )
+        self.batch_merge_queries = batch_merge_queries
+
+        # LRU caches of the validation results, one for each schema
+        self.validation_cache_size = validation_cache_size
+        self._validation_caches: _ValidationCaches = (
+            _validation_caches
+            if validation_cache_size is None
+            else weakref.WeakKeyDictionary()
+        )
+
+        # Cache of the query results
+        assert cache_policy in CACHE_POLICIES, f"Invalid cache policy: {cache_policy}"
+        self.cache: Optional[BaseCache] = cache
+        self.cache_policy: CachePolicy = cache_policy
+
+        self.deduplicate_requests = deduplicate_requests
+
+        # Event loop thread used by connect_background
+        self._background_portal: Optional[BlockingPortal] = None
+        self._background_portal_cm: Optional[ContextManager[BlockingPortal]] = None
+
     @property
     def batching_enabled(self) -> bool:
         return self.batch_interval != 0
 
+    @property
+    def background_connected(self) -> bool:
+        """Whether the client is connected in a background event loop
+        with :meth:`connect_background`."""
+        return self._background_portal is not None
+
+    @property
+    def validation_cache(self) -> Optional[LRUCache[str, List]]:
+        """LRU cache of the validation errors of the current schema,
+        keyed by query hash, or None if the cache is disabled."""
+        if self.validation_cache_size == 0 or self.schema is None:
+            return None
+
+        cache = self._validation_caches.get(self.schema)
+
+        if cache is None:
+            cache = self._validation_caches.setdefault(
+                self.schema,
+                LRUCache(maxsize=self.validation_cache_size or _VALIDATION_CACHE_SIZE),
+            )
+
+        return cache
+
+    def _background_call(
+        self, func: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        """Run a coroutine function in the background event loop
+        and wait for its result."""
+        assert self._background_portal is not None
+        return self._background_portal.call(functools.partial(func, *args, **kwargs))
+
     def validate(self, request: GraphQLRequest) -> None:
         """:meta private:"""
         assert (
             self.schema
         ), "Cannot validate the document locally, you need to pass a schema."
 
-        validation_errors = validate(self.schema, request.document)
+        if isinstance(request, PreparedRequest) and request.schema is self.schema:
+            # Already validated in the prepare method
+            return
+
+        validation_cache = self.validation_cache
+
+        if validation_cache is None:
+            validation_errors = validate(self.schema, request.document)
+
+        else:
+            cached = validation_cache.get(request.query_hash)
+
+            if cached is None:
+                validation_errors = validate(self.schema, request.document)
+                validation_cache.set(request.query_hash, validation_errors)
+            else:
+                validation_errors = cached
+
         if validation_errors:
-            raise validation_errors[0]
+            # The cached errors are shared between the calls and the threads,
+            # a new error is raised so that its traceback is not accumulated
+            error = validation_errors[0]
+            raise GraphQLError(
+                error.message,
+                error.nodes,
+                error.source,
+                error.positions,
+                error.path,
+                error.original_error,
+                error.extensions,
+            )
+
+        if isinstance(request, PreparedRequest):
+            request._bind_schema(self.schema)
+
+    def _create_batch_policy(self) -> BatchFlushPolicy:
+        """:meta private:"""
+        return BatchFlushPolicy(
+            interval=self.batch_interval,
+            max_requests=self.batch_max,
+            max_bytes=self.batch_max_bytes,
+            adaptive=self.batch_adaptive,
+            low_priority_interval=self.batch_low_priority_interval,
+            json_codec=self.transport.json_codec,
+        )
+
+    def _cache_lookup(
+        self, request: GraphQLRequest, cache_policy: Optional[CachePolicy]
+    ) -> Tuple[Optional[str], Optional[ExecutionResult], bool]:
+        """Look for the result of the request in the cache.
+
+        :return: a tuple with:
+
+            * the cache key, or None if the cache should not be used for the request
+            * the cached result of a query, or None if the request should be executed
+            * True if the cached result has expired and should be refreshed
+
+        :meta private:
+        """
+        if cache_policy is None:
+            cache_policy = self.cache_policy
+        else:
+            assert (
+                cache_policy in CACHE_POLICIES
+            ), f"Invalid cache policy: {cache_policy}"
+
+        if self.cache is None or cache_policy == "no-cache":
+            return None, None, False
+
+        cache_key = get_cache_key(request)
+
+        # The results of the mutations are still saved, to update the entities
+        if cache_policy == "network-only" or not is_cacheable(request):
+            return cache_key, None, False
+
+        entry = self.cache.read(request, cache_key, schema=self.schema)
+
+        if entry is None:
+            return cache_key, None, False
+
+        if not entry.expired:
+            return cache_key, entry.get_result(), False
+
+        if cache_policy == "stale-while-revalidate":
+            return cache_key, entry.get_result(), True
+
+        return cache_key, None, False
+
+    def _cache_store(
+        self,
+        request: GraphQLRequest,
+        cache_key: Optional[str],
+        result: ExecutionResult,
+    ) -> None:
+        """Save the result in the cache if it does not contain errors.
+
+        :meta private:
+        """
+        if cache_key is None or result.errors or result.data is None:
+            return
+
+        assert self.cache is not None
+        self.cache.write(request, cache_key, result, schema=self.schema)
+
+    def prepare(self, request: GraphQLRequest) -> PreparedRequest:
+        """Prepare a request which will be executed many times.
+
+        The document is validated once with the schema of the client (if provided)
+        and the printed query string, the executed operation and the types of the
+        variables are saved in the returned
+        :class:`PreparedRequest <gql.PreparedRequest>`.
+
+        Use the :meth:`with_variables <gql.PreparedRequest.with_variables>` method
+        of the prepared request to execute it with new variable values.
+
+        .. note::
+            If the schema is fetched from the transport, you should prepare
+            your requests after the connection, once the schema is available.
+
+        :param request: GraphQL request as a
+                        :class:`GraphQLRequest <gql.GraphQLRequest>` object.
+        :return: a :class:`PreparedRequest <gql.PreparedRequest>`
+        :raises graphql.error.GraphQLError: if the document is not valid.
+        """
+
+        prepared = PreparedRequest(request)
+
+        if self.schema:
+            self.validate(prepared)
+
+        return prepared
 
     def _build_schema_from_introspection(
         self, execution_result: ExecutionResult
@@ -475,10 +786,24 @@ class Client:
          If you have multiple requests to send, it is better to get your own session
          and execute the requests in your session.
 
+         If the client is connected with
+         :meth:`connect_background <gql.client.Client.connect_background>`,
+         the request is executed in the session of the background event loop instead.
+
          The extra arguments passed in the method will be passed to the transport
          execute method.
         """
 
+        if self.background_connected:
+            return self._background_call(
+                cast(AsyncClientSession, self.session).execute,
+                request,
+                serialize_variables=serialize_variables,
+                parse_result=parse_result,
+                get_execution_result=get_execution_result,
+                **kwargs,
+            )
+
         if isinstance(self.transport, AsyncTransport):
             loop = self._get_event_loop()
 
@@ -568,10 +893,24 @@ class Client:
          If you want to perform multiple executions, it is better to use
          the context manager to keep a session active.
 
+         If the client is connected with
+         :meth:`connect_background <gql.client.Client.connect_background>`,
+         the requests are executed in the session of the background event loop instead.
+
          The extra arguments passed in the method will be passed to the transport
          execute method.
         """
 
+        if self.background_connected:
+            return self._background_call(
+                cast(AsyncClientSession, self.session).execute_batch,
+                requests,
+                serialize_variables=serialize_variables,
+                parse_result=parse_result,
+                get_execution_result=get_execution_result,
+                **kwargs,
+            )
+
         if isinstance(self.transport, AsyncTransport):
             loop = self._get_event_loop()
 
@@ -711,6 +1050,16 @@ class Client:
         We need an async transport for this functionality.
         """
 
+        if self.background_connected:
+            yield from self._subscribe_background(
+                request,
+                serialize_variables=serialize_variables,
+                parse_result=parse_result,
+                get_execution_result=get_execution_result,
+                **kwargs,
+            )
+            return
+
         loop = self._get_event_loop()
 
         assert not loop.is_running(), (
@@ -757,6 +1106,28 @@ class Client:
             # Then reraise the exception
             raise
 
+    def _subscribe_background(
+        self, request: GraphQLRequest, **kwargs: Any
+    ) -> Generator[Any, None, None]:
+        """Subscribe in the session of the background event loop."""
+
+        session = cast(AsyncClientSession, self.session)
+
+        async_generator = session.subscribe(request, **kwargs)
+
+        try:
+            while True:
+                try:
+                    result = self._background_call(_anext, async_generator)
+                except StopAsyncIteration:
+                    break
+
+                yield result
+
+        finally:
+            if self.background_connected:
+                self._background_call(_aclose, async_generator)
+
     async def connect_async(self, reconnecting=False, **kwargs):
         r"""Connect asynchronously with the underlying async transport to
         produce a session.
@@ -861,24 +1232,135 @@ class Client:
     def __exit__(self, *args):
         self.close_sync()
 
+    def connect_background(self, reconnecting: bool = False, **kwargs: Any) -> None:
+        r"""Connect the async transport in an event loop running in a
+        background thread.
+
+        Until :meth:`close_background <gql.client.Client.close_background>`
+        is called, the :meth:`execute <gql.client.Client.execute>`,
+        :meth:`execute_batch <gql.client.Client.execute_batch>` and
+        :meth:`subscribe <gql.client.Client.subscribe>` methods can be called
+        from any thread and use the same connected session.
+
+        See :ref:`background_session`.
+
+        :param reconnecting: if True, create a permanent reconnecting session
+        :param \**kwargs: additional arguments for the
+            :meth:`connect_async <gql.client.Client.connect_async>` method.
+        """
+
+        assert isinstance(
+            self.transport, AsyncTransport
+        ), "Only a transport of type AsyncTransport can be used in the background"
+
+        assert not self.background_connected, "Already connected in the background"
+
+        portal_cm = start_blocking_portal()
+        portal = portal_cm.__enter__()
+
+        try:
+            portal.call(functools.partial(self.connect_async, reconnecting, **kwargs))
+        except BaseException:
+            portal_cm.__exit__(None, None, None)
+            raise
+
+        self._background_portal_cm = portal_cm
+        self._background_portal = portal
+
+    def close_background(self) -> None:
+        """Close the session of the background event loop and stop its thread.
+
+        If batching is enabled, this will block until the remaining queries in the
+        batching queue have been processed.
+        """
+
+        assert self._background_portal is not None, "Not connected in the background"
+        assert self._background_portal_cm is not None
+
+        portal_cm = self._background_portal_cm
+
+        try:
+            self._background_call(self.close_async)
+        finally:
+            self._background_portal = None
+            self._background_portal_cm = None
+            portal_cm.__exit__(None, None, None)
+
 
 class SyncClientSession:
     """An instance of this class is created when using :code:`with` on the client.
 
     It contains the sync method execute to send queries
     on a sync transport using the same session.
+
+    A connected session can be shared by several threads, for example
+    the workers of a thread pool, to reuse the connections of the transport.
+    See :ref:`sync_session_threads`.
     """
 
     def __init__(self, client: Client):
         """:param client: the :class:`client <gql.client.Client>` used"""
         self.client = client
 
+        # Threads refreshing the expired results of the cache, by cache key
+        self._revalidation_threads: Dict[str, Thread] = {}
+        self._revalidation_lock = Lock()
+
+    def _execute_transport(
+        self,
+        request: GraphQLRequest,
+        *,
+        priority: BatchPriority = "normal",
+        **kwargs: Any,
+    ) -> ExecutionResult:
+        """Execute the request on the transport,
+        in a batch if batching is enabled."""
+
+        if self.client.batching_enabled and priority != "high":
+            future_result = self._execute_future(request, priority=priority)
+            return future_result.result()
+
+        return self.transport.execute(request, **kwargs)
+
+    def _revalidate(
+        self, request: GraphQLRequest, cache_key: str, **kwargs: Any
+    ) -> None:
+        """Refresh in a background thread the expired result of the cache."""
+
+        with self._revalidation_lock:
+            if cache_key in self._revalidation_threads:
+                return
+
+            thread = Thread(
+                target=self._revalidation_run,
+                args=(request, cache_key),
+                kwargs=kwargs,
+                daemon=True,
+            )
+            self._revalidation_threads[cache_key] = thread
+
+        thread.start()
+
+    def _revalidation_run(
+        self, request: GraphQLRequest, cache_key: str, **kwargs: Any
+    ) -> None:
+        try:
+            result = self._execute_transport(request, priority="low", **kwargs)
+            self.client._cache_store(request, cache_key, result)
+        except Exception as exc:
+            log.warning(f"Unable to refresh the cached result: {exc!r}")
+        finally:
+            with self._revalidation_lock:
+                del self._revalidation_threads[cache_key]
+
     def _execute(
         self,
         request: GraphQLRequest,
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
+        priority: BatchPriority = "normal",
         **kwargs: Any,
     ) -> ExecutionResult:
         """Execute the provided request synchronously using
@@ -891,6 +1373,11 @@ class SyncClientSession:
             By default use the serialize_variables argument of the client.
         :param parse_result: Whether gql will deserialize the result.
             By default use the parse_results argument of the client.
+        :param cache_policy: the :data:`cache policy <gql.cache.CachePolicy>`
+            used if a cache is provided to the client.
+            By default use the cache_policy argument of the client.
+        :param priority: the :data:`priority <gql.batching.BatchPriority>`
+            of the request if batching is enabled. Default: "normal".
 
         The extra arguments are passed to the transport execute method."""
 
@@ -898,6 +1385,8 @@ class SyncClientSession:
         # variable_values and operation_name
         request = support_deprecated_request(request, kwargs)
 
+        assert priority in BATCH_PRIORITIES, f"Invalid priority: {priority}"
+
         # Validate document
         if self.client.schema:
             self.client.validate(request)
@@ -909,15 +1398,15 @@ class SyncClientSession:
                 ):
                     request = request.serialize_variable_values(self.client.schema)
 
-        if self.client.batching_enabled:
-            future_result = self._execute_future(request)
-            result = future_result.result()
+        cache_key, result, revalidate = self.client._cache_lookup(request, cache_policy)
 
-        else:
-            result = self.transport.execute(
-                request,
-                **kwargs,
-            )
+        if result is None:
+            result = self._execute_transport(request, priority=priority, **kwargs)
+            self.client._cache_store(request, cache_key, result)
+
+        elif revalidate:
+            assert cache_key is not None
+            self._revalidate(request, cache_key, **kwargs)
 
         # Unserialize the result if requested
         if self.client.schema:
@@ -927,6 +1416,7 @@ class SyncClientSession:
                     request.document,
                     result.data,
                     operation_name=request.operation_name,
+                    only_custom_types=self.client.parse_only_custom_types,
                 )
 
         return result
@@ -938,6 +1428,8 @@ class SyncClientSession:
         *,
         serialize_variables: Optional[bool] = ...,
         parse_result: Optional[bool] = ...,
+        cache_policy: Optional[CachePolicy] = ...,
+        priority: BatchPriority = ...,
         get_execution_result: Literal[False] = ...,
         **kwargs: Any,
     ) -> Dict[str, Any]: ...  # pragma: no cover
@@ -949,6 +1441,8 @@ class SyncClientSession:
         *,
         serialize_variables: Optional[bool] = ...,
         parse_result: Optional[bool] = ...,
+        cache_policy: Optional[CachePolicy] = ...,
+        priority: BatchPriority = ...,
         get_execution_result: Literal[True],
         **kwargs: Any,
     ) -> ExecutionResult: ...  # pragma: no cover
@@ -960,6 +1454,8 @@ class SyncClientSession:
         *,
         serialize_variables: Optional[bool] = ...,
         parse_result: Optional[bool] = ...,
+        cache_policy: Optional[CachePolicy] = ...,
+        priority: BatchPriority = ...,
         get_execution_result: bool,
         **kwargs: Any,
     ) -> Union[Dict[str, Any], ExecutionResult]: ...  # pragma: no cover
@@ -970,6 +1466,8 @@ class SyncClientSession:
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
+        priority: BatchPriority = "normal",
         get_execution_result: bool = False,
         **kwargs: Any,
     ) -> Union[Dict[str, Any], ExecutionResult]:
@@ -985,6 +1483,11 @@ class SyncClientSession:
             By default use the serialize_variables argument of the client.
         :param parse_result: Whether gql will deserialize the result.
             By default use the parse_results argument of the client.
+        :param cache_policy: the :data:`cache policy <gql.cache.CachePolicy>`
+            used if a cache is provided to the client.
+            By default use the cache_policy argument of the client.
+        :param priority: the :data:`priority <gql.batching.BatchPriority>`
+            of the request if batching is enabled. Default: "normal".
         :param get_execution_result: return the full ExecutionResult instance instead of
             only the "data" field. Necessary if you want to get the "extensions" field.
 
@@ -995,6 +1498,8 @@ class SyncClientSession:
             request,
             serialize_variables=serialize_variables,
             parse_result=parse_result,
+            cache_policy=cache_policy,
+            priority=priority,
             **kwargs,
         )
 
@@ -1022,6 +1527,7 @@ class SyncClientSession:
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
         validate_document: Optional[bool] = True,
         **kwargs: Any,
     ) -> List[ExecutionResult]:
@@ -1034,6 +1540,9 @@ class SyncClientSession:
             By default use the serialize_variables argument of the client.
         :param parse_result: Whether gql will deserialize the result.
             By default use the parse_results argument of the client.
+        :param cache_policy: the :data:`cache policy <gql.cache.CachePolicy>`
+            used if a cache is provided to the client.
+            By default use the cache_policy argument of the client.
         :param validate_document: Whether we still need to validate the document.
 
         The extra arguments are passed to the transport execute method."""
@@ -1058,17 +1567,18 @@ class SyncClientSession:
                     for req in requests
                 ]
 
-        results = self.transport.execute_batch(requests, **kwargs)
+        results = self._execute_batch_with_cache(requests, cache_policy, **kwargs)
 
         # Unserialize the result if requested
         if self.client.schema:
             if parse_result or (parse_result is None and self.client.parse_results):
-                for result in results:
+                for req, result in zip(requests, results):
                     result.data = parse_result_fn(
                         self.client.schema,
                         req.document,
                         result.data,
                         operation_name=req.operation_name,
+                        only_custom_types=self.client.parse_only_custom_types,
                     )
 
         return results
@@ -1080,6 +1590,7 @@ class SyncClientSession:
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
         get_execution_result: Literal[False] = ...,
         **kwargs: Any,
     ) -> List[Dict[str, Any]]: ...  # pragma: no cover
@@ -1091,6 +1602,7 @@ class SyncClientSession:
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
         get_execution_result: Literal[True],
         **kwargs: Any,
     ) -> List[ExecutionResult]: ...  # pragma: no cover
@@ -1102,6 +1614,7 @@ class SyncClientSession:
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
         get_execution_result: bool,
         **kwargs: Any,
     ) -> Union[List[Dict[str, Any]], List[ExecutionResult]]: ...  # pragma: no cover
@@ -1112,6 +1625,7 @@ class SyncClientSession:
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
         get_execution_result: bool = False,
         **kwargs: Any,
     ) -> Union[List[Dict[str, Any]], List[ExecutionResult]]:
@@ -1127,6 +1641,9 @@ class SyncClientSession:
             By default use the serialize_variables argument of the client.
         :param parse_result: Whether gql will deserialize the result.
             By default use the parse_results argument of the client.
+        :param cache_policy: the :data:`cache policy <gql.cache.CachePolicy>`
+            used if a cache is provided to the client.
+            By default use the cache_policy argument of the client.
         :param get_execution_result: return the full ExecutionResult instance instead of
             only the "data" field. Necessary if you want to get the "extensions" field.
 
@@ -1137,6 +1654,7 @@ class SyncClientSession:
             requests,
             serialize_variables=serialize_variables,
             parse_result=parse_result,
+            cache_policy=cache_policy,
             **kwargs,
         )
 
@@ -1159,62 +1677,306 @@ class SyncClientSession:
 
         return cast(List[Dict[str, Any]], [result.data for result in results])
 
+    def execute_many(
+        self,
+        requests: Iterable[GraphQLRequest],
+        *,
+        max_concurrency: int = 10,
+        ordered: bool = False,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> Generator[Tuple[int, Any], None, None]:
+        """Execute many GraphQL requests concurrently in a thread pool,
+        yielding the results as they complete.
+
+        The requests are taken from the iterable only when less than
+        max_concurrency requests are in progress, so that it can be a generator
+        producing a large number of requests.
+
+        :param requests: Iterable of requests that will be executed.
+        :param max_concurrency: Maximum number of requests executed at the same time.
+        :param ordered: Whether the results should be yielded in the order
+            of the requests. The results waiting for a previous request
+            count in the max_concurrency limit.
+        :param return_exceptions: Whether the exceptions should be yielded
+            instead of being raised. If False, the first exception stops
+            the execution of the remaining requests.
+        :return: a generator of (index, result) tuples, where index is the
+            position of the request in the iterable.
+
+        The extra arguments are passed to the :meth:`execute` method."""
+
+        assert max_concurrency > 0, "max_concurrency should be positive"
+
+        request_iterator = iter(requests)
+        futures: Dict[Future, int] = {}
+
+        # Results waiting for a previous request if ordered
+        waiting: Dict[int, Any] = {}
+
+        next_index = 0
+        next_yield_index = 0
+        exhausted = False
+
+        execute = cast(Callable[..., Any], self.execute)
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+        try:
+            while True:
+                while not exhausted and len(futures) + len(waiting) < max_concurrency:
+                    try:
+                        request = next(request_iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+
+                    future = executor.submit(execute, request, **kwargs)
+                    futures[future] = next_index
+                    next_index += 1
+
+                if not futures:
+                    break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+                for future in sorted(done, key=futures.__getitem__):
+                    index = futures.pop(future)
+                    exception = future.exception()
+
+                    if exception is not None and not return_exceptions:
+                        raise exception
+
+                    value = future.result() if exception is None else exception
+
+                    if ordered:
+                        waiting[index] = value
+                    else:
+                        yield index, value
+
+                while next_yield_index in waiting:
+                    yield next_yield_index, waiting.pop(next_yield_index)
+                    next_yield_index += 1
+
+        finally:
+            # The requests already in progress are finished
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _execute_batch_with_cache(
+        self,
+        requests: List[GraphQLRequest],
+        cache_policy: Optional[CachePolicy],
+        **kwargs: Any,
+    ) -> List[ExecutionResult]:
+        """Execute in a batch only the requests not found in the cache."""
+
+        cache_lookups = [
+            self.client._cache_lookup(req, cache_policy) for req in requests
+        ]
+
+        results: List[Optional[ExecutionResult]] = [
+            result for _, result, _ in cache_lookups
+        ]
+        missing_indexes = [index for index, res in enumerate(results) if res is None]
+
+        if missing_indexes:
+            network_results = self._execute_transport_batch(
+                [requests[index] for index in missing_indexes], **kwargs
+            )
+
+            for index, result in zip(missing_indexes, network_results):
+                self.client._cache_store(
+                    requests[index], cache_lookups[index][0], result
+                )
+                results[index] = result
+
+        for req, (cache_key, _, revalidate) in zip(requests, cache_lookups):
+            if revalidate:
+                assert cache_key is not None
+                self._revalidate(req, cache_key, **kwargs)
+
+        return cast(List[ExecutionResult], results)
+
+    def _execute_transport_batch(
+        self, requests: List[GraphQLRequest], **kwargs: Any
+    ) -> List[ExecutionResult]:
+        """Execute the requests in a batch on the transport,
+        or in a single merged query if batch_merge_queries is enabled."""
+
+        if not self.client.batch_merge_queries:
+            return self.transport.execute_batch(requests, **kwargs)
+
+        merged_indexes = [
+            index for index, req in enumerate(requests) if can_merge_request(req)
+        ]
+        if len(merged_indexes) < 2:
+            merged_indexes = []
+
+        results: List[Optional[ExecutionResult]] = [None] * len(requests)
+
+        if merged_indexes:
+            merged_request = merge_requests([requests[i] for i in merged_indexes])
+            merged_result = self.transport.execute(merged_request, **kwargs)
+
+            split_results = split_result(merged_result, len(merged_indexes))
+            for index, result in zip(merged_indexes, split_results):
+                results[index] = result
+
+        # The requests which cannot be merged are sent separately
+        for index, req in enumerate(requests):
+            if results[index] is None:
+                results[index] = self.transport.execute(req, **kwargs)
+
+        return cast(List[ExecutionResult], results)
+
     def _batch_loop(self) -> None:
         """main loop of the thread used to wait for requests
         to execute them in a batch"""
 
+        policy = self._batch_policy
         stop_loop = False
 
-        while not stop_loop:
+        # Request which did not fit in the previous batch
+        pending: Optional[BatchItem] = None
+
+        while True:
 
             # First wait for a first request in from the batch queue
-            requests_and_futures: List[Tuple[GraphQLRequest, Future]] = []
-            request_and_future: Tuple[GraphQLRequest, Future] = self.batch_queue.get()
-            if request_and_future is None:
-                break
-            requests_and_futures.append(request_and_future)
+            if pending is None:
+                if stop_loop:
+                    break
+                first_item: Optional[BatchItem] = self.batch_queue.get()
+                if first_item is None:
+                    break
+            else:
+                first_item, pending = pending, None
+
+            batch = [first_item]
+            batch_size = first_item.size
+            flush_time = policy.get_flush_time(first_item)
+
+            # Then wait for other requests until the batch should be sent,
+            # waking up as soon as a new request arrives
+            checked = 1
+            timeout: Optional[float] = None
+            idle = False
+            while True:
+                previous_len = len(batch)
+                stop_loop, pending, batch_size = self._batch_collect(
+                    batch, batch_size, timeout=timeout
+                )
 
-            # Then wait the requested batch interval except if we already
-            # have the maximum number of requests in the queue
-            if self.batch_queue.qsize() < self.client.batch_max - 1:
-                time.sleep(self.client.batch_interval)
+                for item in batch[checked:]:
+                    flush_time = policy.update_flush_time(flush_time, item)
+                checked = len(batch)
 
-            # Then get the requests which had been made during that wait interval
-            for _ in range(self.client.batch_max - 1):
-                if self.batch_queue.empty():
+                if stop_loop or pending or len(batch) >= self.client.batch_max:
                     break
-                request_and_future = self.batch_queue.get()
-                if request_and_future is None:
-                    stop_loop = True
+
+                # Send the batch if no request arrived
+                if idle and len(batch) == previous_len:
                     break
-                requests_and_futures.append(request_and_future)
 
-            requests = [request for request, _ in requests_and_futures]
-            futures = [future for _, future in requests_and_futures]
+                remaining = flush_time - time.monotonic()
+                if remaining <= 0:
+                    break
 
+                idle_timeout = policy.idle_timeout
+                idle = idle_timeout is not None and idle_timeout < remaining
+                timeout = idle_timeout if idle else remaining
+
+            # Wait until less than batch_max_concurrency batches are in flight
+            self._batch_semaphore.acquire()
+
+            # Then get the requests which had been made during that wait
+            if not stop_loop and pending is None:
+                stop_loop, pending, batch_size = self._batch_collect(batch, batch_size)
+
+            if self._batch_executor is None:
+                self._send_batch(batch)
+            else:
+                self._batch_executor.submit(self._send_batch, batch)
+
+        # Wait for the batches in flight
+        if self._batch_executor is not None:
+            self._batch_executor.shutdown(wait=True)
+
+        # Indicate that the Thread has stopped
+        self._batch_thread_stopped_event.set()
+
+    def _batch_collect(
+        self,
+        batch: List[BatchItem],
+        batch_size: int,
+        *,
+        timeout: Optional[float] = None,
+    ) -> Tuple[bool, Optional[BatchItem], int]:
+        """Move the requests of the queue in the batch.
+
+        :param timeout: if not None, the time in seconds to wait for a first
+            request to arrive. The other requests are collected without waiting.
+        :return: a tuple with True if the loop should stop, the request which
+            did not fit in the batch and the new size of the batch payload
+        """
+
+        while len(batch) < self.client.batch_max:
+            try:
+                item: Optional[BatchItem] = (
+                    self.batch_queue.get_nowait()
+                    if timeout is None
+                    else self.batch_queue.get(timeout=timeout)
+                )
+            except Empty:
+                break
+
+            timeout = None
+
+            if item is None:
+                return True, None, batch_size
+
+            if not self._batch_policy.fits(batch_size, item):
+                return False, item, batch_size
+
+            batch.append(item)
+            batch_size += item.size
+
+        return False, None, batch_size
+
+    def _send_batch(self, batch: List[BatchItem]) -> None:
+        """Execute the requests in a batch and fill in the future results."""
+
+        requests = [item.request for item in batch]
+        futures: List[Future] = [item.future for item in batch]
+        start_time = time.monotonic()
+
+        try:
             # Manually execute the requests in a batch
             try:
                 results: List[ExecutionResult] = self._execute_batch(
                     requests,
                     serialize_variables=False,  # already done
                     parse_result=False,
+                    cache_policy="no-cache",  # already done
                     validate_document=False,
                 )
             except Exception as exc:
                 for future in futures:
                     future.set_exception(exc)
-                continue
+                return
+
+            self._batch_policy.record_round_trip(time.monotonic() - start_time)
 
             # Fill in the future results
             for result, future in zip(results, futures):
                 future.set_result(result)
 
-        # Indicate that the Thread has stopped
-        self._batch_thread_stopped_event.set()
+        finally:
+            self._batch_semaphore.release()
 
     def _execute_future(
         self,
         request: GraphQLRequest,
+        *,
+        priority: BatchPriority = "normal",
     ) -> Future:
         """If batching is enabled, this method will put a request in the batching queue
         instead of executing it directly so that the requests could be put in a batch.
@@ -1224,7 +1986,11 @@ class SyncClientSession:
         assert not self._batch_thread_stop_requested, "Batching thread has been stopped"
 
         future: Future = Future()
-        self.batch_queue.put((request, future))
+        self.batch_queue.put(
+            self._batch_policy.create_item(
+                request, future, timeout=None, priority=priority
+            )
+        )
 
         return future
 
@@ -1233,7 +1999,14 @@ class SyncClientSession:
         is enabled."""
 
         if self.client.batching_enabled:
-            self.batch_queue: Queue = Queue()
+            self.batch_queue: Queue = Queue(maxsize=self.client.batch_queue_size)
+            self._batch_semaphore = Semaphore(self.client.batch_max_concurrency)
+            self._batch_policy = self.client._create_batch_policy()
+            self._batch_executor: Optional[ThreadPoolExecutor] = (
+                ThreadPoolExecutor(max_workers=self.client.batch_max_concurrency)
+                if self.client.batch_max_concurrency > 1
+                else None
+            )
             self._batch_thread_stop_requested = False
             self._batch_thread_stopped_event = Event()
             self._batch_thread = Thread(target=self._batch_loop, daemon=True)
@@ -1247,6 +2020,10 @@ class SyncClientSession:
         Will wait until all the remaining requests in the batch processing queue
         have been executed.
         """
+        # Wait for the refresh of the expired results of the cache
+        for thread in list(self._revalidation_threads.values()):
+            thread.join()
+
         if hasattr(self, "_batch_thread_stopped_event"):
             # Send a None in the queue to indicate that the batching Thread must stop
             # after having processed the remaining requests in the queue
@@ -1287,6 +2064,12 @@ class AsyncClientSession:
         """:param client: the :class:`client <gql.client.Client>` used"""
         self.client = client
 
+        # Tasks refreshing the expired results of the cache, by cache key
+        self._revalidation_tasks: Dict[str, asyncio.Task] = {}
+
+        # Queries currently executed on the transport, by cache key
+        self._inflight_requests: Dict[str, _InFlightRequest] = {}
+
     async def _subscribe(
         self,
         request: GraphQLRequest,
@@ -1350,6 +2133,7 @@ class AsyncClientSession:
                             request.document,
                             result.data,
                             operation_name=request.operation_name,
+                            only_custom_types=self.client.parse_only_custom_types,
                         )
 
                 yield result
@@ -1444,15 +2228,212 @@ class AsyncClientSession:
                         yield result
                     else:
                         yield result.data
+
+                # The patches of an incremental delivery response have no data
+                elif get_execution_result and isinstance(
+                    result, IncrementalExecutionResult
+                ):
+                    yield result
         finally:
             await inner_generator.aclose()
 
+    async def execute_stream(
+        self,
+        request: GraphQLRequest,
+        path: Union[str, Sequence[Union[str, int]]],
+        *,
+        serialize_variables: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Any, None]:
+        """Execute a query and yield the items of a list of its result
+        as soon as they are received, without buffering the whole answer.
+
+        The items are the raw JSON values, their custom scalars are not parsed.
+
+        Raises a TransportQueryError, after the items received, if an error
+        has been returned in the answer.
+
+        :param request: GraphQL query as :class:`GraphQLRequest <gql.GraphQLRequest>`.
+        :param path: path of the list in the answer, either as a dotted str
+            like :code:`"data.orders.edges"` or as a sequence of keys
+            and list indexes
+        :param serialize_variables: whether the variable values should be
+            serialized. Used for custom scalars and/or enums.
+            By default use the serialize_variables argument of the client.
+
+        The extra arguments are passed to the transport execute_stream method."""
+
+        # Still supporting for now old method of providing
+        # variable_values and operation_name
+        request = support_deprecated_request(request, kwargs)
+
+        # Validate document
+        if self.client.schema:
+            self.client.validate(request)
+
+            # Parse variable values for custom scalars if requested
+            if request.variable_values is not None:
+                if serialize_variables or (
+                    serialize_variables is None and self.client.serialize_variables
+                ):
+                    request = request.serialize_variable_values(self.client.schema)
+
+        inner_generator: AsyncGenerator[Any, None] = self.transport.execute_stream(
+            request,
+            path,
+            **kwargs,
+        )
+
+        try:
+            async for item in inner_generator:
+                yield item
+        finally:
+            await inner_generator.aclose()
+
+    async def _execute_transport(
+        self,
+        request: GraphQLRequest,
+        *,
+        priority: BatchPriority = "normal",
+        **kwargs: Any,
+    ) -> ExecutionResult:
+        """Execute the request on the transport,
+        in a batch if batching is enabled."""
+
+        # Check if batching is enabled
+        if self.client.batching_enabled and priority != "high":
+            future_result = await self._execute_future(request, priority=priority)
+            return await future_result
+
+        # Execute the query with the transport with a timeout
+        with fail_after(self.client.execute_timeout):
+            return await self.transport.execute(
+                request,
+                **kwargs,
+            )
+
+    def _get_deduplication_key(
+        self, request: GraphQLRequest, cache_key: Optional[str], kwargs: Dict
+    ) -> Optional[str]:
+        """Returns the key identifying the request if it can share its execution
+        with identical requests, or None."""
+
+        # Requests with extra transport arguments are never shared
+        if not self.client.deduplicate_requests or kwargs:
+            return None
+
+        if not is_cacheable(request):
+            return None
+
+        return cache_key if cache_key is not None else get_cache_key(request)
+
+    async def _execute_network(
+        self,
+        request: GraphQLRequest,
+        cache_key: Optional[str],
+        *,
+        priority: BatchPriority = "normal",
+        **kwargs: Any,
+    ) -> ExecutionResult:
+        """Execute the request on the transport and save its result in the cache."""
+
+        result = await self._execute_transport(request, priority=priority, **kwargs)
+        self.client._cache_store(request, cache_key, result)
+
+        return result
+
+    async def _execute_shared(
+        self,
+        request: GraphQLRequest,
+        cache_key: Optional[str],
+        *,
+        priority: BatchPriority = "normal",
+        **kwargs: Any,
+    ) -> ExecutionResult:
+        """Execute the request on the transport, sharing the execution with
+        the identical queries already in flight if deduplication is enabled."""
+
+        key = self._get_deduplication_key(request, cache_key, kwargs)
+
+        if key is None:
+            return await self._execute_network(
+                request, cache_key, priority=priority, **kwargs
+            )
+
+        inflight = self._inflight_requests.get(key)
+
+        if inflight is None:
+            # The execution is done in a separate task so that
+            # the cancellation of a request does not cancel the others
+            task = asyncio.ensure_future(
+                self._execute_network(request, cache_key, priority=priority)
+            )
+            inflight = _InFlightRequest(task)
+            self._inflight_requests[key] = inflight
+
+            def on_done(task: "asyncio.Task[ExecutionResult]") -> None:
+                if self._inflight_requests.get(key) is inflight:
+                    del self._inflight_requests[key]
+
+                # Avoid the warning if all the requests have been cancelled
+                if not task.cancelled():
+                    task.exception()
+
+            task.add_done_callback(on_done)
+
+        else:
+            log.debug("Sharing the execution of an identical request in flight")
+
+        inflight.waiters += 1
+        try:
+            result = await asyncio.shield(inflight.task)
+        finally:
+            inflight.waiters -= 1
+
+        # The last request receiving the result takes it, the others get a copy
+        if inflight.waiters == 0:
+            return result
+
+        return _copy_result(result)
+
+    def _revalidate(
+        self, request: GraphQLRequest, cache_key: str, **kwargs: Any
+    ) -> None:
+        """Refresh in a background task the expired result of the cache."""
+
+        if cache_key in self._revalidation_tasks:
+            return
+
+        self._revalidation_tasks[cache_key] = asyncio.ensure_future(
+            self._revalidation_run(request, cache_key, **kwargs)
+        )
+
+    async def _revalidation_run(
+        self, request: GraphQLRequest, cache_key: str, **kwargs: Any
+    ) -> None:
+        try:
+            result = await self._execute_transport(request, priority="low", **kwargs)
+            self.client._cache_store(request, cache_key, result)
+        except Exception as exc:
+            log.warning(f"Unable to refresh the cached result: {exc!r}")
+        finally:
+            del self._revalidation_tasks[cache_key]
+
+    async def _revalidation_cleanup(self) -> None:
+        """Wait for the refresh of the expired results of the cache."""
+        tasks = list(self._revalidation_tasks.values())
+
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     async def _execute(
         self,
         request: GraphQLRequest,
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
+        priority: BatchPriority = "normal",
         **kwargs: Any,
     ) -> ExecutionResult:
         """Coroutine to execute the provided request asynchronously using
@@ -1468,6 +2449,11 @@ class AsyncClientSession:
             By default use the serialize_variables argument of the client.
         :param parse_result: Whether gql will deserialize the result.
             By default use the parse_results argument of the client.
+        :param cache_policy: the :data:`cache policy <gql.cache.CachePolicy>`
+            used if a cache is provided to the client.
+            By default use the cache_policy argument of the client.
+        :param priority: the :data:`priority <gql.batching.BatchPriority>`
+            of the request if batching is enabled. Default: "normal".
 
         The extra arguments are passed to the transport execute method."""
 
@@ -1475,6 +2461,8 @@ class AsyncClientSession:
         # variable_values and operation_name
         request = support_deprecated_request(request, kwargs)
 
+        assert priority in BATCH_PRIORITIES, f"Invalid priority: {priority}"
+
         # Validate document
         if self.client.schema:
             self.client.validate(request)
@@ -1486,17 +2474,16 @@ class AsyncClientSession:
                 ):
                     request = request.serialize_variable_values(self.client.schema)
 
-        # Check if batching is enabled
-        if self.client.batching_enabled:
-            future_result = await self._execute_future(request)
-            result = await future_result
-        else:
-            # Execute the query with the transport with a timeout
-            with fail_after(self.client.execute_timeout):
-                result = await self.transport.execute(
-                    request,
-                    **kwargs,
-                )
+        cache_key, result, revalidate = self.client._cache_lookup(request, cache_policy)
+
+        if result is None:
+            result = await self._execute_shared(
+                request, cache_key, priority=priority, **kwargs
+            )
+
+        elif revalidate:
+            assert cache_key is not None
+            self._revalidate(request, cache_key, **kwargs)
 
         # Unserialize the result if requested
         if self.client.schema:
@@ -1506,6 +2493,7 @@ class AsyncClientSession:
                     request.document,
                     result.data,
                     operation_name=request.operation_name,
+                    only_custom_types=self.client.parse_only_custom_types,
                 )
 
         return result
@@ -1517,6 +2505,8 @@ class AsyncClientSession:
         *,
         serialize_variables: Optional[bool] = ...,
         parse_result: Optional[bool] = ...,
+        cache_policy: Optional[CachePolicy] = ...,
+        priority: BatchPriority = ...,
         get_execution_result: Literal[False] = ...,
         **kwargs: Any,
     ) -> Dict[str, Any]: ...  # pragma: no cover
@@ -1528,6 +2518,8 @@ class AsyncClientSession:
         *,
         serialize_variables: Optional[bool] = ...,
         parse_result: Optional[bool] = ...,
+        cache_policy: Optional[CachePolicy] = ...,
+        priority: BatchPriority = ...,
         get_execution_result: Literal[True],
         **kwargs: Any,
     ) -> ExecutionResult: ...  # pragma: no cover
@@ -1539,6 +2531,8 @@ class AsyncClientSession:
         *,
         serialize_variables: Optional[bool] = ...,
         parse_result: Optional[bool] = ...,
+        cache_policy: Optional[CachePolicy] = ...,
+        priority: BatchPriority = ...,
         get_execution_result: bool,
         **kwargs: Any,
     ) -> Union[Dict[str, Any], ExecutionResult]: ...  # pragma: no cover
@@ -1549,6 +2543,8 @@ class AsyncClientSession:
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
+        priority: BatchPriority = "normal",
         get_execution_result: bool = False,
         **kwargs: Any,
     ) -> Union[Dict[str, Any], ExecutionResult]:
@@ -1564,6 +2560,11 @@ class AsyncClientSession:
             By default use the serialize_variables argument of the client.
         :param parse_result: Whether gql will deserialize the result.
             By default use the parse_results argument of the client.
+        :param cache_policy: the :data:`cache policy <gql.cache.CachePolicy>`
+            used if a cache is provided to the client.
+            By default use the cache_policy argument of the client.
+        :param priority: the :data:`priority <gql.batching.BatchPriority>`
+            of the request if batching is enabled. Default: "normal".
         :param get_execution_result: return the full ExecutionResult instance instead of
             only the "data" field. Necessary if you want to get the "extensions" field.
 
@@ -1574,6 +2575,8 @@ class AsyncClientSession:
             request,
             serialize_variables=serialize_variables,
             parse_result=parse_result,
+            cache_policy=cache_policy,
+            priority=priority,
             **kwargs,
         )
 
@@ -1601,6 +2604,7 @@ class AsyncClientSession:
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
         validate_document: Optional[bool] = True,
         **kwargs: Any,
     ) -> List[ExecutionResult]:
@@ -1613,6 +2617,9 @@ class AsyncClientSession:
             By default use the serialize_variables argument of the client.
         :param parse_result: Whether gql will deserialize the result.
             By default use the parse_results argument of the client.
+        :param cache_policy: the :data:`cache policy <gql.cache.CachePolicy>`
+            used if a cache is provided to the client.
+            By default use the cache_policy argument of the client.
         :param validate_document: Whether we still need to validate the document.
 
         The extra arguments are passed to the transport execute_batch method."""
@@ -1637,17 +2644,18 @@ class AsyncClientSession:
                     for req in requests
                 ]
 
-        results = await self.transport.execute_batch(requests, **kwargs)
+        results = await self._execute_batch_with_cache(requests, cache_policy, **kwargs)
 
         # Unserialize the result if requested
         if self.client.schema:
             if parse_result or (parse_result is None and self.client.parse_results):
-                for result in results:
+                for req, result in zip(requests, results):
                     result.data = parse_result_fn(
                         self.client.schema,
                         req.document,
                         result.data,
                         operation_name=req.operation_name,
+                        only_custom_types=self.client.parse_only_custom_types,
                     )
 
         return results
@@ -1659,6 +2667,7 @@ class AsyncClientSession:
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
         get_execution_result: Literal[False] = ...,
         **kwargs: Any,
     ) -> List[Dict[str, Any]]: ...  # pragma: no cover
@@ -1670,6 +2679,7 @@ class AsyncClientSession:
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
         get_execution_result: Literal[True],
         **kwargs: Any,
     ) -> List[ExecutionResult]: ...  # pragma: no cover
@@ -1681,6 +2691,7 @@ class AsyncClientSession:
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
         get_execution_result: bool,
         **kwargs: Any,
     ) -> Union[List[Dict[str, Any]], List[ExecutionResult]]: ...  # pragma: no cover
@@ -1691,6 +2702,7 @@ class AsyncClientSession:
         *,
         serialize_variables: Optional[bool] = None,
         parse_result: Optional[bool] = None,
+        cache_policy: Optional[CachePolicy] = None,
         get_execution_result: bool = False,
         **kwargs: Any,
     ) -> Union[List[Dict[str, Any]], List[ExecutionResult]]:
@@ -1706,6 +2718,9 @@ class AsyncClientSession:
             By default use the serialize_variables argument of the client.
         :param parse_result: Whether gql will deserialize the result.
             By default use the parse_results argument of the client.
+        :param cache_policy: the :data:`cache policy <gql.cache.CachePolicy>`
+            used if a cache is provided to the client.
+            By default use the cache_policy argument of the client.
         :param get_execution_result: return the full ExecutionResult instance instead of
             only the "data" field. Necessary if you want to get the "extensions" field.
 
@@ -1716,6 +2731,7 @@ class AsyncClientSession:
             requests,
             serialize_variables=serialize_variables,
             parse_result=parse_result,
+            cache_policy=cache_policy,
             **kwargs,
         )
 
@@ -1738,80 +2754,350 @@ class AsyncClientSession:
 
         return cast(List[Dict[str, Any]], [result.data for result in results])
 
+    async def execute_many(
+        self,
+        requests: Union[Iterable[GraphQLRequest], AsyncIterable[GraphQLRequest]],
+        *,
+        max_concurrency: int = 10,
+        ordered: bool = False,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Tuple[int, Any], None]:
+        """Execute many GraphQL requests concurrently,
+        yielding the results as they complete.
+
+        The requests are taken from the iterable only when less than
+        max_concurrency requests are in progress, so that it can be a generator
+        producing a large number of requests.
+
+        If batching is enabled, the requests are sent in batches.
+
+        :param requests: Iterable or async iterable of requests
+            that will be executed.
+        :param max_concurrency: Maximum number of requests executed at the same time.
+        :param ordered: Whether the results should be yielded in the order
+            of the requests. The results waiting for a previous request
+            count in the max_concurrency limit.
+        :param return_exceptions: Whether the exceptions should be yielded
+            instead of being raised. If False, the first exception cancels
+            the remaining requests.
+        :return: an async generator of (index, result) tuples, where index is the
+            position of the request in the iterable.
+
+        The extra arguments are passed to the :meth:`execute` method."""
+
+        assert max_concurrency > 0, "max_concurrency should be positive"
+
+        if isinstance(requests, AsyncIterable):
+            async_iterator = requests.__aiter__()
+            sync_iterator = None
+        else:
+            async_iterator = None
+            sync_iterator = iter(requests)
+
+        tasks: Dict[asyncio.Task, int] = {}
+
+        # Results waiting for a previous request if ordered
+        waiting: Dict[int, Any] = {}
+
+        next_index = 0
+        next_yield_index = 0
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(tasks) + len(waiting) < max_concurrency:
+                    try:
+                        if async_iterator is not None:
+                            request = await async_iterator.__anext__()
+                        else:
+                            assert sync_iterator is not None
+                            request = next(sync_iterator)
+                    except (StopIteration, StopAsyncIteration):
+                        exhausted = True
+                        break
+
+                    task = asyncio.create_task(self.execute(request, **kwargs))
+                    tasks[task] = next_index
+                    next_index += 1
+
+                if not tasks:
+                    break
+
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in sorted(done, key=tasks.__getitem__):
+                    index = tasks.pop(task)
+                    exception = task.exception()
+
+                    if exception is not None and not return_exceptions:
+                        raise exception
+
+                    value = task.result() if exception is None else exception
+
+                    if ordered:
+                        waiting[index] = value
+                    else:
+                        yield index, value
+
+                while next_yield_index in waiting:
+                    yield next_yield_index, waiting.pop(next_yield_index)
+                    next_yield_index += 1
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _execute_batch_with_cache(
+        self,
+        requests: List[GraphQLRequest],
+        cache_policy: Optional[CachePolicy],
+        **kwargs: Any,
+    ) -> List[ExecutionResult]:
+        """Execute in a batch only the requests not found in the cache."""
+
+        cache_lookups = [
+            self.client._cache_lookup(req, cache_policy) for req in requests
+        ]
+
+        results: List[Optional[ExecutionResult]] = [
+            result for _, result, _ in cache_lookups
+        ]
+        missing_indexes = [index for index, res in enumerate(results) if res is None]
+
+        if missing_indexes:
+            # Identical queries are sent only once in the batch
+            sent_indexes: List[int] = []
+            duplicate_of: Dict[int, int] = {}
+            index_by_key: Dict[str, int] = {}
+
+            for index in missing_indexes:
+                key = self._get_deduplication_key(
+                    requests[index], cache_lookups[index][0], kwargs
+                )
+
+                if key is not None and key in index_by_key:
+                    duplicate_of[index] = index_by_key[key]
+                    continue
+
+                if key is not None:
+                    index_by_key[key] = index
+
+                sent_indexes.append(index)
+
+            network_results = await self._execute_transport_batch(
+                [requests[index] for index in sent_indexes], **kwargs
+            )
+
+            for index, result in zip(sent_indexes, network_results):
+                self.client._cache_store(
+                    requests[index], cache_lookups[index][0], result
+                )
+                results[index] = result
+
+            for index, original_index in duplicate_of.items():
+                original_result = results[original_index]
+                assert original_result is not None
+                results[index] = _copy_result(original_result)
+
+        for req, (cache_key, _, revalidate) in zip(requests, cache_lookups):
+            if revalidate:
+                assert cache_key is not None
+                self._revalidate(req, cache_key, **kwargs)
+
+        return cast(List[ExecutionResult], results)
+
+    async def _execute_transport_batch(
+        self, requests: List[GraphQLRequest], **kwargs: Any
+    ) -> List[ExecutionResult]:
+        """Execute the requests in a batch on the transport,
+        or in a single merged query if batch_merge_queries is enabled."""
+
+        if not self.client.batch_merge_queries:
+            return await self.transport.execute_batch(requests, **kwargs)
+
+        merged_indexes = [
+            index for index, req in enumerate(requests) if can_merge_request(req)
+        ]
+        if len(merged_indexes) < 2:
+            merged_indexes = []
+
+        results: List[Optional[ExecutionResult]] = [None] * len(requests)
+
+        if merged_indexes:
+            merged_request = merge_requests([requests[i] for i in merged_indexes])
+            merged_result = await self.transport.execute(merged_request, **kwargs)
+
+            split_results = split_result(merged_result, len(merged_indexes))
+            for index, result in zip(merged_indexes, split_results):
+                results[index] = result
+
+        # The requests which cannot be merged are sent separately
+        for index, req in enumerate(requests):
+            if results[index] is None:
+                results[index] = await self.transport.execute(req, **kwargs)
+
+        return cast(List[ExecutionResult], results)
+
     async def _batch_loop(self) -> None:
         """Main loop of the task used to wait for requests
         to execute them in a batch"""
 
+        policy = self._batch_policy
         stop_loop = False
 
-        while not stop_loop:
-            # First wait for a first request in from the batch queue
-            requests_and_futures: List[Tuple[GraphQLRequest, asyncio.Future]] = []
-
-            # Wait for the first request
-            request_and_future: Optional[Tuple[GraphQLRequest, asyncio.Future]] = (
-                await self.batch_queue.get()
-            )
+        # Request which did not fit in the previous batch
+        pending: Optional[BatchItem] = None
 
-            if request_and_future is None:
-                # None is our sentinel value to stop the loop
-                break
+        while True:
+            # First wait for a first request in from the batch queue
+            if pending is None:
+                if stop_loop:
+                    break
 
-            requests_and_futures.append(request_and_future)
+                first_item: Optional[BatchItem] = await self.batch_queue.get()
 
-            # Then wait the requested batch interval except if we already
-            # have the maximum number of requests in the queue
-            if self.batch_queue.qsize() < self.client.batch_max - 1:
-                # Wait for the batch interval
-                await asyncio.sleep(self.client.batch_interval)
+                if first_item is None:
+                    # None is our sentinel value to stop the loop
+                    break
+            else:
+                first_item, pending = pending, None
+
+            batch = [first_item]
+            batch_size = first_item.size
+            flush_time = policy.get_flush_time(first_item)
+
+            # Then wait for other requests until the batch should be sent,
+            # waking up as soon as a new request arrives
+            checked = 1
+            timeout: Optional[float] = None
+            idle = False
+            while True:
+                previous_len = len(batch)
+                stop_loop, pending, batch_size = await self._batch_collect(
+                    batch, batch_size, timeout=timeout
+                )
 
-            # Then get the requests which had been made during that wait interval
-            for _ in range(self.client.batch_max - 1):
-                try:
-                    # Use get_nowait since we don't want to wait here
-                    request_and_future = self.batch_queue.get_nowait()
+                for item in batch[checked:]:
+                    flush_time = policy.update_flush_time(flush_time, item)
+                checked = len(batch)
 
-                    if request_and_future is None:
-                        # Sentinel value - stop after processing current batch
-                        stop_loop = True
-                        break
+                if stop_loop or pending or len(batch) >= self.client.batch_max:
+                    break
 
-                    requests_and_futures.append(request_and_future)
+                # Send the batch if no request arrived
+                if idle and len(batch) == previous_len:
+                    break
 
-                except asyncio.QueueEmpty:
-                    # No more requests in queue, that's fine
+                remaining = flush_time - time.monotonic()
+                if remaining <= 0:
                     break
 
-            # Extract requests and futures
-            requests = [request for request, _ in requests_and_futures]
-            futures = [future for _, future in requests_and_futures]
+                idle_timeout = policy.idle_timeout
+                idle = idle_timeout is not None and idle_timeout < remaining
+                timeout = idle_timeout if idle else remaining
 
-            # Execute the batch
-            try:
-                results: List[ExecutionResult] = await self._execute_batch(
-                    requests,
-                    serialize_variables=False,  # already done
-                    parse_result=False,  # will be done later
-                    validate_document=False,  # already validated
+            # Wait until less than batch_max_concurrency batches are in flight
+            await self._batch_semaphore.acquire()
+
+            # Then get the requests which had been made during that wait
+            if not stop_loop and pending is None:
+                stop_loop, pending, batch_size = await self._batch_collect(
+                    batch, batch_size
                 )
 
-                # Set the result for each future
-                for result, future in zip(results, futures):
-                    if not future.cancelled():
-                        future.set_result(result)
+            # Execute the batch in a separate task
+            task = asyncio.ensure_future(self._send_batch(batch))
+            self._batch_send_tasks.add(task)
+            task.add_done_callback(self._batch_send_tasks.discard)
 
-            except Exception as exc:
-                # If batch execution fails, propagate the error to all futures
-                for future in futures:
-                    if not future.cancelled():
-                        future.set_exception(exc)
+        # Wait for the batches in flight
+        if self._batch_send_tasks:
+            await asyncio.gather(*self._batch_send_tasks)
 
         # Signal that the task has stopped
         self._batch_task_stopped_event.set()
 
+    async def _batch_collect(
+        self,
+        batch: List[BatchItem],
+        batch_size: int,
+        *,
+        timeout: Optional[float] = None,
+    ) -> Tuple[bool, Optional[BatchItem], int]:
+        """Move the requests of the queue in the batch.
+
+        :param timeout: if not None, the time in seconds to wait for a first
+            request to arrive. The other requests are collected without waiting.
+        :return: a tuple with True if the loop should stop, the request which
+            did not fit in the batch and the new size of the batch payload
+        """
+
+        while len(batch) < self.client.batch_max:
+            try:
+                item: Optional[BatchItem] = (
+                    self.batch_queue.get_nowait()
+                    if timeout is None
+                    else await asyncio.wait_for(self.batch_queue.get(), timeout)
+                )
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+
+            timeout = None
+
+            if item is None:
+                # Sentinel value - stop after processing current batch
+                return True, None, batch_size
+
+            if not self._batch_policy.fits(batch_size, item):
+                return False, item, batch_size
+
+            batch.append(item)
+            batch_size += item.size
+
+        return False, None, batch_size
+
+    async def _send_batch(self, batch: List[BatchItem]) -> None:
+        """Execute the requests in a batch and set the results of the futures."""
+
+        # Extract requests and futures
+        requests = [item.request for item in batch]
+        futures: List[asyncio.Future] = [item.future for item in batch]
+        start_time = time.monotonic()
+
+        # Execute the batch
+        try:
+            results: List[ExecutionResult] = await self._execute_batch(
+                requests,
+                serialize_variables=False,  # already done
+                parse_result=False,  # will be done later
+                cache_policy="no-cache",  # already done
+                validate_document=False,  # already validated
+            )
+
+            self._batch_policy.record_round_trip(time.monotonic() - start_time)
+
+            # Set the result for each future
+            for result, future in zip(results, futures):
+                if not future.cancelled():
+                    future.set_result(result)
+
+        except Exception as exc:
+            # If batch execution fails, propagate the error to all futures
+            for future in futures:
+                if not future.cancelled():
+                    future.set_exception(exc)
+
+        finally:
+            self._batch_semaphore.release()
+
     async def _execute_future(
         self,
         request: GraphQLRequest,
+        *,
+        priority: BatchPriority = "normal",
     ) -> asyncio.Future:
         """If batching is enabled, this method will put a request in the batching queue
         instead of executing it directly so that the requests could be put in a batch.
@@ -1821,14 +3107,26 @@ class AsyncClientSession:
         assert not self._batch_task_stop_requested, "Batching task has been stopped"
 
         future: asyncio.Future = asyncio.Future()
-        await self.batch_queue.put((request, future))
+        await self.batch_queue.put(
+            self._batch_policy.create_item(
+                request,
+                future,
+                timeout=self.client.execute_timeout,
+                priority=priority,
+            )
+        )
 
         return future
 
     async def _batch_init(self):
         """Initialize the batch task loop if batching is enabled."""
         if self.client.batching_enabled:
-            self.batch_queue: asyncio.Queue = asyncio.Queue()
+            self.batch_queue: asyncio.Queue = asyncio.Queue(
+                maxsize=self.client.batch_queue_size
+            )
+            self._batch_semaphore = asyncio.Semaphore(self.client.batch_max_concurrency)
+            self._batch_send_tasks: Set[asyncio.Task] = set()
+            self._batch_policy = self.client._create_batch_policy()
             self._batch_task_stop_requested = False
             self._batch_task_stopped_event = asyncio.Event()
             self._batch_task = asyncio.create_task(self._batch_loop())
@@ -1862,6 +3160,8 @@ class AsyncClientSession:
         Will wait until all the remaining requests in the batch processing queue
         have been executed.
         """
+        await self._revalidation_cleanup()
+
         await self._batch_cleanup()
 
         await self.transport.close()
@@ -1915,7 +3215,7 @@ class ReconnectingAsyncClientSession(AsyncClientSession):
             for the execute method OR a retry decorator (e.g., from tenacity)
             to provide specific retries parameters for this method.
         """
-        self.client = client
+        super().__init__(client)
         self._connect_task = None
 
         self._reconnect_request_event = asyncio.Event()
@@ -2003,6 +3303,8 @@ class ReconnectingAsyncClientSession(AsyncClientSession):
     async def close(self):
         """Stop the connect task and cleanup the batching task
         if batching is enabled."""
+        await self._revalidation_cleanup()
+
         await self._batch_cleanup()
 
         await self.stop_connecting_task()
@@ -0,0 +1,135 @@
+"""Compression of the body of the requests sent to the backend.
+See :ref:`request_compression`."""
+
+import functools
+import gzip
+from typing import Callable, Optional, Union
+
+from anyio import to_thread
+
+
+class RequestCompressor:
+    """Compress the body of the requests sent by the HTTP transports,
+    sent with a :code:`Content-Encoding` header.
+
+    Only the bodies larger than :code:`min_size` are compressed,
+    the compression of the small bodies costs more than the bytes it saves.
+
+    This default compressor uses the gzip encoding of the standard library.
+    """
+
+    encoding: str = "gzip"
+    """Value of the Content-Encoding header of the compressed requests."""
+
+    def __init__(
+        self,
+        *,
+        min_size: int = 1024,
+        level: int = 6,
+        thread_min_size: int = 256 * 1024,
+    ):
+        """
+        :param min_size: minimal size in bytes of the bodies to compress
+        :param level: the compression level, from 1 (fastest) to 9 (smallest)
+        :param thread_min_size: minimal size in bytes of the bodies compressed
+            in a worker thread by the async transports, so that the event loop
+            is not blocked by the compression of the large bodies
+        """
+        self.min_size = min_size
+        self.level = level
+        self.thread_min_size = thread_min_size
+
+    def should_compress(self, body: bytes) -> bool:
+        """Returns True if the body is large enough to be compressed."""
+        return len(body) >= self.min_size
+
+    def compress(self, body: bytes) -> bytes:
+        """Compress the body of a request.
+
+        :param body: the encoded body
+        :return: the compressed body
+        """
+        return gzip.compress(body, compresslevel=self.level, mtime=0)
+
+    async def compress_async(self, body: bytes) -> bytes:
+        """Compress the body of a request from an async transport,
+        in a worker thread if it is larger than :code:`thread_min_size`.
+
+        :param body: the encoded body
+        :return: the compressed body
+        """
+        if len(body) >= self.thread_min_size:
+            return await to_thread.run_sync(self.compress, body)
+
+        return self.compress(body)
+
+
+class ZstdCompressor(RequestCompressor):
+    """Compressor using the `zstd`_ encoding, faster than gzip
+    for the same compression ratio. The backend should support it.
+
+    It uses the :code:`compression.zstd` module of Python 3.14 or the
+    `zstandard`_ library, which is not installed with gql,
+    install it with :code:`pip install zstandard`.
+
+    .. _zstd: https://datatracker.ietf.org/doc/html/rfc8878
+    .. _zstandard: https://github.com/indygreg/python-zstandard
+    """
+
+    encoding = "zstd"
+
+    def __init__(
+        self,
+        *,
+        min_size: int = 1024,
+        level: int = 3,
+        thread_min_size: int = 256 * 1024,
+    ):
+        """
+        :param min_size: minimal size in bytes of the bodies to compress
+        :param level: the compression level, from 1 (fastest) to 22 (smallest)
+        :param thread_min_size: minimal size in bytes of the bodies compressed
+            in a worker thread by the async transports
+        """
+        super().__init__(
+            min_size=min_size, level=level, thread_min_size=thread_min_size
+        )
+
+        try:
+            from compression.zstd import compress
+        except ModuleNotFoundError:
+            from zstandard import compress  # type: ignore[no-redef]
+
+        self._compress: Callable[[bytes], bytes] = functools.partial(
+            compress, level=level
+        )
+
+    def compress(self, body: bytes) -> bytes:
+        return self._compress(body)
+
+
+def get_request_compressor(
+    request_compression: Optional[Union[str, RequestCompressor]],
+) -> Optional[RequestCompressor]:
+    """Returns the compressor of a transport from its
+    :code:`request_compression` argument.
+
+    :param request_compression: None to not compress the requests,
+        "gzip", "zstd" or a compressor
+    :raises ValueError: if the encoding is not supported
+    """
+    if request_compression is None or isinstance(
+        request_compression, RequestCompressor
+    ):
+        return request_compression
+
+    if request_compression == "gzip":
+        return RequestCompressor()
+
+    if request_compression == "zstd":
+        return ZstdCompressor()
+
+    raise ValueError(
+        f"Unsupported request compression: {request_compression!r}. "
+        "Use 'gzip', 'zstd' or a RequestCompressor instance."
+    )
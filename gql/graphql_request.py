@@ -1,7 +1,16 @@
+import copy
+import hashlib
 import warnings
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
-from graphql import DocumentNode, GraphQLSchema, Source, parse, print_ast
+from graphql import (
+    DocumentNode,
+    GraphQLSchema,
+    OperationDefinitionNode,
+    Source,
+    parse,
+    print_ast,
+)
 
 
 class GraphQLRequest:
@@ -40,8 +49,14 @@ class GraphQLRequest:
         elif not isinstance(request, GraphQLRequest):
             raise TypeError(f"Unexpected type for GraphQLRequest: {type(request)}")
 
+        # Printed query and its hash, saved with the document they were computed for
+        self._printed_query: Optional[Tuple[DocumentNode, str]] = None
+        self._query_hash: Optional[Tuple[str, str]] = None
+
         if isinstance(request, GraphQLRequest):
             self.document = request.document
+            self._printed_query = request._printed_query
+            self._query_hash = request._query_hash
             if variable_values is None:
                 variable_values = request.variable_values
             if operation_name is None:
@@ -53,27 +68,54 @@ class GraphQLRequest:
         self.operation_name: Optional[str] = operation_name
         self.extensions: Optional[Dict[str, Any]] = extensions
 
-    def serialize_variable_values(self, schema: GraphQLSchema) -> "GraphQLRequest":
+    def serialize_variable_values(
+        self, schema: GraphQLSchema, *, only_custom_types: bool = False
+    ) -> "GraphQLRequest":
 
         from .utilities.serialize_variable_values import serialize_variable_values
 
-        assert self.variable_values
+        assert self.variable_values is not None
 
         return GraphQLRequest(
-            self.document,
+            self,
             variable_values=serialize_variable_values(
                 schema=schema,
                 document=self.document,
                 variable_values=self.variable_values,
                 operation_name=self.operation_name,
+                only_custom_types=only_custom_types,
             ),
             operation_name=self.operation_name,
             extensions=self.extensions,
         )
 
+    def _print_query(self) -> str:
+        """Print the document, reusing the previous result
+        if the document has not been replaced since."""
+        printed_query = self._printed_query
+
+        if printed_query is None or printed_query[0] is not self.document:
+            printed_query = (self.document, print_ast(self.document))
+            self._printed_query = printed_query
+
+        return printed_query[1]
+
+    @property
+    def query_hash(self) -> str:
+        """SHA-256 hash (hex digest) of the printed query string."""
+        query_str = self._print_query()
+        query_hash = self._query_hash
+
+        if query_hash is None or query_hash[0] is not query_str:
+            digest = hashlib.sha256(query_str.encode("utf-8")).hexdigest()
+            query_hash = (query_str, digest)
+            self._query_hash = query_hash
+
+        return query_hash[1]
+
     @property
     def payload(self) -> Dict[str, Any]:
-        query_str = print_ast(self.document)
+        query_str = self._print_query()
         payload: Dict[str, Any] = {"query": query_str}
 
         if self.operation_name:
@@ -91,6 +133,115 @@ class GraphQLRequest:
         return str(self.payload)
 
 
+class PreparedRequest(GraphQLRequest):
+    """GraphQL Request compiled once to be executed many times.
+
+    Instead of creating this object directly, you should use the
+    :meth:`prepare <gql.Client.prepare>` method of the Client, which will also
+    validate the document once with the schema of the client.
+
+    Compared to a :class:`GraphQLRequest <gql.GraphQLRequest>`, the printed
+    query string, the executed operation and the types of the variables
+    are computed only once.
+
+    .. note::
+        The document should not be modified after the request has been prepared.
+    """
+
+    def __init__(
+        self,
+        request: Union[DocumentNode, "GraphQLRequest", str],
+        *,
+        variable_values: Optional[Dict[str, Any]] = None,
+        operation_name: Optional[str] = None,
+        extensions: Optional[Dict[str, Any]] = None,
+    ):
+        """Initialize a prepared GraphQL request.
+
+        Same arguments as :class:`GraphQLRequest <gql.GraphQLRequest>`.
+
+        :raises graphql.error.GraphQLError: if a syntax error is encountered or
+            if the operation to execute cannot be found in the document.
+        """
+        from .utilities.serialize_variable_values import _get_document_operation
+
+        super().__init__(
+            request,
+            variable_values=variable_values,
+            operation_name=operation_name,
+            extensions=extensions,
+        )
+
+        self.operation: OperationDefinitionNode = _get_document_operation(
+            self.document, operation_name=self.operation_name
+        )
+        self.query_str: str = print_ast(self.document)
+
+        # Beginning of the encoded payload with the query, for each JSON codec
+        # Shared with the copies made by with_variables
+        self._encoded_queries: Dict[Any, bytes] = {}
+
+        # Schema used to validate the document and to get the variable types
+        self.schema: Optional[GraphQLSchema] = None
+        self._variables_serializer: Optional[
+            Callable[[Dict[str, Any]], Dict[str, Any]]
+        ] = None
+
+    def _bind_schema(self, schema: GraphQLSchema) -> None:
+        """Save the schema after a successful validation and compile
+        the serializer of the variables of the operation for this schema."""
+
+        from .utilities.serialize_variable_values import compile_variables_serializer
+
+        self._variables_serializer = compile_variables_serializer(
+            schema, self.document, self.operation_name
+        )
+        self.schema = schema
+
+    def with_variables(
+        self,
+        variable_values: Optional[Dict[str, Any]],
+        *,
+        extensions: Optional[Dict[str, Any]] = None,
+    ) -> "PreparedRequest":
+        """Get a copy of this prepared request with new variable values.
+
+        :param variable_values: Dictionary of input parameters.
+        :param extensions: Dictionary of protocol extensions.
+            By default, keep the extensions of this request.
+        :return: a new :class:`PreparedRequest <gql.PreparedRequest>` sharing
+            the computations made for this request.
+        """
+        prepared = copy.copy(self)
+        prepared.variable_values = variable_values
+
+        if extensions is not None:
+            prepared.extensions = extensions
+
+        return prepared
+
+    def serialize_variable_values(
+        self, schema: GraphQLSchema, *, only_custom_types: bool = False
+    ) -> "GraphQLRequest":
+
+        if (
+            schema is not self.schema
+            or only_custom_types
+            or self._variables_serializer is None
+        ):
+            serialized = super().serialize_variable_values(
+                schema, only_custom_types=only_custom_types
+            )
+            return self.with_variables(serialized.variable_values)
+
+        assert self.variable_values is not None
+
+        return self.with_variables(self._variables_serializer(self.variable_values))
+
+    def _print_query(self) -> str:
+        return self.query_str
+
+
 def support_deprecated_request(
     request: Union[GraphQLRequest, DocumentNode],
     kwargs: Dict,
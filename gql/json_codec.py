@@ -0,0 +1,207 @@
+"""Codecs used to encode the requests and to decode the answers in JSON.
+See :ref:`json_codecs`."""
+
+import json
+from typing import Any, Callable, List, Optional, Union
+
+from .graphql_request import GraphQLRequest, PreparedRequest
+
+
+class JSONCodec:
+    """Encode and decode the JSON messages exchanged with the backend.
+
+    The codecs work on bytes, so that the answers received by the transports
+    are decoded without an intermediate str and the requests are encoded
+    directly in the body sent to the backend.
+
+    This default codec uses the :mod:`json` module of the standard library.
+    """
+
+    # Separator between the items of the encoded objects and lists,
+    # None if unknown to always encode the whole payload of the requests
+    item_separator: Optional[bytes] = b", "
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value in JSON.
+
+        :param value: the value to encode
+        :return: the UTF-8 encoded JSON document
+        """
+        return json.dumps(value).encode("utf-8")
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        """Decode a JSON document.
+
+        :param data: the JSON document, as bytes or str
+        :return: the decoded value
+        :raises ValueError: if the document is not valid JSON
+        """
+        return json.loads(data)
+
+    def dumps(self, value: Any) -> str:
+        """Encode a value in JSON as a str, for the places which need
+        a str like the URL of the GET requests or the logs."""
+        return json.dumps(value)
+
+    def encode_request(
+        self, request: Union[GraphQLRequest, List[GraphQLRequest]]
+    ) -> bytes:
+        """Encode the payload of a request or of a batch of requests.
+
+        The beginning of the payload containing the query of a
+        :class:`PreparedRequest <gql.PreparedRequest>` is encoded once
+        and reused for its next executions, only the other keys
+        like the variable values are encoded again.
+
+        :param request: the request or the list of requests of a batch
+        :return: the encoded payload
+        """
+        separator = self.item_separator
+
+        if isinstance(request, list):
+            if separator is None:
+                return self.encode([req.payload for req in request])
+
+            return b"[" + separator.join(map(self.encode_request, request)) + b"]"
+
+        payload = request.payload
+
+        if separator is None or not isinstance(request, PreparedRequest):
+            return self.encode(payload)
+
+        prefix = request._encoded_queries.get(self)
+
+        if prefix is None:
+            # Encoded object without its closing brace
+            prefix = self.encode({"query": payload["query"]}).rstrip()[:-1]
+            request._encoded_queries[self] = prefix
+
+        del payload["query"]
+
+        if not payload:
+            return prefix + b"}"
+
+        # Encoded object without its opening brace
+        return prefix + separator + self.encode(payload).lstrip()[1:]
+
+
+class CallableJSONCodec(JSONCodec):
+    """Codec using a serializer and a deserializer callables, like the
+    :code:`json_serialize` and :code:`json_deserialize` arguments
+    of the HTTP transports.
+
+    The deserializer receives a str, the serializer can return a str or bytes.
+    """
+
+    item_separator = None
+
+    def __init__(
+        self,
+        serialize: Callable[[Any], Union[str, bytes]] = json.dumps,
+        deserialize: Callable[[str], Any] = json.loads,
+    ):
+        """
+        :param serialize: the serializer callable, json.dumps by default
+        :param deserialize: the deserializer callable, json.loads by default
+        """
+        self.serialize = serialize
+        self.deserialize = deserialize
+
+    def encode(self, value: Any) -> bytes:
+        encoded = self.serialize(value)
+        return encoded.encode("utf-8") if isinstance(encoded, str) else encoded
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        if not isinstance(data, str):
+            data = bytes(data).decode("utf-8")
+        return self.deserialize(data)
+
+    def dumps(self, value: Any) -> str:
+        encoded = self.serialize(value)
+        return encoded if isinstance(encoded, str) else encoded.decode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec using the `orjson`_ library.
+
+    The orjson library is not installed with gql,
+    install it with :code:`pip install orjson`.
+
+    .. _orjson: https://github.com/ijl/orjson
+    """
+
+    item_separator = b","
+
+    def __init__(self, option: Optional[int] = None):
+        """
+        :param option: options of the orjson.dumps function,
+            for example :code:`orjson.OPT_NON_STR_KEYS`
+        """
+        import orjson
+
+        self._orjson = orjson
+        self.option = option
+
+    def encode(self, value: Any) -> bytes:
+        return self._orjson.dumps(value, option=self.option)
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, value: Any) -> str:
+        return self.encode(value).decode("utf-8")
+
+
+class MsgspecCodec(JSONCodec):
+    """Codec using the JSON encoder and decoder of the `msgspec`_ library.
+
+    The msgspec library is not installed with gql,
+    install it with :code:`pip install msgspec`.
+
+    .. _msgspec: https://jcristharif.com/msgspec/
+    """
+
+    item_separator = b","
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._decode_error = msgspec.DecodeError
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def encode(self, value: Any) -> bytes:
+        return self._encoder.encode(value)
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as e:
+            raise ValueError(str(e)) from e
+
+    def dumps(self, value: Any) -> str:
+        return self.encode(value).decode("utf-8")
+
+
+DEFAULT_JSON_CODEC = JSONCodec()
+"""Codec used by default, with the :mod:`json` module of the standard library."""
+
+
+def get_json_codec(
+    json_codec: Optional[JSONCodec],
+    json_serialize: Callable[[Any], Union[str, bytes]] = json.dumps,
+    json_deserialize: Callable[[str], Any] = json.loads,
+) -> JSONCodec:
+    """Returns the codec of a transport from its arguments.
+
+    :param json_codec: the codec provided, used if not None
+    :param json_serialize: the legacy serializer argument of the transport
+    :param json_deserialize: the legacy deserializer argument of the transport
+    """
+    if json_codec is not None:
+        return json_codec
+
+    if json_serialize is json.dumps and json_deserialize is json.loads:
+        return DEFAULT_JSON_CODEC
+
+    return CallableJSONCodec(json_serialize, json_deserialize)
@@ -10,25 +10,38 @@ from typing import (
     Dict,
     List,
     Optional,
+    Sequence,
     Tuple,
     Type,
     Union,
 )
 
 import aiohttp
-from aiohttp import BodyPartReader, MultipartReader
 from aiohttp.client_exceptions import ClientResponseError
 from aiohttp.client_reqrep import Fingerprint
 from aiohttp.helpers import BasicAuth
 from aiohttp.typedefs import LooseCookies, LooseHeaders
 from graphql import ExecutionResult
-from multidict import CIMultiDictProxy
+from multidict import CIMultiDict, CIMultiDictProxy
 
+from ..compression import RequestCompressor, get_request_compressor
 from ..graphql_request import GraphQLRequest
+from ..json_codec import JSONCodec, get_json_codec
 from .appsync_auth import AppSyncAuthentication
 from .async_transport import AsyncTransport
 from .common.aiohttp_closed_event import create_aiohttp_closed_event
 from .common.batch import get_batch_execution_result_list
+from .common.http_get import DEFAULT_MAX_URL_LENGTH, get_query_url
+from .common.incremental import has_incremental_directives
+from .common.json_stream import parse_json_list_stream
+from .common.multipart import (
+    INCREMENTAL_ACCEPT_HEADER,
+    SUBSCRIPTION_ACCEPT_HEADER,
+    merge_incremental_response,
+    parse_content_type,
+    parse_multipart_response,
+)
+from .common.persisted_queries import PersistedQueries
 from .exceptions import (
     TransportAlreadyConnected,
     TransportClosed,
@@ -38,6 +51,7 @@ from .exceptions import (
     TransportServerError,
 )
 from .file_upload import FileVar, close_files, extract_files, open_files
+from .http_result import HTTPExecutionResult
 
 log = logging.getLogger(__name__)
 
@@ -67,6 +81,11 @@ class AIOHTTPTransport(AsyncTransport):
         json_serialize: Callable = json.dumps,
         json_deserialize: Callable = json.loads,
         client_session_args: Optional[Dict[str, Any]] = None,
+        persisted_queries: bool = False,
+        use_get_for_queries: bool = False,
+        max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+        json_codec: Optional[JSONCodec] = None,
+        request_compression: Optional[Union[str, RequestCompressor]] = None,
     ) -> None:
         """Initialize the transport with the given aiohttp parameters.
 
@@ -85,6 +104,20 @@ class AIOHTTPTransport(AsyncTransport):
                 By default json.loads() function
         :param client_session_args: Dict of extra args passed to
                 `aiohttp.ClientSession`_
+        :param persisted_queries: Set to True to send the queries using the
+                :ref:`Automatic Persisted Queries <persisted_queries>` protocol.
+        :param use_get_for_queries: Set to True to send the query operations
+                with the :ref:`HTTP GET method <http_get>`.
+        :param max_url_length: Maximum length of the URL for GET requests.
+                Longer requests are sent with the POST method.
+        :param json_codec: The :ref:`JSON codec <json_codecs>` used to encode
+                the requests and decode the answers.
+                By default, a codec using the json_serialize
+                and json_deserialize arguments.
+        :param request_compression: Set to "gzip", "zstd" or a
+                :ref:`request compressor <request_compression>` to compress
+                the large bodies of the requests. Not compatible with
+                the AppSync authentication.
 
         .. _aiohttp.ClientSession:
           https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession
@@ -98,9 +131,25 @@ class AIOHTTPTransport(AsyncTransport):
         self.ssl_close_timeout: Optional[Union[int, float]] = ssl_close_timeout
         self.client_session_args = client_session_args
         self.session: Optional[aiohttp.ClientSession] = None
+
+        # Headers of the last response
+        # Use the response_headers attribute of the results instead
+        # if the transport is used by several tasks
         self.response_headers: Optional[CIMultiDictProxy[str]]
+
         self.json_serialize: Callable = json_serialize
         self.json_deserialize: Callable = json_deserialize
+        self.json_codec: JSONCodec = get_json_codec(
+            json_codec, json_serialize, json_deserialize
+        )
+        self.persisted_queries: Optional[PersistedQueries] = (
+            PersistedQueries() if persisted_queries else None
+        )
+        self.use_get_for_queries: bool = use_get_for_queries
+        self.max_url_length: int = max_url_length
+        self.request_compressor: Optional[RequestCompressor] = get_request_compressor(
+            request_compression
+        )
 
     async def connect(self) -> None:
         """Coroutine which will create an aiohttp ClientSession() as self.session.
@@ -120,7 +169,7 @@ class AIOHTTPTransport(AsyncTransport):
                 "auth": (
                     None if isinstance(self.auth, AppSyncAuthentication) else self.auth
                 ),
-                "json_serialize": self.json_serialize,
+                "json_serialize": self.json_codec.dumps,
             }
 
             if self.timeout is not None:
@@ -167,29 +216,36 @@ class AIOHTTPTransport(AsyncTransport):
 
         self.session = None
 
-    def _prepare_request(
+    async def _prepare_request(
         self,
         request: Union[GraphQLRequest, List[GraphQLRequest]],
         extra_args: Optional[Dict[str, Any]] = None,
         upload_files: bool = False,
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], Dict[str, FileVar]]:
+        """Returns the arguments of the request method
+        and the files to close after the request."""
 
-        payload: Union[Dict, List]
-        if isinstance(request, GraphQLRequest):
-            payload = request.payload
-        else:
-            payload = [req.payload for req in request]
+        files: Dict[str, FileVar] = {}
+        payload_str: Optional[str] = None
 
         if upload_files:
-            assert isinstance(payload, Dict)
             assert isinstance(request, GraphQLRequest)
-            post_args = self._prepare_file_uploads(request, payload)
+            post_args, files, payload_str = self._prepare_file_uploads(
+                request, request.payload
+            )
         else:
-            post_args = {"json": payload}
+            # The payload is encoded once, the logs and the signature reuse it
+            body = self.json_codec.encode_request(request)
+            post_args = {"data": await self._get_json_payload(body)}
+
+        if payload_str is None and (
+            isinstance(self.auth, AppSyncAuthentication)
+            or log.isEnabledFor(logging.DEBUG)
+        ):
+            payload_str = body.decode("utf-8")
 
         # Log the payload
-        if log.isEnabledFor(logging.DEBUG):
-            log.debug(">>> %s", self.json_serialize(payload))
+        log.debug(">>> %s", payload_str)
 
         # Pass post_args to aiohttp post method
         if extra_args:
@@ -198,15 +254,57 @@ class AIOHTTPTransport(AsyncTransport):
         # Add headers for AppSync if requested
         if isinstance(self.auth, AppSyncAuthentication):
             post_args["headers"] = self.auth.get_headers(
-                self.json_serialize(payload),
+                payload_str,
                 {"content-type": "application/json"},
             )
 
-        return post_args
+        return post_args, files
+
+    async def _get_json_payload(self, body: bytes) -> aiohttp.BytesPayload:
+        """Returns the payload of an encoded JSON body, compressed if it is
+        larger than the threshold of the request compressor."""
+
+        compressor = self.request_compressor
+
+        # The AppSync authentication signs the body which is sent
+        if (
+            compressor is None
+            or isinstance(self.auth, AppSyncAuthentication)
+            or not compressor.should_compress(body)
+        ):
+            return aiohttp.BytesPayload(body, content_type="application/json")
+
+        return aiohttp.BytesPayload(
+            await compressor.compress_async(body),
+            content_type="application/json",
+            headers={"Content-Encoding": compressor.encoding},
+        )
+
+    def _prepare_get_request(self, request: GraphQLRequest) -> Optional[str]:
+        """Returns the URL to send the request with the GET method
+        or None if the request should be sent with the POST method."""
+
+        # AppSync authentication needs to sign the body of a POST request
+        if not self.use_get_for_queries or isinstance(self.auth, AppSyncAuthentication):
+            return None
+
+        url = get_query_url(
+            str(self.url),
+            request,
+            json_serialize=self.json_codec.dumps,
+            max_url_length=self.max_url_length,
+        )
+
+        if url is not None:
+            log.debug(">>> GET %s", url)
+
+        return url
 
     def _prepare_file_uploads(
         self, request: GraphQLRequest, payload: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], Dict[str, FileVar], str]:
+        """Returns the arguments of the request method, the files to close
+        after the request and the encoded operations field."""
 
         # If the upload_files flag is set, then we need variable_values
         variable_values = request.variable_values
@@ -221,7 +319,6 @@ class AIOHTTPTransport(AsyncTransport):
 
         # Opening the files using the FileVar parameters
         open_files(list(files.values()), transport_supports_streaming=True)
-        self.files = files
 
         # Save the nulled variable values in the payload
         payload["variables"] = nulled_variable_values
@@ -240,12 +337,12 @@ class AIOHTTPTransport(AsyncTransport):
         file_vars = {str(i): files[path] for i, path in enumerate(files)}
 
         # Add the payload to the operations field
-        operations_str = self.json_serialize(payload)
+        operations_str = self.json_codec.dumps(payload)
         log.debug("operations %s", operations_str)
         data.add_field("operations", operations_str, content_type="application/json")
 
         # Add the file map field
-        file_map_str = self.json_serialize(file_map)
+        file_map_str = self.json_codec.dumps(file_map)
         log.debug("file_map %s", file_map_str)
         data.add_field("map", file_map_str, content_type="application/json")
 
@@ -261,7 +358,7 @@ class AIOHTTPTransport(AsyncTransport):
 
         post_args: Dict[str, Any] = {"data": data}
 
-        return post_args
+        return post_args, files, operations_str
 
     @staticmethod
     def _raise_transport_server_error_if_status_more_than_400(
@@ -299,7 +396,8 @@ class AIOHTTPTransport(AsyncTransport):
         self.response_headers = response.headers
 
         try:
-            result = await response.json(loads=self.json_deserialize, content_type=None)
+            # Decode the body without an intermediate str
+            result = self.json_codec.decode(await response.read())
 
             if log.isEnabledFor(logging.DEBUG):
                 result_text = await response.text()
@@ -317,6 +415,11 @@ class AIOHTTPTransport(AsyncTransport):
         self, response: aiohttp.ClientResponse
     ) -> ExecutionResult:
 
+        content_type = response.headers.get("Content-Type", "")
+
+        if parse_content_type(content_type)[0] == "multipart/mixed":
+            return await self._prepare_incremental_result(response, content_type)
+
         result = await self._get_json_result(response)
 
         if "errors" not in result and "data" not in result:
@@ -324,10 +427,32 @@ class AIOHTTPTransport(AsyncTransport):
                 response, 'No "data" or "errors" keys in answer'
             )
 
-        return ExecutionResult(
+        return HTTPExecutionResult(
             errors=result.get("errors"),
             data=result.get("data"),
             extensions=result.get("extensions"),
+            response_headers=response.headers,
+            status_code=response.status,
+        )
+
+    async def _prepare_incremental_result(
+        self, response: aiohttp.ClientResponse, content_type: str
+    ) -> ExecutionResult:
+        """Returns the result merged from all the parts of
+        an incremental delivery response."""
+
+        # Saving latest response headers in the transport
+        self.response_headers = response.headers
+
+        self._raise_transport_server_error_if_status_more_than_400(response)
+
+        merger = merge_incremental_response(
+            await response.read(), content_type, self.json_codec
+        )
+
+        return merger.get_result(
+            response_headers=response.headers,
+            status_code=response.status,
         )
 
     async def _prepare_batch_result(
@@ -339,7 +464,12 @@ class AIOHTTPTransport(AsyncTransport):
         answers = await self._get_json_result(response)
 
         try:
-            return get_batch_execution_result_list(reqs, answers)
+            return get_batch_execution_result_list(
+                reqs,
+                answers,
+                response_headers=response.headers,
+                status_code=response.status,
+            )
         except TransportProtocolError:
             # Raise a TransportServerError if status > 400
             self._raise_transport_server_error_if_status_more_than_400(response)
@@ -371,22 +501,63 @@ class AIOHTTPTransport(AsyncTransport):
         if self.session is None:
             raise TransportClosed("Transport is not connected")
 
-        post_args = self._prepare_request(
-            request,
-            extra_args,
-            upload_files,
-        )
+        apq = self.persisted_queries
+
+        if apq is None or upload_files:
+            return await self._execute_request(request, extra_args, upload_files)
+
+        result = await self._execute_request(apq.get_request(request), extra_args)
+
+        if apq.process_result(request, result):
+            result = await self._execute_request(
+                apq.get_request(request, include_query=True), extra_args
+            )
+            apq.process_result(request, result)
+
+        return result
+
+    async def _execute_request(
+        self,
+        request: GraphQLRequest,
+        extra_args: Optional[Dict[str, Any]] = None,
+        upload_files: bool = False,
+    ) -> ExecutionResult:
+
+        assert self.session is not None
+
+        get_request = None if upload_files else self._prepare_get_request(request)
+        files: Dict[str, FileVar] = {}
+
+        if get_request is None:
+            method = "POST"
+            url = self.url
+            request_args, files = await self._prepare_request(
+                request,
+                extra_args,
+                upload_files,
+            )
+        else:
+            method = "GET"
+            url = get_request
+            request_args = dict(extra_args) if extra_args else {}
+
+        # Accept the multipart answers of the queries using @defer or @stream
+        if has_incremental_directives(request._print_query()):
+            headers = CIMultiDict(request_args.get("headers") or {})
+            headers.setdefault("Accept", INCREMENTAL_ACCEPT_HEADER)
+            request_args["headers"] = headers
 
         try:
-            async with self.session.post(self.url, ssl=self.ssl, **post_args) as resp:
+            async with self.session.request(
+                method, url, ssl=self.ssl, **request_args
+            ) as resp:
                 return await self._prepare_result(resp)
         except TransportError:
             raise
         except Exception as e:
             raise TransportConnectionFailed(str(e)) from e
         finally:
-            if upload_files:
-                close_files(list(self.files.values()))
+            close_files(list(files.values()))
 
     async def execute_batch(
         self,
@@ -409,7 +580,41 @@ class AIOHTTPTransport(AsyncTransport):
         if self.session is None:
             raise TransportClosed("Transport is not connected")
 
-        post_args = self._prepare_request(
+        apq = self.persisted_queries
+
+        if apq is None:
+            return await self._execute_batch_request(reqs, extra_args)
+
+        results = await self._execute_batch_request(
+            [apq.get_request(req) for req in reqs], extra_args
+        )
+
+        # Send again, with their query, only the requests which were not found
+        indexes = apq.get_batch_resend_indexes(reqs, results)
+
+        if indexes:
+            resent_reqs = [reqs[index] for index in indexes]
+
+            resent_results = await self._execute_batch_request(
+                [apq.get_request(req, include_query=True) for req in resent_reqs],
+                extra_args,
+            )
+            apq.get_batch_resend_indexes(resent_reqs, resent_results)
+
+            for index, result in zip(indexes, resent_results):
+                results[index] = result
+
+        return results
+
+    async def _execute_batch_request(
+        self,
+        reqs: List[GraphQLRequest],
+        extra_args: Optional[Dict[str, Any]] = None,
+    ) -> List[ExecutionResult]:
+
+        assert self.session is not None
+
+        post_args, _ = await self._prepare_request(
             reqs,
             extra_args,
         )
@@ -427,26 +632,30 @@ class AIOHTTPTransport(AsyncTransport):
         request: GraphQLRequest,
         *,
         extra_args: Optional[Dict[str, Any]] = None,
+        raw_patches: bool = False,
     ) -> AsyncGenerator[ExecutionResult, None]:
         """Execute a GraphQL subscription and yield results from multipart response.
 
+        The parts of the response are parsed as soon as they are received.
+        For the queries using the @defer or @stream directives, the result merged
+        with the patches received so far is yielded after each part.
+
         :param request: GraphQL request to execute
         :param extra_args: additional arguments to send to the aiohttp post method
+        :param raw_patches: set to True to yield the payloads of an incremental
+            delivery response without merging them
         :yields: ExecutionResult objects as they arrive in the multipart stream
         """
         if self.session is None:
             raise TransportClosed("Transport is not connected")
 
-        post_args = self._prepare_request(request, extra_args)
+        post_args, _ = await self._prepare_request(request, extra_args)
 
         headers = dict(post_args.get("headers", {}))
         headers.update(
             {
                 "Content-Type": "application/json",
-                "Accept": (
-                    "multipart/mixed;boundary=graphql;"
-                    "subscriptionSpec=1.0,application/json"
-                ),
+                "Accept": SUBSCRIPTION_ACCEPT_HEADER,
             }
         )
         post_args["headers"] = headers
@@ -461,26 +670,19 @@ class AIOHTTPTransport(AsyncTransport):
                     # Raise a TransportServerError if status > 400
                     self._raise_transport_server_error_if_status_more_than_400(resp)
 
-                initial_content_type = resp.headers.get("Content-Type", "")
-                if (
-                    "application/json" in initial_content_type
-                    and "multipart/mixed" not in initial_content_type
-                ):
+                content_type = resp.headers.get("Content-Type", "")
+
+                if parse_content_type(content_type)[0] == "application/json":
                     yield await self._prepare_result(resp)
                     return
 
-                if (
-                    ("multipart/mixed" not in initial_content_type)
-                    or ("boundary=graphql" not in initial_content_type)
-                    or ("subscriptionSpec=1.0" not in initial_content_type)
-                ):
-                    raise TransportProtocolError(
-                        f"Unexpected content-type: {initial_content_type}. "
-                        "Server may not support the multipart subscription protocol."
-                    )
-
                 # Parse multipart response
-                async for result in self._parse_multipart_response(resp):
+                async for result in parse_multipart_response(
+                    resp.content.iter_any(),
+                    content_type,
+                    self.json_codec,
+                    raw_patches=raw_patches,
+                ):
                     yield result
 
         except TransportError:
@@ -488,122 +690,47 @@ class AIOHTTPTransport(AsyncTransport):
         except Exception as e:
             raise TransportConnectionFailed(str(e)) from e
 
-    async def _parse_multipart_response(
+    async def execute_stream(
         self,
-        response: aiohttp.ClientResponse,
-    ) -> AsyncGenerator[ExecutionResult, None]:
-        """
-        Parse a multipart response stream and yield execution results.
+        request: GraphQLRequest,
+        path: Union[str, Sequence[Union[str, int]]],
+        *,
+        extra_args: Optional[Dict[str, Any]] = None,
+    ) -> AsyncGenerator[Any, None]:
+        """Execute a query and yield the items of a list of its result
+        as soon as they are received, without buffering the whole answer.
 
-        Uses aiohttp's built-in MultipartReader to handle the multipart protocol.
+        Don't call this method directly on the transport, instead use
+        :code:`execute_stream` on a session.
 
-        :param response: The aiohttp response object
-        :yields: ExecutionResult objects
-        """
-        # Use aiohttp's built-in multipart reader
-        reader = MultipartReader.from_response(response)
-
-        # Iterate through each part in the multipart response
-        while True:
-            try:
-                part = await reader.next()
-            except Exception:
-                # reader.next() throws on empty parts at the end of the stream.
-                # (some servers may send this.)
-                # see: https://github.com/aio-libs/aiohttp/pull/11857
-                # As an ugly workaround for now, we can check if we've reached
-                # EOF and assume this was the case.
-                if reader.at_eof():
-                    break
-
-                # Otherwise, re-raise unexpected errors
-                raise  # pragma: no cover
-
-            if part is None:
-                # No more parts
-                break
-
-            assert not isinstance(
-                part, MultipartReader
-            ), "Nested multipart parts are not supported in GraphQL subscriptions"
-
-            result = await self._parse_multipart_part(part)
-            if result:
-                yield result
-
-    async def _parse_multipart_part(
-        self, part: BodyPartReader
-    ) -> Optional[ExecutionResult]:
+        :param request: GraphQL request as a
+                        :class:`GraphQLRequest <gql.GraphQLRequest>` object.
+        :param path: path of the list in the answer,
+            like :code:`"data.orders.edges"`
+        :param extra_args: additional arguments to send to the aiohttp post method
+        :yields: the items of the list, decoded by the JSON codec
+        :raises TransportQueryError: if the answer contains errors,
+            after the items received
         """
-        Parse a single part from a multipart response.
+        if self.session is None:
+            raise TransportClosed("Transport is not connected")
 
-        :param part: aiohttp BodyPartReader for the part
-        :return: ExecutionResult or None if part is empty/heartbeat
-        """
-        # Verify the part has the correct content type
-        content_type = part.headers.get(aiohttp.hdrs.CONTENT_TYPE, "")
-        if not content_type.startswith("application/json"):
-            raise TransportProtocolError(
-                f"Unexpected part content-type: {content_type}. "
-                "Expected 'application/json'."
-            )
+        post_args, _ = await self._prepare_request(request, extra_args)
 
         try:
-            # Read the part content as text
-            body = await part.text()
-            body = body.strip()
+            async with self.session.post(self.url, ssl=self.ssl, **post_args) as resp:
+                # Saving latest response headers in the transport
+                self.response_headers = resp.headers
 
-            if log.isEnabledFor(logging.DEBUG):
-                log.debug("<<< %s", ascii(body or "(empty body, skipping)"))
-
-            if not body:
-                return None
-
-            # Parse JSON body using custom deserializer
-            data = self.json_deserialize(body)
-
-            # Handle heartbeats - empty JSON objects
-            if not data:
-                log.debug("Received heartbeat, ignoring")
-                return None
-
-            # The multipart subscription protocol wraps data in a "payload" property
-            if "payload" not in data:
-                log.warning("Invalid response: missing 'payload' field")
-                return None
-
-            payload = data["payload"]
-
-            # Check for transport-level errors (payload is null)
-            if payload is None:
-                # If there are errors, this is a transport-level error
-                errors = data.get("errors")
-                if errors:
-                    error_messages = [
-                        error.get("message", "Unknown transport error")
-                        for error in errors
-                    ]
-
-                    for message in error_messages:
-                        log.error(f"Transport error: {message}")
-
-                    raise TransportServerError("\n\n".join(error_messages))
-                else:
-                    # Null payload without errors - just skip this part
-                    return None
-
-            # Extract GraphQL data from payload
-            return ExecutionResult(
-                data=payload.get("data"),
-                errors=payload.get("errors"),
-                extensions=payload.get("extensions"),
-            )
-        except json.JSONDecodeError as e:
-            log.warning(
-                f"Failed to parse JSON: {ascii(e)}, "
-                f"body: {ascii(body[:100]) if body else ''}"
-            )
-            return None
-        except UnicodeDecodeError as e:
-            log.warning(f"Failed to decode part: {ascii(e)}")
-            return None
+                # Raise a TransportServerError if status > 400
+                self._raise_transport_server_error_if_status_more_than_400(resp)
+
+                async for item in parse_json_list_stream(
+                    resp.content.iter_any(), path, self.json_codec
+                ):
+                    yield item
+
+        except TransportError:
+            raise
+        except Exception as e:
+            raise TransportConnectionFailed(str(e)) from e
@@ -127,7 +127,7 @@ class AppSyncWebsocketsTransport(SubscriptionTransportBase):
         answer_type: str = ""
 
         try:
-            json_answer = json.loads(answer)
+            json_answer = self.json_codec.decode(answer)
 
             answer_type = str(json_answer.get("type"))
 
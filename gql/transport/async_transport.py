@@ -1,12 +1,17 @@
 import abc
-from typing import Any, AsyncGenerator, List
+from typing import Any, AsyncGenerator, List, Sequence, Union
 
 from graphql import ExecutionResult
 
 from ..graphql_request import GraphQLRequest
+from ..json_codec import DEFAULT_JSON_CODEC, JSONCodec
 
 
 class AsyncTransport(abc.ABC):
+    # Codec used to encode the requests and decode the answers
+    # Can be replaced with the json_codec argument of the Client
+    json_codec: JSONCodec = DEFAULT_JSON_CODEC
+
     @abc.abstractmethod
     async def connect(self):
         """Coroutine used to create a connection to the specified address"""
@@ -49,6 +54,25 @@ class AsyncTransport(abc.ABC):
             "This Transport has not implemented the execute_batch method"
         )  # pragma: no cover
 
+    def execute_stream(
+        self,
+        request: GraphQLRequest,
+        path: Union[str, Sequence[Union[str, int]]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Any, None]:
+        """Execute a query and yield the items of a list of its result
+        as soon as they are received.
+
+        :param request: GraphQL request as a
+                        :class:`GraphQLRequest <gql.GraphQLRequest>` object.
+        :param path: path of the list in the answer,
+            like :code:`"data.orders.edges"`
+        """
+        raise NotImplementedError(
+            "This Transport has not implemented the execute_stream method"
+        )  # pragma: no cover
+
     @abc.abstractmethod
     def subscribe(
         self,
@@ -168,11 +168,12 @@ class AIOHTTPWebSocketsAdapter(AdapterConnection):
 
         self._response_headers = self.websocket._response.headers
 
-    async def send(self, message: str) -> None:
+    async def send(self, message: Union[str, bytes]) -> None:
         """Send message to the WebSocket server.
 
         Args:
-            message: String message to send
+            message: String message to send, or UTF-8 encoded bytes
+                sent in a text frame
 
         Raises:
             TransportConnectionFailed: If connection closed
@@ -181,7 +182,10 @@ class AIOHTTPWebSocketsAdapter(AdapterConnection):
             raise TransportConnectionFailed("WebSocket connection is already closed")
 
         try:
-            await self.websocket.send_str(message)
+            if isinstance(message, bytes):
+                await self.websocket.send_frame(message, WSMsgType.TEXT)
+            else:
+                await self.websocket.send_str(message)
         except Exception as e:
             raise TransportConnectionFailed(
                 f"Error trying to send data: {type(e).__name__}"
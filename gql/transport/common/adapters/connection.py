@@ -1,5 +1,5 @@
 import abc
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 
 class AdapterConnection(abc.ABC):
@@ -28,11 +28,12 @@ class AdapterConnection(abc.ABC):
         pass  # pragma: no cover
 
     @abc.abstractmethod
-    async def send(self, message: str) -> None:
+    async def send(self, message: Union[str, bytes]) -> None:
         """Send message to the server.
 
         Args:
-            message: String message to send
+            message: String message to send, or UTF-8 encoded bytes
+                sent as a text message
 
         Raises:
             TransportConnectionFailed: If connection closed
@@ -76,11 +76,12 @@ class WebSocketsAdapter(AdapterConnection):
 
         self._response_headers = self.websocket.response.headers
 
-    async def send(self, message: str) -> None:
+    async def send(self, message: Union[str, bytes]) -> None:
         """Send message to the WebSocket server.
 
         Args:
-            message: String message to send
+            message: String message to send, or UTF-8 encoded bytes
+                sent in a text frame
 
         Raises:
             TransportConnectionFailed: If connection closed
@@ -89,7 +90,7 @@ class WebSocketsAdapter(AdapterConnection):
             raise TransportConnectionFailed("WebSocket connection is already closed")
 
         try:
-            await self.websocket.send(message)
+            await self.websocket.send(message, text=True)
         except Exception as e:
             raise TransportConnectionFailed(
                 f"Error trying to send data: {type(e).__name__}"
@@ -124,8 +124,11 @@ class SubscriptionTransportBase(AsyncTransport):
         """
         pass  # pragma: no cover
 
-    async def _send(self, message: str) -> None:
-        """Send the provided message to the adapter connection and log the message"""
+    async def _send(self, message: Union[str, bytes]) -> None:
+        """Send the provided message to the adapter connection and log the message
+
+        The messages encoded in bytes by the JSON codec are sent as text frames.
+        """
 
         if not self._connected:
             if isinstance(self.close_exception, TransportConnectionFailed):
@@ -136,7 +139,11 @@ class SubscriptionTransportBase(AsyncTransport):
         try:
             # Can raise TransportConnectionFailed
             await self.adapter.send(message)
-            log.debug(">>> %s", message)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(
+                    ">>> %s",
+                    message.decode() if isinstance(message, bytes) else message,
+                )
         except TransportConnectionFailed as e:
             await self._fail(e, clean_close=False)
             raise e
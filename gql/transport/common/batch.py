@@ -2,6 +2,8 @@ from typing import (
     Any,
     Dict,
     List,
+    Mapping,
+    Optional,
 )
 
 from graphql import ExecutionResult
@@ -10,6 +12,7 @@ from ...graphql_request import GraphQLRequest
 from ..exceptions import (
     TransportProtocolError,
 )
+from ..http_result import HTTPExecutionResult
 
 
 def _raise_protocol_error(result_text: str, reason: str) -> None:
@@ -55,17 +58,12 @@ def _validate_num_of_answers_same_as_requests(
         )
 
 
-def _answer_to_execution_result(result: Dict[str, Any]) -> ExecutionResult:
-    return ExecutionResult(
-        errors=result.get("errors"),
-        data=result.get("data"),
-        extensions=result.get("extensions"),
-    )
-
-
 def get_batch_execution_result_list(
     reqs: List[GraphQLRequest],
     answers: List,
+    *,
+    response_headers: Optional[Mapping[str, str]] = None,
+    status_code: Optional[int] = None,
 ) -> List[ExecutionResult]:
 
     _validate_answer_is_a_list(answers)
@@ -73,4 +71,13 @@ def get_batch_execution_result_list(
     _validate_every_answer_is_a_dict(answers)
     _validate_data_and_errors_keys_in_answers(answers)
 
-    return [_answer_to_execution_result(answer) for answer in answers]
+    return [
+        HTTPExecutionResult(
+            errors=answer.get("errors"),
+            data=answer.get("data"),
+            extensions=answer.get("extensions"),
+            response_headers=response_headers,
+            status_code=status_code,
+        )
+        for answer in answers
+    ]
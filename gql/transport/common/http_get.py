@@ -0,0 +1,62 @@
+import logging
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlencode
+
+from ...graphql_request import GraphQLRequest
+from ...utilities.serialize_variable_values import _is_query_request
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_URL_LENGTH = 2048
+
+
+def get_query_url(
+    url: str,
+    request: GraphQLRequest,
+    *,
+    json_serialize: Callable[[Any], str],
+    max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+) -> Optional[str]:
+    """Returns the URL used to send the request with the GET method, as specified
+    in the `GraphQL over HTTP`_ spec, or None if the POST method should be used.
+
+    The POST method is used if the operation is not a query
+    or if the URL would be longer than :code:`max_url_length`.
+
+    :param url: the GraphQL server URL
+    :param request: the GraphQL request
+    :param json_serialize: Json serializer callable for the variables
+        and the extensions.
+    :param max_url_length: maximum length of the returned URL
+
+    .. _GraphQL over HTTP:
+        https://graphql.github.io/graphql-over-http/draft/#sec-GET
+    """
+
+    # Let the server return the error if the operation cannot be found
+    if not _is_query_request(request):
+        return None
+
+    payload = request.payload
+    params: Dict[str, str] = {}
+
+    if "query" in payload:
+        params["query"] = payload["query"]
+
+    if "operationName" in payload:
+        params["operationName"] = payload["operationName"]
+
+    for key in ("variables", "extensions"):
+        if key in payload:
+            params[key] = json_serialize(payload[key])
+
+    separator = "&" if "?" in url else "?"
+    query_url = url + separator + urlencode(params)
+
+    if len(query_url) > max_url_length:
+        log.debug(
+            f"URL length {len(query_url)} is more than {max_url_length}: using POST"
+        )
+        return None
+
+    return query_url
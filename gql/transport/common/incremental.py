@@ -0,0 +1,219 @@
+"""Merging of the payloads of the `incremental delivery`_ responses,
+received for the queries using the @defer and @stream directives.
+
+.. _incremental delivery:
+  https://github.com/graphql/graphql-over-http/blob/main/rfcs/IncrementalDelivery.md
+"""
+
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+from graphql import ExecutionResult
+
+from ..exceptions import TransportProtocolError
+from ..http_result import HTTPExecutionResult
+
+Path = List[Union[str, int]]
+
+
+def has_incremental_directives(request_str: str) -> bool:
+    """Returns True if a printed query may use the @defer or @stream directives.
+
+    The query is not parsed: a false positive only adds an Accept header."""
+    return "@defer" in request_str or "@stream" in request_str
+
+
+class IncrementalExecutionResult(ExecutionResult):
+    """Payload of an incremental delivery response, as received from the server.
+
+    The first payload contains the initial data, the next payloads
+    contain the patches to apply to it in their :code:`incremental` attribute.
+    """
+
+    __slots__ = ("pending", "incremental", "completed", "has_next")
+
+    def __init__(
+        self,
+        data: Optional[Dict[str, Any]] = None,
+        errors: Optional[List[Any]] = None,
+        extensions: Optional[Dict[str, Any]] = None,
+        *,
+        pending: Optional[List[Dict[str, Any]]] = None,
+        incremental: Optional[List[Dict[str, Any]]] = None,
+        completed: Optional[List[Dict[str, Any]]] = None,
+        has_next: bool = False,
+    ):
+        """
+        :param data: the initial data, in the first payload
+        :param errors: the errors of the payload
+        :param extensions: the extensions of the payload
+        :param pending: the deferred fragments and streamed lists announced
+        :param incremental: the patches with their path, data or items
+        :param completed: the deferred fragments and streamed lists completed
+        :param has_next: False for the last payload
+        """
+        super().__init__(data=data, errors=errors, extensions=extensions)
+
+        self.pending: Optional[List[Dict[str, Any]]] = pending
+        self.incremental: Optional[List[Dict[str, Any]]] = incremental
+        self.completed: Optional[List[Dict[str, Any]]] = completed
+        self.has_next: bool = has_next
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, Any]) -> "IncrementalExecutionResult":
+        return cls(
+            data=payload.get("data"),
+            errors=payload.get("errors"),
+            extensions=payload.get("extensions"),
+            pending=payload.get("pending"),
+            incremental=payload.get("incremental"),
+            completed=payload.get("completed"),
+            has_next=bool(payload.get("hasNext", False)),
+        )
+
+
+class IncrementalResultMerger:
+    """Merge the payloads of an incremental delivery response in a single result.
+
+    Both formats of the patches are supported: with a :code:`path`
+    (@defer and @stream specification of 2022) or with the :code:`id`
+    of a pending result (current specification).
+
+    The data is copied along the paths of the patches instead of being modified,
+    so that the results already returned are not changed by the next patches.
+    """
+
+    def __init__(self) -> None:
+        self.data: Optional[Dict[str, Any]] = None
+        self.errors: List[Any] = []
+        self.extensions: Optional[Dict[str, Any]] = None
+
+        self.has_next: bool = True
+        """False once the last payload has been merged."""
+
+        self._pending_paths: Dict[str, Path] = {}
+
+    def merge(self, payload: Mapping[str, Any]) -> None:
+        """Merge the next payload of the response.
+
+        :param payload: the decoded payload
+        :raises TransportProtocolError: if the payload is not valid
+        """
+        if not isinstance(payload, Mapping):
+            raise TransportProtocolError(f"Invalid incremental payload: {payload!r}")
+
+        if "data" in payload:
+            self.data = payload["data"]
+
+        self._add_errors(payload)
+
+        extensions = payload.get("extensions")
+        if extensions:
+            self.extensions = {**(self.extensions or {}), **extensions}
+
+        try:
+            for pending in payload.get("pending") or []:
+                self._pending_paths[str(pending["id"])] = pending["path"]
+
+            for incremental in payload.get("incremental") or []:
+                self._merge_incremental(incremental)
+
+            for completed in payload.get("completed") or []:
+                self._pending_paths.pop(str(completed["id"]), None)
+                self._add_errors(completed)
+
+        except (KeyError, TypeError) as e:
+            raise TransportProtocolError(
+                f"Invalid incremental payload: {payload!r}"
+            ) from e
+
+        self.has_next = bool(payload.get("hasNext", False))
+
+    def _add_errors(self, payload: Mapping[str, Any]) -> None:
+        errors = payload.get("errors")
+        if errors:
+            self.errors.extend(errors)
+
+    def _merge_incremental(self, incremental: Mapping[str, Any]) -> None:
+
+        self._add_errors(incremental)
+
+        if "id" in incremental:
+            path = self._pending_paths[str(incremental["id"])]
+            path = path + incremental.get("subPath", [])
+            index: Optional[int] = None
+        else:
+            path = incremental["path"]
+            index = path[-1] if "items" in incremental else None
+            if index is not None:
+                path = path[:-1]
+
+        if "items" in incremental:
+            items = incremental["items"]
+
+            def update(value: Any) -> Any:
+                if not isinstance(value, list):
+                    return value
+                position = len(value) if index is None else index
+                return value[:position] + items + value[position:]
+
+        else:
+            data = incremental.get("data")
+
+            def update(value: Any) -> Any:
+                if not isinstance(value, dict) or not isinstance(data, dict):
+                    return value
+                return _merge_data(value, data)
+
+        self.data = _update_at_path(self.data, path, update)
+
+    def get_result(self, **kwargs: Any) -> HTTPExecutionResult:
+        """Returns the result merged so far.
+
+        :param kwargs: the metadata of the HTTP response, if any
+        """
+        return HTTPExecutionResult(
+            data=self.data,
+            errors=list(self.errors) if self.errors else None,
+            extensions=self.extensions,
+            **kwargs,
+        )
+
+
+def _update_at_path(value: Any, path: Path, update: Callable[[Any], Any]) -> Any:
+    """Returns a copy of value with the value at path replaced by its update.
+
+    The value is returned unchanged if the path does not exist,
+    for example if a parent was set to null because of an error."""
+    if not path:
+        return update(value)
+
+    key = path[0]
+
+    try:
+        child = value[key]
+    except (KeyError, IndexError, TypeError):
+        return value
+
+    copy: Any = dict(value) if isinstance(value, dict) else list(value)
+    copy[key] = _update_at_path(child, path[1:], update)
+
+    return copy
+
+
+def _merge_data(target: Any, source: Any) -> Any:
+    """Returns a copy of target with source deeply merged in it."""
+
+    if isinstance(target, dict) and isinstance(source, dict):
+        merged = dict(target)
+        for key, value in source.items():
+            merged[key] = _merge_data(merged[key], value) if key in merged else value
+        return merged
+
+    if (
+        isinstance(target, list)
+        and isinstance(source, list)
+        and len(target) == len(source)
+    ):
+        return [_merge_data(item, patch) for item, patch in zip(target, source)]
+
+    return source
@@ -0,0 +1,361 @@
+"""Incremental parsing of the JSON answers, yielding the items of a list
+of the answer as soon as they are received, without buffering the whole answer.
+
+The same parser is used by the aiohttp and httpx transports.
+See :ref:`streaming_execution`.
+"""
+
+import codecs
+import json
+import logging
+import re
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ...json_codec import JSONCodec
+from ...utils import str_first_element
+from ..exceptions import TransportProtocolError, TransportQueryError
+
+log = logging.getLogger(__name__)
+
+# A string, possibly truncated at the end of the buffer, or a structural character
+_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*(?:(?P<end>")|\\?\Z)|[][{}:,]', re.DOTALL)
+
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+
+# Characters which can continue a number
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+# Complete strings and other characters until the next bracket,
+# or also until the next comma at the top level of an item
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_SKIP_RE = re.compile(rf'[^"\[\]{{}}]*(?:{_STRING}[^"\[\]{{}}]*)*', re.DOTALL)
+_SKIP_TOP_RE = re.compile(rf'[^"\[\]{{}},]*(?:{_STRING}[^"\[\]{{}},]*)*', re.DOTALL)
+
+
+class JSONListStream:
+    """Parse a JSON document from the chunks of an answer and return
+    the items of the list found at a path of the document as soon as
+    each of them is complete.
+
+    Only the item being received is buffered. The rest of the document,
+    in which the list is left empty, is returned by :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Sequence[Union[str, int]]],
+        json_codec: JSONCodec,
+    ):
+        """
+        :param path: path of the list in the document, either as a dotted
+            str like :code:`"data.orders.edges"` or as a sequence of keys
+            and list indexes
+        :param json_codec: codec used to decode the items and the document
+        """
+        if isinstance(path, str):
+            path = path.split(".")
+
+        self.path: List[str] = [str(key) for key in path]
+        self.json_codec = json_codec
+
+        self.found = False
+        """True once the start of the list has been received."""
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+
+        # Parts of the document without the items of the list
+        self._document: List[str] = []
+
+        # Open containers ("{" or "[") and key or index of their current value
+        self._containers: List[str] = []
+        self._keys: List[Optional[str]] = []
+
+        # Last string received in an object, the key if followed by ":"
+        self._last_string = ""
+
+        self._in_list = False
+        self._list_start = False
+
+        # Size of the buffered item before trying again to decode it
+        self._retry_size = 0
+
+        # Position in the buffered item and depth reached by the scan of its brackets
+        self._scan_pos = 0
+        self._scan_depth = 0
+
+        self._raw_decode = json.JSONDecoder().raw_decode
+
+        # With the default codec, the items are decoded by the standard decoder
+        # which also finds their end. With other codecs, the end of the items
+        # is found by scanning their brackets, so that they are decoded only once.
+        self._decode_item = None if type(json_codec) is JSONCodec else json_codec.decode
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Parse the next chunk of the answer.
+
+        :param chunk: the bytes received
+        :return: the items of the list completed by this chunk
+        :raises ValueError: if the document is not valid JSON
+        """
+        self._buffer += self._decoder.decode(chunk)
+        return self._parse(final=False)
+
+    def close(self) -> Tuple[List[Any], Any]:
+        """Parse the end of the answer and decode the rest of the document.
+
+        :return: a tuple with the items of the list not returned yet
+            and the decoded document, in which the list is empty
+        :raises ValueError: if the document is not valid JSON
+        """
+        self._buffer += self._decoder.decode(b"", final=True)
+        items = self._parse(final=True)
+
+        if self._in_list or self._containers:
+            raise ValueError("Incomplete JSON document")
+
+        return items, self.json_codec.decode("".join(self._document))
+
+    def _parse(self, final: bool) -> List[Any]:
+        items: List[Any] = []
+        buffer = self._buffer
+        length = len(buffer)
+        pos = 0
+
+        while pos < length:
+            if self._in_list:
+                pos = _WHITESPACE_RE.match(buffer, pos).end()  # type: ignore
+
+                if pos == length:
+                    break
+
+                if self._list_start and buffer[pos] == "]":
+                    self._end_list()
+                    pos += 1
+                    continue
+
+                if self._decode_item is None:
+                    decoded = self._raw_decode_item(buffer, pos, final)
+                    if decoded is None:
+                        break
+                    value, next_pos = decoded
+
+                else:
+                    item_end = self._find_item_end(buffer, pos, final)
+                    if item_end is None:
+                        break
+                    value, next_pos = self._decode_item(buffer[pos:item_end]), item_end
+
+                delimiter = buffer[next_pos]
+
+                if delimiter not in ",]":
+                    raise ValueError(f"Expecting ',' delimiter: char {next_pos}")
+
+                items.append(value)
+                self._list_start = False
+                pos = next_pos + 1
+
+                if delimiter == "]":
+                    self._end_list()
+
+                continue
+
+            match = _TOKEN_RE.search(buffer, pos)
+
+            if match is None:
+                self._document.append(buffer[pos:])
+                pos = length
+                break
+
+            token = match.group()
+            start, end = match.span()
+
+            if token[0] == '"':
+                if match.group("end") is None:
+                    # Truncated string, kept in the buffer
+                    self._document.append(buffer[pos:start])
+                    pos = start
+                    break
+
+                self._last_string = token
+
+            elif token in "{[":
+                if token == "[" and not self.found and self._keys == self.path:
+                    self.found = True
+                    self._in_list = True
+                    self._list_start = True
+
+                else:
+                    self._containers.append(token)
+                    self._keys.append("0" if token == "[" else None)
+
+            elif not self._containers:
+                raise ValueError(f"Unexpected {token!r}: char {start}")
+
+            elif token == ":":
+                key = self._last_string
+                self._keys[-1] = json.loads(key) if "\\" in key else key[1:-1]
+
+            elif token == ",":
+                if self._containers[-1] == "[":
+                    self._keys[-1] = str(int(self._keys[-1] or 0) + 1)
+
+            else:
+                self._containers.pop()
+                self._keys.pop()
+
+            self._document.append(buffer[pos:end])
+            pos = end
+
+        self._buffer = buffer[pos:]
+
+        return items
+
+    def _raw_decode_item(
+        self, buffer: str, pos: int, final: bool
+    ) -> Optional[Tuple[Any, int]]:
+        """Decode the item starting at pos with the standard decoder.
+
+        :return: a tuple with the item and the position of the delimiter
+            following it, or None if more data is needed
+        """
+        length = len(buffer)
+
+        # Wait for more data after a failed attempt to decode the item,
+        # a large item is not decoded again for each chunk received
+        if not final and length - pos < self._retry_size:
+            return None
+
+        try:
+            value, end = self._raw_decode(buffer, pos)
+        except ValueError:
+            if final:
+                raise
+            self._retry_size = 2 * (length - pos)
+            return None
+
+        next_pos = _WHITESPACE_RE.match(buffer, end).end()  # type: ignore
+
+        # A number at the end of the buffer or followed by a character
+        # which could continue it may be truncated
+        if not final and (next_pos == length or buffer[end] in _NUMBER_CHARS):
+            return None
+
+        if next_pos == length:
+            raise ValueError("Incomplete JSON document")
+
+        self._retry_size = 0
+
+        return value, next_pos
+
+    def _find_item_end(self, buffer: str, pos: int, final: bool) -> Optional[int]:
+        """Find the end of the item starting at pos by scanning its brackets,
+        without decoding it.
+
+        :return: the position of the delimiter following the item,
+            or None if more data is needed
+        """
+        length = len(buffer)
+        scan_pos = pos + self._scan_pos
+        depth = self._scan_depth
+
+        while True:
+            skip_re = _SKIP_RE if depth else _SKIP_TOP_RE
+            scan_pos = skip_re.match(buffer, scan_pos).end()  # type: ignore
+
+            # Wait for more data, a truncated string is scanned again
+            if scan_pos == length or buffer[scan_pos] == '"':
+                break
+
+            char = buffer[scan_pos]
+
+            if char in "{[":
+                depth += 1
+
+            elif depth:
+                depth -= 1
+
+            elif char == "}":
+                raise ValueError(f"Unexpected '}}': char {scan_pos}")
+
+            else:
+                self._scan_pos = 0
+                self._scan_depth = 0
+                return scan_pos
+
+            scan_pos += 1
+
+        if final:
+            raise ValueError("Incomplete JSON document")
+
+        self._scan_pos = scan_pos - pos
+        self._scan_depth = depth
+
+        return None
+
+    def _end_list(self) -> None:
+        self._in_list = False
+        self._document.append("]")
+
+
+async def parse_json_list_stream(
+    chunks: AsyncIterable[bytes],
+    path: Union[str, Sequence[Union[str, int]]],
+    json_codec: JSONCodec,
+) -> AsyncGenerator[Any, None]:
+    """Yield the items of the list at a path of a GraphQL answer
+    as soon as they are received.
+
+    :param chunks: the chunks of the body of the answer
+    :param path: path of the list in the answer, like :code:`"data.orders.edges"`
+    :param json_codec: codec used to decode the answer
+    :raises TransportQueryError: if the answer contains errors,
+        after the items received
+    :raises TransportProtocolError: if the answer is not a valid GraphQL result
+    """
+    stream = JSONListStream(path, json_codec)
+    count = 0
+
+    try:
+        async for chunk in chunks:
+            for item in stream.feed(chunk):
+                count += 1
+                yield item
+
+        items, result = stream.close()
+
+    except ValueError as e:
+        raise TransportProtocolError(
+            f"Server did not return a valid GraphQL result: Not a JSON answer: {e}"
+        ) from e
+
+    for item in items:
+        count += 1
+        yield item
+
+    log.debug("<<< %d items at %s: %s", count, ".".join(stream.path), result)
+
+    if not isinstance(result, dict) or (
+        "data" not in result and "errors" not in result
+    ):
+        raise TransportProtocolError(
+            "Server did not return a valid GraphQL result: "
+            f'No "data" or "errors" keys in answer: {result}'
+        )
+
+    if result.get("errors"):
+        raise TransportQueryError(
+            str_first_element(result["errors"]),
+            errors=result["errors"],
+            data=result.get("data"),
+            extensions=result.get("extensions"),
+        )
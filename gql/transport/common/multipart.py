@@ -0,0 +1,425 @@
+"""Incremental parsing of the multipart/mixed responses used by the
+`multipart subscription protocol`_ and by the `incremental delivery`_
+of the queries using the @defer and @stream directives.
+
+The same parser is used by the aiohttp and httpx transports.
+
+.. _multipart subscription protocol:
+  https://www.apollographql.com/docs/graphos/routing/operations/subscriptions/multipart-protocol
+.. _incremental delivery:
+  https://github.com/graphql/graphql-over-http/blob/main/rfcs/IncrementalDelivery.md
+"""
+
+import logging
+from email.message import Message
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from graphql import ExecutionResult
+
+from ...json_codec import JSONCodec
+from ..exceptions import TransportProtocolError, TransportServerError
+from .incremental import IncrementalExecutionResult, IncrementalResultMerger
+
+log = logging.getLogger(__name__)
+
+SUBSCRIPTION_ACCEPT_HEADER = (
+    "multipart/mixed;boundary=graphql;subscriptionSpec=1.0,"
+    "multipart/mixed;deferSpec=20220824,application/json"
+)
+"""Accept header of the subscribe requests, for the subscriptions
+and the queries using the @defer and @stream directives."""
+
+INCREMENTAL_ACCEPT_HEADER = "multipart/mixed;deferSpec=20220824,application/json"
+"""Accept header of the execute requests using the @defer and @stream directives."""
+
+MultipartPart = Tuple[Dict[str, str], bytes]
+"""Part of a multipart body: its headers, with lowercase names, and its body."""
+
+
+def parse_content_type(content_type: str) -> Tuple[str, Dict[str, str]]:
+    """Returns the lowercase media type and the parameters of a
+    Content-Type header."""
+    message = Message()
+    message["content-type"] = content_type
+
+    params = {
+        str(key).lower(): str(value)
+        for key, value in message.get_params(failobj=[])[1:]
+    }
+
+    return message.get_content_type(), params
+
+
+class MultipartParser:
+    """Parse a multipart/mixed body from the chunks received,
+    without decoding the whole body.
+
+    The chunks are appended to a single buffer, from which the complete parts
+    are removed as soon as their closing delimiter is received.
+    Lines should be separated by CRLF, as required by the specification.
+    """
+
+    def __init__(self, boundary: str):
+        """
+        :param boundary: the boundary parameter of the Content-Type header
+        """
+        self._delimiter = b"--" + boundary.encode("ascii")
+
+        # A part body ends with a CRLF followed by the delimiter
+        self._body_end = b"\r\n" + self._delimiter
+
+        self._buffer = bytearray()
+
+        # Position in the buffer from which to search the end of the current part,
+        # to avoid searching again in the data already received
+        self._search_from = 0
+
+        self._state = "preamble"
+        self._headers: Dict[str, str] = {}
+
+        self.done: bool = False
+        """True once the closing delimiter has been received."""
+
+    def feed(self, data: bytes) -> List[MultipartPart]:
+        """Add a chunk of the body and return the parts completed by it.
+
+        :param data: the next chunk of the body
+        :return: the list of complete parts, which can be empty
+        :raises TransportProtocolError: if the headers of a part are invalid
+        """
+        if self.done:
+            return []
+
+        self._buffer += data
+
+        parts: List[MultipartPart] = []
+
+        while self._parse_next(parts):
+            pass
+
+        return parts
+
+    def _parse_next(self, parts: List[MultipartPart]) -> bool:
+        """Parse the beginning of the buffer depending on the current state.
+
+        Returns True if the parsing can continue, False if more data is needed."""
+        buffer = self._buffer
+
+        if self._state == "preamble":
+            # Skip anything before the next delimiter
+            index = buffer.find(self._delimiter, self._search_from)
+
+            if index < 0:
+                self._search_from = max(0, len(buffer) - len(self._delimiter) + 1)
+                return False
+
+            del buffer[: index + len(self._delimiter)]
+            self._search_from = 0
+            self._state = "delimiter"
+
+        elif self._state == "delimiter":
+            # After the delimiter: "--" for the end of the body or a line end
+            index = buffer.find(b"\r\n")
+
+            if buffer.startswith(b"--"):
+                self.done = True
+                buffer.clear()
+                return False
+
+            if index < 0:
+                return False
+
+            del buffer[: index + 2]
+            self._state = "headers"
+
+        elif self._state == "headers":
+            if buffer.startswith(self._delimiter):
+                # Empty part without headers nor body
+                self._state = "preamble"
+                return True
+
+            if buffer.startswith(b"\r\n"):
+                # Part without headers
+                header_lines = b""
+                del buffer[:2]
+            else:
+                index = buffer.find(b"\r\n\r\n")
+
+                if index < 0:
+                    return False
+
+                header_lines = bytes(buffer[:index])
+                del buffer[: index + 4]
+
+            self._headers = self._parse_headers(header_lines)
+            self._search_from = 0
+            self._state = "body"
+
+        else:
+            # Body of a part, until the next delimiter
+            index = buffer.find(self._body_end, self._search_from)
+
+            if index < 0:
+                self._search_from = max(0, len(buffer) - len(self._body_end) + 1)
+                return False
+
+            parts.append((self._headers, bytes(buffer[:index])))
+
+            # Keep the delimiter for the preamble state
+            del buffer[: index + 2]
+            self._search_from = 0
+            self._state = "preamble"
+
+        return True
+
+    @staticmethod
+    def _parse_headers(header_lines: bytes) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+
+        if not header_lines:
+            return headers
+
+        for line in header_lines.decode("latin-1").split("\r\n"):
+            name, separator, value = line.partition(":")
+
+            if not separator:
+                raise TransportProtocolError(f"Invalid multipart header: {line!r}")
+
+            headers[name.strip().lower()] = value.strip()
+
+        return headers
+
+
+def parse_subscription_part(
+    body: bytes, json_codec: JSONCodec
+) -> Optional[ExecutionResult]:
+    """Returns the result contained in the body of a part of the multipart
+    subscription protocol, or None for the heartbeats and the invalid parts.
+
+    :param body: the body of the part
+    :param json_codec: the codec used to decode the body
+    :raises TransportServerError: if the part contains transport errors
+    """
+    body = body.strip()
+
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            "<<< %s",
+            ascii(
+                body.decode("utf-8", "replace") if body else "(empty body, skipping)"
+            ),
+        )
+
+    if not body:
+        return None
+
+    try:
+        data = json_codec.decode(body)
+    except UnicodeDecodeError as e:
+        log.warning(f"Failed to decode part: {ascii(e)}")
+        return None
+    except ValueError as e:
+        log.warning(f"Failed to parse JSON: {ascii(e)}, body: {ascii(body[:100])}")
+        return None
+
+    # Handle heartbeats - empty JSON objects
+    if not data:
+        log.debug("Received heartbeat, ignoring")
+        return None
+
+    # The multipart subscription protocol wraps data in a "payload" property
+    if "payload" not in data:
+        log.warning("Invalid response: missing 'payload' field")
+        return None
+
+    payload = data["payload"]
+
+    # Check for transport-level errors (payload is null)
+    if payload is None:
+        # If there are errors, this is a transport-level error
+        errors = data.get("errors")
+        if errors:
+            error_messages = [
+                error.get("message", "Unknown transport error") for error in errors
+            ]
+
+            for message in error_messages:
+                log.error(f"Transport error: {message}")
+
+            raise TransportServerError("\n\n".join(error_messages))
+        else:
+            # Null payload without errors - just skip this part
+            return None
+
+    # Extract GraphQL data from payload
+    return ExecutionResult(
+        data=payload.get("data"),
+        errors=payload.get("errors"),
+        extensions=payload.get("extensions"),
+    )
+
+
+def get_multipart_boundary(content_type: str) -> Tuple[str, bool]:
+    """Returns the boundary of a multipart response and True if it is
+    an incremental delivery response, False for the subscription protocol.
+
+    :raises TransportProtocolError: if the response is not a multipart response
+    """
+    media_type, params = parse_content_type(content_type)
+    boundary = params.get("boundary")
+
+    if media_type != "multipart/mixed" or not boundary:
+        raise TransportProtocolError(
+            f"Unexpected content-type: {content_type}. "
+            "Server may not support the multipart subscription protocol."
+        )
+
+    subscription_spec = params.get("subscriptionspec")
+
+    if subscription_spec is None:
+        return boundary, True
+
+    if not subscription_spec.startswith("1.0"):
+        raise TransportProtocolError(
+            f"Unexpected content-type: {content_type}. "
+            "Server may not support the multipart subscription protocol."
+        )
+
+    return boundary, False
+
+
+def _check_part_content_type(headers: Mapping[str, str]) -> None:
+    content_type = headers.get("content-type", "")
+    if not content_type.startswith("application/json"):
+        raise TransportProtocolError(
+            f"Unexpected part content-type: {content_type}. "
+            "Expected 'application/json'."
+        )
+
+
+def parse_incremental_part(body: bytes, json_codec: JSONCodec) -> Optional[Any]:
+    """Returns the payload contained in the body of a part of an incremental
+    delivery response, or None for the empty parts and the heartbeats.
+
+    :param body: the body of the part
+    :param json_codec: the codec used to decode the body
+    :raises TransportProtocolError: if the body is not valid JSON, since
+        the next patches could not be merged without it
+    """
+    body = body.strip()
+
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("<<< %s", body.decode("utf-8", "replace"))
+
+    if not body:
+        return None
+
+    try:
+        payload = json_codec.decode(body)
+    except ValueError as e:
+        raise TransportProtocolError(
+            f"Invalid JSON in incremental part: {ascii(body[:100])}"
+        ) from e
+
+    return payload or None
+
+
+async def parse_multipart_response(
+    chunks: AsyncIterable[bytes],
+    content_type: str,
+    json_codec: JSONCodec,
+    *,
+    raw_patches: bool = False,
+) -> AsyncGenerator[ExecutionResult, None]:
+    """Parse a streamed multipart response and yield its results
+    as soon as their part is received.
+
+    For an incremental delivery response, the result merged with all the patches
+    received is yielded after each part.
+
+    :param chunks: the chunks of the body of the response
+    :param content_type: the Content-Type header of the response
+    :param json_codec: the codec used to decode the parts
+    :param raw_patches: set to True to yield the payloads of an incremental
+        delivery response without merging them, as
+        :class:`IncrementalExecutionResult
+        <gql.transport.common.incremental.IncrementalExecutionResult>`
+    :raises TransportProtocolError: if the response is not valid
+    """
+    boundary, incremental = get_multipart_boundary(content_type)
+
+    parser = MultipartParser(boundary)
+    merger = IncrementalResultMerger()
+
+    async for chunk in chunks:
+        for headers, body in parser.feed(chunk):
+
+            _check_part_content_type(headers)
+
+            if not incremental:
+                result = parse_subscription_part(body, json_codec)
+                if result:
+                    yield result
+                continue
+
+            payload = parse_incremental_part(body, json_codec)
+
+            if payload is None:
+                continue
+
+            if raw_patches:
+                yield IncrementalExecutionResult.from_payload(payload)
+            else:
+                merger.merge(payload)
+                yield merger.get_result()
+
+        if parser.done:
+            return
+
+    raise TransportProtocolError("Incomplete multipart response")
+
+
+def merge_incremental_response(
+    body: bytes,
+    content_type: str,
+    json_codec: JSONCodec,
+) -> IncrementalResultMerger:
+    """Merge all the parts of a complete incremental delivery response.
+
+    :param body: the body of the response
+    :param content_type: the Content-Type header of the response
+    :param json_codec: the codec used to decode the parts
+    :raises TransportProtocolError: if the response is not valid
+    """
+    boundary, incremental = get_multipart_boundary(content_type)
+
+    if not incremental:
+        raise TransportProtocolError(
+            "Unexpected multipart subscription response for an execute request"
+        )
+
+    parser = MultipartParser(boundary)
+    merger = IncrementalResultMerger()
+
+    for headers, part_body in parser.feed(body):
+
+        _check_part_content_type(headers)
+
+        payload = parse_incremental_part(part_body, json_codec)
+
+        if payload is not None:
+            merger.merge(payload)
+
+    if not parser.done:
+        raise TransportProtocolError("Incomplete multipart response")
+
+    return merger
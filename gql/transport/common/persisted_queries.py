@@ -0,0 +1,149 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from graphql import ExecutionResult
+
+from ...graphql_request import GraphQLRequest
+from ...utils import LRUCache
+
+log = logging.getLogger(__name__)
+
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+
+# Error codes sent in the error extensions by some servers
+_ERROR_CODES = {
+    "PERSISTED_QUERY_NOT_FOUND": PERSISTED_QUERY_NOT_FOUND,
+    "PERSISTED_QUERY_NOT_SUPPORTED": PERSISTED_QUERY_NOT_SUPPORTED,
+}
+
+
+class PersistedQueryRequest(GraphQLRequest):
+    """GraphQL request sent using the `Automatic Persisted Queries`_ protocol.
+
+    The SHA-256 hash of the query is sent in the
+    :code:`extensions.persistedQuery` field of the payload.
+    The query itself is sent only if :code:`include_query` is True.
+
+    .. _Automatic Persisted Queries:
+        https://www.apollographql.com/docs/apollo-server/performance/apq
+    """
+
+    def __init__(self, request: GraphQLRequest, *, include_query: bool = False):
+        """:param request: the original request
+        :param include_query: whether the query should be sent with its hash
+        """
+        persisted_query = {"version": 1, "sha256Hash": request.query_hash}
+
+        super().__init__(
+            request,
+            extensions={
+                **(request.extensions or {}),
+                "persistedQuery": persisted_query,
+            },
+        )
+
+        self.include_query: bool = include_query
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        payload = super().payload
+
+        if not self.include_query:
+            del payload["query"]
+
+        return payload
+
+
+def _get_persisted_query_error(result: ExecutionResult) -> Optional[str]:
+    """Returns the name of the persisted query error in the result, if any."""
+
+    for error in result.errors or []:
+        if not isinstance(error, dict):
+            continue
+
+        message = error.get("message")
+        if message in (PERSISTED_QUERY_NOT_FOUND, PERSISTED_QUERY_NOT_SUPPORTED):
+            return message
+
+        code = (error.get("extensions") or {}).get("code")
+        if code in _ERROR_CODES:
+            return _ERROR_CODES[code]
+
+    return None
+
+
+class PersistedQueries:
+    """State of the Automatic Persisted Queries of an HTTP transport.
+
+    The requests are first sent with only the hash of their query.
+    If the server answers with a :code:`PersistedQueryNotFound` error,
+    the request is sent again with both the query and its hash, so that
+    the server can save the query for the next requests.
+
+    The hashes of the queries which have been accepted by the server are kept
+    in the :code:`acknowledged_hashes` cache.
+
+    If the server answers with a :code:`PersistedQueryNotSupported` error,
+    persisted queries are disabled and all the following requests are sent
+    with their full query.
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        """:param cache_size: maximum number of acknowledged hashes to keep"""
+        self.enabled: bool = True
+        self.acknowledged_hashes: LRUCache[str, bool] = LRUCache(maxsize=cache_size)
+
+    def get_request(
+        self, request: GraphQLRequest, *, include_query: bool = False
+    ) -> GraphQLRequest:
+        """Returns the request which should be sent to the server.
+
+        :param request: the original request
+        :param include_query: True if the query should be sent with its hash
+        """
+        if not self.enabled:
+            return request
+
+        return PersistedQueryRequest(request, include_query=include_query)
+
+    def process_result(self, request: GraphQLRequest, result: ExecutionResult) -> bool:
+        """Update the state with the result received for this request.
+
+        :param request: the original request
+        :param result: the result received from the server
+        :returns: True if the request should be sent again with its query
+        """
+        error = _get_persisted_query_error(result)
+
+        if error == PERSISTED_QUERY_NOT_SUPPORTED:
+            if self.enabled:
+                log.warning("Persisted queries are not supported by the server")
+                self.enabled = False
+            return True
+
+        query_hash = request.query_hash
+
+        if error == PERSISTED_QUERY_NOT_FOUND:
+            log.debug(f"Persisted query not found: {query_hash}")
+            self.acknowledged_hashes.discard(query_hash)
+            return True
+
+        if self.enabled:
+            self.acknowledged_hashes.set(query_hash, True)
+
+        return False
+
+    def get_batch_resend_indexes(
+        self, reqs: List[GraphQLRequest], results: List[ExecutionResult]
+    ) -> List[int]:
+        """Update the state with the results received for a batch.
+
+        :returns: the indexes of the requests which should be sent again
+            with their query
+        """
+        return [
+            index
+            for index, (req, result) in enumerate(zip(reqs, results))
+            if self.process_result(req, result)
+        ]
@@ -0,0 +1,152 @@
+"""Incremental parsing of the `Server-Sent Events`_ streams used by the
+`GraphQL over Server-Sent Events protocol`_.
+
+.. _Server-Sent Events:
+  https://html.spec.whatwg.org/multipage/server-sent-events.html
+.. _GraphQL over Server-Sent Events protocol:
+  https://github.com/enisdenjo/graphql-sse/blob/master/PROTOCOL.md
+"""
+
+from typing import List, Optional
+
+
+class SSEEvent:
+    """Event received in an event stream."""
+
+    __slots__ = ("event", "data", "id")
+
+    def __init__(self, event: str, data: bytes, id: Optional[str] = None):
+        """
+        :param event: the type of the event, "message" by default
+        :param data: the data of the event, the lines being separated by LF
+        :param id: the last event id of the stream when the event was received
+        """
+        self.event: str = event
+        self.data: bytes = data
+        self.id: Optional[str] = id
+
+    def __repr__(self) -> str:
+        return f"SSEEvent(event={self.event!r}, data={self.data!r}, id={self.id!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SSEEvent):
+            return NotImplemented
+        return (self.event, self.data, self.id) == (other.event, other.data, other.id)
+
+
+class SSEParser:
+    """Parse an event stream from the chunks received.
+
+    Only the incomplete last line of the received chunks is kept in a buffer,
+    the data of the events stays in bytes to be decoded by the JSON codec.
+    Lines can be separated by CRLF, LF or CR, as allowed by the specification.
+    """
+
+    def __init__(self) -> None:
+        self.last_event_id: Optional[str] = None
+        """Id of the last event received, sent in the Last-Event-ID header
+        to resume the stream after a reconnection."""
+
+        self.retry: Optional[int] = None
+        """Reconnection delay in milliseconds requested by the server."""
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard the incomplete line and event, to parse a new stream
+        after a reconnection.
+
+        The last event id and the reconnection delay are kept."""
+        self._buffer = bytearray()
+
+        # Skip the LF of a CRLF split between two chunks
+        self._skip_lf = False
+        self._first_line = True
+
+        self._event_type = ""
+        self._data: List[bytes] = []
+
+    def feed(self, data: bytes) -> List[SSEEvent]:
+        """Add a chunk of the stream and return the events completed by it.
+
+        :param data: the next chunk of the stream
+        :return: the list of complete events, which can be empty
+        """
+        if not data:
+            return []
+
+        if self._skip_lf and data[:1] == b"\n":
+            data = data[1:]
+
+        self._skip_lf = False
+
+        # Most chunks of a long line do not contain any line end
+        if b"\n" not in data and b"\r" not in data:
+            self._buffer += data
+            return []
+
+        self._buffer += data
+        lines = self._buffer.splitlines(keepends=True)
+
+        if lines[-1].endswith((b"\r", b"\n")):
+            self._buffer = bytearray()
+            self._skip_lf = lines[-1].endswith(b"\r")
+        else:
+            self._buffer = lines.pop()
+
+        events: List[SSEEvent] = []
+
+        for line in lines:
+            event = self._parse_line(bytes(line.rstrip(b"\r\n")))
+            if event is not None:
+                events.append(event)
+
+        return events
+
+    def _parse_line(self, line: bytes) -> Optional[SSEEvent]:
+
+        if self._first_line:
+            self._first_line = False
+            if line.startswith(b"\xef\xbb\xbf"):
+                line = line[3:]
+
+        if not line:
+            return self._dispatch()
+
+        if line.startswith(b":"):
+            # Comment, used by the servers to keep the connection alive
+            return None
+
+        name, _, value = line.partition(b":")
+
+        if value.startswith(b" "):
+            value = value[1:]
+
+        if name == b"data":
+            self._data.append(value)
+        elif name == b"event":
+            self._event_type = value.decode("utf-8", "replace")
+        elif name == b"id":
+            if b"\0" not in value:
+                self.last_event_id = value.decode("utf-8", "replace")
+        elif name == b"retry":
+            if value.isdigit():
+                self.retry = int(value)
+
+        # Other fields are ignored
+
+        return None
+
+    def _dispatch(self) -> Optional[SSEEvent]:
+
+        event_type = self._event_type or "message"
+        data = self._data
+
+        self._event_type = ""
+        self._data = []
+
+        # The blocks without data are not dispatched
+        if not data:
+            return None
+
+        return SSEEvent(event_type, b"\n".join(data), self.last_event_id)
@@ -0,0 +1,37 @@
+from typing import Any, Dict, List, Mapping, Optional
+
+from graphql import ExecutionResult
+
+
+class HTTPExecutionResult(ExecutionResult):
+    """Result returned by the HTTP transports, with the metadata
+    of the HTTP response in which it was received.
+
+    The metadata of each request stays available in its result when
+    the same transport is used at the same time by several threads or tasks,
+    unlike the :code:`response_headers` attribute of the transport which only
+    contains the headers of the last response.
+    """
+
+    __slots__ = ("response_headers", "status_code")
+
+    def __init__(
+        self,
+        data: Optional[Dict[str, Any]] = None,
+        errors: Optional[List[Any]] = None,
+        extensions: Optional[Dict[str, Any]] = None,
+        *,
+        response_headers: Optional[Mapping[str, str]] = None,
+        status_code: Optional[int] = None,
+    ):
+        """
+        :param data: the data of the GraphQL result
+        :param errors: the errors of the GraphQL result
+        :param extensions: the extensions of the GraphQL result
+        :param response_headers: the headers of the HTTP response
+        :param status_code: the status code of the HTTP response
+        """
+        super().__init__(data=data, errors=errors, extensions=extensions)
+
+        self.response_headers: Optional[Mapping[str, str]] = response_headers
+        self.status_code: Optional[int] = status_code
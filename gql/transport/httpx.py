@@ -9,6 +9,7 @@ from typing import (
     List,
     NoReturn,
     Optional,
+    Sequence,
     Tuple,
     Type,
     Union,
@@ -21,31 +22,119 @@ except ModuleNotFoundError:  # pragma: no cover
 
 from graphql import ExecutionResult
 
+from ..compression import RequestCompressor, get_request_compressor
 from ..graphql_request import GraphQLRequest
+from ..json_codec import JSONCodec, get_json_codec
 from . import AsyncTransport, Transport
 from .common.batch import get_batch_execution_result_list
+from .common.http_get import DEFAULT_MAX_URL_LENGTH, get_query_url
+from .common.incremental import has_incremental_directives
+from .common.json_stream import parse_json_list_stream
+from .common.multipart import (
+    INCREMENTAL_ACCEPT_HEADER,
+    SUBSCRIPTION_ACCEPT_HEADER,
+    merge_incremental_response,
+    parse_content_type,
+    parse_multipart_response,
+)
+from .common.persisted_queries import PersistedQueries
 from .exceptions import (
     TransportAlreadyConnected,
     TransportClosed,
     TransportConnectionFailed,
+    TransportError,
     TransportProtocolError,
     TransportServerError,
 )
-from .file_upload import close_files, extract_files, open_files
+from .file_upload import FileVar, close_files, extract_files, open_files
+from .http_result import HTTPExecutionResult
 
 log = logging.getLogger(__name__)
 
 
+class HTTPXPoolStats:
+    """Utilization of the connection pool of an httpx transport."""
+
+    __slots__ = (
+        "active_connections",
+        "idle_connections",
+        "http2_connections",
+        "active_requests",
+        "waiting_requests",
+        "streams_per_connection",
+    )
+
+    def __init__(
+        self,
+        *,
+        active_connections: int,
+        idle_connections: int,
+        http2_connections: int,
+        active_requests: Optional[int],
+        waiting_requests: Optional[int],
+        streams_per_connection: Optional[List[int]],
+    ):
+        """
+        :param active_connections: number of connections with requests in flight,
+            or still connecting
+        :param idle_connections: number of connections kept alive without requests
+        :param http2_connections: number of connections using HTTP/2
+        :param active_requests: number of requests sent on a connection
+        :param waiting_requests: number of requests waiting for a connection,
+            because the pool limits are reached
+        :param streams_per_connection: number of requests in flight
+            on each connection of the pool, at most 1 with HTTP/1.1
+
+        The statistics of the requests are None if they are not available
+        with the installed version of httpcore.
+        """
+        self.active_connections: int = active_connections
+        self.idle_connections: int = idle_connections
+        self.http2_connections: int = http2_connections
+        self.active_requests: Optional[int] = active_requests
+        self.waiting_requests: Optional[int] = waiting_requests
+        self.streams_per_connection: Optional[List[int]] = streams_per_connection
+
+    @property
+    def connections(self) -> int:
+        """Number of connections of the pool."""
+        return self.active_connections + self.idle_connections
+
+    def __repr__(self) -> str:
+        return (
+            f"HTTPXPoolStats(active_connections={self.active_connections}, "
+            f"idle_connections={self.idle_connections}, "
+            f"http2_connections={self.http2_connections}, "
+            f"active_requests={self.active_requests}, "
+            f"waiting_requests={self.waiting_requests}, "
+            f"streams_per_connection={self.streams_per_connection})"
+        )
+
+
 class _HTTPXTransport:
     file_classes: Tuple[Type[Any], ...] = (io.IOBase,)
 
+    # Headers of the last response
+    # Use the response_headers attribute of the results instead
+    # if the transport is used by several threads or tasks
     response_headers: Optional[httpx.Headers] = None
 
+    client: Optional[Union[httpx.Client, httpx.AsyncClient]] = None
+
     def __init__(
         self,
         url: Union[str, httpx.URL],
         json_serialize: Callable = json.dumps,
         json_deserialize: Callable = json.loads,
+        persisted_queries: bool = False,
+        use_get_for_queries: bool = False,
+        max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+        pool_maxsize: Optional[int] = None,
+        json_codec: Optional[JSONCodec] = None,
+        http2: bool = False,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        request_compression: Optional[Union[str, RequestCompressor]] = None,
         **kwargs: Any,
     ):
         """Initialize the transport with the given httpx parameters.
@@ -55,49 +144,248 @@ class _HTTPXTransport:
                 By default json.dumps() function.
         :param json_deserialize: Json deserializer callable.
                 By default json.loads() function.
+        :param persisted_queries: Set to True to send the queries using the
+                :ref:`Automatic Persisted Queries <persisted_queries>` protocol.
+        :param use_get_for_queries: Set to True to send the query operations
+                with the :ref:`HTTP GET method <http_get>`.
+        :param max_url_length: Maximum length of the URL for GET requests.
+                Longer requests are sent with the POST method.
+        :param pool_maxsize: Maximum number of connections opened to the server,
+                which are all kept alive. Should be at least the number of threads
+                using the transport at the same time.
+                By default, use the limits of httpx or the limits argument.
+        :param json_codec: The :ref:`JSON codec <json_codecs>` used to encode
+                the requests and decode the answers.
+                By default, a codec using the json_serialize
+                and json_deserialize arguments.
+        :param http2: Set to True to use HTTP/2 when the server supports it,
+                multiplexing the concurrent requests over the same connections.
+                Requires the h2 package: :code:`pip install httpx[http2]`.
+        :param max_keepalive_connections: Maximum number of idle connections
+                kept alive. By default, pool_maxsize if it is set.
+        :param keepalive_expiry: Time in seconds after which an idle connection
+                is closed.
+        :param request_compression: Set to "gzip", "zstd" or a
+                :ref:`request compressor <request_compression>` to compress
+                the large bodies of the requests.
         :param kwargs: Extra args passed to the `httpx` client.
         """
         self.url = url
         self.json_serialize = json_serialize
         self.json_deserialize = json_deserialize
+        self.json_codec: JSONCodec = get_json_codec(
+            json_codec, json_serialize, json_deserialize
+        )
+        self.persisted_queries: Optional[PersistedQueries] = (
+            PersistedQueries() if persisted_queries else None
+        )
+        self.use_get_for_queries = use_get_for_queries
+        self.max_url_length = max_url_length
+        self.pool_maxsize = pool_maxsize
+        self.http2 = http2
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.request_compressor: Optional[RequestCompressor] = get_request_compressor(
+            request_compression
+        )
         self.kwargs = kwargs
 
+    def _get_client_args(self) -> Dict[str, Any]:
+        """Returns the arguments of the httpx client."""
+
+        client_args = dict(self.kwargs)
+
+        if self.http2:
+            client_args["http2"] = True
+
+        if (
+            self.pool_maxsize is None
+            and self.max_keepalive_connections is None
+            and self.keepalive_expiry is None
+        ):
+            return client_args
+
+        # Same defaults as httpx, unless a limits argument was provided
+        limits: httpx.Limits = client_args.get(
+            "limits",
+            httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+
+        max_connections = limits.max_connections
+        max_keepalive_connections = limits.max_keepalive_connections
+        keepalive_expiry = limits.keepalive_expiry
+
+        if self.pool_maxsize is not None:
+            max_connections = self.pool_maxsize
+            max_keepalive_connections = self.pool_maxsize
+
+        if self.max_keepalive_connections is not None:
+            max_keepalive_connections = self.max_keepalive_connections
+
+        if self.keepalive_expiry is not None:
+            keepalive_expiry = self.keepalive_expiry
+
+        client_args["limits"] = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+
+        return client_args
+
+    def get_pool_stats(self) -> Optional[HTTPXPoolStats]:
+        """Returns the utilization of the connection pool of the transport.
+
+        The requests in flight are counted for each connection of the pool,
+        to check that the concurrent requests are multiplexed with HTTP/2.
+
+        The statistics are best-effort: the pool and its requests are not part
+        of the public API of httpx, the statistics of the requests are None
+        if they cannot be found with the installed version of httpcore.
+
+        :return: the statistics of the pool, or None if the client uses
+            a custom transport instead of the httpx connection pool
+        :raises TransportClosed: if the transport is not connected
+        """
+        if self.client is None:
+            raise TransportClosed("Transport is not connected")
+
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+
+        if connections is None:
+            return None
+
+        connections = list(connections)
+
+        idle_connections = sum(1 for connection in connections if connection.is_idle())
+
+        active_requests: Optional[int] = None
+        waiting_requests: Optional[int] = None
+        streams_per_connection: Optional[List[int]] = None
+
+        requests = getattr(pool, "_requests", None)
+
+        if requests is not None:
+            requests = list(requests)
+
+            if all(
+                hasattr(request, "connection") and hasattr(request, "is_queued")
+                for request in requests
+            ):
+                streams_per_connection = [
+                    sum(1 for request in requests if request.connection is connection)
+                    for connection in connections
+                ]
+                waiting_requests = sum(1 for request in requests if request.is_queued())
+                active_requests = len(requests) - waiting_requests
+
+        return HTTPXPoolStats(
+            active_connections=len(connections) - idle_connections,
+            idle_connections=idle_connections,
+            http2_connections=sum(
+                1 for connection in connections if "HTTP/2" in connection.info()
+            ),
+            active_requests=active_requests,
+            waiting_requests=waiting_requests,
+            streams_per_connection=streams_per_connection,
+        )
+
     def _prepare_request(
         self,
         request: Union[GraphQLRequest, List[GraphQLRequest]],
         *,
         extra_args: Optional[Dict[str, Any]] = None,
         upload_files: bool = False,
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], Dict[str, FileVar]]:
+        """Returns the arguments of the request method
+        and the files to close after the request."""
 
-        payload: Union[Dict, List]
-        if isinstance(request, GraphQLRequest):
-            payload = request.payload
-        else:
-            payload = [req.payload for req in request]
+        files: Dict[str, FileVar] = {}
+        payload_str: Optional[str] = None
 
         if upload_files:
-            assert isinstance(payload, Dict)
             assert isinstance(request, GraphQLRequest)
-            post_args = self._prepare_file_uploads(request, payload)
+            post_args, files, payload_str = self._prepare_file_uploads(
+                request, request.payload
+            )
         else:
-            post_args = {"json": payload}
+            # The payload is encoded once, the logs reuse it
+            body = self.json_codec.encode_request(request)
+            post_args = {
+                "content": body,
+                "headers": {"Content-Type": "application/json"},
+            }
 
         # Log the payload
         if log.isEnabledFor(logging.DEBUG):
-            log.debug(">>> %s", self.json_serialize(payload))
+            log.debug(">>> %s", payload_str or body.decode("utf-8"))
 
         # Pass post_args to httpx post method
         if extra_args:
+            if "headers" in extra_args and "content" in post_args:
+                headers = httpx.Headers(extra_args["headers"])
+                headers.setdefault("Content-Type", "application/json")
+                extra_args = {**extra_args, "headers": headers}
+
             post_args.update(extra_args)
 
-        return post_args
+        return post_args, files
+
+    def _get_request_compressor(
+        self, post_args: Dict[str, Any]
+    ) -> Optional[RequestCompressor]:
+        """Returns the compressor of the encoded JSON body of a request,
+        or None if it should not be compressed."""
+
+        compressor = self.request_compressor
+        content = post_args.get("content")
+
+        if (
+            compressor is None
+            or not isinstance(content, bytes)
+            or not compressor.should_compress(content)
+        ):
+            return None
+
+        return compressor
+
+    @staticmethod
+    def _set_compressed_content(
+        post_args: Dict[str, Any], content: bytes, encoding: str
+    ) -> None:
+        headers = httpx.Headers(post_args.get("headers"))
+        headers["Content-Encoding"] = encoding
+
+        post_args["content"] = content
+        post_args["headers"] = headers
+
+    def _prepare_get_request(self, request: GraphQLRequest) -> Optional[str]:
+        """Returns the URL to send the request with the GET method
+        or None if the request should be sent with the POST method."""
+
+        if not self.use_get_for_queries:
+            return None
+
+        url = get_query_url(
+            str(self.url),
+            request,
+            json_serialize=self.json_codec.dumps,
+            max_url_length=self.max_url_length,
+        )
+
+        if url is not None:
+            log.debug(">>> GET %s", url)
+
+        return url
 
     def _prepare_file_uploads(
         self,
         request: GraphQLRequest,
         payload: Dict[str, Any],
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], Dict[str, FileVar], str]:
+        """Returns the arguments of the request method, the files to close
+        after the request and the encoded operations field."""
 
         variable_values = request.variable_values
 
@@ -113,7 +401,6 @@ class _HTTPXTransport:
 
         # Opening the files using the FileVar parameters
         open_files(list(files.values()))
-        self.files = files
 
         # Save the nulled variable values in the payload
         payload["variables"] = nulled_variable_values
@@ -140,16 +427,27 @@ class _HTTPXTransport:
                 file_streams[key] = (name, file_var.f, file_var.content_type)
 
         # Add the payload to the operations field
-        operations_str = self.json_serialize(payload)
+        operations_str = self.json_codec.dumps(payload)
         log.debug("operations %s", operations_str)
         data["operations"] = operations_str
 
         # Add the file map field
-        file_map_str = self.json_serialize(file_map)
+        file_map_str = self.json_codec.dumps(file_map)
         log.debug("file_map %s", file_map_str)
         data["map"] = file_map_str
 
-        return {"data": data, "files": file_streams}
+        return {"data": data, "files": file_streams}, files, operations_str
+
+    @staticmethod
+    def _add_incremental_accept_header(
+        request: GraphQLRequest, request_args: Dict[str, Any]
+    ) -> None:
+        """Accept the multipart answers of the queries using @defer or @stream."""
+
+        if has_incremental_directives(request._print_query()):
+            headers = httpx.Headers(request_args.get("headers"))
+            headers.setdefault("Accept", INCREMENTAL_ACCEPT_HEADER)
+            request_args["headers"] = headers
 
     def _get_json_result(self, response: httpx.Response) -> Any:
 
@@ -160,7 +458,7 @@ class _HTTPXTransport:
             log.debug("<<< %s", response.text)
 
         try:
-            result: Dict[str, Any] = self.json_deserialize(response.content)
+            result: Dict[str, Any] = self.json_codec.decode(response.content)
         except Exception:
             self._raise_response_error(response, "Not a JSON answer")
 
@@ -168,15 +466,42 @@ class _HTTPXTransport:
 
     def _prepare_result(self, response: httpx.Response) -> ExecutionResult:
 
+        content_type = response.headers.get("Content-Type", "")
+
+        if parse_content_type(content_type)[0] == "multipart/mixed":
+            return self._prepare_incremental_result(response, content_type)
+
         result = self._get_json_result(response)
 
         if "errors" not in result and "data" not in result:
             self._raise_response_error(response, 'No "data" or "errors" keys in answer')
 
-        return ExecutionResult(
+        return HTTPExecutionResult(
             errors=result.get("errors"),
             data=result.get("data"),
             extensions=result.get("extensions"),
+            response_headers=response.headers,
+            status_code=response.status_code,
+        )
+
+    def _prepare_incremental_result(
+        self, response: httpx.Response, content_type: str
+    ) -> ExecutionResult:
+        """Returns the result merged from all the parts of
+        an incremental delivery response."""
+
+        # Saving latest response headers in the transport
+        self.response_headers = response.headers
+
+        self._raise_transport_server_error_if_status_more_than_400(response)
+
+        merger = merge_incremental_response(
+            response.content, content_type, self.json_codec
+        )
+
+        return merger.get_result(
+            response_headers=response.headers,
+            status_code=response.status_code,
         )
 
     def _prepare_batch_result(
@@ -188,7 +513,12 @@ class _HTTPXTransport:
         answers = self._get_json_result(response)
 
         try:
-            return get_batch_execution_result_list(reqs, answers)
+            return get_batch_execution_result_list(
+                reqs,
+                answers,
+                response_headers=response.headers,
+                status_code=response.status_code,
+            )
         except TransportProtocolError:
             # Raise a TransportServerError if status > 400
             self._raise_transport_server_error_if_status_more_than_400(response)
@@ -234,7 +564,18 @@ class HTTPXTransport(Transport, _HTTPXTransport):
 
         log.debug("Connecting transport")
 
-        self.client = httpx.Client(**self.kwargs)
+        self.client = httpx.Client(**self._get_client_args())
+
+    def _compress_request(self, post_args: Dict[str, Any]) -> None:
+        """Compress the JSON body of a request if it is large."""
+        compressor = self._get_request_compressor(post_args)
+
+        if compressor is not None:
+            self._set_compressed_content(
+                post_args,
+                compressor.compress(post_args["content"]),
+                compressor.encoding,
+            )
 
     def execute(
         self,
@@ -259,19 +600,58 @@ class HTTPXTransport(Transport, _HTTPXTransport):
         if not self.client:
             raise TransportClosed("Transport is not connected")
 
-        post_args = self._prepare_request(
-            request,
-            extra_args=extra_args,
-            upload_files=upload_files,
-        )
+        apq = self.persisted_queries
+
+        if apq is None or upload_files:
+            return self._execute_request(
+                request, extra_args=extra_args, upload_files=upload_files
+            )
+
+        result = self._execute_request(apq.get_request(request), extra_args=extra_args)
+
+        if apq.process_result(request, result):
+            result = self._execute_request(
+                apq.get_request(request, include_query=True), extra_args=extra_args
+            )
+            apq.process_result(request, result)
+
+        return result
+
+    def _execute_request(
+        self,
+        request: GraphQLRequest,
+        *,
+        extra_args: Optional[Dict[str, Any]] = None,
+        upload_files: bool = False,
+    ) -> ExecutionResult:
+
+        assert self.client is not None
+
+        get_request = None if upload_files else self._prepare_get_request(request)
+        files: Dict[str, FileVar] = {}
+
+        if get_request is None:
+            method = "POST"
+            url = self.url
+            request_args, files = self._prepare_request(
+                request,
+                extra_args=extra_args,
+                upload_files=upload_files,
+            )
+            self._compress_request(request_args)
+        else:
+            method = "GET"
+            url = get_request
+            request_args = dict(extra_args) if extra_args else {}
+
+        self._add_incremental_accept_header(request, request_args)
 
         try:
-            response = self.client.post(self.url, **post_args)
+            response = self.client.request(method, url, **request_args)
         except Exception as e:
             raise TransportConnectionFailed(str(e)) from e
         finally:
-            if upload_files:
-                close_files(list(self.files.values()))
+            close_files(list(files.values()))
 
         return self._prepare_result(response)
 
@@ -296,10 +676,46 @@ class HTTPXTransport(Transport, _HTTPXTransport):
         if not self.client:
             raise TransportClosed("Transport is not connected")
 
-        post_args = self._prepare_request(
+        apq = self.persisted_queries
+
+        if apq is None:
+            return self._execute_batch_request(reqs, extra_args=extra_args)
+
+        results = self._execute_batch_request(
+            [apq.get_request(req) for req in reqs], extra_args=extra_args
+        )
+
+        # Send again, with their query, only the requests which were not found
+        indexes = apq.get_batch_resend_indexes(reqs, results)
+
+        if indexes:
+            resent_reqs = [reqs[index] for index in indexes]
+
+            resent_results = self._execute_batch_request(
+                [apq.get_request(req, include_query=True) for req in resent_reqs],
+                extra_args=extra_args,
+            )
+            apq.get_batch_resend_indexes(resent_reqs, resent_results)
+
+            for index, result in zip(indexes, resent_results):
+                results[index] = result
+
+        return results
+
+    def _execute_batch_request(
+        self,
+        reqs: List[GraphQLRequest],
+        *,
+        extra_args: Optional[Dict[str, Any]] = None,
+    ) -> List[ExecutionResult]:
+
+        assert self.client is not None
+
+        post_args, _ = self._prepare_request(
             reqs,
             extra_args=extra_args,
         )
+        self._compress_request(post_args)
 
         try:
             response = self.client.post(self.url, **post_args)
@@ -330,7 +746,19 @@ class HTTPXAsyncTransport(AsyncTransport, _HTTPXTransport):
 
         log.debug("Connecting transport")
 
-        self.client = httpx.AsyncClient(**self.kwargs)
+        self.client = httpx.AsyncClient(**self._get_client_args())
+
+    async def _compress_request(self, post_args: Dict[str, Any]) -> None:
+        """Compress the JSON body of a request, in a worker thread
+        if it is large, to not block the event loop."""
+        compressor = self._get_request_compressor(post_args)
+
+        if compressor is not None:
+            self._set_compressed_content(
+                post_args,
+                await compressor.compress_async(post_args["content"]),
+                compressor.encoding,
+            )
 
     async def execute(
         self,
@@ -356,19 +784,60 @@ class HTTPXAsyncTransport(AsyncTransport, _HTTPXTransport):
         if not self.client:
             raise TransportClosed("Transport is not connected")
 
-        post_args = self._prepare_request(
-            request,
-            extra_args=extra_args,
-            upload_files=upload_files,
+        apq = self.persisted_queries
+
+        if apq is None or upload_files:
+            return await self._execute_request(
+                request, extra_args=extra_args, upload_files=upload_files
+            )
+
+        result = await self._execute_request(
+            apq.get_request(request), extra_args=extra_args
         )
 
+        if apq.process_result(request, result):
+            result = await self._execute_request(
+                apq.get_request(request, include_query=True), extra_args=extra_args
+            )
+            apq.process_result(request, result)
+
+        return result
+
+    async def _execute_request(
+        self,
+        request: GraphQLRequest,
+        *,
+        extra_args: Optional[Dict[str, Any]] = None,
+        upload_files: bool = False,
+    ) -> ExecutionResult:
+
+        assert self.client is not None
+
+        get_request = None if upload_files else self._prepare_get_request(request)
+        files: Dict[str, FileVar] = {}
+
+        if get_request is None:
+            method = "POST"
+            url = self.url
+            request_args, files = self._prepare_request(
+                request,
+                extra_args=extra_args,
+                upload_files=upload_files,
+            )
+            await self._compress_request(request_args)
+        else:
+            method = "GET"
+            url = get_request
+            request_args = dict(extra_args) if extra_args else {}
+
+        self._add_incremental_accept_header(request, request_args)
+
         try:
-            response = await self.client.post(self.url, **post_args)
+            response = await self.client.request(method, url, **request_args)
         except Exception as e:
             raise TransportConnectionFailed(str(e)) from e
         finally:
-            if upload_files:
-                close_files(list(self.files.values()))
+            close_files(list(files.values()))
 
         return self._prepare_result(response)
 
@@ -393,10 +862,46 @@ class HTTPXAsyncTransport(AsyncTransport, _HTTPXTransport):
         if not self.client:
             raise TransportClosed("Transport is not connected")
 
-        post_args = self._prepare_request(
+        apq = self.persisted_queries
+
+        if apq is None:
+            return await self._execute_batch_request(reqs, extra_args=extra_args)
+
+        results = await self._execute_batch_request(
+            [apq.get_request(req) for req in reqs], extra_args=extra_args
+        )
+
+        # Send again, with their query, only the requests which were not found
+        indexes = apq.get_batch_resend_indexes(reqs, results)
+
+        if indexes:
+            resent_reqs = [reqs[index] for index in indexes]
+
+            resent_results = await self._execute_batch_request(
+                [apq.get_request(req, include_query=True) for req in resent_reqs],
+                extra_args=extra_args,
+            )
+            apq.get_batch_resend_indexes(resent_reqs, resent_results)
+
+            for index, result in zip(indexes, resent_results):
+                results[index] = result
+
+        return results
+
+    async def _execute_batch_request(
+        self,
+        reqs: List[GraphQLRequest],
+        *,
+        extra_args: Optional[Dict[str, Any]] = None,
+    ) -> List[ExecutionResult]:
+
+        assert self.client is not None
+
+        post_args, _ = self._prepare_request(
             reqs,
             extra_args=extra_args,
         )
+        await self._compress_request(post_args)
 
         try:
             response = await self.client.post(self.url, **post_args)
@@ -405,15 +910,114 @@ class HTTPXAsyncTransport(AsyncTransport, _HTTPXTransport):
 
         return self._prepare_batch_result(reqs, response)
 
-    def subscribe(
+    async def subscribe(
         self,
         request: GraphQLRequest,
+        *,
+        extra_args: Optional[Dict[str, Any]] = None,
+        raw_patches: bool = False,
     ) -> AsyncGenerator[ExecutionResult, None]:
-        """Subscribe is not supported on HTTP.
+        """Execute a GraphQL subscription and yield results from multipart response.
+
+        The parts of the response are parsed as soon as they are received,
+        using the `multipart subscription protocol`_.
+        For the queries using the @defer or @stream directives, the result merged
+        with the patches received so far is yielded after each part.
 
-        :meta private:
+        :param request: GraphQL request to execute
+        :param extra_args: additional arguments to send to the httpx post method
+        :param raw_patches: set to True to yield the payloads of an incremental
+            delivery response without merging them
+        :yields: ExecutionResult objects as they arrive in the multipart stream
+
+        .. _multipart subscription protocol:
+          https://www.apollographql.com/docs/graphos/routing/operations/subscriptions/multipart-protocol
         """
-        raise NotImplementedError("The HTTP transport does not support subscriptions")
+        if not self.client:
+            raise TransportClosed("Transport is not connected")
+
+        post_args, _ = self._prepare_request(request, extra_args=extra_args)
+        await self._compress_request(post_args)
+
+        headers = httpx.Headers(post_args.get("headers"))
+        headers["Accept"] = SUBSCRIPTION_ACCEPT_HEADER
+        post_args["headers"] = headers
+
+        try:
+            async with self.client.stream("POST", self.url, **post_args) as response:
+                # Saving latest response headers in the transport
+                self.response_headers = response.headers
+
+                if response.status_code >= 400:
+                    await response.aread()
+                    self._raise_transport_server_error_if_status_more_than_400(response)
+
+                content_type = response.headers.get("Content-Type", "")
+
+                if parse_content_type(content_type)[0] == "application/json":
+                    await response.aread()
+                    yield self._prepare_result(response)
+                    return
+
+                async for result in parse_multipart_response(
+                    response.aiter_bytes(),
+                    content_type,
+                    self.json_codec,
+                    raw_patches=raw_patches,
+                ):
+                    yield result
+
+        except TransportError:
+            raise
+        except Exception as e:
+            raise TransportConnectionFailed(str(e)) from e
+
+    async def execute_stream(
+        self,
+        request: GraphQLRequest,
+        path: Union[str, Sequence[Union[str, int]]],
+        *,
+        extra_args: Optional[Dict[str, Any]] = None,
+    ) -> AsyncGenerator[Any, None]:
+        """Execute a query and yield the items of a list of its result
+        as soon as they are received, without buffering the whole answer.
+
+        Don't call this method directly on the transport, instead use
+        :code:`execute_stream` on a session.
+
+        :param request: GraphQL request as a
+                        :class:`GraphQLRequest <gql.GraphQLRequest>` object.
+        :param path: path of the list in the answer,
+            like :code:`"data.orders.edges"`
+        :param extra_args: additional arguments to send to the httpx post method
+        :yields: the items of the list, decoded by the JSON codec
+        :raises TransportQueryError: if the answer contains errors,
+            after the items received
+        """
+        if not self.client:
+            raise TransportClosed("Transport is not connected")
+
+        post_args, _ = self._prepare_request(request, extra_args=extra_args)
+        await self._compress_request(post_args)
+
+        try:
+            async with self.client.stream("POST", self.url, **post_args) as response:
+                # Saving latest response headers in the transport
+                self.response_headers = response.headers
+
+                if response.status_code >= 400:
+                    await response.aread()
+                    self._raise_transport_server_error_if_status_more_than_400(response)
+
+                async for item in parse_json_list_stream(
+                    response.aiter_bytes(), path, self.json_codec
+                ):
+                    yield item
+
+        except TransportError:
+            raise
+        except Exception as e:
+            raise TransportConnectionFailed(str(e)) from e
 
     async def close(self):
         """Closing the transport by closing the inner session"""
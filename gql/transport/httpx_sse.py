@@ -0,0 +1,566 @@
+import asyncio
+import logging
+from contextlib import suppress
+from typing import Any, AsyncGenerator, Dict, Optional, Union
+
+try:
+    import httpx2 as httpx
+except ModuleNotFoundError:  # pragma: no cover
+    import httpx  # type: ignore[no-redef]
+
+from graphql import ExecutionResult
+
+from ..graphql_request import GraphQLRequest
+from ..json_codec import JSONCodec
+from .async_transport import AsyncTransport
+from .common.listener_queue import ListenerQueue
+from .common.multipart import parse_content_type
+from .common.sse import SSEEvent, SSEParser
+from .exceptions import (
+    TransportAlreadyConnected,
+    TransportClosed,
+    TransportConnectionFailed,
+    TransportError,
+    TransportProtocolError,
+    TransportQueryError,
+)
+from .httpx import _HTTPXTransport
+
+log = logging.getLogger(__name__)
+
+
+class HTTPXSSETransport(AsyncTransport, _HTTPXTransport):
+    """:ref:`Async Transport <async_transports>` used to execute GraphQL queries
+    and subscriptions on remote servers with the
+    `GraphQL over Server-Sent Events protocol`_.
+
+    The transport uses the httpx library. By default, each operation is sent
+    in its own HTTP request, with its results streamed in the response
+    (distinct connections mode). With :code:`single_connection=True`,
+    the results of all the operations are received in a single event stream.
+
+    .. _GraphQL over Server-Sent Events protocol:
+      https://github.com/enisdenjo/graphql-sse/blob/master/PROTOCOL.md
+    """
+
+    TOKEN_HEADER = "X-GraphQL-Event-Stream-Token"
+
+    client: Optional[httpx.AsyncClient] = None
+
+    def __init__(
+        self,
+        url: Union[str, httpx.URL],
+        *,
+        single_connection: bool = False,
+        reconnect_attempts: int = 3,
+        reconnect_delay: float = 1.0,
+        pool_maxsize: Optional[int] = None,
+        json_codec: Optional[JSONCodec] = None,
+        **kwargs: Any,
+    ):
+        """Initialize the transport with the given httpx parameters.
+
+        :param url: The GraphQL server URL. Example: 'https://server.com:PORT/path'.
+        :param single_connection: Set to True to receive the results of all the
+                operations in a single event stream, opened at the connection.
+        :param reconnect_attempts: Number of consecutive reconnections without
+                receiving any event, after which the event stream is considered
+                lost. In distinct connections mode, the stream of an operation
+                is only reconnected if the server sent event ids.
+        :param reconnect_delay: Delay in seconds before a reconnection,
+                if the server did not send a retry field.
+        :param pool_maxsize: Maximum number of connections opened to the server.
+                By default, use the limits of httpx or the limits argument.
+        :param json_codec: The :ref:`JSON codec <json_codecs>` used to encode
+                the requests and decode the events.
+        :param kwargs: Extra args passed to the `httpx` client.
+                Use :code:`http2=True` to multiplex the event streams
+                of the distinct connections mode in a single HTTP/2 connection.
+        """
+        super().__init__(
+            url,
+            pool_maxsize=pool_maxsize,
+            json_codec=json_codec,
+            **kwargs,
+        )
+
+        self.single_connection: bool = single_connection
+        self.reconnect_attempts: int = reconnect_attempts
+        self.reconnect_delay: float = reconnect_delay
+
+        self.next_query_id: int = 1
+        self.listeners: Dict[int, ListenerQueue] = {}
+
+        # Token and task of the event stream in single connection mode
+        self.token: Optional[str] = None
+        self.receive_data_task: Optional[asyncio.Future] = None
+
+        self.close_exception: Optional[Exception] = None
+
+    def _get_client_args(self) -> Dict[str, Any]:
+        client_args = super()._get_client_args()
+
+        # The events of a subscription can be separated by long delays
+        client_args.setdefault("timeout", httpx.Timeout(5.0, read=None))
+
+        return client_args
+
+    async def connect(self) -> None:
+        """Create the httpx client and, in single connection mode,
+        reserve and open the event stream."""
+        if self.client:
+            raise TransportAlreadyConnected("Transport is already connected")
+
+        log.debug("Connecting transport")
+
+        self.client = httpx.AsyncClient(**self._get_client_args())
+        self.next_query_id = 1
+        self.close_exception = None
+
+        if self.single_connection:
+            try:
+                self.token = await self._reserve_event_stream()
+                response = await self._connect_event_stream(None)
+            except BaseException:
+                await self.close()
+                raise
+
+            self.receive_data_task = asyncio.ensure_future(
+                self._receive_data_loop(response)
+            )
+
+    async def _reserve_event_stream(self) -> str:
+        """Reserve the event stream of the single connection mode
+        and return its token."""
+        assert self.client is not None
+
+        try:
+            response = await self.client.put(self.url)
+        except Exception as e:
+            raise TransportConnectionFailed(str(e)) from e
+
+        self._raise_transport_server_error_if_status_more_than_400(response)
+
+        if response.status_code != 201:
+            raise TransportProtocolError(
+                f"Event stream reservation failed with status {response.status_code}"
+            )
+
+        return response.text
+
+    async def _connect_event_stream(
+        self, last_event_id: Optional[str]
+    ) -> httpx.Response:
+        """Open the event stream of the single connection mode."""
+        assert self.client is not None and self.token is not None
+
+        headers = {"Accept": "text/event-stream", self.TOKEN_HEADER: self.token}
+
+        if last_event_id is not None:
+            headers["Last-Event-ID"] = last_event_id
+
+        request = self.client.build_request("GET", self.url, headers=headers)
+
+        try:
+            response = await self.client.send(request, stream=True)
+        except Exception as e:
+            raise TransportConnectionFailed(str(e)) from e
+
+        try:
+            await self._check_event_stream(response)
+        except BaseException:
+            await response.aclose()
+            raise
+
+        return response
+
+    async def _check_event_stream(self, response: httpx.Response) -> None:
+        """Raise an exception if the response is not an event stream."""
+
+        # Saving latest response headers in the transport
+        self.response_headers = response.headers
+
+        if response.status_code >= 400:
+            await response.aread()
+            self._raise_transport_server_error_if_status_more_than_400(response)
+
+        content_type = response.headers.get("Content-Type", "")
+
+        if parse_content_type(content_type)[0] != "text/event-stream":
+            raise TransportProtocolError(
+                f"Unexpected content-type: {content_type}. "
+                "Server may not support the GraphQL over SSE protocol."
+            )
+
+    def _get_reconnect_delay(self, parser: SSEParser) -> float:
+        if parser.retry is not None:
+            return parser.retry / 1000
+        return self.reconnect_delay
+
+    async def _receive_data_loop(self, response: Optional[httpx.Response]) -> None:
+        """Task receiving the events of the single connection mode,
+        which reconnects the event stream if it is closed."""
+        parser = SSEParser()
+        attempts = 0
+
+        try:
+            while True:
+                try:
+                    if response is None:
+                        response = await self._connect_event_stream(
+                            parser.last_event_id
+                        )
+
+                    async for chunk in response.aiter_bytes():
+                        for event in parser.feed(chunk):
+                            attempts = 0
+                            await self._handle_event(event)
+
+                    log.debug("Event stream closed by the server")
+
+                    error: TransportError = TransportConnectionFailed(
+                        "Event stream closed by the server"
+                    )
+
+                except TransportConnectionFailed as e:
+                    error = e
+
+                except httpx.HTTPError as e:
+                    error = TransportConnectionFailed(str(e))
+                    error.__cause__ = e
+
+                finally:
+                    if response is not None:
+                        await response.aclose()
+                        response = None
+
+                if attempts >= self.reconnect_attempts:
+                    raise error
+
+                attempts += 1
+                parser.reset()
+
+                delay = self._get_reconnect_delay(parser)
+                log.debug(f"Reconnecting the event stream in {delay} seconds")
+
+                await asyncio.sleep(delay)
+
+        except TransportError as e:
+            await self._fail(e)
+
+        finally:
+            log.debug("Exiting _receive_data_loop()")
+
+    async def _handle_event(self, event: SSEEvent) -> None:
+        """Put the result of an event of the single connection mode
+        in the queue of its operation."""
+
+        if event.event not in ("next", "complete"):
+            log.debug(f"Ignoring event of type {event.event!r}")
+            return
+
+        message = self._decode_event(event)
+
+        try:
+            query_id = int(message["id"])
+        except (TypeError, KeyError, ValueError) as e:
+            raise TransportProtocolError(
+                f"Invalid {event.event} event: missing operation id"
+            ) from e
+
+        listener = self.listeners.get(query_id)
+
+        # Do nothing if no one is listening to this operation
+        if listener is None:
+            return
+
+        if event.event == "next":
+            result = self._get_execution_result(message.get("payload"))
+            await listener.put(("data", result))
+        else:
+            await listener.put(("complete", None))
+
+    def _decode_event(self, event: SSEEvent) -> Any:
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("<<< %s %s", event.event, event.data.decode("utf-8", "replace"))
+
+        try:
+            return self.json_codec.decode(event.data)
+        except ValueError as e:
+            raise TransportProtocolError(
+                f"Invalid JSON in {event.event} event: {event.data[:100]!r}"
+            ) from e
+
+    @staticmethod
+    def _get_execution_result(result: Any) -> ExecutionResult:
+
+        if not isinstance(result, dict) or (
+            "data" not in result and "errors" not in result
+        ):
+            raise TransportProtocolError(
+                f"Server did not return a GraphQL result: {result!r}"
+            )
+
+        return ExecutionResult(
+            data=result.get("data"),
+            errors=result.get("errors"),
+            extensions=result.get("extensions"),
+        )
+
+    async def _fail(self, e: Exception) -> None:
+        """Send the exception to all the operations of the single connection mode.
+
+        The transport cannot be used anymore until it is connected again."""
+        log.debug(f"_fail: {e!r}")
+
+        self.close_exception = e
+
+        for listener in self.listeners.values():
+            await listener.set_exception(e)
+
+    async def execute(
+        self,
+        request: GraphQLRequest,
+        *,
+        extra_args: Optional[Dict[str, Any]] = None,
+    ) -> ExecutionResult:
+        """Execute the provided request against the configured remote server.
+
+        The operation is executed as a subscription, returning its first result.
+
+        :param request: GraphQL request as a
+                        :class:`GraphQLRequest <gql.GraphQLRequest>` object.
+        :param extra_args: additional arguments to send to the httpx post method
+        :return: The result of execution.
+        """
+        first_result = None
+
+        generator = self.subscribe(request, extra_args=extra_args, send_stop=False)
+
+        async for result in generator:
+            first_result = result
+            break
+
+        await generator.aclose()
+
+        if first_result is None:
+            raise TransportQueryError(
+                "Query completed without any answer received from the server"
+            )
+
+        return first_result
+
+    def subscribe(
+        self,
+        request: GraphQLRequest,
+        *,
+        extra_args: Optional[Dict[str, Any]] = None,
+        send_stop: bool = True,
+    ) -> AsyncGenerator[ExecutionResult, None]:
+        """Execute a GraphQL request and yield its results as they are received.
+
+        The request can be a query, a mutation or a subscription.
+
+        :param request: GraphQL request as a
+                        :class:`GraphQLRequest <gql.GraphQLRequest>` object.
+        :param extra_args: additional arguments to send to the httpx post method
+        :param send_stop: in single connection mode, set to False to not ask the
+                server to stop the operation if the generator is closed early
+        :yields: ExecutionResult objects as they arrive in the event stream
+        """
+        if self.single_connection:
+            return self._subscribe_single_connection(
+                request, extra_args=extra_args, send_stop=send_stop
+            )
+
+        return self._subscribe_distinct_connection(request, extra_args=extra_args)
+
+    async def _subscribe_distinct_connection(
+        self,
+        request: GraphQLRequest,
+        *,
+        extra_args: Optional[Dict[str, Any]],
+    ) -> AsyncGenerator[ExecutionResult, None]:
+        """Send the request and parse the event stream of its response.
+
+        The stream is reconnected if it is closed before the complete event
+        and the server sent event ids to resume it."""
+        if not self.client:
+            raise TransportClosed("Transport is not connected")
+
+        post_args, _ = self._prepare_request(request, extra_args=extra_args)
+
+        headers = httpx.Headers(post_args.get("headers"))
+        headers["Accept"] = "text/event-stream"
+        post_args["headers"] = headers
+
+        parser = SSEParser()
+        attempts = 0
+
+        while True:
+            if parser.last_event_id is not None:
+                headers["Last-Event-ID"] = parser.last_event_id
+
+            try:
+                async with self.client.stream(
+                    "POST", self.url, **post_args
+                ) as response:
+                    content_type = response.headers.get("Content-Type", "")
+
+                    if (
+                        response.status_code < 400
+                        and parse_content_type(content_type)[0] == "application/json"
+                    ):
+                        await response.aread()
+                        yield self._prepare_result(response)
+                        return
+
+                    await self._check_event_stream(response)
+
+                    async for chunk in response.aiter_bytes():
+                        for event in parser.feed(chunk):
+                            attempts = 0
+
+                            if event.event == "complete":
+                                return
+
+                            if event.event == "next":
+                                yield self._get_execution_result(
+                                    self._decode_event(event)
+                                )
+
+                error: TransportError = TransportConnectionFailed(
+                    "Event stream closed before the complete event"
+                )
+
+            except TransportError:
+                raise
+
+            except Exception as e:
+                error = TransportConnectionFailed(str(e))
+                error.__cause__ = e
+
+            if parser.last_event_id is None or attempts >= self.reconnect_attempts:
+                raise error
+
+            attempts += 1
+            parser.reset()
+
+            delay = self._get_reconnect_delay(parser)
+            log.debug(f"Reconnecting the event stream in {delay} seconds")
+
+            await asyncio.sleep(delay)
+
+    async def _subscribe_single_connection(
+        self,
+        request: GraphQLRequest,
+        *,
+        extra_args: Optional[Dict[str, Any]],
+        send_stop: bool,
+    ) -> AsyncGenerator[ExecutionResult, None]:
+        """Send the request with an operation id and receive its results
+        from the queue filled by the receive data task."""
+        if not self.client:
+            raise TransportClosed("Transport is not connected")
+
+        if self.close_exception is not None:
+            raise self.close_exception
+
+        query_id = self.next_query_id
+        self.next_query_id += 1
+
+        # Create a queue to receive the answers for this query_id
+        listener = ListenerQueue(query_id, send_stop=send_stop)
+        self.listeners[query_id] = listener
+
+        try:
+            await self._send_operation(request, query_id, extra_args=extra_args)
+
+            while True:
+                answer_type, execution_result = await listener.get()
+
+                if execution_result is not None:
+                    yield execution_result
+
+                elif answer_type == "complete":
+                    log.debug(f"Complete received for operation {query_id}")
+                    break
+
+        except (asyncio.CancelledError, GeneratorExit) as e:
+            log.debug(f"Exception in subscribe: {e!r}")
+            if listener.send_stop:
+                await self._stop_operation(query_id)
+                listener.send_stop = False
+            raise e
+
+        finally:
+            del self.listeners[query_id]
+
+    async def _send_operation(
+        self,
+        request: GraphQLRequest,
+        query_id: int,
+        *,
+        extra_args: Optional[Dict[str, Any]],
+    ) -> None:
+        """Send an operation whose results will be received in the event stream."""
+        assert self.client is not None and self.token is not None
+
+        request = GraphQLRequest(
+            request,
+            extensions={**(request.extensions or {}), "operationId": str(query_id)},
+        )
+
+        post_args, _ = self._prepare_request(request, extra_args=extra_args)
+
+        headers = httpx.Headers(post_args.get("headers"))
+        headers[self.TOKEN_HEADER] = self.token
+        post_args["headers"] = headers
+
+        try:
+            response = await self.client.post(self.url, **post_args)
+        except Exception as e:
+            raise TransportConnectionFailed(str(e)) from e
+
+        self._raise_transport_server_error_if_status_more_than_400(response)
+
+        if response.status_code != 202:
+            raise TransportProtocolError(
+                f"Operation not accepted by the server: status {response.status_code}"
+            )
+
+    async def _stop_operation(self, query_id: int) -> None:
+        """Ask the server to stop an operation of the single connection mode."""
+        if self.client is None or self.token is None:
+            return
+
+        log.debug(f"Stopping operation {query_id}")
+
+        try:
+            await self.client.delete(
+                self.url,
+                params={"operationId": str(query_id)},
+                headers={self.TOKEN_HEADER: self.token},
+            )
+        except Exception as e:
+            log.warning(f"Failed to stop operation {query_id}: {e!r}")
+
+    async def close(self) -> None:
+        """Close the event stream and the httpx client.
+
+        The operations still running receive a TransportClosed exception."""
+        if self.receive_data_task is not None:
+            self.receive_data_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.receive_data_task
+            self.receive_data_task = None
+
+        if self.listeners:
+            await self._fail(TransportClosed("Transport closed by user"))
+
+        self.token = None
+
+        if self.client:
+            await self.client.aclose()
+            self.client = None
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 from typing import Any, Dict, Optional, Tuple, Union
 
@@ -90,7 +89,7 @@ class PhoenixChannelWebsocketsTransport(SubscriptionTransportBase):
         query_id = self.next_query_id
         self.next_query_id += 1
 
-        init_message = json.dumps(
+        init_message = self.json_codec.encode(
             {
                 "topic": self.channel_name,
                 "event": "phx_join",
@@ -119,7 +118,7 @@ class PhoenixChannelWebsocketsTransport(SubscriptionTransportBase):
                     self.next_query_id += 1
 
                     await self._send(
-                        json.dumps(
+                        self.json_codec.encode(
                             {
                                 "topic": "phoenix",
                                 "event": "heartbeat",
@@ -147,7 +146,7 @@ class PhoenixChannelWebsocketsTransport(SubscriptionTransportBase):
 
         # Save the ref so it can be matched in the reply
         self.subscriptions[subscription_id].unsubscribe_id = unsubscribe_query_id
-        unsubscribe_message = json.dumps(
+        unsubscribe_message = self.json_codec.encode(
             {
                 "topic": self.channel_name,
                 "event": "unsubscribe",
@@ -167,7 +166,7 @@ class PhoenixChannelWebsocketsTransport(SubscriptionTransportBase):
         query_id = self.next_query_id
         self.next_query_id += 1
 
-        connection_terminate_message = json.dumps(
+        connection_terminate_message = self.json_codec.encode(
             {
                 "topic": self.channel_name,
                 "event": "phx_leave",
@@ -195,7 +194,7 @@ class PhoenixChannelWebsocketsTransport(SubscriptionTransportBase):
         query_id = self.next_query_id
         self.next_query_id += 1
 
-        query_str = json.dumps(
+        query_str = self.json_codec.encode(
             {
                 "topic": self.channel_name,
                 "event": "doc",
@@ -269,7 +268,7 @@ class PhoenixChannelWebsocketsTransport(SubscriptionTransportBase):
             return d
 
         try:
-            json_answer = json.loads(answer)
+            json_answer = self.json_codec.decode(answer)
 
             event = str(_required_value(json_answer, "event", "answer"))
 
@@ -17,15 +17,19 @@ from typing import (
 
 import requests
 from graphql import ExecutionResult
-from requests.adapters import HTTPAdapter, Retry
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter, Retry
 from requests.auth import AuthBase
 from requests.structures import CaseInsensitiveDict
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 
 from gql.transport import Transport
 
+from ..compression import RequestCompressor, get_request_compressor
 from ..graphql_request import GraphQLRequest
+from ..json_codec import JSONCodec, get_json_codec
 from .common.batch import get_batch_execution_result_list
+from .common.http_get import DEFAULT_MAX_URL_LENGTH, get_query_url
+from .common.persisted_queries import PersistedQueries
 from .exceptions import (
     TransportAlreadyConnected,
     TransportClosed,
@@ -34,6 +38,7 @@ from .exceptions import (
     TransportServerError,
 )
 from .file_upload import FileVar, close_files, extract_files, open_files
+from .http_result import HTTPExecutionResult
 
 log = logging.getLogger(__name__)
 
@@ -63,6 +68,13 @@ class RequestsHTTPTransport(Transport):
         retry_status_forcelist: Collection[int] = _default_retry_codes,
         json_serialize: Callable = json.dumps,
         json_deserialize: Callable = json.loads,
+        persisted_queries: bool = False,
+        use_get_for_queries: bool = False,
+        max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+        pool_maxsize: int = DEFAULT_POOLSIZE,
+        pool_block: bool = False,
+        json_codec: Optional[JSONCodec] = None,
+        request_compression: Optional[Union[str, RequestCompressor]] = None,
         **kwargs: Any,
     ):
         """Initialize the transport with the given request parameters.
@@ -93,6 +105,28 @@ class RequestsHTTPTransport(Transport):
                 By default json.dumps() function
         :param json_deserialize: Json deserializer callable.
                 By default json.loads() function
+        :param persisted_queries: Set to True to send the queries using the
+                :ref:`Automatic Persisted Queries <persisted_queries>` protocol.
+        :param use_get_for_queries: Set to True to send the query operations
+                with the :ref:`HTTP GET method <http_get>`.
+                The other requests are sent with the method provided in
+                the method argument.
+        :param max_url_length: Maximum length of the URL for GET requests.
+                Longer requests are sent with the method provided in
+                the method argument.
+        :param pool_maxsize: Maximum number of connections kept open to the server.
+                Should be at least the number of threads using the transport
+                at the same time. (Default: 10).
+        :param pool_block: Whether the requests should wait for a free connection
+                when pool_maxsize connections are in use, instead of opening
+                a connection which is closed after the request. (Default: False).
+        :param json_codec: The :ref:`JSON codec <json_codecs>` used to encode
+                the requests and decode the answers.
+                By default, a codec using the json_serialize
+                and json_deserialize arguments.
+        :param request_compression: Set to "gzip", "zstd" or a
+                :ref:`request compressor <request_compression>` to compress
+                the large bodies of the requests sent as JSON.
         :param kwargs: Optional arguments that ``request`` takes.
             These can be seen at the `requests`_ source code or the official `docs`_
 
@@ -112,10 +146,26 @@ class RequestsHTTPTransport(Transport):
         self.retry_status_forcelist = retry_status_forcelist
         self.json_serialize: Callable = json_serialize
         self.json_deserialize: Callable = json_deserialize
+        self.json_codec: JSONCodec = get_json_codec(
+            json_codec, json_serialize, json_deserialize
+        )
+        self.persisted_queries: Optional[PersistedQueries] = (
+            PersistedQueries() if persisted_queries else None
+        )
+        self.use_get_for_queries = use_get_for_queries
+        self.max_url_length = max_url_length
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.request_compressor: Optional[RequestCompressor] = get_request_compressor(
+            request_compression
+        )
         self.kwargs = kwargs
 
         self.session: Optional[requests.Session] = None
 
+        # Headers of the last response
+        # Use the response_headers attribute of the results instead
+        # if the transport is used by several threads
         self.response_headers: Optional[CaseInsensitiveDict[str]] = None
 
     def connect(self):
@@ -123,16 +173,23 @@ class RequestsHTTPTransport(Transport):
             # Creating a session that can later be re-use to configure custom mechanisms
             self.session = requests.Session()
 
+            adapter_args: Dict[str, Any] = {}
+
             # If we specified some retries, we provide a predefined retry-logic
             if self.retries > 0:
-                adapter = HTTPAdapter(
-                    max_retries=Retry(
-                        total=self.retries,
-                        backoff_factor=self.retry_backoff_factor,
-                        status_forcelist=self.retry_status_forcelist,
-                        allowed_methods=None,
-                    )
+                adapter_args["max_retries"] = Retry(
+                    total=self.retries,
+                    backoff_factor=self.retry_backoff_factor,
+                    status_forcelist=self.retry_status_forcelist,
+                    allowed_methods=None,
                 )
+
+            if self.pool_maxsize != DEFAULT_POOLSIZE or self.pool_block:
+                adapter_args["pool_maxsize"] = self.pool_maxsize
+                adapter_args["pool_block"] = self.pool_block
+
+            if adapter_args:
+                adapter = HTTPAdapter(**adapter_args)
                 for prefix in "http://", "https://":
                     self.session.mount(prefix, adapter)
         else:
@@ -145,38 +202,41 @@ class RequestsHTTPTransport(Transport):
         timeout: Optional[int] = None,
         extra_args: Optional[Dict[str, Any]] = None,
         upload_files: bool = False,
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], Dict[str, FileVar]]:
+        """Returns the arguments of the request method
+        and the files to close after the request."""
 
-        payload: Union[Dict, List]
-        if isinstance(request, GraphQLRequest):
-            payload = request.payload
-        else:
-            payload = [req.payload for req in request]
-
-        post_args: Dict[str, Any] = {
-            "headers": self.headers,
-            "auth": self.auth,
-            "cookies": self.cookies,
-            "timeout": timeout or self.default_timeout,
-            "verify": self.verify,
-        }
+        post_args = self._get_request_args(timeout)
+        files: Dict[str, FileVar] = {}
+        payload_str: Optional[str] = None
 
         if upload_files:
-            assert isinstance(payload, Dict)
             assert isinstance(request, GraphQLRequest)
-            post_args = self._prepare_file_uploads(
+            post_args, files, payload_str = self._prepare_file_uploads(
                 request=request,
-                payload=payload,
+                payload=request.payload,
                 post_args=post_args,
             )
 
+        elif self.use_json:
+            # The payload is encoded once, the logs reuse it
+            body = self.json_codec.encode_request(request)
+            post_args["data"] = body
+
+            if log.isEnabledFor(logging.DEBUG):
+                payload_str = body.decode("utf-8")
+
         else:
-            data_key = "json" if self.use_json else "data"
-            post_args[data_key] = payload
+            if isinstance(request, GraphQLRequest):
+                post_args["data"] = request.payload
+            else:
+                post_args["data"] = [req.payload for req in request]
+
+            if log.isEnabledFor(logging.DEBUG):
+                payload_str = self.json_codec.dumps(post_args["data"])
 
         # Log the payload
-        if log.isEnabledFor(logging.DEBUG):
-            log.debug(">>> %s", self.json_serialize(payload))
+        log.debug(">>> %s", payload_str)
 
         # Pass kwargs to requests post method
         post_args.update(self.kwargs)
@@ -185,7 +245,67 @@ class RequestsHTTPTransport(Transport):
         if extra_args:
             post_args.update(extra_args)
 
-        return post_args
+        # The body encoded by the codec is sent with the json content type
+        if self.use_json and not upload_files:
+            headers = CaseInsensitiveDict(post_args["headers"])
+            headers.setdefault("Content-Type", "application/json")
+
+            body = post_args["data"]
+            compressor = self.request_compressor
+
+            if (
+                compressor is not None
+                and isinstance(body, bytes)
+                and compressor.should_compress(body)
+            ):
+                post_args["data"] = compressor.compress(body)
+                headers["Content-Encoding"] = compressor.encoding
+
+            post_args["headers"] = headers
+
+        return post_args, files
+
+    def _get_request_args(self, timeout: Optional[int]) -> Dict[str, Any]:
+        return {
+            "headers": self.headers,
+            "auth": self.auth,
+            "cookies": self.cookies,
+            "timeout": timeout or self.default_timeout,
+            "verify": self.verify,
+        }
+
+    def _prepare_get_request(
+        self,
+        request: GraphQLRequest,
+        *,
+        timeout: Optional[int] = None,
+        extra_args: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Returns the URL and the arguments to send the request with the GET
+        method or None if the request should be sent with the configured method."""
+
+        if not self.use_get_for_queries:
+            return None
+
+        url = get_query_url(
+            self.url,
+            request,
+            json_serialize=self.json_codec.dumps,
+            max_url_length=self.max_url_length,
+        )
+
+        if url is None:
+            return None
+
+        log.debug(">>> GET %s", url)
+
+        get_args = self._get_request_args(timeout)
+        get_args.update(self.kwargs)
+
+        if extra_args:
+            get_args.update(extra_args)
+
+        return url, get_args
 
     def _prepare_file_uploads(
         self,
@@ -193,7 +313,9 @@ class RequestsHTTPTransport(Transport):
         *,
         payload: Dict[str, Any],
         post_args: Dict[str, Any],
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], Dict[str, FileVar], str]:
+        """Returns the arguments of the request method, the files to close
+        after the request and the encoded operations field."""
         # If the upload_files flag is set, then we need variable_values
         assert request.variable_values is not None
 
@@ -206,13 +328,12 @@ class RequestsHTTPTransport(Transport):
 
         # Opening the files using the FileVar parameters
         open_files(list(files.values()))
-        self.files = files
 
         # Save the nulled variable values in the payload
         payload["variables"] = nulled_variable_values
 
         # Add the payload to the operations field
-        operations_str = self.json_serialize(payload)
+        operations_str = self.json_codec.dumps(payload)
         log.debug("operations %s", operations_str)
 
         # Generate the file map
@@ -226,10 +347,10 @@ class RequestsHTTPTransport(Transport):
         file_vars = {str(i): files[path] for i, path in enumerate(files)}
 
         # Add the file map field
-        file_map_str = self.json_serialize(file_map)
+        file_map_str = self.json_codec.dumps(file_map)
         log.debug("file_map %s", file_map_str)
 
-        fields = {"operations": operations_str, "map": file_map_str}
+        fields: Dict[str, Any] = {"operations": operations_str, "map": file_map_str}
 
         # Add the extracted files as remaining fields
         for k, file_var in file_vars.items():
@@ -253,7 +374,7 @@ class RequestsHTTPTransport(Transport):
 
         post_args["headers"]["Content-Type"] = data.content_type
 
-        return post_args
+        return post_args, files, operations_str
 
     def execute(
         self,
@@ -280,21 +401,69 @@ class RequestsHTTPTransport(Transport):
         if not self.session:
             raise TransportClosed("Transport is not connected")
 
-        post_args = self._prepare_request(
-            request,
-            timeout=timeout,
-            extra_args=extra_args,
-            upload_files=upload_files,
+        apq = self.persisted_queries
+
+        if apq is None or upload_files:
+            return self._execute_request(
+                request,
+                timeout=timeout,
+                extra_args=extra_args,
+                upload_files=upload_files,
+            )
+
+        result = self._execute_request(
+            apq.get_request(request), timeout=timeout, extra_args=extra_args
         )
 
+        if apq.process_result(request, result):
+            result = self._execute_request(
+                apq.get_request(request, include_query=True),
+                timeout=timeout,
+                extra_args=extra_args,
+            )
+            apq.process_result(request, result)
+
+        return result
+
+    def _execute_request(
+        self,
+        request: GraphQLRequest,
+        *,
+        timeout: Optional[int] = None,
+        extra_args: Optional[Dict[str, Any]] = None,
+        upload_files: bool = False,
+    ) -> ExecutionResult:
+
+        assert self.session is not None
+
+        get_request = None
+        files: Dict[str, FileVar] = {}
+
+        if not upload_files:
+            get_request = self._prepare_get_request(
+                request, timeout=timeout, extra_args=extra_args
+            )
+
+        if get_request is None:
+            method = self.method
+            url = self.url
+            request_args, files = self._prepare_request(
+                request,
+                timeout=timeout,
+                extra_args=extra_args,
+                upload_files=upload_files,
+            )
+        else:
+            method = "GET"
+            url, request_args = get_request
+
         # Using the created session to perform requests
         try:
-            response = self.session.request(self.method, self.url, **post_args)
+            response = self.session.request(method, url, **request_args)
         except Exception as e:
             raise TransportConnectionFailed(str(e)) from e
         finally:
-            if upload_files:
-                close_files(list(self.files.values()))
+            close_files(list(files.values()))
 
         return self._prepare_result(response)
 
@@ -346,7 +515,48 @@ class RequestsHTTPTransport(Transport):
         if not self.session:
             raise TransportClosed("Transport is not connected")
 
-        post_args = self._prepare_request(
+        apq = self.persisted_queries
+
+        if apq is None:
+            return self._execute_batch_request(
+                reqs, timeout=timeout, extra_args=extra_args
+            )
+
+        results = self._execute_batch_request(
+            [apq.get_request(req) for req in reqs],
+            timeout=timeout,
+            extra_args=extra_args,
+        )
+
+        # Send again, with their query, only the requests which were not found
+        indexes = apq.get_batch_resend_indexes(reqs, results)
+
+        if indexes:
+            resent_reqs = [reqs[index] for index in indexes]
+
+            resent_results = self._execute_batch_request(
+                [apq.get_request(req, include_query=True) for req in resent_reqs],
+                timeout=timeout,
+                extra_args=extra_args,
+            )
+            apq.get_batch_resend_indexes(resent_reqs, resent_results)
+
+            for index, result in zip(indexes, resent_results):
+                results[index] = result
+
+        return results
+
+    def _execute_batch_request(
+        self,
+        reqs: List[GraphQLRequest],
+        *,
+        timeout: Optional[int] = None,
+        extra_args: Optional[Dict[str, Any]] = None,
+    ) -> List[ExecutionResult]:
+
+        assert self.session is not None
+
+        post_args, _ = self._prepare_request(
             reqs,
             timeout=timeout,
             extra_args=extra_args,
@@ -369,7 +579,7 @@ class RequestsHTTPTransport(Transport):
         self.response_headers = response.headers
 
         try:
-            result = self.json_deserialize(response.text)
+            result = self.json_codec.decode(response.content)
 
             if log.isEnabledFor(logging.DEBUG):
                 log.debug("<<< %s", response.text)
@@ -386,10 +596,12 @@ class RequestsHTTPTransport(Transport):
         if "errors" not in result and "data" not in result:
             self._raise_response_error(response, 'No "data" or "errors" keys in answer')
 
-        return ExecutionResult(
+        return HTTPExecutionResult(
             errors=result.get("errors"),
             data=result.get("data"),
             extensions=result.get("extensions"),
+            response_headers=response.headers,
+            status_code=response.status_code,
         )
 
     def _prepare_batch_result(
@@ -401,7 +613,12 @@ class RequestsHTTPTransport(Transport):
         answers = self._get_json_result(response)
 
         try:
-            return get_batch_execution_result_list(reqs, answers)
+            return get_batch_execution_result_list(
+                reqs,
+                answers,
+                response_headers=response.headers,
+                status_code=response.status_code,
+            )
         except TransportProtocolError:
             # Raise a TransportServerError if status > 400
             self._raise_transport_server_error_if_status_more_than_400(response)
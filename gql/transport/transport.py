@@ -4,9 +4,14 @@ from typing import Any, List
 from graphql import ExecutionResult
 
 from ..graphql_request import GraphQLRequest
+from ..json_codec import DEFAULT_JSON_CODEC, JSONCodec
 
 
 class Transport(abc.ABC):
+    # Codec used to encode the requests and decode the answers
+    # Can be replaced with the json_codec argument of the Client
+    json_codec: JSONCodec = DEFAULT_JSON_CODEC
+
     @abc.abstractmethod
     def execute(
         self,
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 from contextlib import suppress
 from typing import Any, Dict, List, Optional, Tuple, Union
@@ -143,7 +142,7 @@ class WebsocketsProtocolTransportBase(SubscriptionTransportBase):
         If the answer is not a connection_ack message, we will return an Exception.
         """
 
-        init_message = json.dumps(
+        init_message = self.json_codec.encode(
             {"type": "connection_init", "payload": self.init_payload}
         )
 
@@ -163,7 +162,7 @@ class WebsocketsProtocolTransportBase(SubscriptionTransportBase):
         if payload is not None:
             ping_message["payload"] = payload
 
-        await self._send(json.dumps(ping_message))
+        await self._send(self.json_codec.encode(ping_message))
 
     async def send_pong(self, payload: Optional[Any] = None) -> None:
         """Send a pong message for the graphql-ws protocol"""
@@ -173,7 +172,7 @@ class WebsocketsProtocolTransportBase(SubscriptionTransportBase):
         if payload is not None:
             pong_message["payload"] = payload
 
-        await self._send(json.dumps(pong_message))
+        await self._send(self.json_codec.encode(pong_message))
 
     async def _send_stop_message(self, query_id: int) -> None:
         """Send stop message to the provided websocket connection and query_id.
@@ -181,7 +180,7 @@ class WebsocketsProtocolTransportBase(SubscriptionTransportBase):
         The server should afterwards return a 'complete' message.
         """
 
-        stop_message = json.dumps({"id": str(query_id), "type": "stop"})
+        stop_message = self.json_codec.encode({"id": str(query_id), "type": "stop"})
 
         await self._send(stop_message)
 
@@ -191,7 +190,9 @@ class WebsocketsProtocolTransportBase(SubscriptionTransportBase):
         This is only for the graphql-ws protocol.
         """
 
-        complete_message = json.dumps({"id": str(query_id), "type": "complete"})
+        complete_message = self.json_codec.encode(
+            {"id": str(query_id), "type": "complete"}
+        )
 
         await self._send(complete_message)
 
@@ -219,7 +220,9 @@ class WebsocketsProtocolTransportBase(SubscriptionTransportBase):
         This message indicates that the connection will disconnect.
         """
 
-        connection_terminate_message = json.dumps({"type": "connection_terminate"})
+        connection_terminate_message = self.json_codec.encode(
+            {"type": "connection_terminate"}
+        )
 
         await self._send(connection_terminate_message)
 
@@ -244,7 +247,7 @@ class WebsocketsProtocolTransportBase(SubscriptionTransportBase):
         if self.subprotocol == self.GRAPHQLWS_SUBPROTOCOL:
             query_type = "subscribe"
 
-        query_str = json.dumps(
+        query_str = self.json_codec.encode(
             {"id": str(query_id), "type": query_type, "payload": payload}
         )
 
@@ -411,7 +414,7 @@ class WebsocketsProtocolTransportBase(SubscriptionTransportBase):
         the detected subprotocol.
         """
         try:
-            json_answer = json.loads(answer)
+            json_answer = self.json_codec.decode(answer)
         except ValueError:
             raise TransportProtocolError(
                 f"Server did not return a GraphQL result: {answer}"
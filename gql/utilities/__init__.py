@@ -1,18 +1,28 @@
 from .build_client_schema import build_client_schema
 from .get_introspection_query_ast import get_introspection_query_ast
+from .merge_requests import can_merge_request, merge_requests, split_result
 from .node_tree import node_tree
-from .parse_result import parse_result
-from .serialize_variable_values import serialize_value, serialize_variable_values
+from .parse_result import compile_result_parser, parse_result
+from .serialize_variable_values import (
+    compile_variables_serializer,
+    serialize_value,
+    serialize_variable_values,
+)
 from .update_schema_enum import update_schema_enum
 from .update_schema_scalars import update_schema_scalar, update_schema_scalars
 
 __all__ = [
     "build_client_schema",
+    "can_merge_request",
+    "compile_result_parser",
+    "compile_variables_serializer",
+    "merge_requests",
     "node_tree",
     "parse_result",
     "get_introspection_query_ast",
     "serialize_variable_values",
     "serialize_value",
+    "split_result",
     "update_schema_enum",
     "update_schema_scalars",
     "update_schema_scalar",
@@ -0,0 +1,320 @@
+import copy
+import re
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from graphql import (
+    DocumentNode,
+    ExecutionResult,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    InlineFragmentNode,
+    NameNode,
+    OperationDefinitionNode,
+    OperationType,
+    SelectionNode,
+    SelectionSetNode,
+    Visitor,
+    print_ast,
+    visit,
+)
+
+from ..graphql_request import GraphQLRequest
+from .serialize_variable_values import _get_request_operation
+
+# Response keys of the merged query: _<index of the request>_<original key>
+_MERGED_KEY_REGEX = re.compile(r"^_(\d+)_(.+)$", re.DOTALL)
+
+
+def _get_prefix(index: int) -> str:
+    return f"_{index}_"
+
+
+class _RenameVisitor(Visitor):
+    """Prefix the variables, and optionally the fragments, of a request."""
+
+    def __init__(self, prefix: str, rename_fragments: bool):
+        super().__init__()
+        self.prefix = prefix
+        self.rename_fragments = rename_fragments
+
+    def _renamed(self, node: Any) -> Any:
+        return replace(node, name=NameNode(value=self.prefix + node.name.value))
+
+    def leave_variable(self, node, *_args):
+        return self._renamed(node)
+
+    def leave_fragment_spread(self, node, *_args):
+        return self._renamed(node) if self.rename_fragments else None
+
+    def leave_fragment_definition(self, node, *_args):
+        return self._renamed(node) if self.rename_fragments else None
+
+
+def _get_used_fragments(
+    node: Any, fragments: Dict[str, FragmentDefinitionNode]
+) -> List[str]:
+    """Names of the fragments used by the node, directly or not."""
+
+    used: List[str] = []
+    seen: Set[str] = set()
+    nodes = [node]
+
+    class SpreadVisitor(Visitor):
+        def enter_fragment_spread(self, spread, *_args):
+            name = spread.name.value
+            if name not in seen and name in fragments:
+                seen.add(name)
+                used.append(name)
+                nodes.append(fragments[name])
+
+    while nodes:
+        visit(nodes.pop(), SpreadVisitor())
+
+    return used
+
+
+def _prefix_selections(
+    selections: Sequence[SelectionNode],
+    prefix: str,
+    fragments: Dict[str, FragmentDefinitionNode],
+) -> List[SelectionNode]:
+    """Prefix the response keys of the root fields of a request.
+
+    The fragments spread at the root of the operation are replaced by
+    inline fragments, as their fields need to be renamed too."""
+
+    prefixed: List[SelectionNode] = []
+
+    for selection in selections:
+        if isinstance(selection, FieldNode):
+            key = selection.alias.value if selection.alias else selection.name.value
+            prefixed.append(replace(selection, alias=NameNode(value=prefix + key)))
+
+        elif isinstance(selection, InlineFragmentNode):
+            selection_set = SelectionSetNode(
+                selections=tuple(
+                    _prefix_selections(
+                        selection.selection_set.selections, prefix, fragments
+                    )
+                )
+            )
+            prefixed.append(replace(selection, selection_set=selection_set))
+
+        else:
+            assert isinstance(selection, FragmentSpreadNode)
+            fragment = fragments[selection.name.value]
+            prefixed.append(
+                InlineFragmentNode(
+                    type_condition=fragment.type_condition,
+                    directives=selection.directives,
+                    selection_set=SelectionSetNode(
+                        selections=tuple(
+                            _prefix_selections(
+                                fragment.selection_set.selections, prefix, fragments
+                            )
+                        )
+                    ),
+                )
+            )
+
+    return prefixed
+
+
+def can_merge_request(request: GraphQLRequest) -> bool:
+    """Returns True if the request can be merged with other requests
+    by :func:`merge_requests <gql.utilities.merge_requests>`.
+
+    Only the queries without extensions and without directives
+    on the operation can be merged.
+    """
+
+    if request.extensions:
+        return False
+
+    operation = _get_request_operation(request)
+
+    return (
+        operation is not None
+        and operation.operation == OperationType.QUERY
+        and not operation.directives
+    )
+
+
+def merge_requests(requests: Sequence[GraphQLRequest]) -> GraphQLRequest:
+    """Merge several queries in a single query, to execute them in a single
+    round trip on servers which do not accept batches of requests.
+
+    The root fields and the variables of each request are renamed with a
+    :code:`_<index>_` prefix. The identical fragments are sent only once,
+    the fragments with the same name but a different definition are renamed.
+
+    The result of the merged request can be split into the results of the
+    requests with :func:`split_result <gql.utilities.split_result>`.
+
+    :param requests: the requests to merge, which should all be mergeable
+        according to :func:`can_merge_request <gql.utilities.can_merge_request>`
+    :return: the merged request
+    """
+
+    fragments: Dict[str, FragmentDefinitionNode] = {}
+    printed_fragments: Dict[str, str] = {}
+    variable_definitions: List[Any] = []
+    variable_values: Dict[str, Any] = {}
+    selections: List[SelectionNode] = []
+
+    for index, request in enumerate(requests):
+        assert can_merge_request(request), f"Cannot merge request: {request}"
+
+        operation = _get_request_operation(request)
+        assert operation is not None
+
+        prefix = _get_prefix(index)
+
+        document_fragments = {
+            definition.name.value: definition
+            for definition in request.document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
+        used_fragments = _get_used_fragments(operation, document_fragments)
+
+        # Keep the name of the fragments if they do not conflict
+        # with the fragments of the previous requests
+        renamer = _RenameVisitor(prefix, rename_fragments=False)
+        request_fragments = [
+            visit(document_fragments[name], renamer) for name in used_fragments
+        ]
+
+        if any(
+            printed_fragments.get(fragment.name.value, print_ast(fragment))
+            != print_ast(fragment)
+            for fragment in request_fragments
+        ):
+            renamer = _RenameVisitor(prefix, rename_fragments=True)
+            request_fragments = [
+                visit(document_fragments[name], renamer) for name in used_fragments
+            ]
+
+        for fragment in request_fragments:
+            name = fragment.name.value
+            if name not in fragments:
+                fragments[name] = fragment
+                printed_fragments[name] = print_ast(fragment)
+
+        operation = visit(operation, renamer)
+
+        variable_definitions.extend(operation.variable_definitions or ())
+
+        if request.variable_values:
+            for definition in operation.variable_definitions or ():
+                name = definition.variable.name.value.removeprefix(prefix)
+                if name in request.variable_values:
+                    variable_values[prefix + name] = request.variable_values[name]
+
+        selections.extend(
+            _prefix_selections(operation.selection_set.selections, prefix, fragments)
+        )
+
+    merged_operation = OperationDefinitionNode(
+        operation=OperationType.QUERY,
+        variable_definitions=tuple(variable_definitions),
+        directives=(),
+        selection_set=SelectionSetNode(selections=tuple(selections)),
+    )
+
+    # The fragments only spread at the root have been inlined
+    used_fragments = _get_used_fragments(merged_operation, fragments)
+
+    document = DocumentNode(
+        definitions=(
+            merged_operation,
+            *(fragments[name] for name in sorted(used_fragments)),
+        )
+    )
+
+    return GraphQLRequest(document, variable_values=variable_values or None)
+
+
+def _split_error(error: Any) -> Optional[Tuple[int, Any]]:
+    """Returns the index of the request of the error and the error
+    with its original path, or None if the error has no path."""
+
+    path = error.get("path") if isinstance(error, dict) else error.path
+
+    if not path or not isinstance(path[0], str):
+        return None
+
+    match = _MERGED_KEY_REGEX.match(path[0])
+
+    if match is None:
+        return None
+
+    original_path = [match.group(2), *path[1:]]
+
+    if isinstance(error, dict):
+        error = {**error, "path": original_path}
+    else:
+        error = copy.copy(error)
+        error.path = original_path
+
+    return int(match.group(1)), error
+
+
+def split_result(result: ExecutionResult, count: int) -> List[ExecutionResult]:
+    """Split the result of a request merged by
+    :func:`merge_requests <gql.utilities.merge_requests>`.
+
+    The errors are assigned to the requests using their path.
+    The errors without a path are returned in the results of all the requests.
+    If the merged result has no data, the requests without errors of their own
+    get all the errors of the merged result.
+
+    :param result: the result of the merged request
+    :param count: the number of merged requests
+    :return: the results of the merged requests, in the same order
+    """
+
+    data: List[Optional[Dict[str, Any]]] = [
+        None if result.data is None else {} for _ in range(count)
+    ]
+    errors: List[List[Any]] = [[] for _ in range(count)]
+
+    if result.data is not None:
+        for key, value in result.data.items():
+            match = _MERGED_KEY_REGEX.match(key)
+            if match is not None:
+                request_data = data[int(match.group(1))]
+                assert request_data is not None
+                request_data[match.group(2)] = value
+
+    for error in result.errors or []:
+        split_error = _split_error(error)
+
+        if split_error is None:
+            for request_errors in errors:
+                request_errors.append(error)
+        else:
+            index, error = split_error
+            errors[index].append(error)
+
+    # Without data, for example when a non-null root field error nulls the whole
+    # result, the other requests get the errors of the merged request
+    if result.data is None:
+        merged_errors = result.errors or [
+            GraphQLError("No data in the result of the merged request")
+        ]
+
+        for request_errors in errors:
+            if not request_errors:
+                request_errors.extend(merged_errors)
+
+    return [
+        ExecutionResult(
+            data=request_data,
+            errors=request_errors or None,
+            extensions=result.extensions,
+        )
+        for request_data, request_errors in zip(data, errors)
+    ]
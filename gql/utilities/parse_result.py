@@ -1,420 +1,361 @@
 import logging
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union, cast
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple, cast
 
 from graphql import (
-    IDLE,
-    REMOVE,
     DocumentNode,
     FieldNode,
     FragmentDefinitionNode,
     FragmentSpreadNode,
+    GraphQLCompositeType,
     GraphQLError,
-    GraphQLInterfaceType,
+    GraphQLLeafType,
     GraphQLList,
     GraphQLNonNull,
-    GraphQLObjectType,
+    GraphQLOutputType,
     GraphQLSchema,
-    GraphQLType,
     InlineFragmentNode,
-    NameNode,
-    Node,
     OperationDefinitionNode,
     SelectionSetNode,
-    TypeInfo,
-    TypeInfoVisitor,
-    Visitor,
+    is_composite_type,
     is_leaf_type,
-    print_ast,
-    visit,
+    is_specified_scalar_type,
 )
-from graphql.language.visitor import VisitorActionEnum
 from graphql.pyutils import inspect
 
-log = logging.getLogger(__name__)
-
-# Equivalent to QUERY_DOCUMENT_KEYS but only for fields interesting to
-# visit to parse the results
-RESULT_DOCUMENT_KEYS: Dict[str, Tuple[str, ...]] = {
-    "document": ("definitions",),
-    "operation_definition": ("selection_set",),
-    "selection_set": ("selections",),
-    "field": ("selection_set",),
-    "inline_fragment": ("selection_set",),
-    "fragment_definition": ("selection_set",),
-}
+from ..utils import LRUCache
 
+log = logging.getLogger(__name__)
 
-def _ignore_non_null(type_: GraphQLType) -> GraphQLType:
-    """Removes the GraphQLNonNull wrappings around types."""
-    if isinstance(type_, GraphQLNonNull):
-        return type_.of_type
-    else:
-        return type_
-
+ResultParser = Callable[[Any], Any]
 
-def _get_fragment(document, fragment_name):
-    """Returns a fragment from the document."""
-    for definition in document.definitions:
-        if isinstance(definition, FragmentDefinitionNode):
-            if definition.name.value == fragment_name:
-                return definition
+# Compiled parsers, keyed by (schema id, document id, operation name, mode).
+# The schema and the document are kept in the value so that their id
+# cannot be reused while the entry is in the cache.
+_parser_cache: LRUCache[
+    Tuple[int, int, Optional[str], bool],
+    Tuple[GraphQLSchema, DocumentNode, Optional[ResultParser]],
+] = LRUCache(maxsize=1024)
 
-    raise GraphQLError(f'Fragment "{fragment_name}" not found in document!')
+# For each response key: the types of the fields with this key and their
+# selection sets. The fields can be defined on different types of a union or
+# an interface, each selection set is collected with the type of its own field.
+_FieldTypes = List[Tuple[GraphQLOutputType, Optional[SelectionSetNode]]]
+_CollectedFields = Dict[str, _FieldTypes]
 
 
-class ParseResultVisitor(Visitor):
+class _ResultParserCompiler:
     def __init__(
         self,
         schema: GraphQLSchema,
         document: DocumentNode,
-        node: Node,
-        result: Dict[str, Any],
-        type_info: TypeInfo,
-        visit_fragment: bool = False,
-        inside_list_level: int = 0,
-        operation_name: Optional[str] = None,
+        only_custom_types: bool,
     ):
-        """Recursive Implementation of a Visitor class to parse results
-        correspondind to a schema and a document.
+        """Compiles a document into a tree of closures parsing the results
+        corresponding to this document.
 
-        Using a TypeInfo class to get the node types during traversal.
+        The document is traversed only once, at compilation time.
+        Fragments are expanded and fields with the same response key are merged,
+        so that the resulting parser only has to follow the result.
 
-        If we reach a list in the results, then we parse each
-        item of the list recursively, traversing the same nodes
-        of the query again.
-
-        During traversal, we keep the current position in the result
-        in the result_stack field.
-
-        Alongside the field type, we calculate the "result type"
-        which is computed from the field type and the current
-        recursive level we are for this field
-        (:code:`inside_list_level` argument).
+        If :code:`only_custom_types` is True, closures are generated only
+        for the paths of the result which lead to custom scalars or enums.
+        The other values are kept unchanged and None is returned instead of
+        a parser if there is nothing to parse.
         """
         self.schema: GraphQLSchema = schema
-        self.document: DocumentNode = document
-        self.node: Node = node
-        self.result: Dict[str, Any] = result
-        self.type_info: TypeInfo = type_info
-        self.visit_fragment: bool = visit_fragment
-        self.inside_list_level = inside_list_level
-        self.operation_name = operation_name
+        self.only_custom_types: bool = only_custom_types
 
-        self.result_stack: List[Any] = []
+        self.fragments: Dict[str, FragmentDefinitionNode] = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
 
-        super().__init__()
+    def collect_fields(
+        self,
+        parent_type: GraphQLCompositeType,
+        selection_set: SelectionSetNode,
+        fields: _CollectedFields,
+        visited_fragments: Set[str],
+    ) -> None:
+        """Collect the fields of a selection set, grouped by response key."""
 
-    @property
-    def current_result(self):
-        try:
-            return self.result_stack[-1]
-        except IndexError:
-            return self.result
+        for selection in selection_set.selections:
 
-    @staticmethod
-    def leave_document(node: DocumentNode, *_args: Any) -> Dict[str, Any]:
-        results = cast(List[Dict[str, Any]], node.definitions)
-        return {k: v for result in results for k, v in result.items()}
+            if isinstance(selection, FieldNode):
 
-    def enter_operation_definition(
-        self, node: OperationDefinitionNode, *_args: Any
-    ) -> Union[None, VisitorActionEnum]:
+                name = (
+                    selection.alias.value if selection.alias else selection.name.value
+                )
 
-        if self.operation_name is not None:
-            if not hasattr(node.name, "value"):
-                return REMOVE  # pragma: no cover
+                field_def = self.schema.get_field(parent_type, selection.name.value)
 
-            name = cast(NameNode, node.name)
+                if field_def is None:
+                    log.debug(f"Field {name} not found in {inspect(parent_type)}")
+                    continue
 
-            if name.value != self.operation_name:
-                log.debug(f"SKIPPING operation {name.value}")
-                return REMOVE
+                fields.setdefault(name, []).append(
+                    (field_def.type, selection.selection_set)
+                )
 
-        return IDLE
+            elif isinstance(selection, InlineFragmentNode):
 
-    @staticmethod
-    def leave_operation_definition(
-        node: OperationDefinitionNode, *_args: Any
-    ) -> Dict[str, Any]:
-        selections = cast(List[Dict[str, Any]], node.selection_set)
-        return {k: v for s in selections for k, v in s.items()}
+                fragment_type = parent_type
 
-    @staticmethod
-    def leave_selection_set(node: SelectionSetNode, *_args: Any) -> Dict[str, Any]:
-        partial_results = cast(Dict[str, Any], node.selections)
-        return partial_results
+                if selection.type_condition is not None:
+                    fragment_type = cast(
+                        GraphQLCompositeType,
+                        self.schema.get_type(selection.type_condition.name.value),
+                    )
 
-    @staticmethod
-    def in_first_field(path):
-        return path.count("selections") <= 1
+                self.collect_fields(
+                    fragment_type, selection.selection_set, fields, visited_fragments
+                )
 
-    def get_current_result_type(self, path):
-        field_type = self.type_info.get_type()
+            elif isinstance(selection, FragmentSpreadNode):
 
-        list_level = self.inside_list_level
+                fragment_name = selection.name.value
 
-        assert field_type is not None
+                try:
+                    fragment = self.fragments[fragment_name]
+                except KeyError:
+                    raise GraphQLError(
+                        f'Fragment "{fragment_name}" not found in document!'
+                    )
 
-        result_type = _ignore_non_null(field_type)
+                # Protection against fragment cycles in invalid documents
+                if fragment_name in visited_fragments:
+                    continue
 
-        if self.in_first_field(path):
+                fragment_type = cast(
+                    GraphQLCompositeType,
+                    self.schema.get_type(fragment.type_condition.name.value),
+                )
 
-            while list_level > 0:
-                assert isinstance(result_type, GraphQLList)
-                result_type = _ignore_non_null(result_type.of_type)
+                self.collect_fields(
+                    fragment_type,
+                    fragment.selection_set,
+                    fields,
+                    visited_fragments | {fragment_name},
+                )
 
-                list_level -= 1
+    def compile_fields(self, fields: _CollectedFields) -> Optional[ResultParser]:
+        """Compile a parser for a result dict containing those fields."""
 
-        return result_type
+        parsers: List[Tuple[str, ResultParser]] = []
 
-    def enter_field(
-        self,
-        node: FieldNode,
-        key: str,
-        parent: Node,
-        path: List[Node],
-        ancestors: List[Node],
-    ) -> Union[None, VisitorActionEnum, Dict[str, Any]]:
-
-        name = node.alias.value if node.alias else node.name.value
-
-        if log.isEnabledFor(logging.DEBUG):
-            log.debug(f"Enter field {name}")
-            log.debug(f"  path={path!r}")
-            log.debug(f"  current_result={self.current_result!r}")
-
-        if self.current_result is None:
-            # Result was null for this field -> remove
-            return REMOVE
-
-        elif isinstance(self.current_result, Mapping):
-
-            try:
-                result_value = self.current_result[name]
-            except KeyError:
-                # Key not found in result.
-                # Should never happen in theory with a correct GraphQL backend
-                # Silently ignoring this field
-                log.debug(f"  Key {name} not found in result --> REMOVE")
-                return REMOVE
-
-            log.debug(f"  result_value={result_value}")
-
-            # We get the field_type from type_info
-            field_type = self.type_info.get_type()
-
-            # We calculate a virtual "result type" depending on our recursion level.
-            result_type = self.get_current_result_type(path)
-
-            # If the result for this field is a list, then we need
-            # to recursively visit the same node multiple times for each
-            # item in the list.
-            if (
-                not isinstance(result_value, Mapping)
-                and isinstance(result_value, Iterable)
-                and not isinstance(result_value, str)
-                and not is_leaf_type(result_type)
-            ):
-
-                # Finding out the inner type of the list
-                inner_type = _ignore_non_null(result_type.of_type)
-
-                if log.isEnabledFor(logging.DEBUG):
-                    log.debug("  List detected:")
-                    log.debug(f"    field_type={inspect(field_type)}")
-                    log.debug(f"    result_type={inspect(result_type)}")
-                    log.debug(f"    inner_type={inspect(inner_type)}\n")
-
-                visits: List[Dict[str, Any]] = []
-
-                # Get parent type
-                initial_type = self.type_info.get_parent_type()
-                assert isinstance(
-                    initial_type, (GraphQLObjectType, GraphQLInterfaceType)
+        for key, field_types in fields.items():
+            parser = self.compile_type(field_types)
+
+            if parser is not None:
+                parsers.append((key, parser))
+
+        if not parsers and self.only_custom_types:
+            return None
+
+        first_key = parsers[0][0] if parsers else None
+
+        def check_container(value: Any) -> None:
+            if not isinstance(value, Mapping):
+                raise GraphQLError(
+                    f"Invalid result for container of field {first_key}: {value!r}"
                 )
 
-                # Get parent SelectionSet node
-                selection_set_node = ancestors[-1]
-                assert isinstance(selection_set_node, SelectionSetNode)
+        if self.only_custom_types:
 
-                # Keep only the current node in a new selection set node
-                new_node = SelectionSetNode(selections=(node,))
+            def parse_object(value: Any) -> Any:
+                if value is None:
+                    return None
 
-                for item in result_value:
+                check_container(value)
 
-                    new_result = {name: item}
+                # Copy-on-write: the result dict is copied
+                # only if one of its values is modified
+                parsed_value: Optional[Dict[str, Any]] = None
 
-                    if log.isEnabledFor(logging.DEBUG):
-                        log.debug(f"      recursive new_result={new_result}")
-                        log.debug(f"      recursive ast={print_ast(node)}")
-                        log.debug(f"      recursive path={path!r}")
-                        log.debug(f"      recursive initial_type={initial_type!r}\n")
+                for key, parser in parsers:
+                    try:
+                        item = value[key]
+                    except KeyError:
+                        continue
 
-                    if self.in_first_field(path):
-                        inside_list_level = self.inside_list_level + 1
-                    else:
-                        inside_list_level = 1
+                    parsed_item = parser(item)
 
-                    inner_visit = parse_result_recursive(
-                        self.schema,
-                        self.document,
-                        new_node,
-                        new_result,
-                        initial_type=initial_type,
-                        inside_list_level=inside_list_level,
-                    )
-                    log.debug(f"      recursive result={inner_visit}\n")
+                    if parsed_item is not item:
+                        if parsed_value is None:
+                            parsed_value = dict(value)
+                        parsed_value[key] = parsed_item
 
-                    inner_visit = cast(List[Dict[str, Any]], inner_visit)
-                    visits.append(inner_visit[0][name])
+                return value if parsed_value is None else parsed_value
 
-                result_value = {name: visits}
-                log.debug(f"    recursive visits final result = {result_value}\n")
-                return result_value
+        else:
 
-            # If the result for this field is not a list, then add it
-            # to the result stack so that it becomes the current_value
-            # for the next inner fields
-            self.result_stack.append(result_value)
+            def parse_object(value: Any) -> Any:
+                if value is None:
+                    return None
 
-            return IDLE
+                check_container(value)
 
-        raise GraphQLError(
-            f"Invalid result for container of field {name}: {self.current_result!r}"
-        )
+                parsed_value: Dict[str, Any] = {}
 
-    def leave_field(
-        self,
-        node: FieldNode,
-        key: str,
-        parent: Node,
-        path: List[Node],
-        ancestors: List[Node],
-    ) -> Dict[str, Any]:
+                for key, parser in parsers:
+                    try:
+                        item = value[key]
+                    except KeyError:
+                        # Key not found in result.
+                        # Should never happen in theory with a correct GraphQL
+                        # backend. Silently ignoring this field.
+                        continue
 
-        name = cast(str, node.alias.value if node.alias else node.name.value)
+                    parsed_value[key] = parser(item)
 
-        log.debug(f"Leave field {name}")
+                return parsed_value
 
-        if self.current_result is None:
+        return parse_object
 
-            return_value = None
+    def compile_type(self, field_types: _FieldTypes) -> Optional[ResultParser]:
+        """Compile a parser for the value of fields with the same response key.
 
-        elif node.selection_set is None:
+        The fields have the same type, except for the composite types
+        of fields defined on different types of a union or an interface.
+        """
 
-            field_type = self.type_info.get_type()
-            result_type = self.get_current_result_type(path)
+        type_ = field_types[0][0]
 
-            if log.isEnabledFor(logging.DEBUG):
-                log.debug(f"  field type of {name} is {inspect(field_type)}")
-                log.debug(f"  result type of {name} is {inspect(result_type)}")
+        if isinstance(type_, GraphQLNonNull):
+            return self.compile_type(
+                [(cast(GraphQLNonNull, t).of_type, s) for t, s in field_types]
+            )
 
-            assert is_leaf_type(result_type)
+        if isinstance(type_, GraphQLList):
+            item_parser = self.compile_type(
+                [(cast(GraphQLList, t).of_type, s) for t, s in field_types]
+            )
 
-            # Finally parsing a single scalar using the parse_value method
-            return_value = result_type.parse_value(self.current_result)
-        else:
+            if item_parser is None:
+                return None
 
-            partial_results = cast(List[Dict[str, Any]], node.selection_set)
+            def parse_list(value: Any) -> Any:
+                if value is None:
+                    return None
 
-            return_value = {k: v for pr in partial_results for k, v in pr.items()}
+                return [item_parser(item) for item in value]
 
-        # Go up a level in the result stack
-        self.result_stack.pop()
+            return parse_list
 
-        log.debug(f"Leave field {name}: returning {return_value}")
+        if is_leaf_type(type_):
+            if self.only_custom_types and is_specified_scalar_type(type_):
+                return None
 
-        return {name: return_value}
+            leaf_type = cast(GraphQLLeafType, type_)
 
-    # Fragments
+            # Not using a bound parse_value method here as it can be
+            # modified later with update_schema_scalars
+            def parse_leaf(value: Any) -> Any:
+                if value is None:
+                    return None
 
-    def enter_fragment_definition(
-        self, node: FragmentDefinitionNode, *_args: Any
-    ) -> Union[None, VisitorActionEnum]:
+                return leaf_type.parse_value(value)
 
-        if log.isEnabledFor(logging.DEBUG):
-            log.debug(f"Enter fragment definition {node.name.value}.")
-            log.debug(f"visit_fragment={self.visit_fragment!s}")
+            return parse_leaf
 
-        if self.visit_fragment:
-            return IDLE
-        else:
-            return REMOVE
+        assert is_composite_type(type_)
+
+        fields: _CollectedFields = {}
+
+        for field_type, selection_set in field_types:
+            if selection_set is not None:
+                self.collect_fields(
+                    cast(GraphQLCompositeType, field_type), selection_set, fields, set()
+                )
+
+        return self.compile_fields(fields)
+
+    def compile_document(
+        self, document: DocumentNode, operation_name: Optional[str]
+    ) -> Optional[ResultParser]:
+        """Compile a parser for the result of the operations of a document.
+
+        If no operation_name is provided, the fields of all the
+        operations of the document are used.
+        """
+
+        fields: _CollectedFields = {}
+
+        for definition in document.definitions:
+            if not isinstance(definition, OperationDefinitionNode):
+                continue
 
-    @staticmethod
-    def leave_fragment_definition(
-        node: FragmentDefinitionNode, *_args: Any
-    ) -> Dict[str, Any]:
+            if operation_name is not None:
+                if definition.name is None or definition.name.value != operation_name:
+                    log.debug(f"SKIPPING operation {inspect(definition.name)}")
+                    continue
 
-        selections = cast(List[Dict[str, Any]], node.selection_set)
-        return {k: v for s in selections for k, v in s.items()}
+            root_type = self.schema.get_root_type(definition.operation)
 
-    def leave_fragment_spread(
-        self, node: FragmentSpreadNode, *_args: Any
-    ) -> Dict[str, Any]:
+            if root_type is None:
+                raise GraphQLError(
+                    f"Schema is not configured for {definition.operation.value}."
+                )
 
-        fragment_name = node.name.value
+            self.collect_fields(root_type, definition.selection_set, fields, set())
 
-        log.debug(f"Start recursive fragment visit {fragment_name}")
+        return self.compile_fields(fields)
 
-        fragment_node = _get_fragment(self.document, fragment_name)
 
-        fragment_result = parse_result_recursive(
-            self.schema,
-            self.document,
-            fragment_node,
-            self.current_result,
-            visit_fragment=True,
-        )
+def compile_result_parser(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    operation_name: Optional[str] = None,
+    *,
+    only_custom_types: bool = False,
+) -> Optional[ResultParser]:
+    """Compile a parser for the results of a document.
 
-        log.debug(
-            f"Result of recursive fragment visit {fragment_name}: {fragment_result}"
-        )
+    :param schema: the GraphQL schema
+    :param document: the document representing the query sent to the backend
+    :param operation_name: the optional operation name
+    :param only_custom_types: if True, only the values of custom scalars and
+        enums are parsed and the rest of the result is kept unchanged,
+        without being copied.
 
-        return cast(Dict[str, Any], fragment_result)
+    :returns: a function receiving a serialized result and returning
+              the parsed result, or None if :code:`only_custom_types` is True
+              and the result cannot contain any custom scalar or enum.
 
-    @staticmethod
-    def leave_inline_fragment(node: InlineFragmentNode, *_args: Any) -> Dict[str, Any]:
+    The returned parser can be called for many results of the same document,
+    without having to traverse the document again.
+    """
 
-        selections = cast(List[Dict[str, Any]], node.selection_set)
-        return {k: v for s in selections for k, v in s.items()}
+    compiler = _ResultParserCompiler(schema, document, only_custom_types)
 
+    return compiler.compile_document(document, operation_name)
 
-def parse_result_recursive(
+
+def get_result_parser(
     schema: GraphQLSchema,
     document: DocumentNode,
-    node: Node,
-    result: Optional[Dict[str, Any]],
-    initial_type: Optional[GraphQLType] = None,
-    inside_list_level: int = 0,
-    visit_fragment: bool = False,
     operation_name: Optional[str] = None,
-) -> Any:
+    *,
+    only_custom_types: bool = False,
+) -> Optional[ResultParser]:
+    """Same as :func:`compile_result_parser` but the compiled parsers are
+    cached for each schema, document and operation_name."""
 
-    if result is None:
-        return None
+    key = (id(schema), id(document), operation_name, only_custom_types)
 
-    type_info = TypeInfo(schema, initial_type=initial_type)
-
-    visited = visit(
-        node,
-        TypeInfoVisitor(
-            type_info,
-            ParseResultVisitor(
-                schema,
-                document,
-                node,
-                result,
-                type_info=type_info,
-                inside_list_level=inside_list_level,
-                visit_fragment=visit_fragment,
-                operation_name=operation_name,
-            ),
-        ),
-        visitor_keys=RESULT_DOCUMENT_KEYS,
+    cached = _parser_cache.get(key)
+
+    if cached is not None:
+        return cached[2]
+
+    parser = compile_result_parser(
+        schema, document, operation_name, only_custom_types=only_custom_types
     )
 
-    return visited
+    _parser_cache.set(key, (schema, document, parser))
+
+    return parser
 
 
 def parse_result(
@@ -422,6 +363,8 @@ def parse_result(
     document: DocumentNode,
     result: Optional[Dict[str, Any]],
     operation_name: Optional[str] = None,
+    *,
+    only_custom_types: bool = False,
 ) -> Optional[Dict[str, Any]]:
     """Unserialize a result received from a GraphQL backend.
 
@@ -429,6 +372,8 @@ def parse_result(
     :param document: the document representing the query sent to the backend
     :param result: the serialized result received from the backend
     :param operation_name: the optional operation name
+    :param only_custom_types: if True, only the values of custom scalars and
+        enums are parsed and the rest of the result is kept unchanged.
 
     :returns: a parsed result with scalars and enums parsed depending on
               their definition in the schema.
@@ -438,11 +383,24 @@ def parse_result(
 
     If the result contains only built-in GraphQL scalars (String, Int, Float, ...)
     then the parsed result should be unchanged.
+    With :code:`only_custom_types=True`, the same result object is returned
+    in that case.
 
     If the result contains custom scalars or enums, then those values
     will be parsed with the parse_value method of the custom scalar or enum
-    definition in the schema."""
+    definition in the schema.
 
-    return parse_result_recursive(
-        schema, document, document, result, operation_name=operation_name
+    The document is compiled only once for each schema, document and
+    operation_name (see :func:`get_result_parser`)."""
+
+    if result is None:
+        return None
+
+    parser = get_result_parser(
+        schema, document, operation_name, only_custom_types=only_custom_types
     )
+
+    if parser is None:
+        return result
+
+    return parser(result)
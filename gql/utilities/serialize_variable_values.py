@@ -1,21 +1,56 @@
-from typing import Any, Dict, Optional
+from itertools import islice
+from math import isfinite
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union, cast
 
 from graphql import (
+    GRAPHQL_MAX_INT,
+    GRAPHQL_MIN_INT,
     DocumentNode,
     GraphQLEnumType,
     GraphQLError,
     GraphQLInputObjectType,
+    GraphQLInputType,
     GraphQLList,
+    GraphQLNamedType,
     GraphQLNonNull,
     GraphQLScalarType,
     GraphQLSchema,
     GraphQLType,
     GraphQLWrappingType,
     OperationDefinitionNode,
+    OperationType,
+    get_named_type,
+    is_specified_scalar_type,
     type_from_ast,
 )
 from graphql.pyutils import inspect
 
+from ..graphql_request import GraphQLRequest, PreparedRequest
+from ..utils import LRUCache
+
+ValueSerializer = Callable[[Any], Any]
+VariablesSerializer = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+# Compiled serializers, keyed by (schema id, document id, operation name, mode).
+# The schema and the document are kept in the value so that their id
+# cannot be reused while the entry is in the cache.
+_serializer_cache: LRUCache[
+    Tuple[int, int, Optional[str], bool],
+    Tuple[GraphQLSchema, DocumentNode, VariablesSerializer],
+] = LRUCache(maxsize=1024)
+
+# For each built-in scalar, a check returning True if the value
+# would be returned unchanged by the serialize method of the scalar
+_BUILTIN_SCALAR_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "String": lambda value: type(value) is str,
+    "ID": lambda value: type(value) is str,
+    "Boolean": lambda value: type(value) is bool,
+    "Int": lambda value: (
+        type(value) is int and GRAPHQL_MIN_INT <= value <= GRAPHQL_MAX_INT
+    ),
+    "Float": lambda value: type(value) is float and isfinite(value),
+}
+
 
 def _get_document_operation(
     document: DocumentNode, operation_name: Optional[str] = None
@@ -50,6 +85,31 @@ def _get_document_operation(
     return operation
 
 
+def _get_request_operation(
+    request: GraphQLRequest,
+) -> Optional[OperationDefinitionNode]:
+    """Returns the operation executed by the request,
+    or None if a single operation cannot be retrieved."""
+
+    if isinstance(request, PreparedRequest):
+        return request.operation
+
+    try:
+        return _get_document_operation(
+            request.document, operation_name=request.operation_name
+        )
+    except GraphQLError:
+        return None
+
+
+def _is_query_request(request: GraphQLRequest) -> bool:
+    """Returns True if the operation executed by the request is a query."""
+
+    operation = _get_request_operation(request)
+
+    return operation is not None and operation.operation == OperationType.QUERY
+
+
 def serialize_value(type_: GraphQLType, value: Any) -> Any:
     """Given a GraphQL type and a Python value, return the serialized value.
 
@@ -91,11 +151,296 @@ def serialize_value(type_: GraphQLType, value: Any) -> Any:
     raise GraphQLError(f"Impossible to serialize value with type: {inspect(type_)}.")
 
 
+class _VariablesSerializerCompiler:
+    def __init__(self, schema: GraphQLSchema, only_custom_types: bool):
+        """Compiles the variable definitions of an operation into closures
+        serializing the variable values.
+
+        The returned values are copied only when needed: a list or a dict
+        is returned unchanged if none of its values have been modified.
+
+        Built-in scalar values are returned directly when their serialize
+        method would not modify them.
+
+        If :code:`only_custom_types` is True, the values for which no custom
+        scalar or enum can be found, looking recursively into the input types,
+        are returned unchanged without being traversed.
+        """
+        self.schema: GraphQLSchema = schema
+        self.only_custom_types: bool = only_custom_types
+
+        self.contains_custom_types: Dict[str, bool] = {}
+        self.input_object_serializers: Dict[str, ValueSerializer] = {}
+
+    def has_custom_types(self, type_: GraphQLNamedType) -> bool:
+        """Returns True if a custom scalar or an enum is reachable
+        from this type."""
+
+        try:
+            return self.contains_custom_types[type_.name]
+        except KeyError:
+            pass
+
+        found = False
+        seen: Set[str] = set()
+        stack: List[GraphQLNamedType] = [type_]
+
+        while stack:
+            current_type = stack.pop()
+
+            if isinstance(current_type, GraphQLInputObjectType):
+                if current_type.name not in seen:
+                    seen.add(current_type.name)
+                    stack.extend(
+                        get_named_type(field.type)
+                        for field in current_type.fields.values()
+                    )
+
+            elif not is_specified_scalar_type(current_type):
+                found = True
+                break
+
+        self.contains_custom_types[type_.name] = found
+
+        return found
+
+    def compile_type(self, type_: GraphQLInputType) -> Optional[ValueSerializer]:
+        """Compile a serializer for a value of the provided type.
+
+        Returns None if the values of this type can be sent unchanged."""
+
+        if self.only_custom_types and not self.has_custom_types(get_named_type(type_)):
+            return None
+
+        if isinstance(type_, GraphQLNonNull):
+            return self.compile_non_null(type_)
+
+        if isinstance(type_, GraphQLList):
+            return self.compile_list(type_)
+
+        if isinstance(type_, GraphQLInputObjectType):
+            return self.compile_input_object(type_)
+
+        if isinstance(type_, (GraphQLScalarType, GraphQLEnumType)):
+            return self.compile_leaf(type_)
+
+        raise GraphQLError(
+            f"Impossible to serialize value with type: {inspect(type_)}."
+        )
+
+    def compile_non_null(self, type_: GraphQLNonNull) -> ValueSerializer:
+
+        inner_serializer = self.compile_type(type_.of_type)
+
+        assert inner_serializer is not None
+
+        def serialize_non_null(value: Any) -> Any:
+            if value is None:
+                raise GraphQLError(f"Type {inspect(type_)} Cannot be None.")
+
+            return inner_serializer(value)
+
+        return serialize_non_null
+
+    def compile_list(self, type_: GraphQLList) -> ValueSerializer:
+
+        item_serializer = self.compile_type(type_.of_type)
+
+        assert item_serializer is not None
+
+        def serialize_list(value: Any) -> Any:
+            if value is None:
+                return None
+
+            if not isinstance(value, list):
+                return [item_serializer(item) for item in value]
+
+            for index, item in enumerate(value):
+                serialized_item = item_serializer(item)
+
+                if serialized_item is not item:
+                    # Copy the list only from the first modified item
+                    serialized = value[:index]
+                    serialized.append(serialized_item)
+                    serialized.extend(
+                        item_serializer(item) for item in islice(value, index + 1, None)
+                    )
+                    return serialized
+
+            return value
+
+        return serialize_list
+
+    def compile_leaf(
+        self, type_: Union[GraphQLScalarType, GraphQLEnumType]
+    ) -> ValueSerializer:
+
+        is_unchanged = None
+
+        if is_specified_scalar_type(type_):
+            is_unchanged = _BUILTIN_SCALAR_CHECKS.get(type_.name)
+
+        # Not using a bound serialize method here as it can be
+        # modified later with update_schema_scalars
+        if is_unchanged is not None:
+
+            def serialize_builtin_scalar(value: Any) -> Any:
+                if value is None or is_unchanged(value):
+                    return value
+
+                return type_.serialize(value)
+
+            return serialize_builtin_scalar
+
+        def serialize_leaf(value: Any) -> Any:
+            if value is None:
+                return None
+
+            return type_.serialize(value)
+
+        return serialize_leaf
+
+    def compile_input_object(self, type_: GraphQLInputObjectType) -> ValueSerializer:
+
+        # Input types can be recursive: the serializer is registered
+        # before compiling its fields
+        try:
+            return self.input_object_serializers[type_.name]
+        except KeyError:
+            pass
+
+        field_names = frozenset(type_.fields)
+        field_serializers: List[Tuple[str, ValueSerializer]] = []
+        keep_unknown_fields = self.only_custom_types
+
+        def serialize_input_object(value: Any) -> Any:
+            if value is None:
+                return None
+
+            serialized: Optional[Dict[str, Any]] = None
+
+            for field_name, field_serializer in field_serializers:
+                if field_name in value:
+                    field_value = value[field_name]
+                    serialized_value = field_serializer(field_value)
+
+                    if serialized_value is not field_value:
+                        if serialized is None:
+                            serialized = dict(value)
+                        serialized[field_name] = serialized_value
+
+            if not keep_unknown_fields and not field_names.issuperset(value):
+                serialized = {
+                    key: field_value
+                    for key, field_value in (serialized or value).items()
+                    if key in field_names
+                }
+
+            return value if serialized is None else serialized
+
+        self.input_object_serializers[type_.name] = serialize_input_object
+
+        for field_name, field in type_.fields.items():
+            field_serializer = self.compile_type(field.type)
+
+            if field_serializer is not None:
+                field_serializers.append((field_name, field_serializer))
+
+        return serialize_input_object
+
+    def compile_operation(
+        self, operation: OperationDefinitionNode
+    ) -> VariablesSerializer:
+
+        variable_serializers: List[Tuple[str, Optional[ValueSerializer]]] = []
+
+        for var_def_node in operation.variable_definitions or ():
+            var_name = var_def_node.variable.name.value
+            var_type = type_from_ast(self.schema, var_def_node.type)
+
+            assert var_type is not None
+
+            variable_serializers.append(
+                (var_name, self.compile_type(cast(GraphQLInputType, var_type)))
+            )
+
+        def serialize_variables(variable_values: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                var_name: (
+                    variable_values[var_name]
+                    if var_serializer is None
+                    else var_serializer(variable_values[var_name])
+                )
+                for var_name, var_serializer in variable_serializers
+                if var_name in variable_values
+            }
+
+        return serialize_variables
+
+
+def compile_variables_serializer(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    operation_name: Optional[str] = None,
+    *,
+    only_custom_types: bool = False,
+) -> VariablesSerializer:
+    """Compile a serializer for the variable values of a document.
+
+    :param schema: the GraphQL schema
+    :param document: the document representing the query sent to the backend
+    :param operation_name: the optional operation_name for the query.
+    :param only_custom_types: if True, only the values containing custom scalars
+        or enums are serialized, the other values are kept unchanged.
+
+    :returns: a function receiving the dictionary of variable values and
+              returning the serialized variable values.
+
+    The returned serializer can be used for many variable values
+    without having to find the variable types in the document again.
+    """
+
+    # Find the operation in the document
+    operation = _get_document_operation(document, operation_name=operation_name)
+
+    compiler = _VariablesSerializerCompiler(schema, only_custom_types)
+
+    return compiler.compile_operation(operation)
+
+
+def get_variables_serializer(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    operation_name: Optional[str] = None,
+    *,
+    only_custom_types: bool = False,
+) -> VariablesSerializer:
+    """Same as :func:`compile_variables_serializer` but the compiled serializers
+    are cached for each schema, document and operation_name."""
+
+    key = (id(schema), id(document), operation_name, only_custom_types)
+
+    cached = _serializer_cache.get(key)
+
+    if cached is not None:
+        return cached[2]
+
+    serializer = compile_variables_serializer(
+        schema, document, operation_name, only_custom_types=only_custom_types
+    )
+
+    _serializer_cache.set(key, (schema, document, serializer))
+
+    return serializer
+
+
 def serialize_variable_values(
     schema: GraphQLSchema,
     document: DocumentNode,
     variable_values: Dict[str, Any],
     operation_name: Optional[str] = None,
+    *,
+    only_custom_types: bool = False,
 ) -> Dict[str, Any]:
     """Given a GraphQL document and a schema, serialize the Dictionary of
     variable values.
@@ -107,24 +452,15 @@ def serialize_variable_values(
     :param variable_values: the dictionnary of variable values which needs
         to be serialized.
     :param operation_name: the optional operation_name for the query.
-    """
-
-    parsed_variable_values: Dict[str, Any] = {}
-
-    # Find the operation in the document
-    operation = _get_document_operation(document, operation_name=operation_name)
-
-    # Serialize every variable value defined for the operation
-    for var_def_node in operation.variable_definitions or ():
-        var_name = var_def_node.variable.name.value
-        var_type = type_from_ast(schema, var_def_node.type)
-
-        if var_name in variable_values:
+    :param only_custom_types: if True, only the values containing custom scalars
+        or enums are serialized, the other values are kept unchanged.
 
-            assert var_type is not None
-
-            var_value = variable_values[var_name]
+    The variable definitions of the document are compiled only once for each
+    schema, document and operation_name (see :func:`get_variables_serializer`).
+    """
 
-            parsed_variable_values[var_name] = serialize_value(var_type, var_value)
+    serializer = get_variables_serializer(
+        schema, document, operation_name, only_custom_types=only_custom_types
+    )
 
-    return parsed_variable_values
+    return serializer(variable_values)
@@ -1,6 +1,11 @@
 """Utilities to manipulate several python objects."""
 
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import Generic, Hashable, List, Optional, Tuple, TypeVar
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
 
 
 # From this response in Stackoverflow
@@ -19,3 +24,71 @@ def str_first_element(errors: List) -> str:
         first_error = errors
 
     return str(first_error)
+
+
+class LRUCache(Generic[_K, _V]):
+    """Thread-safe mapping keeping at most :code:`maxsize` items.
+
+    When the cache is full, the least recently used item is discarded.
+
+    The number of cache hits and misses of the :meth:`get` method are
+    available in the :code:`hits` and :code:`misses` attributes.
+    """
+
+    def __init__(self, maxsize: int):
+        """:param maxsize: maximum number of items in the cache"""
+        assert maxsize > 0, "maxsize should be a positive number"
+
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._data: "OrderedDict[_K, _V]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: _K) -> Optional[_V]:
+        """Get the value for this key or None if the key is not in the cache."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: _K, value: _V) -> None:
+        """Set the value for this key, discarding the least recently used item
+        if the cache is full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, key: _K) -> None:
+        """Remove the item with this key from the cache if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def items(self) -> List[Tuple[_K, _V]]:
+        """Returns a copy of the items, from the least recently used,
+        without changing their order."""
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self) -> None:
+        """Remove all the items from the cache and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
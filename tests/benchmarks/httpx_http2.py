@@ -0,0 +1,130 @@
+"""Benchmark of the concurrent queries of the HTTPXAsyncTransport
+with HTTP/1.1 and with HTTP/2 multiplexing.
+
+Run with: python -m tests.benchmarks.httpx_http2
+
+Both local servers answer each query after the same delay.
+With HTTP/1.1, a connection is used by a single query at a time, so the
+concurrent queries wait for a connection of the pool once its limit is reached.
+With HTTP/2, the queries are multiplexed as streams of the same connections.
+Requires aiohttp and the h2 package.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+from aiohttp import web
+
+from gql import Client, gql
+from gql.transport.httpx import HTTPXAsyncTransport
+
+from ..conftest import H2Server
+
+# The debug logs enabled by the tests would be measured
+logging.getLogger("gql.transport.httpx").setLevel(logging.WARNING)
+
+query = gql("{ continents { code name } }")
+
+answer = b'{"data":{"continents":[{"code":"AF","name":"Africa"}]}}'
+
+
+async def start_http1_server(delay: float) -> web.AppRunner:
+    async def handler(request: web.Request) -> web.Response:
+        await request.read()
+        await asyncio.sleep(delay)
+        return web.Response(body=answer, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_route("POST", "/graphql", handler)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+
+    return runner
+
+
+async def bench(
+    name: str, url: str, concurrency: int, number: int, **kwargs: Any
+) -> None:
+    transport = HTTPXAsyncTransport(url=url, **kwargs)
+
+    async with Client(transport=transport) as session:
+        semaphore = asyncio.Semaphore(concurrency)
+        max_connections = 0
+
+        async def execute() -> Dict[str, Any]:
+            nonlocal max_connections
+
+            async with semaphore:
+                task = asyncio.ensure_future(session.execute(query))
+                await asyncio.sleep(0)
+
+                stats = transport.get_pool_stats()
+                assert stats is not None
+                max_connections = max(max_connections, stats.connections)
+
+                return await task
+
+        # Warm up the connections
+        await asyncio.gather(*(execute() for _ in range(concurrency)))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(execute() for _ in range(number)))
+        duration = time.perf_counter() - start
+
+    print(
+        f"{name:<30} {number / duration:8.0f} queries/s"
+        f"    connections: {max_connections}"
+    )
+
+
+async def main() -> None:
+    delay = 0.05
+    number = 1000
+    pool_maxsize = 10
+
+    http1_server = await start_http1_server(delay)
+    http1_port = http1_server.addresses[0][1]
+    http1_url = f"http://127.0.0.1:{http1_port}/graphql"
+
+    http2_server = H2Server(answer, delay=delay)
+    await http2_server.start()
+
+    print(
+        f"{number} queries, answered after {delay * 1000:.0f} ms,"
+        f" pool_maxsize={pool_maxsize}"
+    )
+
+    try:
+        for concurrency in [10, 100]:
+            print(f"Concurrency: {concurrency}")
+
+            await bench(
+                "HTTP/1.1",
+                http1_url,
+                concurrency,
+                number,
+                pool_maxsize=pool_maxsize,
+            )
+
+            # http1=False to use HTTP/2 without TLS
+            await bench(
+                "HTTP/2",
+                http2_server.url,
+                concurrency,
+                number,
+                http2=True,
+                http1=False,
+                pool_maxsize=pool_maxsize,
+            )
+
+    finally:
+        await http1_server.cleanup()
+        await http2_server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
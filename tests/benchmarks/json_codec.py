@@ -0,0 +1,69 @@
+"""Benchmark of the JSON codecs on a large answer.
+
+Run with: python -m tests.benchmarks.json_codec
+
+The answer is decoded from the bytes received by the transports
+and a large mutation payload is encoded in the body sent to the backend.
+"""
+
+import json
+import timeit
+from typing import Any, Dict, List
+
+from gql.json_codec import CallableJSONCodec, JSONCodec, MsgspecCodec, OrjsonCodec
+
+
+def make_answer(count: int) -> bytes:
+    orders: List[Dict[str, Any]] = [
+        {
+            "node": {
+                "id": str(index),
+                "reference": f"ORDER-{index:08d}",
+                "amount": index * 1.25,
+                "paid": index % 2 == 0,
+                "lines": [
+                    {"sku": f"SKU-{line}", "quantity": line} for line in range(5)
+                ],
+            }
+        }
+        for index in range(count)
+    ]
+
+    return json.dumps({"data": {"orders": {"edges": orders}}}).encode("utf-8")
+
+
+def bench(name: str, codec: JSONCodec, answer: bytes, number: int) -> None:
+    value = codec.decode(answer)
+
+    decode_time = timeit.timeit(lambda: codec.decode(answer), number=number) / number
+    encode_time = timeit.timeit(lambda: codec.encode(value), number=number) / number
+
+    print(
+        f"{name:<30} decode: {decode_time * 1000:8.2f} ms"
+        f"    encode: {encode_time * 1000:8.2f} ms"
+    )
+
+
+def main() -> None:
+    answer = make_answer(20000)
+    number = 10
+
+    print(f"Answer of {len(answer) / 1e6:.1f} MB, mean of {number} runs")
+
+    # The previous path of the transports: decode to str, then json.loads
+    bench("json (str)", CallableJSONCodec(), answer, number)
+    bench("JSONCodec (bytes)", JSONCodec(), answer, number)
+
+    try:
+        bench("OrjsonCodec (bytes)", OrjsonCodec(), answer, number)
+    except ImportError:
+        print("orjson is not installed")
+
+    try:
+        bench("MsgspecCodec (bytes)", MsgspecCodec(), answer, number)
+    except ImportError:
+        print("msgspec is not installed")
+
+
+if __name__ == "__main__":
+    main()
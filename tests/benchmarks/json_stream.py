@@ -0,0 +1,109 @@
+"""Benchmark of the streaming execution of a query with a large answer,
+compared to its execution with the whole answer decoded at once.
+
+Run with: python -m tests.benchmarks.json_stream
+
+The peak memory is measured with tracemalloc, which slows down both modes.
+Requires aiohttp.
+"""
+
+import asyncio
+import logging
+import time
+import tracemalloc
+
+from aiohttp import web
+
+from gql import Client, gql
+from gql.transport.aiohttp import AIOHTTPTransport
+
+from .json_codec import make_answer
+
+# The debug logs enabled by the tests would be measured
+logging.getLogger("gql.transport").setLevel(logging.WARNING)
+
+query = gql("{ orders { edges { node { id reference amount paid } } } }")
+
+
+async def start_server(answer: bytes) -> web.AppRunner:
+    async def handler(request: web.Request) -> web.Response:
+        await request.read()
+        return web.Response(body=answer, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_route("POST", "/graphql", handler)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+
+    return runner
+
+
+async def bench_execute(url: str) -> None:
+    async with Client(transport=AIOHTTPTransport(url=url)) as session:
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+
+        result = await session.execute(query)
+        first_item_time = time.perf_counter() - start
+        count = sum(1 for _ in result["orders"]["edges"])
+        duration = time.perf_counter() - start
+
+        del result
+
+    print_result("execute", count, first_item_time, duration)
+
+
+async def bench_execute_stream(url: str) -> None:
+    async with Client(transport=AIOHTTPTransport(url=url)) as session:
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+
+        first_item_time = 0.0
+        count = 0
+
+        async for _ in session.execute_stream(query, "data.orders.edges"):
+            if count == 0:
+                first_item_time = time.perf_counter() - start
+            count += 1
+
+        duration = time.perf_counter() - start
+
+    print_result("execute_stream", count, first_item_time, duration)
+
+
+def print_result(
+    name: str, count: int, first_item_time: float, duration: float
+) -> None:
+    peak = tracemalloc.get_traced_memory()[1]
+
+    print(
+        f"{name:<16} {count} items"
+        f"    first item: {first_item_time * 1000:7.0f} ms"
+        f"    total: {duration * 1000:7.0f} ms"
+        f"    peak memory: {peak / 2**20:6.1f} MiB"
+    )
+
+
+async def main() -> None:
+    answer = make_answer(200_000)
+
+    runner = await start_server(answer)
+    port = runner.addresses[0][1]
+    url = f"http://127.0.0.1:{port}/graphql"
+
+    print(f"Answer of {len(answer) / 2**20:.1f} MiB")
+
+    tracemalloc.start()
+
+    try:
+        await bench_execute(url)
+        await bench_execute_stream(url)
+    finally:
+        tracemalloc.stop()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,7 +10,7 @@ import sys
 import tempfile
 import types
 from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, Iterable, List, Union, cast
+from typing import Callable, Iterable, List, Optional, Union, cast
 
 import pytest
 import pytest_asyncio
@@ -452,6 +452,111 @@ class PhoenixChannelServerHelper:
         await ws.send('{"event":"phx_reply", "payload": {"status": "ok"}, "ref": 1}')
 
 
+class H2Server:
+    """HTTP/2 server on localhost on a free port, without TLS (h2c).
+
+    The clients must use HTTP/2 with prior knowledge.
+    The same answer is sent to every request after a delay, or once the
+    answer_event is set, and the connections and the concurrent streams
+    are counted to test the multiplexing.
+    """
+
+    def __init__(self, answer: bytes, delay: float = 0):
+        self.answer = answer
+        self.delay = delay
+        self.answer_event: Optional[asyncio.Event] = None
+
+        self.connections = 0
+        self.requests = 0
+        self.max_concurrent_streams = 0
+
+    async def start(self):
+        event_loop = asyncio.get_running_loop()
+
+        self.server = await event_loop.create_server(
+            lambda: _H2ServerProtocol(self), "127.0.0.1", 0
+        )
+
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{self.port}/graphql"
+
+        print(f"HTTP/2 server started on port {self.port}")
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+class _H2ServerProtocol(asyncio.Protocol):
+    def __init__(self, server: H2Server):
+        import h2.config
+        import h2.connection
+
+        self.server = server
+        self.h2 = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False)
+        )
+        self.streams: set = set()
+        self.tasks: set = set()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server.connections += 1
+        self.h2.initiate_connection()
+        self.transport.write(self.h2.data_to_send())
+
+    def connection_lost(self, exc):
+        for task in self.tasks:
+            task.cancel()
+
+    def data_received(self, data):
+        import h2.events
+        import h2.exceptions
+
+        try:
+            events = self.h2.receive_data(data)
+        except h2.exceptions.ProtocolError:  # pragma: no cover
+            self.transport.write(self.h2.data_to_send())
+            self.transport.close()
+            return
+
+        for event in events:
+            if isinstance(event, h2.events.DataReceived):
+                self.h2.acknowledge_received_data(
+                    event.flow_controlled_length, event.stream_id
+                )
+            elif isinstance(event, h2.events.StreamEnded):
+                self.streams.add(event.stream_id)
+                self.server.requests += 1
+                self.server.max_concurrent_streams = max(
+                    self.server.max_concurrent_streams, len(self.streams)
+                )
+                task = asyncio.ensure_future(self.answer(event.stream_id))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+
+        self.transport.write(self.h2.data_to_send())
+
+    async def answer(self, stream_id):
+        await asyncio.sleep(self.server.delay)
+
+        if self.server.answer_event is not None:
+            await self.server.answer_event.wait()
+
+        self.streams.discard(stream_id)
+
+        self.h2.send_headers(
+            stream_id,
+            [
+                (":status", "200"),
+                ("content-type", "application/json"),
+                ("content-length", str(len(self.server.answer))),
+            ],
+        )
+        self.h2.send_data(stream_id, self.server.answer, end_stream=True)
+        self.transport.write(self.h2.data_to_send())
+
+
 class TemporaryFile:
     """Class used to generate temporary files for the tests"""
 
@@ -1,3 +1,9 @@
+import copy
+from datetime import datetime
+from typing import Any, AsyncGenerator, Dict, List
+
+import pytest
+from graphql import ExecutionResult, GraphQLScalarType, build_schema
 from graphql.type import (
     GraphQLArgument,
     GraphQLField,
@@ -9,7 +15,9 @@ from graphql.type import (
     GraphQLString,
 )
 
-from gql import Client, gql
+from gql import Client, GraphQLRequest, gql
+from gql.transport import AsyncTransport, Transport
+from gql.utilities import parse_result, update_schema_scalar
 
 static_result = {
     "edges": [
@@ -93,3 +101,184 @@ def test_parse_results_null_mapping():
 
     query.variable_values = {"count": 2}
     assert client.execute(query) == {"test": static_result}
+
+
+abstract_schema = build_schema("""
+    scalar Datetime
+
+    interface Node {
+      id: ID
+    }
+
+    type EventChild {
+      name: String
+      when: Datetime
+    }
+
+    type NoteChild {
+      name: String
+      other: String
+    }
+
+    type Event implements Node {
+      id: ID
+      child: EventChild
+    }
+
+    type Note implements Node {
+      id: ID
+      child: NoteChild
+    }
+
+    union Item = Event | Note
+
+    type Query {
+      items: [Item]
+      nodes: [Node]
+    }
+""")
+
+update_schema_scalar(
+    abstract_schema,
+    "Datetime",
+    GraphQLScalarType("Datetime", parse_value=datetime.fromisoformat),
+)
+
+abstract_result = [
+    {"id": "1", "child": {"name": "event", "when": "2024-05-01T10:00:00"}},
+    {"id": "2", "child": {"name": "note", "other": "2024-05-01T10:00:00"}},
+]
+
+
+@pytest.mark.parametrize("only_custom_types", [False, True])
+@pytest.mark.parametrize(
+    "query_str",
+    [
+        """{
+          items {
+            ... on Event { id child { name when } }
+            ... on Note { id child { name other } }
+          }
+        }""",
+        """{
+          nodes {
+            id
+            ... on Note { child { other name } }
+            ... on Event { child { when name } }
+          }
+        }""",
+    ],
+    ids=["union", "interface"],
+)
+def test_parse_results_fragments_on_different_types(query_str, only_custom_types):
+    """The fields with the same response key in fragments on different types
+    are parsed with the type of their own field."""
+
+    document = gql(query_str).document
+    key = "items" if "items" in query_str else "nodes"
+
+    result = parse_result(
+        abstract_schema,
+        document,
+        {key: abstract_result},
+        only_custom_types=only_custom_types,
+    )
+
+    assert result == {
+        key: [
+            {"id": "1", "child": {"name": "event", "when": datetime(2024, 5, 1, 10)}},
+            {"id": "2", "child": {"name": "note", "other": "2024-05-01T10:00:00"}},
+        ]
+    }
+
+
+class ResultTransport(Transport):
+    """Sync transport returning a copy of the same data for each request."""
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.data = data
+
+    def execute(
+        self, request: GraphQLRequest, *args: Any, **kwargs: Any
+    ) -> ExecutionResult:
+        return ExecutionResult(data=copy.deepcopy(self.data))
+
+    def execute_batch(
+        self, reqs: List[GraphQLRequest], *args: Any, **kwargs: Any
+    ) -> List[ExecutionResult]:
+        return [self.execute(request) for request in reqs]
+
+
+class ResultAsyncTransport(AsyncTransport):
+    """Async transport returning a copy of the same data for each request."""
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.data = data
+
+    async def connect(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def execute(
+        self, request: GraphQLRequest, *args: Any, **kwargs: Any
+    ) -> ExecutionResult:
+        return ExecutionResult(data=copy.deepcopy(self.data))
+
+    async def subscribe(
+        self, request: GraphQLRequest, *args: Any, **kwargs: Any
+    ) -> AsyncGenerator[ExecutionResult, None]:
+        yield ExecutionResult(data=copy.deepcopy(self.data))
+
+
+client_query = gql("{ nodes { id ... on Event { child { when } } } }")
+
+client_data = {
+    "nodes": [{"id": 1, "extra": 3, "child": {"when": "2024-05-01T10:00:00"}}]
+}
+
+# By default, the built-in scalars are coerced and the extra fields are removed
+parsed_data = {"nodes": [{"id": "1", "child": {"when": datetime(2024, 5, 1, 10)}}]}
+
+# Only the custom scalars are parsed with parse_only_custom_types
+custom_parsed_data = {
+    "nodes": [{"id": 1, "extra": 3, "child": {"when": datetime(2024, 5, 1, 10)}}]
+}
+
+
+@pytest.mark.parametrize(
+    "parse_only_custom_types, expected",
+    [(False, parsed_data), (True, custom_parsed_data)],
+)
+def test_client_parse_results(parse_only_custom_types, expected):
+    client = Client(
+        schema=abstract_schema,
+        transport=ResultTransport(client_data),
+        parse_results=True,
+        parse_only_custom_types=parse_only_custom_types,
+    )
+
+    with client as session:
+        assert session.execute(client_query) == expected
+        assert session.execute_batch([client_query]) == [expected]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "parse_only_custom_types, expected",
+    [(False, parsed_data), (True, custom_parsed_data)],
+)
+async def test_async_client_parse_results(parse_only_custom_types, expected):
+    client = Client(
+        schema=abstract_schema,
+        transport=ResultAsyncTransport(client_data),
+        parse_results=True,
+        parse_only_custom_types=parse_only_custom_types,
+    )
+
+    async with client as session:
+        assert await session.execute(client_query) == expected
+
+        async for result in session.subscribe(client_query):
+            assert result == expected
@@ -0,0 +1,299 @@
+from decimal import Decimal
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+import pytest
+from graphql import ExecutionResult, GraphQLError, GraphQLScalarType, build_schema
+
+from gql import Client, GraphQLRequest, gql
+from gql.transport import AsyncTransport, Transport
+from gql.utilities import (
+    compile_variables_serializer,
+    serialize_variable_values,
+    update_schema_scalar,
+)
+from gql.utilities.serialize_variable_values import get_variables_serializer
+
+type_defs = """
+    scalar Money
+
+    enum Color {
+      RED
+      GREEN
+    }
+
+    input Filter {
+      name: String
+      color: Color
+      tags: [String!]
+      price: Money
+      or: [Filter!]
+    }
+
+    input Page {
+      first: Int
+      after: ID
+      sub: Page
+    }
+
+    type Query {
+      items(filter: Filter, colors: [Color], page: Page, count: Int!): [String]
+    }
+"""
+
+schema = build_schema(type_defs)
+
+update_schema_scalar(
+    schema,
+    "Money",
+    GraphQLScalarType("Money", serialize=lambda value: f"{value:.2f}"),
+)
+
+query = gql("""
+    query Items($filter: Filter, $colors: [Color], $page: Page, $count: Int!) {
+      items(filter: $filter, colors: $colors, page: $page, count: $count)
+    }
+    """)
+
+
+def test_serialize_variables_recursive_input():
+
+    tags = ["a", "b"]
+
+    variable_values: Dict[str, Any] = {
+        "filter": {
+            "name": "test",
+            "tags": tags,
+            "or": [
+                {"color": "RED", "price": Decimal("1.5")},
+                {"name": "other"},
+            ],
+        },
+        "colors": ["GREEN"],
+        "count": 10,
+    }
+
+    serialized = serialize_variable_values(schema, query.document, variable_values)
+
+    assert serialized == {
+        "filter": {
+            "name": "test",
+            "tags": ["a", "b"],
+            "or": [
+                {"color": "RED", "price": "1.50"},
+                {"name": "other"},
+            ],
+        },
+        "colors": ["GREEN"],
+        "count": 10,
+    }
+
+    # The original values are not modified
+    assert variable_values["filter"]["or"][0]["price"] == Decimal("1.5")
+
+    # Untouched values are not copied
+    assert serialized["filter"]["tags"] is tags
+    assert serialized["filter"]["or"][1] is variable_values["filter"]["or"][1]
+
+
+def test_serialize_variables_builtin_scalars():
+
+    variable_values = {
+        "filter": {"name": 5, "tags": ["a", True], "unknown": 1},
+        "page": {"first": 1.0, "after": 1234},
+        "count": 10,
+    }
+
+    serialized = serialize_variable_values(schema, query.document, variable_values)
+
+    assert serialized == {
+        "filter": {"name": "5", "tags": ["a", "true"]},
+        "page": {"first": 1, "after": "1234"},
+        "count": 10,
+    }
+
+
+def test_serialize_variables_only_custom_types():
+
+    page = {"first": 1.0, "after": 1234, "sub": {"first": 2}}
+
+    variable_values = {
+        "filter": {"name": 5, "price": 2, "unknown": 1},
+        "page": page,
+        "count": 10,
+    }
+
+    serialized = serialize_variable_values(
+        schema, query.document, variable_values, only_custom_types=True
+    )
+
+    assert serialized == {
+        "filter": {"name": 5, "price": "2.00", "unknown": 1},
+        "page": {"first": 1.0, "after": 1234, "sub": {"first": 2}},
+        "count": 10,
+    }
+
+    assert serialized["page"] is page
+
+
+def test_serialize_variables_non_null_none():
+
+    with pytest.raises(GraphQLError) as exc_info:
+        serialize_variable_values(schema, query.document, {"count": None})
+
+    assert str(exc_info.value) == "Type Int! Cannot be None."
+
+    with pytest.raises(GraphQLError) as exc_info:
+        serialize_variable_values(
+            schema, query.document, {"filter": {"or": [None]}}, only_custom_types=True
+        )
+
+    assert str(exc_info.value) == "Type Filter! Cannot be None."
+
+
+def test_compile_variables_serializer():
+
+    serializer = compile_variables_serializer(schema, query.document)
+
+    assert serializer({"colors": ["RED", None], "count": 1}) == {
+        "colors": ["RED", None],
+        "count": 1,
+    }
+    assert serializer({"filter": None, "count": 1}) == {"filter": None, "count": 1}
+
+
+def test_variables_serializer_cached():
+
+    serializer = get_variables_serializer(schema, query.document)
+
+    assert get_variables_serializer(schema, query.document) is serializer
+    assert (
+        get_variables_serializer(schema, query.document, only_custom_types=True)
+        is not serializer
+    )
+
+
+class RecordingTransport(Transport):
+    """Sync transport saving the variable values sent."""
+
+    def __init__(self) -> None:
+        self.variable_values: List[Optional[Dict[str, Any]]] = []
+
+    def execute(
+        self, request: GraphQLRequest, *args: Any, **kwargs: Any
+    ) -> ExecutionResult:
+        self.variable_values.append(request.variable_values)
+        return ExecutionResult(data={"items": []})
+
+    def execute_batch(
+        self, reqs: List[GraphQLRequest], *args: Any, **kwargs: Any
+    ) -> List[ExecutionResult]:
+        return [self.execute(request) for request in reqs]
+
+
+class RecordingAsyncTransport(AsyncTransport):
+    """Async transport saving the variable values sent."""
+
+    def __init__(self) -> None:
+        self.variable_values: List[Optional[Dict[str, Any]]] = []
+
+    async def connect(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def execute(
+        self, request: GraphQLRequest, *args: Any, **kwargs: Any
+    ) -> ExecutionResult:
+        self.variable_values.append(request.variable_values)
+        return ExecutionResult(data={"items": []})
+
+    async def execute_batch(
+        self, reqs: List[GraphQLRequest], *args: Any, **kwargs: Any
+    ) -> List[ExecutionResult]:
+        return [await self.execute(request) for request in reqs]
+
+    async def subscribe(
+        self, request: GraphQLRequest, *args: Any, **kwargs: Any
+    ) -> AsyncGenerator[ExecutionResult, None]:
+        yield ExecutionResult(data={"items": []})  # pragma: no cover
+
+
+def get_request_factory(
+    client: Client, prepared: bool
+) -> Callable[[Dict[str, Any]], GraphQLRequest]:
+    """Returns a function creating the requests of the query with variables,
+    with a PreparedRequest using its compiled serializer if prepared is True."""
+
+    if not prepared:
+        return lambda variable_values: GraphQLRequest(
+            query, variable_values=variable_values
+        )
+
+    prepared_request = client.prepare(query)
+    assert prepared_request._variables_serializer is not None
+
+    return prepared_request.with_variables
+
+
+@pytest.mark.parametrize("prepared", [False, True])
+def test_client_serialize_variables_builtin_types(prepared: bool) -> None:
+    transport = RecordingTransport()
+    client = Client(schema=schema, transport=transport)
+
+    make_request = get_request_factory(client, prepared)
+
+    with client as session:
+        session.execute(
+            make_request({"filter": {"name": 5, "extra": 2, "price": 2}, "count": 1}),
+            serialize_variables=True,
+        )
+
+        session.execute_batch(
+            [make_request({"filter": {"name": 6}})],
+            serialize_variables=True,
+        )
+
+        # A None value for a non-null variable is refused by the client
+        with pytest.raises(GraphQLError, match="Type Int! Cannot be None."):
+            session.execute(
+                make_request({"count": None}),
+                serialize_variables=True,
+            )
+
+    # The built-in scalars are coerced and the unknown fields are removed
+    assert transport.variable_values == [
+        {"filter": {"name": "5", "price": "2.00"}, "count": 1},
+        {"filter": {"name": "6"}},
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prepared", [False, True])
+async def test_async_client_serialize_variables_builtin_types(prepared: bool) -> None:
+    transport = RecordingAsyncTransport()
+    client = Client(schema=schema, transport=transport)
+
+    make_request = get_request_factory(client, prepared)
+
+    async with client as session:
+        await session.execute(
+            make_request({"filter": {"name": 5, "extra": 2, "price": 2}, "count": 1}),
+            serialize_variables=True,
+        )
+
+        await session.execute_batch(
+            [make_request({"filter": {"name": 6}})],
+            serialize_variables=True,
+        )
+
+        with pytest.raises(GraphQLError, match="Type Int! Cannot be None."):
+            await session.execute(
+                make_request({"count": None}),
+                serialize_variables=True,
+            )
+
+    assert transport.variable_values == [
+        {"filter": {"name": "5", "price": "2.00"}, "count": 1},
+        {"filter": {"name": "6"}},
+    ]
@@ -0,0 +1,223 @@
+import asyncio
+from typing import Any, List, cast
+
+import pytest
+from graphql import ExecutionResult, GraphQLError, print_ast
+
+from gql import Client, GraphQLRequest
+from gql.utilities import can_merge_request, merge_requests, split_result
+from tests.starwars.schema import StarWarsSchema
+
+hero_request = GraphQLRequest(
+    """
+    query HeroQuery($episode: Episode) {
+      hero(episode: $episode) {
+        ...CharacterFields
+      }
+    }
+
+    fragment CharacterFields on Character {
+      name
+    }
+    """,
+    variable_values={"episode": "EMPIRE"},
+)
+
+human_request = GraphQLRequest(
+    """
+    query HumanQuery($id: String!) {
+      luke: human(id: $id) {
+        ...CharacterFields
+      }
+      ...RootFields
+    }
+
+    fragment CharacterFields on Character {
+      id
+      name
+    }
+
+    fragment RootFields on Query {
+      droid(id: "2001") {
+        name
+      }
+    }
+    """,
+    variable_values={"id": "1000"},
+)
+
+
+def test_merge_requests():
+
+    merged = merge_requests([hero_request, human_request])
+
+    assert print_ast(merged.document) == (
+        "query ($_0_episode: Episode, $_1_id: String!) {\n"
+        "  _0_hero: hero(episode: $_0_episode) {\n"
+        "    ...CharacterFields\n"
+        "  }\n"
+        "  _1_luke: human(id: $_1_id) {\n"
+        "    ..._1_CharacterFields\n"
+        "  }\n"
+        "  ... on Query {\n"
+        '    _1_droid: droid(id: "2001") {\n'
+        "      name\n"
+        "    }\n"
+        "  }\n"
+        "}\n"
+        "\n"
+        "fragment CharacterFields on Character {\n"
+        "  name\n"
+        "}\n"
+        "\n"
+        "fragment _1_CharacterFields on Character {\n"
+        "  id\n"
+        "  name\n"
+        "}"
+    )
+
+    assert merged.variable_values == {"_0_episode": "EMPIRE", "_1_id": "1000"}
+
+    # Identical fragments are sent only once
+    merged = merge_requests([hero_request, hero_request])
+
+    assert print_ast(merged.document).count("fragment") == 1
+
+
+def test_can_merge_request():
+
+    assert can_merge_request(hero_request)
+    assert not can_merge_request(GraphQLRequest("mutation { a }"))
+    assert not can_merge_request(GraphQLRequest("subscription { a }"))
+    assert not can_merge_request(GraphQLRequest("{ a }", extensions={"b": 1}))
+    assert not can_merge_request(GraphQLRequest("{ a }", operation_name="unknown"))
+
+
+def test_split_result():
+
+    result = ExecutionResult(
+        data={"_0_hero": {"name": "R2-D2"}, "_1_luke": None},
+        # The errors of the transports are dicts, not GraphQLError instances
+        errors=cast(
+            List[Any],
+            [
+                {"message": "Error 1", "path": ["_1_luke", "name"]},
+                {"message": "Error 2"},
+            ],
+        ),
+        extensions={"cost": 3},
+    )
+
+    results = split_result(result, 2)
+
+    assert results[0].data == {"hero": {"name": "R2-D2"}}
+    assert results[0].errors == [{"message": "Error 2"}]
+    assert results[0].extensions == {"cost": 3}
+
+    assert results[1].data == {"luke": None}
+    assert results[1].errors == [
+        {"message": "Error 1", "path": ["luke", "name"]},
+        {"message": "Error 2"},
+    ]
+
+    # GraphQLError instances are also supported
+    result = ExecutionResult(data=None, errors=[GraphQLError("Error", path=["_1_a"])])
+
+    results = split_result(result, 2)
+
+    assert results[1].data is None
+    assert results[1].errors is not None
+    assert results[1].errors[0].path == ["a"]
+
+    # Without data, the other requests get the errors of the merged result
+    assert results[0].data is None
+    assert results[0].errors == result.errors
+
+
+def test_split_result_without_data():
+
+    # A non-null root field error nulls the data of all the requests
+    result = ExecutionResult(data=None, errors=[GraphQLError("boom", path=["_0_a"])])
+
+    results = split_result(result, 3)
+
+    assert results[0].errors is not None
+    assert results[0].errors[0].path == ["a"]
+
+    for request_result in results[1:]:
+        assert request_result.data is None
+        assert request_result.errors == result.errors
+
+    # An invalid result without data nor errors
+    results = split_result(ExecutionResult(data=None), 2)
+
+    for request_result in results:
+        assert request_result.data is None
+        assert request_result.errors is not None
+        assert request_result.errors[0].message == (
+            "No data in the result of the merged request"
+        )
+
+
+@pytest.mark.asyncio
+async def test_merge_queries_client(monkeypatch):
+
+    client = Client(schema=StarWarsSchema, batch_merge_queries=True)
+
+    async with client as session:
+
+        expected = [
+            await session.execute(hero_request),
+            await session.execute(human_request),
+        ]
+
+        executed = []
+
+        transport_execute = session.transport.execute
+
+        async def execute(request, *args, **kwargs):
+            executed.append(request)
+            return await transport_execute(request, *args, **kwargs)
+
+        monkeypatch.setattr(session.transport, "execute", execute)
+
+        results = await session.execute_batch([hero_request, human_request])
+
+        assert results == expected
+        assert expected[1] == {
+            "luke": {"id": "1000", "name": "Luke Skywalker"},
+            "droid": {"name": "R2-D2"},
+        }
+
+        # A single query was executed
+        assert len(executed) == 1
+
+
+@pytest.mark.asyncio
+async def test_merge_queries_automatic_batching(monkeypatch):
+
+    client = Client(
+        schema=StarWarsSchema, batch_merge_queries=True, batch_interval=0.01
+    )
+
+    async with client as session:
+
+        executed = []
+
+        transport_execute = session.transport.execute
+
+        async def execute(request, *args, **kwargs):
+            executed.append(request)
+            return await transport_execute(request, *args, **kwargs)
+
+        monkeypatch.setattr(session.transport, "execute", execute)
+
+        results = await asyncio.gather(
+            session.execute(hero_request),
+            session.execute(human_request),
+        )
+
+        assert results[0] == {"hero": {"name": "Luke Skywalker"}}
+        assert results[1]["luke"] == {"id": "1000", "name": "Luke Skywalker"}
+
+        assert len(executed) == 1
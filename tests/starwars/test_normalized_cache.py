@@ -0,0 +1,406 @@
+import time
+
+import pytest
+from graphql import ExecutionResult
+
+from gql import Client, GraphQLRequest, gql
+from gql.cache import NormalizedCache
+from tests.starwars.schema import StarWarsSchema
+
+hero_query = GraphQLRequest("""
+    query HeroQuery {
+      hero {
+        __typename
+        id
+        name
+        friends {
+          __typename
+          id
+          name
+        }
+      }
+    }
+    """)
+
+human_query = GraphQLRequest("""
+    query HumanQuery($id: String!) {
+      human(id: $id) {
+        __typename
+        id
+        name
+      }
+    }
+    """)
+
+
+def write(cache, request, data, schema=None):
+    cache.write(request, "", ExecutionResult(data=data), schema=schema)
+
+
+def read(cache, request, schema=None):
+    entry = cache.read(request, "", schema=schema)
+    return None if entry is None else entry.data
+
+
+def test_normalized_cache_entities():
+
+    cache = NormalizedCache()
+
+    write(
+        cache,
+        hero_query,
+        {
+            "hero": {
+                "__typename": "Droid",
+                "id": "2001",
+                "name": "R2-D2",
+                "friends": [
+                    {"__typename": "Human", "id": "1000", "name": "Luke"},
+                    {"__typename": "Human", "id": "1002", "name": "Han"},
+                ],
+            }
+        },
+    )
+
+    assert "Droid:2001" in cache
+    assert cache.get_entity("Droid:2001") == {
+        "__typename": "Droid",
+        "id": "2001",
+        "name": "R2-D2",
+        "friends": [{"__ref": "Human:1000"}, {"__ref": "Human:1002"}],
+    }
+
+    assert read(cache, hero_query)["hero"]["friends"][0]["name"] == "Luke"
+
+    # The human query was never executed but can be answered by the cache
+    # if the human field was saved with these arguments
+    request = GraphQLRequest(human_query, variable_values={"id": "1000"})
+    assert read(cache, request) is None
+
+    write(
+        cache,
+        request,
+        {"human": {"__typename": "Human", "id": "1000", "name": "Luke Skywalker"}},
+    )
+
+    assert read(cache, request) == {
+        "human": {"__typename": "Human", "id": "1000", "name": "Luke Skywalker"}
+    }
+
+    # The entity is updated in the other query
+    assert read(cache, hero_query)["hero"]["friends"][0]["name"] == "Luke Skywalker"
+
+    # Other arguments
+    request = GraphQLRequest(human_query, variable_values={"id": "1002"})
+    assert read(cache, request) is None
+
+    # Evicted entity
+    cache.evict("Human:1000")
+    assert read(cache, hero_query) is None
+
+    cache.clear()
+    assert "Droid:2001" not in cache
+
+
+def test_normalized_cache_mutation_updates_entities():
+
+    cache = NormalizedCache()
+
+    write(
+        cache,
+        hero_query,
+        {
+            "hero": {
+                "__typename": "Droid",
+                "id": "2001",
+                "name": "R2-D2",
+                "friends": [],
+            }
+        },
+    )
+
+    mutation = GraphQLRequest("""
+        mutation {
+          renameDroid(id: "2001", name: "Artoo") {
+            __typename
+            id
+            name
+          }
+        }
+        """)
+
+    write(
+        cache,
+        mutation,
+        {"renameDroid": {"__typename": "Droid", "id": "2001", "name": "Artoo"}},
+    )
+
+    assert read(cache, hero_query) == {
+        "hero": {
+            "__typename": "Droid",
+            "id": "2001",
+            "name": "Artoo",
+            "friends": [],
+        }
+    }
+
+    # The mutation itself is not saved
+    assert read(cache, mutation) is None
+
+
+def test_normalized_cache_aliases_and_fragments():
+
+    query = GraphQLRequest("""
+        query {
+          luke: human(id: "1000") {
+            __typename
+            id
+            fullName: name
+            ...HumanFields
+          }
+          hero {
+            __typename
+            id
+            ... on Droid {
+              primaryFunction
+            }
+            ... on Human {
+              homePlanet
+            }
+          }
+        }
+
+        fragment HumanFields on Human {
+          homePlanet
+        }
+        """)
+
+    data = {
+        "luke": {
+            "__typename": "Human",
+            "id": "1000",
+            "fullName": "Luke Skywalker",
+            "homePlanet": "Tatooine",
+        },
+        "hero": {"__typename": "Droid", "id": "2001", "primaryFunction": "Astromech"},
+    }
+
+    cache = NormalizedCache()
+
+    write(cache, query, data)
+
+    assert cache.get_entity("Human:1000") == {
+        "__typename": "Human",
+        "id": "1000",
+        "name": "Luke Skywalker",
+        "homePlanet": "Tatooine",
+    }
+
+    assert read(cache, query) == data
+
+
+def test_normalized_cache_abstract_fragments():
+
+    query = GraphQLRequest("""
+        query {
+          hero {
+            __typename
+            id
+            ... on Character {
+              name
+            }
+          }
+        }
+        """)
+
+    data = {"hero": {"__typename": "Droid", "id": "2001", "name": "R2-D2"}}
+
+    cache = NormalizedCache()
+
+    write(cache, query, data)
+
+    # With the schema, the fragment is known to apply to the Droid type
+    assert read(cache, query, schema=StarWarsSchema) == data
+
+    # Without the schema, the fragment applies because its fields are present
+    assert read(cache, query) == data
+
+
+def test_normalized_cache_objects_without_id():
+
+    query = GraphQLRequest("""
+        query {
+          hero {
+            __typename
+            id
+            appearsIn
+            info {
+              text
+            }
+          }
+        }
+        """)
+
+    data = {
+        "hero": {
+            "__typename": "Droid",
+            "id": "2001",
+            "appearsIn": ["NEWHOPE", "EMPIRE"],
+            "info": {"text": "abc"},
+        }
+    }
+
+    cache = NormalizedCache()
+
+    write(cache, query, data)
+
+    entity = cache.get_entity("Droid:2001")
+    assert entity is not None
+    assert entity["info"] == {"text": "abc"}
+    assert read(cache, query) == data
+
+
+def test_normalized_cache_skip_include():
+
+    query = GraphQLRequest(
+        """
+        query ($withName: Boolean!) {
+          hero {
+            __typename
+            id
+            name @include(if: $withName)
+          }
+        }
+        """,
+        variable_values={"withName": False},
+    )
+
+    cache = NormalizedCache()
+
+    write(cache, query, {"hero": {"__typename": "Droid", "id": "2001"}})
+
+    assert read(cache, query) == {"hero": {"__typename": "Droid", "id": "2001"}}
+
+    query.variable_values = {"withName": True}
+
+    assert read(cache, query) is None
+
+
+def test_normalized_cache_ttl():
+
+    cache = NormalizedCache(ttl=0)
+
+    request = GraphQLRequest(human_query, variable_values={"id": "1000"})
+
+    write(
+        cache,
+        request,
+        {"human": {"__typename": "Human", "id": "1000", "name": "Luke"}},
+    )
+
+    entry = cache.read(request, "")
+
+    assert entry is not None
+    assert entry.expired
+
+
+def write_human(cache: NormalizedCache, human_id: str) -> GraphQLRequest:
+    request = GraphQLRequest(human_query, variable_values={"id": human_id})
+
+    write(
+        cache,
+        request,
+        {"human": {"__typename": "Human", "id": human_id, "name": "Luke"}},
+    )
+
+    return request
+
+
+def test_normalized_cache_maxsize():
+
+    cache = NormalizedCache(maxsize=3)
+
+    requests = [write_human(cache, human_id) for human_id in ["1000", "1001", "1002"]]
+
+    # The least recently used entity is discarded, the root query is kept
+    assert len(cache.records) == 3
+    assert "Human:1000" not in cache
+    assert "ROOT_QUERY" in cache
+
+    assert read(cache, requests[0]) is None
+    assert read(cache, requests[2]) is not None
+
+
+def test_normalized_cache_remove_expired(monkeypatch):
+
+    now = 1000.0
+    monkeypatch.setattr(time, "time", lambda: now)
+
+    cache = NormalizedCache(ttl=60)
+    request = write_human(cache, "1000")
+
+    now = 1070.0
+
+    # The expired fields are kept until the next cleanup
+    entry = cache.read(request, "")
+    assert entry is not None
+    assert entry.expired
+
+    write_human(cache, "1001")
+
+    assert "Human:1000" not in cache
+    assert read(cache, request) is None
+
+    root = cache.get_entity("ROOT_QUERY")
+    assert root is not None
+    assert list(root) == ['human({"id":"1001"})']
+
+
+@pytest.mark.asyncio
+async def test_normalized_cache_client(monkeypatch):
+
+    client = Client(schema=StarWarsSchema, cache=NormalizedCache())
+
+    executed = []
+
+    async with client as session:
+
+        transport_execute = session.transport.execute
+
+        async def execute(request, *args, **kwargs):
+            executed.append(request)
+            return await transport_execute(request, *args, **kwargs)
+
+        monkeypatch.setattr(session.transport, "execute", execute)
+
+        result = await session.execute(gql("""
+                query {
+                  hero {
+                    __typename
+                    id
+                    name
+                    friends {
+                      __typename
+                      id
+                      name
+                    }
+                  }
+                }
+                """))
+
+        assert result["hero"]["name"] == "R2-D2"
+        assert len(executed) == 1
+
+        # Only reading fields already in the cache
+        result = await session.execute(gql("""
+                query {
+                  hero {
+                    ... on Character {
+                      name
+                    }
+                  }
+                }
+                """))
+
+        assert result == {"hero": {"name": "R2-D2"}}
+        assert len(executed) == 1
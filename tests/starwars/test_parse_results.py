@@ -4,7 +4,8 @@ import pytest
 from graphql import GraphQLError
 
 from gql import gql
-from gql.utilities import parse_result
+from gql.utilities import compile_result_parser, parse_result
+from gql.utilities.parse_result import get_result_parser
 from tests.starwars.schema import StarWarsSchema
 
 
@@ -211,3 +212,215 @@ def test_inline_fragment():
     parsed_result = parse_result(StarWarsSchema, query.document, result)
 
     assert result == parsed_result
+
+
+def test_fragments_merged_by_response_key():
+
+    query = gql("""
+        query {
+          hero {
+            ...HeroNames
+            ...HeroEpisodes
+          }
+        }
+        fragment HeroNames on Character {
+          friends {
+            name
+          }
+        }
+        fragment HeroEpisodes on Character {
+          friends {
+            appearsIn
+          }
+        }
+        """)
+
+    result = {
+        "hero": {
+            "friends": [
+                {"name": "Luke Skywalker", "appearsIn": ["NEWHOPE", "EMPIRE"]},
+                {"name": "Han Solo", "appearsIn": ["JEDI"]},
+            ],
+        }
+    }
+
+    parsed_result = parse_result(StarWarsSchema, query.document, result)
+
+    assert parsed_result == {
+        "hero": {
+            "friends": [
+                {"name": "Luke Skywalker", "appearsIn": [4, 5]},
+                {"name": "Han Solo", "appearsIn": [6]},
+            ],
+        }
+    }
+
+
+def test_operation_name():
+
+    query = gql("""
+        query Names {
+          hero {
+            name
+          }
+        }
+        query Episodes {
+          hero {
+            appearsIn
+          }
+        }
+        """)
+
+    result = {"hero": {"appearsIn": ["JEDI"]}}
+
+    parsed_result = parse_result(
+        StarWarsSchema, query.document, result, operation_name="Episodes"
+    )
+    assert parsed_result == {"hero": {"appearsIn": [6]}}
+
+    parsed_result = parse_result(
+        StarWarsSchema, query.document, result, operation_name="Names"
+    )
+    assert parsed_result == {"hero": {}}
+
+
+def test_only_custom_types_pass_through():
+
+    query = gql("""
+        {
+          hero {
+            id
+            friends {
+              name
+            }
+          }
+        }
+        """)
+
+    result = {
+        "hero": {
+            "id": "2001",
+            "friends": [{"name": "Luke Skywalker"}, {"name": "Han Solo"}],
+            "extra": 5,
+        }
+    }
+
+    assert (
+        compile_result_parser(StarWarsSchema, query.document, only_custom_types=True)
+        is None
+    )
+
+    parsed_result = parse_result(
+        StarWarsSchema, query.document, result, only_custom_types=True
+    )
+
+    assert parsed_result is result
+
+
+def test_only_custom_types_copy_on_write():
+
+    query = gql("""
+        {
+          hero {
+            name
+            appearsIn
+            friends {
+              name
+            }
+          }
+          human(id: "1000") {
+            name
+          }
+        }
+        """)
+
+    friends = [{"name": "Luke Skywalker"}]
+    human = {"name": "Luke Skywalker"}
+
+    result: Dict[str, Any] = {
+        "hero": {
+            "name": "R2-D2",
+            "appearsIn": ["NEWHOPE", "EMPIRE", "JEDI"],
+            "friends": friends,
+        },
+        "human": human,
+    }
+
+    parsed_result = parse_result(
+        StarWarsSchema, query.document, result, only_custom_types=True
+    )
+
+    assert parsed_result == {
+        "hero": {
+            "name": "R2-D2",
+            "appearsIn": [4, 5, 6],
+            "friends": friends,
+        },
+        "human": human,
+    }
+
+    # The original result is not modified
+    assert result["hero"]["appearsIn"] == ["NEWHOPE", "EMPIRE", "JEDI"]
+
+    # Paths without custom types are not copied
+    assert parsed_result is not None
+    assert parsed_result["hero"]["friends"] is friends
+    assert parsed_result["human"] is human
+
+
+def test_only_custom_types_invalid_result_raise_error():
+
+    query = gql("""
+        {
+          hero {
+            appearsIn
+          }
+        }
+        """)
+
+    result = {"hero": 5}
+
+    with pytest.raises(GraphQLError) as exc_info:
+        parse_result(StarWarsSchema, query.document, result, only_custom_types=True)
+
+    assert "Invalid result for container of field appearsIn: 5" in str(exc_info)
+
+
+def test_compile_result_parser():
+
+    query = gql("""
+        query HeroEpisodes($episode: Episode) {
+          hero(episode: $episode) {
+            name
+            appearsIn
+          }
+        }
+        """)
+
+    parser = compile_result_parser(StarWarsSchema, query.document)
+    assert parser is not None
+
+    assert parser({"hero": {"name": "R2-D2", "appearsIn": ["JEDI"]}}) == {
+        "hero": {"name": "R2-D2", "appearsIn": [6]}
+    }
+    assert parser({"hero": None}) == {"hero": None}
+
+
+def test_result_parser_cached():
+
+    query = gql("""
+        {
+          hero {
+            appearsIn
+          }
+        }
+        """)
+
+    parser = get_result_parser(StarWarsSchema, query.document)
+
+    assert parser is not None
+    assert get_result_parser(StarWarsSchema, query.document) is parser
+    assert (
+        get_result_parser(StarWarsSchema, query.document, only_custom_types=True)
+        is not parser
+    )
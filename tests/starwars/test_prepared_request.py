@@ -0,0 +1,141 @@
+import pytest
+from graphql import GraphQLError
+
+from gql import Client, GraphQLRequest, PreparedRequest, gql
+from tests.starwars.schema import StarWarsSchema
+
+hero_query_str = """
+    query HeroByEpisode($episode: Episode) {
+      hero(episode: $episode) {
+        name
+        appearsIn
+      }
+    }
+"""
+
+
+@pytest.fixture
+def client():
+    return Client(schema=StarWarsSchema)
+
+
+def test_prepare_request(client):
+    prepared = client.prepare(gql(hero_query_str))
+
+    assert isinstance(prepared, PreparedRequest)
+    assert prepared.schema is StarWarsSchema
+    assert prepared.operation.name is not None
+    assert prepared.operation.name.value == "HeroByEpisode"
+    assert prepared.payload == {"query": prepared.query_str}
+
+
+def test_prepare_request_invalid_document(client):
+    query = gql("""
+        query {
+          hero {
+            unknownField
+          }
+        }
+        """)
+
+    with pytest.raises(GraphQLError) as exc_info:
+        client.prepare(query)
+
+    assert "Cannot query field 'unknownField'" in str(exc_info.value)
+
+
+def test_prepare_request_unknown_operation_name(client):
+    query = GraphQLRequest(hero_query_str, operation_name="Unknown")
+
+    with pytest.raises(GraphQLError) as exc_info:
+        client.prepare(query)
+
+    assert "Unknown operation named 'Unknown'" in str(exc_info.value)
+
+
+def test_prepare_request_without_schema():
+    prepared = PreparedRequest(hero_query_str)
+
+    assert prepared.schema is None
+    assert prepared.payload["query"] == prepared.query_str
+
+
+def test_prepared_request_with_variables(client):
+    extensions = {"key": "value"}
+    prepared = client.prepare(GraphQLRequest(hero_query_str, extensions=extensions))
+
+    prepared_empire = prepared.with_variables({"episode": "EMPIRE"})
+
+    assert isinstance(prepared_empire, PreparedRequest)
+    assert prepared_empire.query_str is prepared.query_str
+    assert prepared_empire.schema is StarWarsSchema
+    assert prepared_empire.variable_values == {"episode": "EMPIRE"}
+    assert prepared_empire.extensions == extensions
+    assert prepared.variable_values is None
+
+    prepared_jedi = prepared.with_variables({"episode": "JEDI"}, extensions={})
+    assert prepared_jedi.extensions == {}
+
+
+def test_prepared_request_validated_only_once(client, monkeypatch):
+    import gql.client as client_module
+
+    prepared = client.prepare(gql(hero_query_str))
+
+    calls = []
+    original_validate = client_module.validate
+
+    def counting_validate(*args, **kwargs):
+        calls.append(args)
+        return original_validate(*args, **kwargs)
+
+    monkeypatch.setattr(client_module, "validate", counting_validate)
+
+    for episode in ["NEWHOPE", "EMPIRE", "JEDI"]:
+        client.execute(prepared.with_variables({"episode": episode}))
+
+    assert calls == []
+
+
+def test_prepared_request_execute(client):
+    prepared = client.prepare(gql(hero_query_str))
+
+    result = client.execute(prepared.with_variables({"episode": "EMPIRE"}))
+
+    assert result == {
+        "hero": {"name": "Luke Skywalker", "appearsIn": ["NEWHOPE", "EMPIRE", "JEDI"]}
+    }
+
+
+def test_prepared_request_serialize_variables_and_parse_result(client):
+    prepared = client.prepare(gql(hero_query_str))
+
+    # 5 is the internal value of the EMPIRE episode
+    result = client.execute(
+        prepared.with_variables({"episode": 5}),
+        serialize_variables=True,
+        parse_result=True,
+    )
+
+    assert result == {"hero": {"name": "Luke Skywalker", "appearsIn": [4, 5, 6]}}
+
+
+def test_prepared_request_serialize_variables_other_schema():
+    prepared = PreparedRequest(hero_query_str, variable_values={"episode": 6})
+
+    serialized = prepared.serialize_variable_values(StarWarsSchema)
+
+    assert isinstance(serialized, PreparedRequest)
+    assert serialized.variable_values == {"episode": "JEDI"}
+
+
+@pytest.mark.asyncio
+async def test_prepared_request_execute_async(client):
+    prepared = client.prepare(gql(hero_query_str))
+
+    async with client as session:
+        for episode, name in [("EMPIRE", "Luke Skywalker"), ("JEDI", "R2-D2")]:
+            result = await session.execute(
+                prepared.with_variables({"episode": episode})
+            )
+            assert result["hero"]["name"] == name
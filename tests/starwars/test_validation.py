@@ -1,10 +1,14 @@
 import copy
+import gc
+import traceback
+import weakref
 
 import pytest
+from graphql import GraphQLError, SourceLocation
 
 from gql import Client, gql
 
-from .schema import StarWarsIntrospection, StarWarsSchema
+from .schema import StarWarsIntrospection, StarWarsSchema, StarWarsTypeDef
 
 
 @pytest.fixture
@@ -258,3 +262,141 @@ def test_build_client_schema_invalid_introspection():
         "'data' attribute of an introspection response and no 'errors' were returned "
         "alongside: 'blah'."
     ) in str(exc_info.value)
+
+
+def test_validation_cache_shared_by_default():
+    client1 = Client(schema=StarWarsSchema)
+    client2 = Client(schema=StarWarsSchema)
+
+    assert client1.validation_cache is not None
+    assert client1.validation_cache is client2.validation_cache
+
+
+def test_validation_cache_hits_and_misses():
+    client = Client(schema=StarWarsSchema, validation_cache_size=10)
+    cache = client.validation_cache
+    assert cache is not None
+
+    query = gql("{ hero { name } }")
+
+    client.validate(query)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # Same document in another request
+    client.validate(gql("{ hero { name } }"))
+    client.validate(query)
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert len(cache) == 1
+
+
+def test_validation_cache_invalid_document():
+    client = Client(schema=StarWarsSchema, validation_cache_size=10)
+    cache = client.validation_cache
+    assert cache is not None
+
+    query = gql("{ hero { unknownField } }")
+
+    errors = []
+
+    for _ in range(3):
+        with pytest.raises(GraphQLError) as exc_info:
+            client.validate(query)
+
+        assert "Cannot query field 'unknownField'" in str(exc_info.value)
+        assert exc_info.value.locations == [SourceLocation(1, 10)]
+        errors.append(exc_info.value)
+
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # A new error is raised at each call, without the previous tracebacks
+    cached = cache.get(query.query_hash)
+    assert cached is not None
+
+    cached_error = cached[0]
+    assert cached_error.__traceback__ is None
+    assert all(error is not cached_error for error in errors)
+
+    tb_lengths = [len(traceback.extract_tb(error.__traceback__)) for error in errors]
+    assert tb_lengths[1] == tb_lengths[2]
+
+
+def test_validation_cache_keyed_by_schema():
+    typedef_client = Client(schema=StarWarsTypeDef, validation_cache_size=10)
+    typedef_cache = typedef_client.validation_cache
+
+    query = gql("{ hero { name } }")
+
+    typedef_client.validate(query)
+
+    # Another schema of the same client uses another cache
+    typedef_client.schema = StarWarsSchema
+    local_cache = typedef_client.validation_cache
+
+    typedef_client.validate(query)
+
+    assert typedef_cache is not None and local_cache is not None
+    assert typedef_cache is not local_cache
+    assert len(typedef_cache) == 1
+    assert len(local_cache) == 1
+
+
+def test_validation_cache_schema_freed():
+    from gql.client import _validation_caches
+
+    client = Client(schema=StarWarsTypeDef)
+    client.validate(gql("{ hero { name } }"))
+
+    assert client.schema in _validation_caches
+    schema_ref = weakref.ref(client.schema)
+
+    # The shared cache does not keep the schema alive
+    del client
+    gc.collect()
+
+    assert schema_ref() is None
+
+
+def test_validation_cache_eviction():
+    client = Client(schema=StarWarsSchema, validation_cache_size=2)
+    cache = client.validation_cache
+    assert cache is not None
+
+    query1 = gql("{ hero { name } }")
+    query2 = gql("{ hero { id } }")
+    query3 = gql("{ hero { appearsIn } }")
+
+    client.validate(query1)
+    client.validate(query2)
+    client.validate(query1)
+    client.validate(query3)
+
+    assert len(cache) == 2
+    assert query1.query_hash in cache
+    assert query2.query_hash not in cache
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_validation_cache_disabled(monkeypatch):
+    import gql.client as client_module
+
+    client = Client(schema=StarWarsSchema, validation_cache_size=0)
+    assert client.validation_cache is None
+
+    calls = []
+    original_validate = client_module.validate
+
+    def counting_validate(*args, **kwargs):
+        calls.append(args)
+        return original_validate(*args, **kwargs)
+
+    monkeypatch.setattr(client_module, "validate", counting_validate)
+
+    query = gql("{ hero { name } }")
+
+    client.validate(query)
+    client.validate(query)
+
+    assert len(calls) == 2
@@ -616,6 +616,74 @@ async def test_aiohttp_subscribe_running_in_thread(aiohttp_server, run_sync_test
     await run_sync_test(server, test_code)
 
 
+@pytest.mark.asyncio
+async def test_aiohttp_execute_background(aiohttp_server, run_sync_test):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from aiohttp import web
+
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received = []
+
+    async def handler(request):
+        body = await request.json()
+        received.append(body)
+
+        if isinstance(body, list):
+            return web.Response(
+                text=f"[{','.join([query1_server_answer] * len(body))}]",
+                content_type="application/json",
+            )
+
+        return web.Response(text=query1_server_answer, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    url = server.make_url("/")
+
+    def test_code():
+        transport = AIOHTTPTransport(url=url)
+
+        client = Client(transport=transport, batch_interval=0.05)
+
+        query = gql(query1_str)
+
+        client.connect_background()
+
+        try:
+            assert client.background_connected
+
+            aiohttp_session = transport.session
+            assert aiohttp_session is not None
+
+            # The requests of several threads are executed in the same session
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(lambda _: client.execute(query), range(4)))
+
+            assert all(r["continents"][0]["code"] == "AF" for r in results)
+            assert transport.session is aiohttp_session
+
+            # and sent in the same batch
+            assert len(received) == 1
+            assert len(received[0]) == 4
+
+            results = [result for result in client.subscribe(query)]
+
+            assert len(results) == 1
+            assert results[0]["continents"][0]["code"] == "AF"
+
+        finally:
+            client.close_background()
+
+        assert not client.background_connected
+        assert transport.session is None
+
+    await run_sync_test(server, test_code)
+
+
 file_upload_mutation_1 = """
     mutation($file: Upload!) {
       uploadFile(input:{other_var:$other_var, file:$file}) {
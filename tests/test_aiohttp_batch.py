@@ -553,3 +553,277 @@ async def test_aiohttp_batch_online_manual():
 
         assert result_eu["continent"]["name"] == "Europe"
         assert result_af["continent"]["name"] == "Africa"
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_batch_parse_results(aiohttp_server):
+    from aiohttp import web
+
+    from gql.transport.aiohttp import AIOHTTPTransport
+    from tests.starwars.schema import StarWarsSchema
+
+    async def handler(request):
+        return web.Response(
+            text=(
+                '[{"data":{"hero":{"appearsIn":["NEWHOPE","JEDI"]}}},'
+                '{"data":{"human":{"name":"Luke Skywalker"}}}]'
+            ),
+            content_type="application/json",
+        )
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    url = server.make_url("/")
+
+    transport = AIOHTTPTransport(url=url, timeout=10)
+
+    client = Client(transport=transport, schema=StarWarsSchema, parse_results=True)
+
+    async with client as session:
+
+        # Each result should be parsed with the document of its own request
+        query = [
+            GraphQLRequest("{ hero { appearsIn } }"),
+            GraphQLRequest('{ human(id: "1000") { name } }'),
+        ]
+
+        results = await session.execute_batch(query)
+
+        assert results[0] == {"hero": {"appearsIn": [4, 6]}}
+        assert results[1] == {"human": {"name": "Luke Skywalker"}}
+
+
+async def make_concurrency_server(aiohttp_server, stats):
+    """Start a server answering slowly and counting the concurrent batches."""
+    from aiohttp import web
+
+    async def handler(request):
+        body = await request.json()
+
+        stats["batches"] += 1
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+
+        await asyncio.sleep(0.05)
+
+        stats["in_flight"] -= 1
+
+        if isinstance(body, dict):
+            return web.json_response({"data": {"size": 1}})
+
+        return web.json_response([{"data": {"size": len(body)}} for _ in body])
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+
+    return await aiohttp_server(app)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_max_concurrency", [1, 3])
+async def test_aiohttp_batch_max_concurrency(aiohttp_server, batch_max_concurrency):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    stats = {"batches": 0, "in_flight": 0, "max_in_flight": 0}
+    server = await make_concurrency_server(aiohttp_server, stats)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"), timeout=10)
+
+    client = Client(
+        transport=transport,
+        batch_interval=0.01,
+        batch_max=2,
+        batch_max_concurrency=batch_max_concurrency,
+    )
+
+    async with client as session:
+
+        query = gql("{ size }")
+
+        results = await asyncio.gather(*(session.execute(query) for _ in range(6)))
+
+        assert results == [{"size": 2}] * 6
+
+    assert stats["batches"] == 3
+    assert stats["max_in_flight"] == batch_max_concurrency
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_batch_queue_size(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    stats = {"batches": 0, "in_flight": 0, "max_in_flight": 0}
+    server = await make_concurrency_server(aiohttp_server, stats)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"), timeout=10)
+
+    client = Client(
+        transport=transport,
+        batch_interval=0.01,
+        batch_max=2,
+        batch_queue_size=2,
+    )
+
+    async with client as session:
+
+        assert session.batch_queue.maxsize == 2
+
+        query = gql("{ size }")
+
+        # The requests wait for a free place in the queue
+        results = await asyncio.gather(*(session.execute(query) for _ in range(6)))
+
+        assert len(results) == 6
+        assert session.batch_queue.qsize() == 0
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_batch_max_bytes(aiohttp_server):
+    from gql.batching import BatchFlushPolicy
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    stats = {"batches": 0, "in_flight": 0, "max_in_flight": 0}
+    server = await make_concurrency_server(aiohttp_server, stats)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"), timeout=10)
+
+    query = gql("{ size }")
+    size = BatchFlushPolicy.get_size(query)
+
+    client = Client(
+        transport=transport,
+        batch_interval=0.01,
+        batch_max=10,
+        batch_max_bytes=2 * size + 1,
+    )
+
+    async with client as session:
+
+        results = await asyncio.gather(*(session.execute(query) for _ in range(6)))
+
+        # The batches are split to stay below the byte budget
+        assert results == [{"size": 2}] * 6
+
+    assert stats["batches"] == 3
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_batch_adaptive(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    stats = {"batches": 0, "in_flight": 0, "max_in_flight": 0}
+    server = await make_concurrency_server(aiohttp_server, stats)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"), timeout=10)
+
+    client = Client(
+        transport=transport,
+        batch_interval=5,
+        batch_max=10,
+        batch_adaptive=True,
+    )
+
+    async with client as session:
+
+        query = gql("{ size }")
+
+        # A lone request does not wait for the batch interval
+        result = await asyncio.wait_for(session.execute(query), timeout=2)
+
+        assert result == {"size": 1}
+
+        # Requests arriving together are still batched
+        results = await asyncio.wait_for(
+            asyncio.gather(*(session.execute(query) for _ in range(4))), timeout=2
+        )
+
+        assert results == [{"size": 4}] * 4
+
+    assert stats["batches"] == 2
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_batch_priority(aiohttp_server):
+    import time
+
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    stats = {"batches": 0, "in_flight": 0, "max_in_flight": 0}
+    server = await make_concurrency_server(aiohttp_server, stats)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"), timeout=10)
+
+    client = Client(
+        transport=transport,
+        batch_interval=0.1,
+        batch_max=10,
+        batch_low_priority_interval=0.5,
+    )
+
+    async with client as session:
+
+        query = gql("{ size }")
+
+        # High priority requests are not batched
+        results = await asyncio.gather(
+            session.execute(query, priority="high"),
+            session.execute(query),
+            session.execute(query),
+        )
+
+        assert results == [{"size": 1}, {"size": 2}, {"size": 2}]
+
+        # Low priority requests wait longer for other requests
+        start_time = time.monotonic()
+        assert await session.execute(query, priority="low") == {"size": 1}
+        assert time.monotonic() - start_time >= 0.4
+
+        # Unless a normal request is in the same batch
+        start_time = time.monotonic()
+        mixed_results = await asyncio.gather(
+            session.execute(query, priority="low"),
+            session.execute(query),
+        )
+        assert mixed_results == [{"size": 2}, {"size": 2}]
+        assert time.monotonic() - start_time < 0.4
+
+        with pytest.raises(AssertionError, match="Invalid priority"):
+            await session.execute(query, priority="urgent")
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_batch_sent_when_full(aiohttp_server):
+    import time
+
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    stats = {"batches": 0, "in_flight": 0, "max_in_flight": 0}
+    server = await make_concurrency_server(aiohttp_server, stats)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"), timeout=10)
+
+    client = Client(transport=transport, batch_interval=5, batch_max=4)
+
+    async with client as session:
+
+        query = gql("{ size }")
+
+        async def delayed_execute(delay):
+            await asyncio.sleep(delay)
+            return await session.execute(query)
+
+        start_time = time.monotonic()
+
+        # The requests arrive during the batch interval
+        results = await asyncio.gather(
+            *(delayed_execute(index * 0.05) for index in range(4))
+        )
+
+        # The full batch does not wait for the end of the batch interval
+        assert time.monotonic() - start_time < 2
+
+        assert results == [{"size": 4}] * 4
+
+    assert stats["batches"] == 1
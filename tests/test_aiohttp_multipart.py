@@ -8,7 +8,6 @@ from gql import Client, gql
 from gql.graphql_request import GraphQLRequest
 from gql.transport.exceptions import (
     TransportClosed,
-    TransportConnectionFailed,
     TransportProtocolError,
     TransportServerError,
 )
@@ -306,7 +305,7 @@ async def test_aiohttp_multipart_newline_separator(multipart_server):
 
     async with Client(transport=transport) as session:
         # Non-compliant multipart format (LF instead of CRLF) should fail
-        with pytest.raises(TransportConnectionFailed):
+        with pytest.raises(TransportProtocolError):
             async for result in session.subscribe(query):
                 pass
 
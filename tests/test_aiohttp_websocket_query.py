@@ -761,3 +761,24 @@ async def test_aiohttp_websocket_connector_owner_false(aiohttp_ws_server):
     assert transport._connected is False
 
     await connector.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("aiohttp_ws_server", [server1_answers], indirect=True)
+async def test_aiohttp_websocket_json_codec(aiohttp_ws_server):
+    from gql.json_codec import OrjsonCodec
+    from gql.transport.aiohttp_websockets import AIOHTTPWebsocketsTransport
+
+    pytest.importorskip("orjson")
+
+    server = aiohttp_ws_server
+
+    url = f"ws://{server.hostname}:{server.port}/graphql"
+
+    transport = AIOHTTPWebsocketsTransport(url=url)
+
+    async with Client(transport=transport, json_codec=OrjsonCodec()) as session:
+
+        result = await session.execute(gql(query1_str))
+
+        assert result["continents"][0]["code"] == "AF"
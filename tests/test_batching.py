@@ -0,0 +1,86 @@
+from gql import GraphQLRequest
+from gql.batching import BatchFlushPolicy
+
+query_str = "{ hello }"
+
+
+def test_batch_flush_policy_fixed_interval():
+
+    policy = BatchFlushPolicy(interval=0.5, max_requests=10)
+
+    item = policy.create_item(GraphQLRequest(query_str), None, timeout=1)
+
+    assert item.deadline is None
+    assert item.size == 0
+    assert policy.get_flush_time(item) == item.arrival + 0.5
+    assert policy.idle_timeout is None
+    assert policy.fits(1000000, item)
+
+
+def test_batch_flush_policy_max_bytes():
+
+    request = GraphQLRequest(query_str)
+    size = BatchFlushPolicy.get_size(request)
+
+    policy = BatchFlushPolicy(interval=0.5, max_requests=10, max_bytes=2 * size)
+
+    item = policy.create_item(request, None, timeout=None)
+
+    assert item.size == size
+    assert policy.fits(size, item)
+    assert not policy.fits(size + 1, item)
+
+
+def test_batch_flush_policy_adaptive():
+
+    policy = BatchFlushPolicy(interval=0.5, max_requests=3, adaptive=True)
+
+    request = GraphQLRequest(query_str)
+
+    # Nothing known about the arrival rate: no waiting
+    item = policy.create_item(request, None, timeout=None)
+    assert policy.get_flush_time(item) == item.arrival
+
+    # Time needed to fill the batch at the observed arrival rate
+    policy.arrival_gap = 0.1
+    assert policy.get_flush_time(item) == item.arrival + 0.2
+    assert policy.idle_timeout == 0.2
+
+    # Requests too rare to be batched
+    policy.arrival_gap = 1
+    assert policy.get_flush_time(item) == item.arrival
+
+
+def test_batch_flush_policy_deadline():
+
+    policy = BatchFlushPolicy(interval=0.5, max_requests=10, adaptive=True)
+    policy.arrival_gap = 0.05
+
+    item = policy.create_item(GraphQLRequest(query_str), None, timeout=0.3)
+
+    assert item.deadline == item.arrival + 0.3
+
+    policy.record_round_trip(0.2)
+    assert policy.round_trip == 0.2
+
+    # The batch is sent in time to receive the answer before the deadline
+    assert policy.get_flush_time(item) == item.deadline - 0.2
+    assert policy.update_flush_time(item.arrival + 1, item) == item.deadline - 0.2
+
+
+def test_batch_flush_policy_priority():
+
+    policy = BatchFlushPolicy(interval=0.1, max_requests=10, low_priority_interval=1)
+
+    request = GraphQLRequest(query_str)
+
+    low_item = policy.create_item(request, None, timeout=None, priority="low")
+    flush_time = policy.get_flush_time(low_item)
+    assert flush_time == low_item.arrival + 1
+
+    # A normal request added to the batch makes it sent sooner
+    item = policy.create_item(request, None, timeout=None)
+    assert policy.update_flush_time(flush_time, item) == item.arrival + 0.1
+
+    high_item = policy.create_item(request, None, timeout=None, priority="high")
+    assert policy.get_flush_time(high_item) == high_item.arrival
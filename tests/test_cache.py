@@ -0,0 +1,298 @@
+import asyncio
+from typing import Any, List
+
+import pytest
+
+from gql import Client, GraphQLRequest, gql
+from gql.cache import InMemoryCache, get_cache_key, is_cacheable
+
+query_str = """
+    query getCount($id: ID) {
+      count(id: $id)
+    }
+"""
+
+mutation_str = """
+    mutation increment {
+      increment
+    }
+"""
+
+
+async def make_counting_server(aiohttp_server: Any, received: List[Any]) -> Any:
+    """Start a server answering with the number of operations received."""
+    from aiohttp import web
+
+    async def handler(request):
+        body = await request.json()
+        received.append(body)
+
+        if isinstance(body, list):
+            return web.json_response([{"data": {"count": len(received)}} for _ in body])
+
+        return web.json_response({"data": {"count": len(received)}})
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+
+    return await aiohttp_server(app)
+
+
+def test_cache_key():
+
+    request = GraphQLRequest(query_str, variable_values={"id": "1", "a": 2})
+
+    # Same printed query with different formatting and variables order
+    same_request = GraphQLRequest(
+        "query getCount($id: ID) { count(id: $id) }",
+        variable_values={"a": 2, "id": "1"},
+    )
+
+    assert get_cache_key(request) == get_cache_key(same_request)
+
+    other_request = GraphQLRequest(query_str, variable_values={"id": "2", "a": 2})
+
+    assert get_cache_key(request) != get_cache_key(other_request)
+
+    other_request = GraphQLRequest(
+        query_str, variable_values={"id": "1", "a": 2}, operation_name="getCount"
+    )
+
+    assert get_cache_key(request) != get_cache_key(other_request)
+
+    other_request = GraphQLRequest(
+        query_str, variable_values={"id": "1", "a": 2}, extensions={"b": 3}
+    )
+
+    assert get_cache_key(request) != get_cache_key(other_request)
+
+
+def test_cache_is_cacheable():
+
+    assert is_cacheable(GraphQLRequest(query_str))
+    assert not is_cacheable(GraphQLRequest(mutation_str))
+    assert not is_cacheable(GraphQLRequest(query_str, operation_name="unknown"))
+
+
+def test_in_memory_cache():
+    from graphql import ExecutionResult
+
+    cache = InMemoryCache(maxsize=2, ttl=None)
+
+    cache.set_result("a", ExecutionResult(data={"a": [1]}))
+    cache.set_result("b", ExecutionResult(data={"b": 2}))
+    cache.set_result("c", ExecutionResult(data={"c": 3}))
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
+
+    entry = cache.get("b")
+    assert entry is not None
+    assert not entry.expired
+    assert entry.get_result().data == {"b": 2}
+
+    cache.delete("b")
+    assert cache.get("b") is None
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_in_memory_cache_ttl():
+    from graphql import ExecutionResult
+
+    cache = InMemoryCache(ttl=0)
+
+    data = {"a": [1]}
+    cache.set_result("a", ExecutionResult(data=data))
+
+    entry = cache.get("a")
+    assert entry is not None
+    assert entry.expired
+
+    # The saved data is a copy
+    result = entry.get_result()
+    assert result.data == data
+    assert result.data is not data
+    assert entry.data is not data
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_aiohttp_cache_policies(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_counting_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+    cache = InMemoryCache()
+
+    async with Client(transport=transport, cache=cache) as session:
+
+        query = gql(query_str)
+
+        # cache-first
+        assert await session.execute(query) == {"count": 1}
+        assert await session.execute(query) == {"count": 1}
+        assert len(received) == 1
+
+        # Different variables
+        query_with_vars = gql(query_str)
+        query_with_vars.variable_values = {"id": "2"}
+
+        assert await session.execute(query_with_vars) == {"count": 2}
+        assert len(received) == 2
+
+        # network-only
+        result = await session.execute(query, cache_policy="network-only")
+        assert result == {"count": 3}
+        assert await session.execute(query) == {"count": 3}
+
+        # no-cache
+        assert await session.execute(query, cache_policy="no-cache") == {"count": 4}
+        assert await session.execute(query) == {"count": 3}
+
+        # Mutations are never cached
+        assert await session.execute(gql(mutation_str)) == {"count": 5}
+        assert await session.execute(gql(mutation_str)) == {"count": 6}
+
+        # Modifying the result does not modify the cache
+        result = await session.execute(query)
+        result["count"] = 0
+        assert await session.execute(query) == {"count": 3}
+
+        # Expired results are not used with cache-first
+        cache.ttl = 0
+        assert await session.execute(query, cache_policy="network-only") == {"count": 7}
+        assert await session.execute(query) == {"count": 8}
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_aiohttp_cache_stale_while_revalidate(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_counting_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+    cache = InMemoryCache(ttl=0)
+
+    client = Client(
+        transport=transport, cache=cache, cache_policy="stale-while-revalidate"
+    )
+
+    async with client as session:
+
+        query = gql(query_str)
+
+        assert await session.execute(query) == {"count": 1}
+
+        # The expired result is returned and refreshed in the background
+        assert await session.execute(query) == {"count": 1}
+        assert await session.execute(query) == {"count": 1}
+
+        while session._revalidation_tasks:
+            await asyncio.sleep(0.01)
+
+        assert len(received) == 2
+        assert await session.execute(query) == {"count": 2}
+
+    assert len(received) == 3
+    assert not session._revalidation_tasks
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_aiohttp_cache_batch(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_counting_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    async with Client(transport=transport, cache=InMemoryCache()) as session:
+
+        query1 = GraphQLRequest(query_str, variable_values={"id": "1"})
+        query2 = GraphQLRequest(query_str, variable_values={"id": "2"})
+
+        assert await session.execute(query1) == {"count": 1}
+
+        # Only the second query is sent to the server
+        results = await session.execute_batch([query1, query2])
+
+        assert results == [{"count": 1}, {"count": 2}]
+        assert len(received[1]) == 1
+        assert received[1][0]["variables"] == {"id": "2"}
+
+        # Everything is in the cache
+        results = await session.execute_batch([query1, query2])
+
+        assert results == [{"count": 1}, {"count": 2}]
+        assert len(received) == 2
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_aiohttp_cache_with_batching(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_counting_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    client = Client(transport=transport, cache=InMemoryCache(), batch_interval=0.01)
+
+    async with client as session:
+
+        query = gql(query_str)
+
+        assert await session.execute(query) == {"count": 1}
+        assert await session.execute(query) == {"count": 1}
+
+        assert len(received) == 1
+
+
+@pytest.mark.aiohttp
+@pytest.mark.requests
+@pytest.mark.asyncio
+async def test_requests_cache(aiohttp_server, run_sync_test):
+    from gql.transport.requests import RequestsHTTPTransport
+
+    received: List[Any] = []
+    server = await make_counting_server(aiohttp_server, received)
+
+    url = server.make_url("/")
+
+    def test_code():
+        transport = RequestsHTTPTransport(url=url)
+        cache = InMemoryCache(ttl=0)
+
+        client = Client(
+            transport=transport, cache=cache, cache_policy="stale-while-revalidate"
+        )
+
+        with client as session:
+
+            query1 = GraphQLRequest(query_str, variable_values={"id": "1"})
+            query2 = GraphQLRequest(query_str, variable_values={"id": "2"})
+
+            assert session.execute(query1) == {"count": 1}
+
+            # The expired result of the first query is returned
+            # and refreshed in the background
+            results = session.execute_batch([query1, query2])
+            assert results == [{"count": 1}, {"count": 2}]
+
+            # Executed concurrently with the refresh of the first query
+            result = session.execute(query2, cache_policy="cache-first")
+            assert result["count"] in (3, 4)
+
+        # The expired result was refreshed before closing
+        assert len(received) == 4
+        assert not session._revalidation_threads
+
+    await run_sync_test(server, test_code)
@@ -0,0 +1,329 @@
+import gzip
+import json
+from typing import Any, List
+
+import pytest
+
+from gql import Client, GraphQLRequest, gql
+from gql.compression import RequestCompressor, ZstdCompressor, get_request_compressor
+
+query_str = """
+    query getContinents {
+      continents {
+        code
+        name
+      }
+    }
+"""
+
+mutation_str = """
+    mutation addOrders($orders: [OrderInput!]!) {
+      addOrders(orders: $orders) {
+        id
+      }
+    }
+"""
+
+query_server_answer = (
+    '{"data":{"continents":['
+    '{"code":"AF","name":"Africa"},{"code":"AN","name":"Antarctica"}]}}'
+)
+
+orders = [{"reference": f"ORDER-{index:08d}", "amount": index} for index in range(500)]
+
+large_request = GraphQLRequest(mutation_str, variable_values={"orders": orders})
+
+
+def make_handler(received: List[Any], *, compress_answer: bool = False) -> Any:
+    from aiohttp import web
+
+    async def handler(request):
+        # The body is decompressed by the aiohttp server
+        received.append(
+            (
+                request.headers.get("Content-Encoding"),
+                request.content_length,
+                await request.json(),
+            )
+        )
+
+        if isinstance(received[-1][2], list):
+            answer = json.dumps([json.loads(query_server_answer)] * 2)
+        else:
+            answer = query_server_answer
+
+        if compress_answer:
+            return web.Response(
+                body=gzip.compress(answer.encode()),
+                content_type="application/json",
+                headers={"Content-Encoding": "gzip"},
+            )
+
+        return web.Response(text=answer, content_type="application/json")
+
+    return handler
+
+
+async def make_server(aiohttp_server, handler):
+    from aiohttp import web
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    return await aiohttp_server(app)
+
+
+def check_received(received):
+    encoding, length, payload = received[0]
+
+    # The large mutation was compressed
+    assert encoding == "gzip"
+    assert length < len(json.dumps(payload)) / 4
+    assert payload["variables"]["orders"] == orders
+
+    # The small query was not compressed
+    encoding, length, payload = received[1]
+    assert encoding is None
+    assert length == len(json.dumps(payload))
+
+
+def test_request_compressor_gzip():
+    compressor = get_request_compressor("gzip")
+
+    assert isinstance(compressor, RequestCompressor)
+    assert compressor.encoding == "gzip"
+
+    body = json.dumps(orders).encode()
+
+    assert compressor.should_compress(body)
+    assert not compressor.should_compress(body[: compressor.min_size - 1])
+
+    compressed = compressor.compress(body)
+
+    assert len(compressed) < len(body)
+    assert gzip.decompress(compressed) == body
+
+    # Same compressed body for the same body
+    assert compressor.compress(body) == compressed
+
+
+def test_request_compressor_zstd():
+    zstandard = pytest.importorskip("zstandard")
+
+    compressor = get_request_compressor("zstd")
+
+    assert isinstance(compressor, ZstdCompressor)
+    assert compressor.encoding == "zstd"
+
+    body = json.dumps(orders).encode()
+
+    assert zstandard.decompress(compressor.compress(body)) == body
+
+
+def test_get_request_compressor():
+    compressor = RequestCompressor(min_size=10, level=1)
+
+    assert get_request_compressor(None) is None
+    assert get_request_compressor(compressor) is compressor
+
+    with pytest.raises(ValueError, match="Unsupported request compression"):
+        get_request_compressor("br")
+
+
+@pytest.mark.asyncio
+async def test_request_compressor_async():
+    body = json.dumps(orders).encode()
+
+    # Compressed in the event loop
+    compressor = RequestCompressor()
+    assert gzip.decompress(await compressor.compress_async(body)) == body
+
+    # Compressed in a worker thread
+    compressor = RequestCompressor(thread_min_size=1024)
+    assert gzip.decompress(await compressor.compress_async(body)) == body
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_compression_aiohttp(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_server(aiohttp_server, make_handler(received))
+
+    transport = AIOHTTPTransport(
+        url=server.make_url("/"),
+        request_compression=RequestCompressor(thread_min_size=1024),
+    )
+
+    async with Client(transport=transport) as session:
+        await session.execute(large_request)
+        await session.execute(gql(query_str))
+
+        results = await session.execute_batch([large_request, large_request])
+        assert len(results) == 2
+
+    check_received(received)
+
+    # The batch was compressed
+    assert received[2][0] == "gzip"
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_compression_aiohttp_appsync(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+    from gql.transport.appsync_auth import AppSyncAuthentication
+
+    class SigningAuthentication(AppSyncAuthentication):
+        def get_headers(self, data=None, headers=None):
+            return {"content-type": "application/json"}
+
+    received: List[Any] = []
+    server = await make_server(aiohttp_server, make_handler(received))
+
+    transport = AIOHTTPTransport(
+        url=server.make_url("/"),
+        auth=SigningAuthentication(),
+        request_compression="gzip",
+    )
+
+    async with Client(transport=transport) as session:
+        await session.execute(large_request)
+
+    # The signed body is not compressed
+    assert received[0][0] is None
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_compression_httpx_async(aiohttp_server):
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    received: List[Any] = []
+    server = await make_server(aiohttp_server, make_handler(received))
+
+    transport = HTTPXAsyncTransport(
+        url=str(server.make_url("/")),
+        request_compression="gzip",
+        headers={"X-Test": "test"},
+    )
+
+    async with Client(transport=transport) as session:
+        await session.execute(large_request)
+        await session.execute(gql(query_str))
+
+        await session.execute_batch([large_request, large_request])
+
+    check_received(received)
+    assert received[2][0] == "gzip"
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_compression_httpx(aiohttp_server, run_sync_test):
+    from gql.transport.httpx import HTTPXTransport
+
+    received: List[Any] = []
+    server = await make_server(aiohttp_server, make_handler(received))
+
+    url = str(server.make_url("/"))
+
+    def test_code():
+        transport = HTTPXTransport(url=url, request_compression="gzip")
+
+        with Client(transport=transport) as session:
+            session.execute(large_request)
+            session.execute(gql(query_str))
+
+            session.execute_batch([large_request, large_request])
+
+        check_received(received)
+        assert received[2][0] == "gzip"
+
+    await run_sync_test(server, test_code)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.requests
+@pytest.mark.asyncio
+async def test_compression_requests(aiohttp_server, run_sync_test):
+    from gql.transport.requests import RequestsHTTPTransport
+
+    received: List[Any] = []
+    server = await make_server(aiohttp_server, make_handler(received))
+
+    url = str(server.make_url("/"))
+
+    def test_code():
+        transport = RequestsHTTPTransport(url=url, request_compression="gzip")
+
+        with Client(transport=transport) as session:
+            session.execute(large_request)
+            session.execute(gql(query_str))
+
+            session.execute_batch([large_request, large_request])
+
+        check_received(received)
+        assert received[2][0] == "gzip"
+
+    await run_sync_test(server, test_code)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_compressed_answer_aiohttp(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_server(
+        aiohttp_server, make_handler(received, compress_answer=True)
+    )
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    async with Client(transport=transport) as session:
+        result = await session.execute(gql(query_str))
+
+    assert result["continents"][0]["code"] == "AF"
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_compressed_answer_httpx_async(aiohttp_server):
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    received: List[Any] = []
+    server = await make_server(
+        aiohttp_server, make_handler(received, compress_answer=True)
+    )
+
+    transport = HTTPXAsyncTransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        result = await session.execute(gql(query_str))
+
+    assert result["continents"][0]["code"] == "AF"
+
+
+@pytest.mark.aiohttp
+@pytest.mark.requests
+@pytest.mark.asyncio
+async def test_compressed_answer_requests(aiohttp_server, run_sync_test):
+    from gql.transport.requests import RequestsHTTPTransport
+
+    received: List[Any] = []
+    server = await make_server(
+        aiohttp_server, make_handler(received, compress_answer=True)
+    )
+
+    url = str(server.make_url("/"))
+
+    def test_code():
+        transport = RequestsHTTPTransport(url=url)
+
+        with Client(transport=transport) as session:
+            result = session.execute(gql(query_str))
+
+        assert result["continents"][0]["code"] == "AF"
+
+    await run_sync_test(server, test_code)
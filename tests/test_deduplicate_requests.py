@@ -0,0 +1,222 @@
+import asyncio
+from typing import Any, List
+
+import pytest
+
+from gql import Client, GraphQLRequest, gql
+
+query_str = """
+    query getCount($id: ID) {
+      count(id: $id)
+    }
+"""
+
+mutation_str = """
+    mutation increment {
+      increment
+    }
+"""
+
+pytestmark = pytest.mark.aiohttp
+
+
+async def make_slow_server(aiohttp_server: Any, received: List[Any]) -> Any:
+    """Start a server answering slowly with the number of requests received."""
+    from aiohttp import web
+
+    async def handler(request):
+        body = await request.json()
+        received.append(body)
+
+        count = len(received)
+
+        await asyncio.sleep(0.05)
+
+        if isinstance(body, list):
+            return web.json_response([{"data": {"count": count}} for _ in body])
+
+        return web.json_response({"data": {"count": count}})
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+
+    return await aiohttp_server(app)
+
+
+@pytest.mark.asyncio
+async def test_deduplicate_requests(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_slow_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    async with Client(transport=transport, deduplicate_requests=True) as session:
+
+        query = gql(query_str)
+
+        results = await asyncio.gather(*(session.execute(query) for _ in range(5)))
+
+        assert len(received) == 1
+        assert results == [{"count": 1}] * 5
+
+        # Each caller receives its own copy of the result
+        results[0]["count"] = 0
+        assert results[1] == {"count": 1}
+
+        # Different variables are not shared
+        other_query = GraphQLRequest(query_str, variable_values={"id": "2"})
+
+        await asyncio.gather(session.execute(query), session.execute(other_query))
+
+        assert len(received) == 3
+
+        # The request is not shared once finished
+        await session.execute(query)
+
+        assert len(received) == 4
+
+        assert not session._inflight_requests
+
+
+@pytest.mark.asyncio
+async def test_deduplicate_requests_http_metadata(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+    from gql.transport.http_result import HTTPExecutionResult
+
+    received: List[Any] = []
+    server = await make_slow_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    async with Client(transport=transport, deduplicate_requests=True) as session:
+
+        query = gql(query_str)
+
+        results = await asyncio.gather(
+            *(session.execute(query, get_execution_result=True) for _ in range(3))
+        )
+
+        assert len(received) == 1
+
+    # The copies keep the metadata of the HTTP response
+    for result in results:
+        assert isinstance(result, HTTPExecutionResult)
+        assert result.status_code == 200
+        assert result.response_headers is not None
+        assert "application/json" in result.response_headers["Content-Type"]
+
+    assert results[0].data is not results[1].data
+
+
+@pytest.mark.asyncio
+async def test_deduplicate_requests_not_for_mutations(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_slow_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    async with Client(transport=transport, deduplicate_requests=True) as session:
+
+        mutation = gql(mutation_str)
+
+        await asyncio.gather(*(session.execute(mutation) for _ in range(3)))
+
+        assert len(received) == 3
+
+
+@pytest.mark.asyncio
+async def test_deduplicate_requests_disabled(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_slow_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    async with Client(transport=transport) as session:
+
+        query = gql(query_str)
+
+        await asyncio.gather(*(session.execute(query) for _ in range(3)))
+
+        assert len(received) == 3
+
+
+@pytest.mark.asyncio
+async def test_deduplicate_requests_cancelled(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_slow_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    async with Client(transport=transport, deduplicate_requests=True) as session:
+
+        query = gql(query_str)
+
+        first = asyncio.ensure_future(session.execute(query))
+        second = asyncio.ensure_future(session.execute(query))
+
+        await asyncio.sleep(0.01)
+
+        # Cancelling the first request does not cancel the shared execution
+        first.cancel()
+
+        assert await second == {"count": 1}
+        assert len(received) == 1
+
+
+@pytest.mark.asyncio
+async def test_deduplicate_requests_batch(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_slow_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    async with Client(transport=transport, deduplicate_requests=True) as session:
+
+        query1 = GraphQLRequest(query_str, variable_values={"id": "1"})
+        query2 = GraphQLRequest(query_str, variable_values={"id": "2"})
+
+        results = await session.execute_batch([query1, query2, query1])
+
+        assert results == [{"count": 1}] * 3
+        assert results[0] is not results[2]
+
+        # The duplicate query is sent only once
+        assert len(received[0]) == 2
+
+
+@pytest.mark.asyncio
+async def test_deduplicate_requests_with_batching(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_slow_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    client = Client(transport=transport, deduplicate_requests=True, batch_interval=0.01)
+
+    async with client as session:
+
+        query1 = GraphQLRequest(query_str, variable_values={"id": "1"})
+        query2 = GraphQLRequest(query_str, variable_values={"id": "2"})
+
+        results = await asyncio.gather(
+            session.execute(query1),
+            session.execute(query2),
+            session.execute(query1),
+        )
+
+        assert results == [{"count": 1}] * 3
+
+        assert len(received) == 1
+        assert len(received[0]) == 2
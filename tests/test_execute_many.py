@@ -0,0 +1,241 @@
+import asyncio
+from typing import Any, Iterator, List
+
+import pytest
+
+from gql import Client, GraphQLRequest
+from gql.transport.exceptions import TransportQueryError
+
+query_str = """
+    query getValue($id: Int) {
+      value(id: $id)
+    }
+"""
+
+pytestmark = pytest.mark.aiohttp
+
+
+async def make_server(
+    aiohttp_server: Any, received: List[Any], in_progress: List[int]
+) -> Any:
+    """Start a server answering with the id of the request,
+    slower for the small ids and with an error for the id 3.
+
+    The maximum number of concurrent requests is saved in in_progress[1]."""
+    from aiohttp import web
+
+    async def handler(request):
+        body = await request.json()
+        received.append(body)
+
+        in_progress[0] += 1
+        in_progress[1] = max(in_progress[0], in_progress[1])
+
+        if isinstance(body, list):
+            await asyncio.sleep(0.01)
+            in_progress[0] -= 1
+            return web.json_response(
+                [{"data": {"value": item["variables"]["id"]}} for item in body]
+            )
+
+        request_id = body["variables"]["id"]
+
+        await asyncio.sleep(0.01 * (5 - request_id % 5))
+
+        in_progress[0] -= 1
+
+        if request_id == 3:
+            return web.json_response({"errors": [{"message": "Error 3"}]})
+
+        return web.json_response({"data": {"value": request_id}})
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+
+    return await aiohttp_server(app)
+
+
+def make_requests(count: int) -> Iterator[GraphQLRequest]:
+    for request_id in range(count):
+        yield GraphQLRequest(query_str, variable_values={"id": request_id})
+
+
+@pytest.mark.asyncio
+async def test_execute_many(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    in_progress = [0, 0]
+    server = await make_server(aiohttp_server, received, in_progress)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    async with Client(transport=transport) as session:
+
+        results = [
+            item
+            async for item in session.execute_many(
+                make_requests(20), max_concurrency=4, return_exceptions=True
+            )
+        ]
+
+        assert len(received) == 20
+        assert in_progress[1] == 4
+
+        # The results are yielded as they complete
+        assert [index for index, _ in results] != list(range(20))
+
+        results_dict = dict(results)
+        assert isinstance(results_dict[3], TransportQueryError)
+        for index in range(20):
+            if index != 3:
+                assert results_dict[index] == {"value": index}
+
+
+@pytest.mark.asyncio
+async def test_execute_many_ordered(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    in_progress = [0, 0]
+    server = await make_server(aiohttp_server, received, in_progress)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    async def async_requests():
+        for request in make_requests(10):
+            yield request
+
+    async with Client(transport=transport) as session:
+
+        results = [
+            item
+            async for item in session.execute_many(
+                async_requests(),
+                max_concurrency=3,
+                ordered=True,
+                return_exceptions=True,
+                get_execution_result=True,
+            )
+        ]
+
+        assert [index for index, _ in results] == list(range(10))
+        assert results[0][1].data == {"value": 0}
+        assert in_progress[1] <= 3
+
+
+@pytest.mark.asyncio
+async def test_execute_many_backpressure(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    in_progress = [0, 0]
+    server = await make_server(aiohttp_server, received, in_progress)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    produced = 0
+
+    def counting_requests():
+        nonlocal produced
+        for request in make_requests(1000):
+            produced += 1
+            yield request
+
+    async with Client(transport=transport) as session:
+
+        results = session.execute_many(counting_requests(), max_concurrency=2)
+
+        index, result = await results.__anext__()
+        await results.aclose()
+
+        # Only the requests needed to fill the free places were taken
+        assert produced <= 3
+        assert len(received) <= 3
+
+
+@pytest.mark.asyncio
+async def test_execute_many_error(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    in_progress = [0, 0]
+    server = await make_server(aiohttp_server, received, in_progress)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    async with Client(transport=transport) as session:
+
+        with pytest.raises(TransportQueryError) as exc_info:
+            async for _ in session.execute_many(make_requests(10), ordered=True):
+                pass
+
+        assert "Error 3" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_execute_many_batching(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    in_progress = [0, 0]
+    server = await make_server(aiohttp_server, received, in_progress)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    client = Client(transport=transport, batch_interval=0.01, batch_max=5)
+
+    async with client as session:
+
+        results = [
+            item
+            async for item in session.execute_many(
+                make_requests(10), max_concurrency=10, ordered=True
+            )
+        ]
+
+        assert [result for _, result in results] == [
+            {"value": index} for index in range(10)
+        ]
+
+        # The requests were sent in two batches of 5 requests
+        assert len(received) == 2
+        assert all(len(body) == 5 for body in received)
+
+
+@pytest.mark.requests
+@pytest.mark.asyncio
+async def test_requests_execute_many(aiohttp_server, run_sync_test):
+    from gql.transport.requests import RequestsHTTPTransport
+
+    received: List[Any] = []
+    in_progress = [0, 0]
+    server = await make_server(aiohttp_server, received, in_progress)
+
+    url = server.make_url("/")
+
+    def test_code():
+        transport = RequestsHTTPTransport(url=url)
+
+        with Client(transport=transport) as session:
+
+            results = list(
+                session.execute_many(
+                    make_requests(10),
+                    max_concurrency=3,
+                    ordered=True,
+                    return_exceptions=True,
+                )
+            )
+
+            assert [index for index, _ in results] == list(range(10))
+            assert isinstance(results[3][1], TransportQueryError)
+            assert results[4][1] == {"value": 4}
+
+            assert len(received) == 10
+            assert in_progress[1] <= 3
+
+            with pytest.raises(TransportQueryError):
+                list(session.execute_many(make_requests(10)))
+
+    await run_sync_test(server, test_code)
@@ -268,3 +268,19 @@ def test_graphql_request_extensions():
     )
     serialized = request_4.serialize_variable_values(schema)
     assert serialized.extensions == extensions_1
+
+
+def test_graphql_request_query_hash():
+    import hashlib
+
+    request_1 = GraphQLRequest("{balance}")
+    request_2 = GraphQLRequest(request_1, variable_values={"a": 1})
+    request_3 = GraphQLRequest("{ balance }")
+
+    expected_hash = hashlib.sha256(request_1.payload["query"].encode()).hexdigest()
+
+    assert request_1.query_hash == expected_hash
+    assert request_2.query_hash == expected_hash
+
+    # The hash is computed on the printed query, not on the source
+    assert request_3.query_hash == expected_hash
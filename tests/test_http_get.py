@@ -0,0 +1,260 @@
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from gql import Client, GraphQLRequest, gql
+from gql.transport.common.http_get import get_query_url
+
+query_str = """
+    query getContinent($code: ID!) {
+      continent(code: $code) {
+        name
+      }
+    }
+"""
+
+mutation_str = """
+    mutation addContinent($name: String!) {
+      addContinent(name: $name) {
+        code
+      }
+    }
+"""
+
+
+async def make_server(aiohttp_server: Any, received: List[Dict[str, Any]]) -> Any:
+    """Start a server answering with the method and the parameters received."""
+    from aiohttp import web
+
+    async def handler(request):
+        if request.method == "GET":
+            params = dict(request.query)
+        else:
+            params = await request.json()
+
+        received.append({"method": request.method, "params": params})
+
+        answer = {"data": {"method": request.method}}
+
+        if isinstance(params, list):
+            return web.json_response([answer for _ in params])
+
+        return web.json_response(answer)
+
+    app = web.Application()
+    app.router.add_route("GET", "/", handler)
+    app.router.add_route("POST", "/", handler)
+
+    return await aiohttp_server(app)
+
+
+def test_get_query_url():
+
+    request = GraphQLRequest(
+        query_str,
+        variable_values={"code": "EU"},
+        operation_name="getContinent",
+        extensions={"key": "value"},
+    )
+
+    url = get_query_url(
+        "https://server.com/graphql", request, json_serialize=json.dumps
+    )
+
+    assert url is not None
+    assert url.startswith("https://server.com/graphql?query=query+getContinent")
+    assert "&operationName=getContinent" in url
+    assert "&variables=%7B%22code%22%3A+%22EU%22%7D" in url
+    assert "&extensions=%7B%22key%22%3A+%22value%22%7D" in url
+
+    url = get_query_url(
+        "https://server.com/graphql?key=1", request, json_serialize=json.dumps
+    )
+
+    assert url is not None
+    assert url.startswith("https://server.com/graphql?key=1&query=")
+
+
+def test_get_query_url_post_fallback():
+
+    request = GraphQLRequest(query_str, variable_values={"code": "EU"})
+
+    # URL too long
+    assert (
+        get_query_url(
+            "https://server.com/graphql",
+            request,
+            json_serialize=json.dumps,
+            max_url_length=50,
+        )
+        is None
+    )
+
+    # Mutation
+    request = GraphQLRequest(mutation_str, variable_values={"name": "Atlantis"})
+
+    assert (
+        get_query_url("https://server.com/graphql", request, json_serialize=json.dumps)
+        is None
+    )
+
+    # Invalid operation name
+    request = GraphQLRequest(query_str, operation_name="unknown")
+
+    assert (
+        get_query_url("https://server.com/graphql", request, json_serialize=json.dumps)
+        is None
+    )
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_aiohttp_use_get_for_queries(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Dict[str, Any]] = []
+    server = await make_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"), use_get_for_queries=True)
+
+    async with Client(transport=transport) as session:
+
+        query = gql(query_str)
+        query.variable_values = {"code": "EU"}
+
+        result = await session.execute(query)
+        assert result == {"method": "GET"}
+
+        assert received[0]["params"] == {
+            "query": query.payload["query"],
+            "variables": '{"code": "EU"}',
+        }
+
+        # Mutations are sent with POST
+        mutation = gql(mutation_str)
+        mutation.variable_values = {"name": "Atlantis"}
+
+        result = await session.execute(mutation)
+        assert result == {"method": "POST"}
+
+        # Long queries are sent with POST
+        transport.max_url_length = 50
+
+        result = await session.execute(query)
+        assert result == {"method": "POST"}
+
+        # Batches are sent with POST
+        transport.max_url_length = 2048
+
+        results = await session.execute_batch([GraphQLRequest(query_str)])
+        assert results[0] == {"method": "POST"}
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_aiohttp_use_get_for_queries_with_persisted_queries(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Dict[str, Any]] = []
+    server = await make_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(
+        url=server.make_url("/"), use_get_for_queries=True, persisted_queries=True
+    )
+
+    async with Client(transport=transport) as session:
+
+        query = gql(query_str)
+
+        result = await session.execute(query)
+        assert result == {"method": "GET"}
+
+        # Only the hash of the query is sent in the URL
+        params = received[0]["params"]
+        assert "query" not in params
+        assert json.loads(params["extensions"]) == {
+            "persistedQuery": {"version": 1, "sha256Hash": query.query_hash}
+        }
+
+
+@pytest.mark.aiohttp
+@pytest.mark.httpx
+@pytest.mark.asyncio
+async def test_httpx_async_use_get_for_queries(aiohttp_server):
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    received: List[Dict[str, Any]] = []
+    server = await make_server(aiohttp_server, received)
+
+    transport = HTTPXAsyncTransport(
+        url=str(server.make_url("/")), use_get_for_queries=True
+    )
+
+    async with Client(transport=transport) as session:
+
+        query = gql(query_str)
+        query.variable_values = {"code": "EU"}
+
+        result = await session.execute(query)
+        assert result == {"method": "GET"}
+        assert received[0]["params"]["variables"] == '{"code": "EU"}'
+
+        result = await session.execute(gql(mutation_str))
+        assert result == {"method": "POST"}
+
+
+@pytest.mark.aiohttp
+@pytest.mark.httpx
+@pytest.mark.asyncio
+async def test_httpx_use_get_for_queries(aiohttp_server, run_sync_test):
+    from gql.transport.httpx import HTTPXTransport
+
+    received: List[Dict[str, Any]] = []
+    server = await make_server(aiohttp_server, received)
+
+    url = str(server.make_url("/"))
+
+    def test_code():
+        transport = HTTPXTransport(url=url, use_get_for_queries=True)
+
+        with Client(transport=transport) as session:
+
+            result = session.execute(gql(query_str))
+            assert result == {"method": "GET"}
+
+            result = session.execute(gql(mutation_str))
+            assert result == {"method": "POST"}
+
+    await run_sync_test(server, test_code)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.requests
+@pytest.mark.asyncio
+async def test_requests_use_get_for_queries(aiohttp_server, run_sync_test):
+    from gql.transport.requests import RequestsHTTPTransport
+
+    received: List[Dict[str, Any]] = []
+    server = await make_server(aiohttp_server, received)
+
+    url = str(server.make_url("/"))
+
+    def test_code():
+        transport = RequestsHTTPTransport(
+            url=url, use_get_for_queries=True, headers={"dummy": "test"}
+        )
+
+        with Client(transport=transport) as session:
+
+            query = gql(query_str)
+            query.variable_values = {"code": "EU"}
+
+            result = session.execute(query)
+            assert result == {"method": "GET"}
+            assert received[0]["params"]["variables"] == '{"code": "EU"}'
+
+            result = session.execute(gql(mutation_str))
+            assert result == {"method": "POST"}
+
+    await run_sync_test(server, test_code)
@@ -1018,3 +1018,62 @@ async def test_httpx_error_fetching_schema(aiohttp_server, run_sync_test):
         assert transport.client is None
 
     await run_sync_test(server, test_code)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_session_shared_by_threads(aiohttp_server, run_sync_test):
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    from aiohttp import web
+
+    from gql.transport.http_result import HTTPExecutionResult
+    from gql.transport.httpx import HTTPXTransport
+
+    peers = set()
+
+    async def handler(request):
+        body = await request.json()
+        request_id = body["variables"]["id"]
+
+        peers.add(request.transport.get_extra_info("peername"))
+
+        # Answer the first requests last
+        await asyncio.sleep(0.01 * (8 - request_id))
+
+        return web.Response(
+            text=query1_server_answer,
+            content_type="application/json",
+            headers={"request-id": str(request_id)},
+        )
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    url = str(server.make_url("/"))
+
+    def test_code():
+        transport = HTTPXTransport(url=url, pool_maxsize=4)
+
+        with Client(transport=transport) as session:
+
+            def execute(request_id):
+                request = GraphQLRequest(query1_str, variable_values={"id": request_id})
+                return session.execute(request, get_execution_result=True)
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(execute, range(8)))
+
+            # The headers of each response are saved in its result
+            for request_id, result in enumerate(results):
+                assert isinstance(result, HTTPExecutionResult)
+                assert result.status_code == 200
+                assert result.response_headers is not None
+                assert result.response_headers["request-id"] == str(request_id)
+
+        # The connections are reused by the threads
+        assert len(peers) <= 4
+
+    await run_sync_test(server, test_code)
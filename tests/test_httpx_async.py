@@ -360,13 +360,13 @@ async def test_httpx_invalid_protocol(aiohttp_server, param):
 
 @pytest.mark.aiohttp
 @pytest.mark.asyncio
-async def test_httpx_subscribe_not_supported(aiohttp_server):
+async def test_httpx_subscribe_json_answer(aiohttp_server):
     from aiohttp import web
 
     from gql.transport.httpx import HTTPXAsyncTransport
 
     async def handler(request):
-        return web.Response(text="does not matter", content_type="application/json")
+        return web.Response(text=query1_server_answer, content_type="application/json")
 
     app = web.Application()
     app.router.add_route("POST", "/", handler)
@@ -380,9 +380,11 @@ async def test_httpx_subscribe_not_supported(aiohttp_server):
 
         query = gql(query1_str)
 
-        with pytest.raises(NotImplementedError):
-            async for result in session.subscribe(query):
-                pass
+        # A single result is received if the server does not use multipart
+        results = [result async for result in session.subscribe(query)]
+
+        assert len(results) == 1
+        assert results[0]["continents"][0]["code"] == "AF"
 
 
 @pytest.mark.aiohttp
@@ -604,16 +606,14 @@ async def test_httpx_subscribe_running_in_thread(aiohttp_server, run_sync_test):
 
         query = gql(query1_str)
 
-        # Note: subscriptions are not supported on the httpx transport
-        # But we add this test in order to have 100% code coverage
         # It is to check that we will correctly set an event loop
         # in the subscribe function if there is none (in a Thread for example)
         # We cannot test this with the websockets transport because
         # the websockets transport will set an event loop in its init
 
-        with pytest.raises(NotImplementedError):
-            for result in client.subscribe(query):
-                pass
+        results = list(client.subscribe(query))
+
+        assert results[0]["continents"][0]["code"] == "AF"
 
     await run_sync_test(server, test_code)
 
@@ -1515,3 +1515,195 @@ async def test_httpx_subscribe_not_supported_cli(aiohttp_server):
 
         output = captured_output.getvalue()
         assert "Africa" in output
+
+
+@pytest.mark.asyncio
+async def test_httpx_pool_limits():
+    try:
+        import httpx2 as httpx
+    except ModuleNotFoundError:  # pragma: no cover
+        import httpx  # type: ignore[no-redef]
+
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    transport = HTTPXAsyncTransport(
+        url="http://127.0.0.1/graphql",
+        pool_maxsize=4,
+        max_keepalive_connections=2,
+        keepalive_expiry=30.0,
+    )
+
+    limits = transport._get_client_args()["limits"]
+
+    assert limits.max_connections == 4
+    assert limits.max_keepalive_connections == 2
+    assert limits.keepalive_expiry == 30.0
+
+    # The limits argument is completed with the explicit arguments
+    transport = HTTPXAsyncTransport(
+        url="http://127.0.0.1/graphql",
+        keepalive_expiry=30.0,
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+    )
+
+    limits = transport._get_client_args()["limits"]
+
+    assert limits.max_connections == 10
+    assert limits.max_keepalive_connections == 5
+    assert limits.keepalive_expiry == 30.0
+
+    # Without explicit arguments, the arguments of the httpx client are unchanged
+    transport = HTTPXAsyncTransport(url="http://127.0.0.1/graphql", timeout=10)
+
+    assert transport._get_client_args() == {"timeout": 10}
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_pool_stats(aiohttp_server):
+    import asyncio
+
+    from aiohttp import web
+
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    answer_event = asyncio.Event()
+
+    async def handler(request):
+        await answer_event.wait()
+        return web.Response(text=query1_server_answer, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    transport = HTTPXAsyncTransport(url=str(server.make_url("/")), pool_maxsize=2)
+
+    with pytest.raises(TransportClosed):
+        transport.get_pool_stats()
+
+    async with Client(transport=transport) as session:
+
+        tasks = [
+            asyncio.ensure_future(session.execute(gql(query1_str))) for _ in range(3)
+        ]
+
+        # Wait for the requests to be sent
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            stats = transport.get_pool_stats()
+            assert stats is not None
+            if stats.active_connections == 2:
+                break
+
+        # With HTTP/1.1, a connection is used by a single request at a time
+        assert stats is not None
+        assert stats.active_connections == 2
+        assert stats.idle_connections == 0
+        assert stats.http2_connections == 0
+        assert stats.active_requests == 2
+        assert stats.waiting_requests == 1
+        assert stats.streams_per_connection == [1, 1]
+
+        answer_event.set()
+        await asyncio.gather(*tasks)
+
+        stats = transport.get_pool_stats()
+        assert stats is not None
+
+        assert stats.connections == 2
+        assert stats.idle_connections == 2
+        assert stats.active_requests == 0
+        assert stats.waiting_requests == 0
+        assert stats.streams_per_connection == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_httpx_pool_stats_best_effort(monkeypatch):
+    import httpx
+
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    transport = HTTPXAsyncTransport(url="http://127.0.0.1/graphql")
+
+    async with Client(transport=transport):
+        assert transport.client is not None
+        pool = transport.client._transport._pool
+
+        # Without the private requests of the pool, the request stats are None
+        monkeypatch.delattr(pool, "_requests")
+
+        stats = transport.get_pool_stats()
+        assert stats is not None
+
+        assert stats.connections == 0
+        assert stats.active_requests is None
+        assert stats.waiting_requests is None
+        assert stats.streams_per_connection is None
+
+    # With a custom transport, there is no pool
+    transport = HTTPXAsyncTransport(
+        url="http://127.0.0.1/graphql",
+        transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+    )
+
+    async with Client(transport=transport):
+        assert transport.get_pool_stats() is None
+
+
+@pytest.mark.asyncio
+async def test_httpx_http2_multiplexing():
+    pytest.importorskip("h2")
+
+    import asyncio
+
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    from .conftest import H2Server
+
+    server = H2Server(query1_server_answer.encode())
+    server.answer_event = asyncio.Event()
+    await server.start()
+
+    try:
+        # http1=False to use HTTP/2 without TLS
+        transport = HTTPXAsyncTransport(
+            url=server.url, http2=True, http1=False, pool_maxsize=2
+        )
+
+        async with Client(transport=transport) as session:
+
+            tasks = [
+                asyncio.ensure_future(session.execute(gql(query1_str)))
+                for _ in range(20)
+            ]
+
+            # Wait for the requests to be received by the server
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if server.requests == 20:
+                    break
+
+            stats = transport.get_pool_stats()
+            assert stats is not None
+
+            # The requests are streams of the same HTTP/2 connection
+            assert stats.connections == 1
+            assert stats.waiting_requests == 0
+            assert stats.streams_per_connection == [20]
+
+            server.answer_event.set()
+            results = await asyncio.gather(*tasks)
+
+            stats = transport.get_pool_stats()
+            assert stats is not None
+
+            assert stats.idle_connections == 1
+            assert stats.http2_connections == 1
+
+        assert all(result["continents"][0]["code"] == "AF" for result in results)
+        assert server.connections == 1
+        assert server.max_concurrent_streams == 20
+
+    finally:
+        await server.stop()
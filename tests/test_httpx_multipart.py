@@ -0,0 +1,444 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from gql import Client, gql
+from gql.graphql_request import GraphQLRequest
+from gql.transport.common.multipart import MultipartParser, parse_content_type
+from gql.transport.exceptions import (
+    TransportClosed,
+    TransportProtocolError,
+    TransportServerError,
+)
+
+# Marking all tests in this file with the httpx marker
+pytestmark = pytest.mark.httpx
+
+subscription_str = """
+    subscription {
+      book {
+        title
+        author
+      }
+    }
+"""
+
+book1 = {"title": "Book 1", "author": "Author 1"}
+book2 = {"title": "Book 2", "author": "Author 2"}
+
+
+def create_multipart_response(books, *, separator="\r\n", include_heartbeat=False):
+    """Helper to create parts for a streamed response body."""
+    parts = []
+
+    for idx, book in enumerate(books):
+        data = {"data": {"book": book}}
+        payload = {"payload": data}
+
+        parts.append((
+            f"--graphql{separator}"
+            f"Content-Type: application/json{separator}"
+            f"{separator}"
+            f"{json.dumps(payload)}{separator}"
+        ))  # fmt: skip
+
+        # Add heartbeat after first item if requested
+        if include_heartbeat and idx == 0:
+            parts.append((
+                f"--graphql{separator}"
+                f"Content-Type: application/json{separator}"
+                f"{separator}"
+                f"{{}}{separator}"
+            ))  # fmt: skip
+
+    # Add end boundary
+    parts.append(f"--graphql--{separator}")
+
+    return parts
+
+
+@pytest.fixture
+def multipart_server(aiohttp_server):
+    from aiohttp import web
+
+    async def create_server(
+        parts,
+        *,
+        content_type=(
+            "multipart/mixed;boundary=graphql;subscriptionSpec=1.0,application/json"
+        ),
+        request_handler=lambda *args: None,
+    ):
+        async def handler(request):
+            request_handler(request)
+            response = web.StreamResponse()
+            response.headers["Content-Type"] = content_type
+            response.enable_chunked_encoding()
+            await response.prepare(request)
+            for part in parts:
+                if isinstance(part, str):
+                    await response.write(part.encode())
+                else:
+                    await response.write(part)
+                await asyncio.sleep(0)  # force the chunk to be written
+            await response.write_eof()
+            return response
+
+        app = web.Application()
+        app.router.add_route("POST", "/", handler)
+        server = await aiohttp_server(app)
+        return server
+
+    return create_server
+
+
+async def subscribe_all(server, **kwargs):
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    transport = HTTPXAsyncTransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        return [
+            result
+            async for result in session.subscribe(gql(subscription_str), **kwargs)
+        ]
+
+
+def test_multipart_parser_split_chunks():
+    body = "".join(
+        create_multipart_response([book1, book2], include_heartbeat=True)
+    ).encode()
+
+    expected = [
+        ({"content-type": "application/json"}, part.split(b"\r\n\r\n", 1)[1][:-2])
+        for part in body.split(b"--graphql")[1:-1]
+    ]
+
+    # Same parts whatever the size of the chunks
+    for chunk_size in [1, 2, 7, 64, len(body)]:
+        parser = MultipartParser("graphql")
+        parts = []
+
+        for start in range(0, len(body), chunk_size):
+            end = start + chunk_size
+            parts.extend(parser.feed(body[start:end]))
+
+        assert parts == expected
+        assert parser.done
+
+        # Data after the closing delimiter is ignored
+        assert parser.feed(b"--graphql\r\n\r\n{}\r\n") == []
+
+
+def test_multipart_parser_preamble_and_empty_parts():
+    parser = MultipartParser("-")
+
+    parts = parser.feed(
+        b"preamble\r\n---\r\n\r\n{}\r\n---\r\n---\r\n"
+        b"Content-Type: application/json\r\nX-Other:  value \r\n\r\n{\r\n}\r\n-----"
+    )
+
+    assert parts == [
+        ({}, b"{}"),
+        ({"content-type": "application/json", "x-other": "value"}, b"{\r\n}"),
+    ]
+    assert parser.done
+
+
+def test_multipart_parser_invalid_header():
+    parser = MultipartParser("graphql")
+
+    with pytest.raises(TransportProtocolError):
+        parser.feed(b"--graphql\r\nInvalid header\r\n\r\n{}\r\n")
+
+
+def test_multipart_parse_content_type():
+    assert parse_content_type(
+        'Multipart/Mixed; boundary="graphql"; subscriptionSpec="1.0"'
+    ) == ("multipart/mixed", {"boundary": "graphql", "subscriptionspec": "1.0"})
+
+    assert parse_content_type("application/json") == ("application/json", {})
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_subscription(multipart_server):
+    def assert_request_headers(request):
+        # Verify the Accept header follows the spec
+        accept_header = request.headers["accept"]
+        assert "multipart/mixed" in accept_header
+        assert "boundary=graphql" in accept_header
+        assert "subscriptionSpec=1.0" in accept_header
+        assert "application/json" in accept_header
+        assert request.headers["content-type"] == "application/json"
+
+    parts = create_multipart_response([book1, book2], include_heartbeat=True)
+    server = await multipart_server(parts, request_handler=assert_request_headers)
+
+    results = await subscribe_all(server)
+
+    # Heartbeats should be filtered out
+    assert len(results) == 2
+    assert results[0]["book"]["title"] == "Book 1"
+    assert results[1]["book"]["title"] == "Book 2"
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_quoted_boundary(multipart_server):
+    parts = create_multipart_response([book1])
+    server = await multipart_server(
+        parts,
+        content_type='multipart/mixed; boundary="graphql"; subscriptionSpec="1.0"',
+    )
+
+    results = await subscribe_all(server)
+
+    assert results == [{"book": book1}]
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_high_rate(multipart_server):
+    """Many parts split at random positions, several parts per chunk."""
+    books = [{"title": f"Book {index}", "author": "Author"} for index in range(2000)]
+
+    body = "".join(create_multipart_response(books)).encode()
+
+    random.seed(42)
+    chunks = []
+    start = 0
+    while start < len(body):
+        end = start + random.randint(1, 4096)
+        chunks.append(body[start:end])
+        start = end
+
+    server = await multipart_server(chunks)
+
+    results = await subscribe_all(server)
+
+    assert [result["book"]["title"] for result in results] == [
+        book["title"] for book in books
+    ]
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_chunked_boundary_split(multipart_server):
+    parts = [
+        "--gra",
+        (
+            "phql\r\nContent-Type: application/json\r\n\r\n"
+            '{"payload": {"data": {"book": {"title": "Bo'
+        ),
+        'ok 1"}}}}\r',
+        "\n--graph",
+        "ql--\r\n",
+    ]
+
+    server = await multipart_server(parts)
+
+    results = await subscribe_all(server)
+
+    assert results == [{"book": {"title": "Book 1"}}]
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_with_content_length_headers(multipart_server):
+    book1_payload = json.dumps({"payload": {"data": {"book": book1}}})
+
+    parts = [
+        (
+            "--graphql\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            "Content-Length: 2\r\n"
+            "\r\n"
+            "{}\r\n"
+        ),
+        (
+            "--graphql\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(book1_payload)}\r\n"
+            "\r\n"
+            f"{book1_payload}\r\n"
+        ),
+        "--graphql\r\n",  # Extra empty part like real servers
+        "--graphql--\r\n",
+    ]
+
+    server = await multipart_server(parts)
+
+    results = await subscribe_all(server)
+
+    assert results == [{"book": book1}]
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_invalid_parts(multipart_server):
+    """Invalid JSON, invalid UTF-8 and parts without payload are skipped."""
+    parts = [
+        b"--graphql\r\nContent-Type: application/json\r\n\r\n{invalid\r\n",
+        b"--graphql\r\nContent-Type: application/json\r\n\r\n\x80\x81\r\n",
+        b'--graphql\r\nContent-Type: application/json\r\n\r\n{"other": 1}\r\n',
+        b'--graphql\r\nContent-Type: application/json\r\n\r\n{"payload": null}\r\n',
+        b"--graphql\r\nContent-Type: application/json\r\n\r\n\r\n",
+        *[part.encode() for part in create_multipart_response([book2])],
+    ]
+
+    server = await multipart_server(parts)
+
+    results = await subscribe_all(server)
+
+    assert results == [{"book": book2}]
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_transport_level_error(multipart_server):
+    error_response = {
+        "payload": None,
+        "errors": [{"message": "Transport connection failed"}],
+    }
+    parts = [
+        (
+            "--graphql\r\n"
+            "Content-Type: application/json\r\n"
+            "\r\n"
+            f"{json.dumps(error_response)}\r\n"
+        ),
+        "--graphql--\r\n",
+    ]
+
+    server = await multipart_server(parts)
+
+    with pytest.raises(TransportServerError) as exc_info:
+        await subscribe_all(server)
+
+    assert "Transport connection failed" in str(exc_info.value)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_wrong_part_content_type(multipart_server):
+    parts = [
+        "--graphql\r\nContent-Type: text/plain\r\n\r\nhello\r\n",
+        "--graphql--\r\n",
+    ]
+
+    server = await multipart_server(parts)
+
+    with pytest.raises(TransportProtocolError) as exc_info:
+        await subscribe_all(server)
+
+    assert "Unexpected part content-type" in str(exc_info.value)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_incomplete_response(multipart_server):
+    # The end of the stream without the closing delimiter
+    parts = create_multipart_response([book1])[:-1]
+
+    server = await multipart_server(parts)
+
+    with pytest.raises(TransportProtocolError) as exc_info:
+        await subscribe_all(server)
+
+    assert "Incomplete multipart response" in str(exc_info.value)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_newline_separator(multipart_server):
+    """LF-only separators are not accepted (spec requires CRLF)."""
+    parts = create_multipart_response([book1], separator="\n")
+
+    server = await multipart_server(parts)
+
+    with pytest.raises(TransportProtocolError):
+        await subscribe_all(server)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_unsupported_content_type(aiohttp_server):
+    from aiohttp import web
+
+    async def handler(request):
+        return web.Response(text="<p>hello</p>", content_type="text/html")
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    with pytest.raises(TransportProtocolError) as exc_info:
+        await subscribe_all(server)
+
+    assert "Unexpected content-type" in str(exc_info.value)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_server_error(aiohttp_server):
+    from aiohttp import web
+
+    async def handler(request):
+        return web.Response(text="Internal Server Error", status=500)
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    with pytest.raises(TransportServerError) as exc_info:
+        await subscribe_all(server)
+
+    assert "500" in str(exc_info.value)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_transport_not_connected(multipart_server):
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    server = await multipart_server(create_multipart_response([book1]))
+    transport = HTTPXAsyncTransport(url=str(server.make_url("/")))
+
+    with pytest.raises(TransportClosed):
+        async for result in transport.subscribe(GraphQLRequest(subscription_str)):
+            pass
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_multipart_response_headers_and_extra_args(multipart_server):
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    received_headers = []
+
+    def save_headers(request):
+        received_headers.append(dict(request.headers))
+
+    server = await multipart_server(
+        create_multipart_response([book1]), request_handler=save_headers
+    )
+    transport = HTTPXAsyncTransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        results = [
+            result
+            async for result in session.subscribe(
+                gql(subscription_str),
+                extra_args={"headers": {"X-Custom-Header": "custom-value"}},
+            )
+        ]
+
+    assert results == [{"book": book1}]
+    assert received_headers[0]["X-Custom-Header"] == "custom-value"
+    assert "multipart/mixed" in received_headers[0]["Accept"]
+
+    assert transport.response_headers is not None
+    assert "multipart/mixed" in transport.response_headers["content-type"]
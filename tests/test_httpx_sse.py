@@ -0,0 +1,596 @@
+import asyncio
+import json
+import random
+from typing import Any, Dict, List, Optional
+
+import pytest
+import pytest_asyncio
+
+from gql import Client, GraphQLRequest, gql
+from gql.transport.common.sse import SSEEvent, SSEParser
+from gql.transport.exceptions import (
+    TransportClosed,
+    TransportConnectionFailed,
+    TransportProtocolError,
+    TransportServerError,
+)
+
+# Marking all tests in this file with the httpx marker
+pytestmark = pytest.mark.httpx
+
+subscription_str = """
+    subscription count($count: Int) {
+      number(count: $count)
+    }
+"""
+
+query_str = """
+    query {
+      number
+    }
+"""
+
+
+def format_event(
+    event: str, data: Optional[Any] = None, event_id: Optional[int] = None
+) -> str:
+    lines = [f"event: {event}"]
+
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+
+    lines.append(f"data: {json.dumps(data) if data is not None else ''}")
+
+    return "\n".join(lines) + "\n\n"
+
+
+def create_events(count: int, *, with_ids: bool = False) -> List[str]:
+    events = [
+        format_event(
+            "next", {"data": {"number": index}}, index + 1 if with_ids else None
+        )
+        for index in range(count)
+    ]
+    events.append(format_event("complete"))
+    return events
+
+
+@pytest.fixture
+def sse_server(aiohttp_server):
+    """Stand-in server for the distinct connections mode,
+    sending a list of chunks for each request received."""
+    from aiohttp import web
+
+    async def create_server(*responses, content_type="text/event-stream"):
+        requests: List[Dict[str, Any]] = []
+
+        async def handler(request):
+            requests.append(
+                {"headers": dict(request.headers), "body": await request.json()}
+            )
+            chunks = responses[min(len(requests), len(responses)) - 1]
+
+            response = web.StreamResponse()
+            response.headers["Content-Type"] = content_type
+            response.enable_chunked_encoding()
+            await response.prepare(request)
+
+            for chunk in chunks:
+                await response.write(
+                    chunk.encode() if isinstance(chunk, str) else chunk
+                )
+                await asyncio.sleep(0)  # force the chunk to be written
+
+            await response.write_eof()
+            return response
+
+        app = web.Application()
+        app.router.add_route("POST", "/", handler)
+        server = await aiohttp_server(app)
+        server.requests = requests
+        return server
+
+    return create_server
+
+
+class SingleConnectionServer:
+    """Stand-in server for the single connection mode.
+
+    The events of the operations are put in a queue written in the event stream,
+    the stream can be closed by putting None in the queue."""
+
+    token = "test-token"
+
+    def __init__(self):
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.stream_headers: List[Dict[str, str]] = []
+        self.operations: List[Dict[str, Any]] = []
+        self.stopped: List[str] = []
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.event_id = 0
+
+    def send(self, event: str, data: Any) -> None:
+        self.event_id += 1
+        self.events.put_nowait(format_event(event, data, self.event_id))
+
+    def close_stream(self) -> None:
+        self.events.put_nowait(None)
+
+    async def produce(self, operation_id: str, count: Optional[int]) -> None:
+        index = 0
+        while count is None or index < count:
+            self.send(
+                "next", {"id": operation_id, "payload": {"data": {"number": index}}}
+            )
+            index += 1
+            await asyncio.sleep(0 if count is not None else 0.01)
+        self.send("complete", {"id": operation_id})
+
+    async def handler(self, request):
+        from aiohttp import web
+
+        if request.method != "PUT":
+            assert request.headers["X-GraphQL-Event-Stream-Token"] == self.token
+
+        if request.method == "PUT":
+            return web.Response(text=self.token, status=201)
+
+        if request.method == "GET":
+            self.stream_headers.append(dict(request.headers))
+
+            response = web.StreamResponse()
+            response.headers["Content-Type"] = "text/event-stream"
+            await response.prepare(request)
+            await response.write(b": connected\n\n")
+
+            while True:
+                event = await self.events.get()
+                if event is None:
+                    break
+                await response.write(event.encode())
+
+            return response
+
+        if request.method == "DELETE":
+            operation_id = request.query["operationId"]
+            self.stopped.append(operation_id)
+            self.tasks[operation_id].cancel()
+            return web.Response()
+
+        payload = await request.json()
+        self.operations.append(payload)
+
+        operation_id = payload["extensions"]["operationId"]
+        count = (payload.get("variables") or {}).get("count", 1)
+
+        self.tasks[operation_id] = asyncio.ensure_future(
+            self.produce(operation_id, count)
+        )
+
+        return web.Response(status=202)
+
+
+@pytest_asyncio.fixture
+async def single_connection_server(aiohttp_server):
+    from aiohttp import web
+
+    stand_in = SingleConnectionServer()
+
+    app = web.Application()
+    app.router.add_route("*", "/", stand_in.handler)
+    server = await aiohttp_server(app)
+    server.stand_in = stand_in
+
+    yield server
+
+    for task in stand_in.tasks.values():
+        task.cancel()
+
+
+def test_sse_parser_chunks():
+    stream = (
+        "\ufeff: comment\r\n"
+        "event: next\r\n"
+        "id: 1\r\n"
+        'data: {"a":\r\n'
+        "data:1}\r\n"
+        "\r\n"
+        "retry: 250\n"
+        "id: 2\n"
+        "\n"
+        "event: complete\r"
+        "data\r"
+        "unknown: field\r"
+        "\r"
+    ).encode()
+
+    expected = [
+        SSEEvent("next", b'{"a":\n1}', "1"),
+        SSEEvent("complete", b"", "2"),
+    ]
+
+    # Same events whatever the size of the chunks
+    for chunk_size in [1, 2, 3, 5, 64, len(stream)]:
+        parser = SSEParser()
+        events = []
+
+        for start in range(0, len(stream), chunk_size):
+            end = start + chunk_size
+            events.extend(parser.feed(stream[start:end]))
+
+        assert events == expected
+        assert parser.last_event_id == "2"
+        assert parser.retry == 250
+
+
+def test_sse_parser_reset():
+    parser = SSEParser()
+
+    assert parser.feed(b"id: 5\nretry: 10\n\nevent: next\ndata: {}\n") == []
+
+    parser.reset()
+
+    # The incomplete event is discarded, the last event id is kept
+    assert parser.feed(b"data: 1\n\n") == [SSEEvent("message", b"1", "5")]
+    assert parser.retry == 10
+
+    # Ids containing a null character are ignored
+    assert parser.feed(b"id: 6\0\nretry: 1s\ndata: 2\n\n") == [
+        SSEEvent("message", b"2", "5")
+    ]
+    assert parser.retry == 10
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_sse_subscription(sse_server):
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    server = await sse_server(create_events(3))
+
+    transport = HTTPXSSETransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        results = [
+            result
+            async for result in session.subscribe(
+                GraphQLRequest(subscription_str, variable_values={"count": 3})
+            )
+        ]
+
+    assert results == [{"number": 0}, {"number": 1}, {"number": 2}]
+
+    request = server.requests[0]
+    assert request["headers"]["Accept"] == "text/event-stream"
+    assert request["headers"]["Content-Type"] == "application/json"
+    assert request["body"]["variables"] == {"count": 3}
+
+    assert transport.response_headers is not None
+    assert "text/event-stream" in transport.response_headers["content-type"]
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_sse_query(sse_server):
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    server = await sse_server(create_events(1))
+
+    transport = HTTPXSSETransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        result = await session.execute(gql(query_str))
+
+    assert result == {"number": 0}
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_sse_high_rate(sse_server):
+    """Many events split at random positions, several events per chunk."""
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    body = "".join(create_events(2000, with_ids=True)).encode()
+
+    random.seed(42)
+    chunks = []
+    start = 0
+    while start < len(body):
+        end = start + random.randint(1, 4096)
+        chunks.append(body[start:end])
+        start = end
+
+    server = await sse_server(chunks)
+
+    transport = HTTPXSSETransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        results = [result async for result in session.subscribe(gql(subscription_str))]
+
+    assert [result["number"] for result in results] == list(range(2000))
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_sse_reconnect_last_event_id(sse_server):
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    events = create_events(4, with_ids=True)
+
+    # The first stream is closed after the second event, asking to retry in 1ms
+    server = await sse_server(["retry: 1\n\n", *events[:2]], events[2:])
+
+    transport = HTTPXSSETransport(url=str(server.make_url("/")), reconnect_delay=60)
+
+    async with Client(transport=transport) as session:
+        results = [result async for result in session.subscribe(gql(subscription_str))]
+
+    assert [result["number"] for result in results] == [0, 1, 2, 3]
+
+    assert len(server.requests) == 2
+    assert "Last-Event-ID" not in server.requests[0]["headers"]
+    assert server.requests[1]["headers"]["Last-Event-ID"] == "2"
+    assert server.requests[1]["body"] == server.requests[0]["body"]
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_sse_reconnect_attempts(sse_server):
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    events = create_events(1, with_ids=True)
+
+    # The stream is always closed without the complete event
+    server = await sse_server(events[:1], [])
+
+    transport = HTTPXSSETransport(
+        url=str(server.make_url("/")), reconnect_attempts=2, reconnect_delay=0
+    )
+
+    async with Client(transport=transport) as session:
+        results = []
+
+        with pytest.raises(TransportConnectionFailed) as exc_info:
+            async for result in session.subscribe(gql(subscription_str)):
+                results.append(result)
+
+    assert "closed before the complete event" in str(exc_info.value)
+    assert results == [{"number": 0}]
+    assert len(server.requests) == 3
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_sse_no_reconnect_without_event_id(sse_server):
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    # Without event ids, the operation would be executed again
+    server = await sse_server(create_events(2)[:1])
+
+    transport = HTTPXSSETransport(url=str(server.make_url("/")), reconnect_delay=0)
+
+    async with Client(transport=transport) as session:
+        with pytest.raises(TransportConnectionFailed):
+            async for result in session.subscribe(gql(subscription_str)):
+                pass
+
+    assert len(server.requests) == 1
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_sse_json_answer(sse_server):
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    server = await sse_server(
+        ['{"data": {"number": 42}}'], content_type="application/json"
+    )
+
+    transport = HTTPXSSETransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        results = [result async for result in session.subscribe(gql(subscription_str))]
+
+    assert results == [{"number": 42}]
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_sse_unexpected_content_type(sse_server):
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    server = await sse_server(["<p>hello</p>"], content_type="text/html")
+
+    transport = HTTPXSSETransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        with pytest.raises(TransportProtocolError) as exc_info:
+            await session.execute(gql(query_str))
+
+    assert "Unexpected content-type" in str(exc_info.value)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "event", [format_event("next", {"other": 1}), "event: next\ndata: {invalid\n\n"]
+)
+async def test_httpx_sse_invalid_event(sse_server, event):
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    server = await sse_server([event])
+
+    transport = HTTPXSSETransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        with pytest.raises(TransportProtocolError):
+            await session.execute(gql(query_str))
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_sse_server_error(aiohttp_server):
+    from aiohttp import web
+
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    async def handler(request):
+        return web.Response(text="Internal Server Error", status=500)
+
+    app = web.Application()
+    app.router.add_route("*", "/", handler)
+    server = await aiohttp_server(app)
+
+    url = str(server.make_url("/"))
+
+    async with Client(transport=HTTPXSSETransport(url=url)) as session:
+        with pytest.raises(TransportServerError) as exc_info:
+            await session.execute(gql(query_str))
+
+    assert exc_info.value.code == 500
+
+    # In single connection mode, the reservation fails at the connection
+    transport = HTTPXSSETransport(url=url, single_connection=True)
+
+    with pytest.raises(TransportServerError):
+        await transport.connect()
+
+    assert transport.client is None
+
+
+@pytest.mark.asyncio
+async def test_httpx_sse_not_connected():
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    for single_connection in [False, True]:
+        transport = HTTPXSSETransport(
+            url="http://localhost/graphql", single_connection=single_connection
+        )
+
+        with pytest.raises(TransportClosed):
+            await transport.execute(gql(query_str))
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_sse_single_connection(single_connection_server):
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    server = single_connection_server
+    stand_in = server.stand_in
+
+    transport = HTTPXSSETransport(url=str(server.make_url("/")), single_connection=True)
+
+    async def subscribe(session, count):
+        return [
+            result["number"]
+            async for result in session.subscribe(
+                GraphQLRequest(subscription_str, variable_values={"count": count})
+            )
+        ]
+
+    async with Client(transport=transport) as session:
+
+        # Many subscriptions receiving their results in the same event stream
+        results = await asyncio.gather(
+            *[subscribe(session, count) for count in range(20)]
+        )
+
+        assert results == [list(range(count)) for count in range(20)]
+
+        result = await session.execute(gql(query_str))
+        assert result == {"number": 0}
+
+    assert len(stand_in.stream_headers) == 1
+    assert stand_in.stream_headers[0]["Accept"] == "text/event-stream"
+
+    operation_ids = [
+        operation["extensions"]["operationId"] for operation in stand_in.operations
+    ]
+    assert sorted(operation_ids, key=int) == [str(index) for index in range(1, 22)]
+
+    # The operations completed by the server are not stopped
+    assert stand_in.stopped == []
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_sse_single_connection_stop(single_connection_server):
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    server = single_connection_server
+    stand_in = server.stand_in
+
+    transport = HTTPXSSETransport(url=str(server.make_url("/")), single_connection=True)
+
+    async with Client(transport=transport) as session:
+        generator = session.subscribe(
+            GraphQLRequest(subscription_str, variable_values={"count": None})
+        )
+
+        async for result in generator:
+            if result["number"] == 2:
+                break
+
+        await generator.aclose()
+
+    assert stand_in.stopped == ["1"]
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_sse_single_connection_reconnect(single_connection_server):
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    server = single_connection_server
+    stand_in = server.stand_in
+
+    transport = HTTPXSSETransport(
+        url=str(server.make_url("/")), single_connection=True, reconnect_delay=0
+    )
+
+    async with Client(transport=transport) as session:
+        results = []
+
+        async for result in session.subscribe(
+            GraphQLRequest(subscription_str, variable_values={"count": None})
+        ):
+            results.append(result["number"])
+
+            # The server closes the stream, the next events are received
+            # after the reconnection
+            if result["number"] == 2:
+                stand_in.close_stream()
+
+            if result["number"] == 5:
+                break
+
+    assert results == list(range(6))
+
+    assert len(stand_in.stream_headers) == 2
+    assert "Last-Event-ID" not in stand_in.stream_headers[0]
+    assert int(stand_in.stream_headers[1]["Last-Event-ID"]) >= 3
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_httpx_sse_single_connection_lost(single_connection_server):
+    from gql.transport.httpx_sse import HTTPXSSETransport
+
+    server = single_connection_server
+    stand_in = server.stand_in
+
+    transport = HTTPXSSETransport(
+        url=str(server.make_url("/")), single_connection=True, reconnect_attempts=0
+    )
+
+    async with Client(transport=transport) as session:
+        with pytest.raises(TransportConnectionFailed):
+            async for result in session.subscribe(
+                GraphQLRequest(subscription_str, variable_values={"count": None})
+            ):
+                stand_in.close_stream()
+
+        # The transport cannot be used until it is connected again
+        with pytest.raises(TransportConnectionFailed):
+            await session.execute(gql(query_str))
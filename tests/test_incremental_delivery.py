@@ -0,0 +1,486 @@
+import asyncio
+import json
+from typing import Any, List
+
+import pytest
+from graphql import (
+    ExecutionResult,
+    ExperimentalIncrementalExecutionResults,
+    build_schema,
+    execute,
+    experimental_execute_incrementally,
+    parse,
+)
+
+from gql import Client, gql
+from gql.json_codec import get_json_codec
+from gql.transport.common.incremental import (
+    IncrementalExecutionResult,
+    IncrementalResultMerger,
+    has_incremental_directives,
+)
+from gql.transport.common.multipart import (
+    INCREMENTAL_ACCEPT_HEADER,
+    merge_incremental_response,
+)
+from gql.transport.exceptions import TransportProtocolError, TransportServerError
+
+schema = build_schema("""
+    type Author {
+      name: String
+      born: Int
+    }
+
+    type Book {
+      title: String
+      author: Author
+    }
+
+    type Query {
+      hero: Book
+      books: [Book]
+    }
+""")
+
+books = [
+    {"title": f"Book {i}", "author": {"name": f"Author {i}", "born": 1900 + i}}
+    for i in range(4)
+]
+
+root_value = {"hero": books[0], "books": books}
+
+query_str = """
+    query getBooks {
+      hero {
+        title
+        ... @defer(label: "author") {
+          author {
+            name
+            ... @defer {
+              born
+            }
+          }
+        }
+      }
+      books @stream(initialCount: 1) {
+        title
+      }
+    }
+"""
+
+content_type = 'multipart/mixed; boundary="-"; deferSpec=20220824'
+
+
+async def get_payloads(query: str) -> List[Any]:
+    """Returns the payloads of the incremental delivery response
+    sent by graphql-core for the query."""
+    result = experimental_execute_incrementally(
+        schema, parse(query), root_value=root_value
+    )
+    if asyncio.iscoroutine(result):
+        result = await result
+
+    assert isinstance(result, ExperimentalIncrementalExecutionResults)
+
+    payloads: List[Any] = [result.initial_result.formatted]
+    async for payload in result.subsequent_results:
+        payloads.append(payload.formatted)
+
+    return payloads
+
+
+def get_expected_data(query: str) -> Any:
+    """Returns the data of the query executed without the incremental delivery."""
+    query = query.replace('@defer(label: "author")', "").replace("@defer", "")
+    query = query.replace("@stream(initialCount: 1)", "")
+    result = execute(schema, parse(query), root_value=root_value)
+
+    assert isinstance(result, ExecutionResult)
+
+    return result.data
+
+
+def create_incremental_response(
+    payloads: List[Any], *, separator: str = "\r\n"
+) -> List[str]:
+    """Helper to create the parts of an incremental delivery response body."""
+    parts = [
+        (
+            f"{separator}---{separator}"
+            f"Content-Type: application/json; charset=utf-8{separator}"
+            f"{separator}"
+            f"{json.dumps(payload)}"
+        )
+        for payload in payloads
+    ]
+
+    parts.append(f"{separator}-----{separator}")
+
+    return parts
+
+
+@pytest.fixture
+def incremental_server(aiohttp_server):
+    from aiohttp import web
+
+    async def create_server(parts, *, request_handler=lambda *args: None):
+        async def handler(request):
+            request_handler(request)
+            response = web.StreamResponse()
+            response.headers["Content-Type"] = content_type
+            response.enable_chunked_encoding()
+            await response.prepare(request)
+            for part in parts:
+                await response.write(part.encode())
+                await asyncio.sleep(0)  # force the chunk to be written
+            await response.write_eof()
+            return response
+
+        app = web.Application()
+        app.router.add_route("POST", "/", handler)
+        server = await aiohttp_server(app)
+        return server
+
+    return create_server
+
+
+def test_has_incremental_directives():
+    assert has_incremental_directives(query_str)
+    assert has_incremental_directives("{ books @stream { title } }")
+    assert not has_incremental_directives("{ books { title } }")
+
+
+@pytest.mark.asyncio
+async def test_incremental_merger_pending_ids():
+    payloads = await get_payloads(query_str)
+
+    # The data is sent in several parts
+    assert len(payloads) > 2
+    assert all("id" in incremental for incremental in payloads[-1]["incremental"])
+
+    merger = IncrementalResultMerger()
+
+    for payload in payloads:
+        merger.merge(payload)
+
+    assert not merger.has_next
+    assert merger.data == get_expected_data(query_str)
+    assert merger.get_result().errors is None
+
+
+def test_incremental_merger_paths():
+    """Patches of the @defer and @stream specification of 2022."""
+    merger = IncrementalResultMerger()
+
+    merger.merge(
+        {
+            "data": {"hero": {"title": "Book 0"}, "books": [{"title": "Book 0"}]},
+            "hasNext": True,
+        }
+    )
+    merger.merge(
+        {
+            "incremental": [
+                {"path": ["books", 1], "items": [{"title": "Book 1"}]},
+                {"path": ["hero"], "data": {"author": {"name": "Author 0"}}},
+            ],
+            "hasNext": True,
+        }
+    )
+    merger.merge(
+        {
+            "incremental": [
+                {"path": ["hero", "author"], "data": {"born": 1900}},
+                {
+                    "path": ["books", 2],
+                    "items": [None],
+                    "errors": [{"message": "Book not found"}],
+                },
+            ],
+            "extensions": {"cost": 3},
+            "hasNext": False,
+        }
+    )
+
+    result = merger.get_result()
+
+    assert not merger.has_next
+    assert result.data == {
+        "hero": {"title": "Book 0", "author": {"name": "Author 0", "born": 1900}},
+        "books": [{"title": "Book 0"}, {"title": "Book 1"}, None],
+    }
+    assert result.errors == [{"message": "Book not found"}]
+    assert result.extensions == {"cost": 3}
+
+
+@pytest.mark.asyncio
+async def test_incremental_merger_results_not_modified():
+    payloads = await get_payloads(query_str)
+
+    merger = IncrementalResultMerger()
+    results = []
+    snapshots = []
+
+    for payload in payloads:
+        merger.merge(payload)
+        result = merger.get_result()
+        results.append(result)
+        snapshots.append(json.dumps(result.data))
+
+    # The results returned were not changed by the next patches
+    assert [json.dumps(result.data) for result in results] == snapshots
+    assert len(set(snapshots)) == len(payloads)
+
+
+def test_incremental_merger_missing_path():
+    """Patches below a field set to null because of an error are ignored."""
+    merger = IncrementalResultMerger()
+
+    merger.merge(
+        {
+            "data": {"hero": None},
+            "errors": [{"message": "Hero not found", "path": ["hero"]}],
+            "hasNext": True,
+        }
+    )
+    merger.merge(
+        {"incremental": [{"path": ["hero"], "data": {"title": "Book 0"}}]},
+    )
+
+    assert merger.data == {"hero": None}
+    assert merger.get_result().errors == [
+        {"message": "Hero not found", "path": ["hero"]}
+    ]
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [],
+        {"incremental": [{"id": "unknown", "data": {}}]},
+        {"incremental": [{"items": []}]},
+        {"pending": [{"path": ["hero"]}]},
+    ],
+)
+def test_incremental_merger_invalid_payload(payload):
+    merger = IncrementalResultMerger()
+    merger.merge({"data": {"hero": {}}, "hasNext": True})
+
+    with pytest.raises(TransportProtocolError):
+        merger.merge(payload)
+
+
+@pytest.mark.asyncio
+async def test_merge_incremental_response_body():
+    payloads = await get_payloads(query_str)
+    body = "".join(create_incremental_response(payloads)).encode()
+
+    merger = merge_incremental_response(body, content_type, get_json_codec(None))
+
+    assert merger.data == get_expected_data(query_str)
+
+
+@pytest.mark.asyncio
+async def test_merge_incremental_response_incomplete_body():
+    payloads = await get_payloads(query_str)
+    body = "".join(create_incremental_response(payloads)[:-1]).encode()
+
+    with pytest.raises(TransportProtocolError, match="Incomplete"):
+        merge_incremental_response(body, content_type, get_json_codec(None))
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_aiohttp_incremental_execute(incremental_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    def assert_accept_header(request):
+        assert request.headers["Accept"] == INCREMENTAL_ACCEPT_HEADER
+
+    server = await incremental_server(
+        create_incremental_response(await get_payloads(query_str)),
+        request_handler=assert_accept_header,
+    )
+
+    transport = AIOHTTPTransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        result = await session.execute(gql(query_str))
+
+    assert result == get_expected_data(query_str)
+    assert transport.response_headers is not None
+    assert transport.response_headers["Content-Type"] == content_type
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_aiohttp_incremental_execute_no_directives(incremental_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    def assert_accept_header(request):
+        assert "deferSpec" not in request.headers.get("Accept", "")
+
+    server = await incremental_server(
+        create_incremental_response([{"data": {"books": []}, "hasNext": False}]),
+        request_handler=assert_accept_header,
+    )
+
+    transport = AIOHTTPTransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        result = await session.execute(gql("{ books { title } }"))
+
+    assert result == {"books": []}
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_aiohttp_incremental_subscribe(incremental_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    payloads = await get_payloads(query_str)
+    server = await incremental_server(create_incremental_response(payloads))
+
+    transport = AIOHTTPTransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        results = [result async for result in session.subscribe(gql(query_str))]
+
+    # A merged result is yielded for each payload
+    assert len(results) == len(payloads)
+    assert results[0] == payloads[0]["data"]
+    assert results[-1] == get_expected_data(query_str)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_aiohttp_incremental_subscribe_raw_patches(incremental_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    payloads = await get_payloads(query_str)
+    server = await incremental_server(create_incremental_response(payloads))
+
+    transport = AIOHTTPTransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        results = [
+            result
+            async for result in session.subscribe(
+                gql(query_str), get_execution_result=True, raw_patches=True
+            )
+        ]
+
+    assert all(isinstance(result, IncrementalExecutionResult) for result in results)
+    assert [result.incremental for result in results[1:]] == [
+        payload["incremental"] for payload in payloads[1:]
+    ]
+    assert results[0].pending == payloads[0]["pending"]
+    assert [result.has_next for result in results] == [
+        payload["hasNext"] for payload in payloads
+    ]
+
+
+@pytest.mark.httpx
+@pytest.mark.asyncio
+async def test_httpx_async_incremental_execute(incremental_server):
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    def assert_accept_header(request):
+        assert request.headers["Accept"] == INCREMENTAL_ACCEPT_HEADER
+
+    server = await incremental_server(
+        create_incremental_response(await get_payloads(query_str)),
+        request_handler=assert_accept_header,
+    )
+
+    transport = HTTPXAsyncTransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        result = await session.execute(gql(query_str))
+
+    assert result == get_expected_data(query_str)
+
+
+@pytest.mark.httpx
+@pytest.mark.asyncio
+async def test_httpx_incremental_execute(incremental_server, run_sync_test):
+    from gql.transport.httpx import HTTPXTransport
+
+    def assert_accept_header(request):
+        assert request.headers["Accept"] == INCREMENTAL_ACCEPT_HEADER
+
+    server = await incremental_server(
+        create_incremental_response(await get_payloads(query_str)),
+        request_handler=assert_accept_header,
+    )
+
+    url = str(server.make_url("/"))
+
+    def test_code():
+        transport = HTTPXTransport(url=url)
+
+        with Client(transport=transport) as session:
+            result = session.execute(gql(query_str))
+
+        assert result == get_expected_data(query_str)
+
+    await run_sync_test(server, test_code)
+
+
+@pytest.mark.httpx
+@pytest.mark.asyncio
+async def test_httpx_async_incremental_subscribe(incremental_server):
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    payloads = await get_payloads(query_str)
+    server = await incremental_server(create_incremental_response(payloads))
+
+    transport = HTTPXAsyncTransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        results = [result async for result in session.subscribe(gql(query_str))]
+
+    assert len(results) == len(payloads)
+    assert results[0] == payloads[0]["data"]
+    assert results[-1] == get_expected_data(query_str)
+
+
+@pytest.mark.httpx
+@pytest.mark.asyncio
+async def test_httpx_async_incremental_invalid_json(incremental_server):
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    parts = create_incremental_response(await get_payloads(query_str))
+    parts[1] = "\r\n---\r\nContent-Type: application/json\r\n\r\n{invalid"
+
+    server = await incremental_server(parts)
+
+    transport = HTTPXAsyncTransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        with pytest.raises(TransportProtocolError, match="Invalid JSON"):
+            async for _ in session.subscribe(gql(query_str)):
+                pass
+
+
+@pytest.mark.httpx
+@pytest.mark.asyncio
+async def test_httpx_async_incremental_server_error(aiohttp_server):
+    from aiohttp import web
+
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    async def handler(request):
+        return web.Response(
+            text="Server error", status=500, content_type="multipart/mixed"
+        )
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    transport = HTTPXAsyncTransport(url=str(server.make_url("/")))
+
+    async with Client(transport=transport) as session:
+        with pytest.raises(TransportServerError):
+            await session.execute(gql(query_str))
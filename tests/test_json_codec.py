@@ -0,0 +1,319 @@
+import json
+from typing import Any, List
+
+import pytest
+
+from gql import Client, GraphQLRequest, PreparedRequest, gql
+from gql.batching import BatchFlushPolicy
+from gql.json_codec import (
+    DEFAULT_JSON_CODEC,
+    CallableJSONCodec,
+    JSONCodec,
+    MsgspecCodec,
+    OrjsonCodec,
+    get_json_codec,
+)
+
+query_str = """
+    query getContinents {
+      continents {
+        code
+        name
+      }
+    }
+"""
+
+query_server_answer = (
+    '{"data":{"continents":['
+    '{"code":"AF","name":"Africa"},{"code":"AN","name":"Antarctica"}]}}'
+)
+
+value = {"query": "{ hello }", "variables": {"name": "é", "values": [1, 2.5, None]}}
+
+
+@pytest.mark.parametrize("codec_class", [JSONCodec, OrjsonCodec, MsgspecCodec])
+def test_json_codec_round_trip(codec_class):
+    if codec_class is OrjsonCodec:
+        pytest.importorskip("orjson")
+    elif codec_class is MsgspecCodec:
+        pytest.importorskip("msgspec")
+
+    codec = codec_class()
+
+    encoded = codec.encode(value)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == value
+    assert codec.decode(encoded) == value
+    assert codec.decode(encoded.decode("utf-8")) == value
+    assert json.loads(codec.dumps(value)) == value
+
+    with pytest.raises(ValueError):
+        codec.decode(b"{not json")
+
+
+def test_json_codec_callable():
+    received: List[Any] = []
+
+    def deserialize(text):
+        received.append(text)
+        return json.loads(text)
+
+    codec = CallableJSONCodec(
+        lambda e: json.dumps(e, separators=(",", ":")), deserialize
+    )
+
+    assert codec.encode({"a": 1}) == b'{"a":1}'
+    assert codec.dumps({"a": 1}) == '{"a":1}'
+
+    # The legacy deserializers always receive a str
+    assert codec.decode(b'{"a": 1}') == {"a": 1}
+    assert codec.decode('{"a": 2}') == {"a": 2}
+    assert received == ['{"a": 1}', '{"a": 2}']
+
+    # A serializer returning bytes
+    codec = CallableJSONCodec(lambda e: json.dumps(e).encode("utf-8"))
+    assert codec.encode({"a": 1}) == b'{"a": 1}'
+    assert codec.dumps({"a": 1}) == '{"a": 1}'
+
+
+def test_get_json_codec():
+    codec = JSONCodec()
+
+    assert get_json_codec(codec) is codec
+    assert get_json_codec(None) is DEFAULT_JSON_CODEC
+    assert get_json_codec(None, json.dumps, json.loads) is DEFAULT_JSON_CODEC
+    assert isinstance(get_json_codec(None, json_deserialize=json.loads), JSONCodec)
+
+    callable_codec = get_json_codec(None, json_serialize=str)
+    assert isinstance(callable_codec, CallableJSONCodec)
+    assert callable_codec.serialize is str
+
+
+@pytest.mark.parametrize("codec_class", [JSONCodec, OrjsonCodec, CallableJSONCodec])
+def test_json_codec_encode_request(codec_class):
+    if codec_class is OrjsonCodec:
+        pytest.importorskip("orjson")
+
+    codec = codec_class()
+
+    request = PreparedRequest(query_str, operation_name="getContinents")
+    request_copy = request.with_variables({"id": 1})
+    requests = [
+        request,
+        request_copy,
+        request.with_variables({"id": 2}, extensions={"ext": True}),
+        GraphQLRequest(query_str, variable_values={"id": 3}),
+    ]
+
+    for req in requests:
+        assert codec.encode_request(req) == codec.encode(req.payload)
+
+    assert codec.encode_request(requests) == codec.encode(
+        [req.payload for req in requests]
+    )
+
+    # The encoded query is shared by the copies of the prepared request
+    if codec.item_separator is not None:
+        assert list(request._encoded_queries) == [codec]
+        assert request_copy._encoded_queries is request._encoded_queries
+    else:
+        assert request._encoded_queries == {}
+
+
+def test_json_codec_batch_size():
+    orjson = pytest.importorskip("orjson")
+
+    request = GraphQLRequest(query_str, variable_values={"id": 1})
+
+    codec = OrjsonCodec()
+
+    assert BatchFlushPolicy.get_size(request, codec) == (
+        len(orjson.dumps(request.payload)) + 1
+    )
+    assert BatchFlushPolicy.get_size(request) > BatchFlushPolicy.get_size(
+        request, codec
+    )
+
+    # Values not serializable by the codec are converted to str
+    request = GraphQLRequest(query_str, variable_values={"id": object()})
+    assert BatchFlushPolicy.get_size(request, codec) > 0
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_json_codec_client_aiohttp(aiohttp_server):
+    from aiohttp import web
+
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    pytest.importorskip("orjson")
+
+    received: List[Any] = []
+
+    async def handler(request):
+        received.append((request.content_type, await request.read()))
+
+        return web.Response(text=query_server_answer, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"))
+
+    codec = OrjsonCodec()
+
+    async with Client(transport=transport, json_codec=codec) as session:
+
+        assert transport.json_codec is codec
+
+        result = await session.execute(gql(query_str))
+
+        assert result["continents"][0]["code"] == "AF"
+
+    # The body was encoded by orjson, without spaces
+    content_type, body = received[0]
+    assert content_type == "application/json"
+    assert body.startswith(b'{"query":"query getContinents')
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_json_codec_aiohttp_encode_once(aiohttp_server):
+    from aiohttp import web
+
+    from gql.transport.aiohttp import AIOHTTPTransport
+    from gql.transport.appsync_auth import AppSyncAuthentication
+
+    received: List[Any] = []
+    signed: List[Any] = []
+
+    class SigningAuthentication(AppSyncAuthentication):
+        def get_headers(self, data=None, headers=None):
+            signed.append(data)
+            return {"content-type": "application/json", "x-signature": "signed"}
+
+    async def handler(request):
+        received.append((request.headers.get("x-signature"), await request.read()))
+
+        return web.Response(text=query_server_answer, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    encoded: List[Any] = []
+
+    class CountingCodec(JSONCodec):
+        def encode(self, value):
+            encoded.append(value)
+            return super().encode(value)
+
+    transport = AIOHTTPTransport(
+        url=server.make_url("/"),
+        auth=SigningAuthentication(),
+        json_codec=CountingCodec(),
+    )
+
+    async with Client(transport=transport) as session:
+
+        request = session.client.prepare(GraphQLRequest(query_str))
+
+        for index in range(3):
+            await session.execute(request.with_variables({"id": index}))
+
+    # The signature was computed on the body which was sent
+    assert [signature for signature, _ in received] == ["signed"] * 3
+    assert signed == [body.decode("utf-8") for _, body in received]
+    assert json.loads(received[2][1])["variables"] == {"id": 2}
+
+    # The query was encoded only once, then only the variables
+    assert encoded == [{"query": request.query_str}] + [
+        {"variables": {"id": index}} for index in range(3)
+    ]
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_json_codec_httpx(aiohttp_server):
+    from aiohttp import web
+
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    received: List[Any] = []
+
+    async def handler(request):
+        received.append(
+            (request.content_type, request.headers.get("x-test"), await request.json())
+        )
+
+        return web.Response(text=query_server_answer, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    url = str(server.make_url("/"))
+
+    decoded: List[Any] = []
+
+    class LoggingCodec(JSONCodec):
+        def decode(self, data):
+            decoded.append(data)
+            return super().decode(data)
+
+    transport = HTTPXAsyncTransport(url=url, json_codec=LoggingCodec())
+
+    async with Client(transport=transport) as session:
+
+        await session.execute(gql(query_str))
+
+        # The content type is kept with headers in the extra args
+        await session.execute(
+            gql(query_str), extra_args={"headers": {"x-test": "value"}}
+        )
+
+    assert received[0][0] == received[1][0] == "application/json"
+    assert received[1][1] == "value"
+    assert received[1][2]["query"].startswith("query getContinents")
+
+    # The answers were decoded from bytes
+    assert decoded == [query_server_answer.encode("utf-8")] * 2
+
+
+@pytest.mark.aiohttp
+@pytest.mark.requests
+@pytest.mark.asyncio
+async def test_json_codec_requests(aiohttp_server, run_sync_test):
+    from aiohttp import web
+
+    from gql.transport.requests import RequestsHTTPTransport
+
+    received: List[Any] = []
+
+    async def handler(request):
+        received.append((request.content_type, await request.json()))
+
+        return web.Response(text=query_server_answer, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    url = server.make_url("/")
+
+    def test_code():
+        transport = RequestsHTTPTransport(url=url)
+
+        with Client(transport=transport, json_codec=JSONCodec()) as session:
+
+            result = session.execute(gql(query_str))
+
+            assert result["continents"][1]["code"] == "AN"
+
+        content_type, body = received[0]
+        assert content_type == "application/json"
+        assert body["query"].startswith("query getContinents")
+
+    await run_sync_test(server, test_code)
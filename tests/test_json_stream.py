@@ -0,0 +1,342 @@
+import asyncio
+import json
+import random
+from typing import Any, List, Tuple
+
+import pytest
+
+from gql import Client, GraphQLRequest, gql
+from gql.json_codec import DEFAULT_JSON_CODEC, CallableJSONCodec
+from gql.transport.common.json_stream import JSONListStream, parse_json_list_stream
+from gql.transport.exceptions import (
+    TransportProtocolError,
+    TransportQueryError,
+    TransportServerError,
+)
+
+query_str = """
+    query getOrders($first: Int) {
+      orders(first: $first) {
+        total
+        edges {
+          node {
+            reference
+            amount
+          }
+        }
+      }
+    }
+"""
+
+edges = [
+    {"node": {"reference": f'ORDER-{index:04d} "[]{{}}",\\é', "amount": index * 1.5}}
+    for index in range(100)
+]
+
+answer = {
+    "data": {"orders": {"edges": edges, "total": len(edges)}},
+    "extensions": {"cost": 3},
+}
+
+answer_bytes = json.dumps(answer).encode()
+
+
+def split(body: bytes, max_size: int) -> List[bytes]:
+    chunks = []
+    pos = 0
+
+    while pos < len(body):
+        end = pos + random.randint(1, max_size)
+        chunks.append(body[pos:end])
+        pos = end
+
+    return chunks
+
+
+def parse(stream: JSONListStream, chunks: List[bytes]) -> Tuple[List[Any], Any]:
+    items: List[Any] = []
+
+    for chunk in chunks:
+        items.extend(stream.feed(chunk))
+
+    remaining, document = stream.close()
+
+    return items + remaining, document
+
+
+@pytest.mark.parametrize("max_size", [1, 7, 100, len(answer_bytes)])
+def test_json_list_stream(max_size):
+    stream = JSONListStream("data.orders.edges", DEFAULT_JSON_CODEC)
+
+    items, document = parse(stream, split(answer_bytes, max_size))
+
+    assert stream.found
+    assert items == edges
+
+    # The rest of the document is kept, with an empty list
+    assert document == {
+        "data": {"orders": {"edges": [], "total": 100}},
+        "extensions": {"cost": 3},
+    }
+
+
+def test_json_list_stream_items_as_soon_as_complete():
+    stream = JSONListStream(["data", "orders", "edges"], DEFAULT_JSON_CODEC)
+
+    assert stream.feed(b'{"data": {"orders": {"edges": [{"a": 1}, 12') == [{"a": 1}]
+
+    # The number could continue in the next chunk
+    assert stream.feed(b"3") == []
+    assert stream.feed(b', "x\\u00e9\xc3') == [123]
+    assert stream.feed(b'\xa9" , true ]}}}') == ["xéé", True]
+
+    assert stream.close() == ([], {"data": {"orders": {"edges": []}}})
+
+
+numbers = [
+    -2500.0,
+    1.5e3,
+    1e-07,
+    -1.5e300,
+    0,
+    -0.25,
+    12345678901234567890,
+    [3.14159, {"a": -42}],
+]
+
+numbers_bytes = json.dumps({"data": {"numbers": numbers}}).encode()
+
+codecs = pytest.mark.parametrize(
+    "codec",
+    [DEFAULT_JSON_CODEC, CallableJSONCodec(json.dumps, json.loads)],
+    ids=["default", "callable"],
+)
+
+
+@codecs
+def test_json_list_stream_numbers(codec):
+    # The numbers split at every position of the answer
+    for index in range(len(numbers_bytes) + 1):
+        stream = JSONListStream("data.numbers", codec)
+        chunks = [numbers_bytes[:index], numbers_bytes[index:]]
+
+        assert parse(stream, chunks)[0] == numbers
+
+    # And in random chunks
+    for _ in range(100):
+        stream = JSONListStream("data.numbers", codec)
+
+        assert parse(stream, split(numbers_bytes, 3))[0] == numbers
+
+
+@codecs
+def test_json_list_stream_number_split_after_dot_or_exponent(codec):
+    stream = JSONListStream("data", codec)
+
+    assert stream.feed(b'{"data": [-2500.') == []
+    assert stream.feed(b"0, 1.5e") == [-2500.0]
+    assert stream.feed(b"3]}") == [1500.0]
+
+    assert stream.close() == ([], {"data": []})
+
+
+def test_json_list_stream_path():
+    body = b'{"data": {"a\\"b": [{"c": [1]}, {"c": [2, 3]}], "c": [4]}}'
+
+    stream = JSONListStream(["data", 'a"b', 1, "c"], DEFAULT_JSON_CODEC)
+    assert parse(stream, split(body, 3))[0] == [2, 3]
+
+    # A list which is not found
+    stream = JSONListStream("data.b", DEFAULT_JSON_CODEC)
+    items, document = parse(stream, [body])
+
+    assert not stream.found
+    assert items == []
+    assert document == json.loads(body)
+
+
+def test_json_list_stream_codec():
+    decoded = []
+
+    def deserialize(data):
+        decoded.append(data)
+        return json.loads(data)
+
+    codec = CallableJSONCodec(json.dumps, deserialize)
+    stream = JSONListStream("data.orders.edges", codec)
+
+    items, _ = parse(stream, split(answer_bytes, 50))
+
+    # The items are decoded one by one by the codec
+    assert items == edges
+    assert len(decoded) == len(edges) + 1
+    assert decoded[:2] == [json.dumps(edge) for edge in edges[:2]]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"data": {"orders": {"edges": [{"a": 1}, {"b"}]}}}',
+        b'{"data": {"orders": {"edges": [1 2]}}}',
+        b'{"data": {"orders": {"edges": [1, 2',
+        b'{"data": {"orders": {"edges": [1, 2]}}',
+        b'{"data": {"orders": {"edges": []}}}}',
+        b"not json",
+    ],
+)
+@codecs
+def test_json_list_stream_invalid(body, codec):
+    stream = JSONListStream("data.orders.edges", codec)
+
+    with pytest.raises(ValueError):
+        parse(stream, split(body, 5))
+
+
+async def async_chunks(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_parse_json_list_stream_errors():
+    body = json.dumps(
+        {
+            "data": {"orders": {"edges": edges[:2], "total": None}},
+            "errors": [{"message": "total not available"}],
+        }
+    ).encode()
+
+    items = []
+
+    with pytest.raises(TransportQueryError) as exc_info:
+        async for item in parse_json_list_stream(
+            async_chunks([body]), "data.orders.edges", DEFAULT_JSON_CODEC
+        ):
+            items.append(item)
+
+    # The items are received before the error
+    assert items == edges[:2]
+    assert str(exc_info.value) == "{'message': 'total not available'}"
+    assert exc_info.value.data == {"orders": {"edges": [], "total": None}}
+
+
+@pytest.mark.asyncio
+async def test_parse_json_list_stream_invalid_answer():
+    with pytest.raises(TransportProtocolError, match="Not a JSON answer"):
+        async for _ in parse_json_list_stream(
+            async_chunks([b"<html>"]), "data.orders.edges", DEFAULT_JSON_CODEC
+        ):
+            pass
+
+    with pytest.raises(TransportProtocolError, match='No "data" or "errors" keys'):
+        async for _ in parse_json_list_stream(
+            async_chunks([b'{"orders": []}']), "orders", DEFAULT_JSON_CODEC
+        ):
+            pass
+
+
+@pytest.fixture
+def stream_server(aiohttp_server):
+    from aiohttp import web
+
+    async def create_server(chunks, *, status=200, last_chunk_event=None):
+        async def handler(request):
+            response = web.StreamResponse(status=status)
+            response.content_type = "application/json"
+            response.enable_chunked_encoding()
+            await response.prepare(request)
+
+            for index, chunk in enumerate(chunks):
+                if index == len(chunks) - 1 and last_chunk_event is not None:
+                    await last_chunk_event.wait()
+
+                await response.write(chunk)
+                await asyncio.sleep(0)  # force the chunk to be written
+
+            await response.write_eof()
+            return response
+
+        app = web.Application()
+        app.router.add_route("POST", "/", handler)
+        return await aiohttp_server(app)
+
+    return create_server
+
+
+def get_aiohttp_transport(server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    return AIOHTTPTransport(url=server.make_url("/"))
+
+
+def get_httpx_transport(server):
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    return HTTPXAsyncTransport(url=str(server.make_url("/")))
+
+
+transports = pytest.mark.parametrize(
+    "get_transport",
+    [
+        pytest.param(get_aiohttp_transport, marks=pytest.mark.aiohttp),
+        pytest.param(get_httpx_transport, marks=pytest.mark.httpx),
+    ],
+)
+
+
+@transports
+@pytest.mark.asyncio
+async def test_execute_stream(stream_server, get_transport):
+    last_chunk_event = asyncio.Event()
+
+    # The end of the answer is sent once the first items are received
+    chunks = split(answer_bytes[:-20], 200) + [answer_bytes[-20:]]
+    server = await stream_server(chunks, last_chunk_event=last_chunk_event)
+
+    request = GraphQLRequest(query_str, variable_values={"first": 100})
+    items = []
+
+    async with Client(transport=get_transport(server)) as session:
+        async for item in session.execute_stream(request, "data.orders.edges"):
+            items.append(item)
+            last_chunk_event.set()
+
+    assert items == edges
+
+
+@transports
+@pytest.mark.asyncio
+async def test_execute_stream_query_error(stream_server, get_transport):
+    body = json.dumps(
+        {"data": {"orders": None}, "errors": [{"message": "Not allowed"}]}
+    ).encode()
+    server = await stream_server([body])
+
+    async with Client(transport=get_transport(server)) as session:
+        with pytest.raises(TransportQueryError, match="Not allowed"):
+            async for _ in session.execute_stream(gql(query_str), "data.orders.edges"):
+                pass
+
+
+@transports
+@pytest.mark.asyncio
+async def test_execute_stream_server_error(stream_server, get_transport):
+    server = await stream_server([b"Internal Server Error"], status=500)
+
+    async with Client(transport=get_transport(server)) as session:
+        with pytest.raises(TransportServerError) as exc_info:
+            async for _ in session.execute_stream(gql(query_str), "data.orders.edges"):
+                pass
+
+    assert exc_info.value.code == 500
+
+
+@transports
+@pytest.mark.asyncio
+async def test_execute_stream_invalid_answer(stream_server, get_transport):
+    server = await stream_server([b'{"data": {"orders": {"edges": [1, 2'])
+
+    async with Client(transport=get_transport(server)) as session:
+        with pytest.raises(TransportProtocolError):
+            async for _ in session.execute_stream(gql(query_str), "data.orders.edges"):
+                pass
@@ -0,0 +1,348 @@
+import hashlib
+from typing import Any, Dict, List, cast
+
+import pytest
+from graphql import ExecutionResult
+
+from gql import Client, GraphQLRequest, gql
+from gql.transport.common.persisted_queries import (
+    PersistedQueries,
+    PersistedQueryRequest,
+)
+
+query1_str = """
+    query getContinents {
+      continents {
+        code
+      }
+    }
+"""
+
+query2_str = """
+    query getCountries {
+      countries {
+        code
+      }
+    }
+"""
+
+not_found_error = {
+    "message": "PersistedQueryNotFound",
+    "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+}
+
+not_supported_error = {
+    "message": "Persisted queries are not supported",
+    "extensions": {"code": "PERSISTED_QUERY_NOT_SUPPORTED"},
+}
+
+
+async def make_apq_server(
+    aiohttp_server: Any, received: List[Any], supported: bool = True
+) -> Any:
+    """Start a server implementing the Automatic Persisted Queries protocol.
+
+    The server answers with the query it received in the data."""
+    from aiohttp import web
+
+    stored_queries: Dict[str, str] = {}
+
+    def answer(body: Dict[str, Any]) -> Dict[str, Any]:
+        query = body.get("query")
+        persisted_query = (body.get("extensions") or {}).get("persistedQuery")
+
+        if persisted_query is not None:
+            if not supported:
+                return {"errors": [not_supported_error]}
+
+            query_hash = persisted_query["sha256Hash"]
+
+            if query is None:
+                if query_hash not in stored_queries:
+                    return {"errors": [not_found_error]}
+                query = stored_queries[query_hash]
+            else:
+                assert hashlib.sha256(query.encode()).hexdigest() == query_hash
+                stored_queries[query_hash] = query
+
+        return {"data": {"query": query}}
+
+    async def handler(request):
+        body = await request.json()
+        received.append(body)
+
+        if isinstance(body, list):
+            return web.json_response([answer(item) for item in body])
+
+        return web.json_response(answer(body))
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+
+    return await aiohttp_server(app)
+
+
+def test_persisted_query_request_payload():
+
+    request = GraphQLRequest(
+        query1_str, variable_values={"a": 1}, extensions={"key": "value"}
+    )
+
+    persisted_request = PersistedQueryRequest(request)
+
+    assert persisted_request.payload == {
+        "variables": {"a": 1},
+        "extensions": {
+            "key": "value",
+            "persistedQuery": {"version": 1, "sha256Hash": request.query_hash},
+        },
+    }
+
+    persisted_request = PersistedQueryRequest(request, include_query=True)
+
+    assert persisted_request.payload["query"] == request.payload["query"]
+
+    # The original request is not modified
+    assert request.extensions == {"key": "value"}
+
+
+def get_errors_result(*errors: Dict[str, Any]) -> ExecutionResult:
+    """Result with the errors as dicts, as received by the transports."""
+    return ExecutionResult(errors=cast(List[Any], list(errors)))
+
+
+def test_persisted_queries_process_result():
+
+    apq = PersistedQueries()
+    request = GraphQLRequest(query1_str)
+
+    assert apq.process_result(request, get_errors_result(not_found_error))
+    assert request.query_hash not in apq.acknowledged_hashes
+
+    assert not apq.process_result(request, ExecutionResult(data={}))
+    assert request.query_hash in apq.acknowledged_hashes
+
+    # Only the error message is provided
+    assert apq.process_result(
+        request, get_errors_result({"message": "PersistedQueryNotFound"})
+    )
+    assert request.query_hash not in apq.acknowledged_hashes
+
+    assert apq.enabled
+    assert apq.process_result(request, get_errors_result(not_supported_error))
+    assert not apq.enabled
+    assert apq.get_request(request) is request
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_aiohttp_persisted_queries(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_apq_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"), persisted_queries=True)
+
+    async with Client(transport=transport) as session:
+
+        query = gql(query1_str)
+        query_str = query.payload["query"]
+
+        # First execution: the query is not known by the server
+        result = await session.execute(query)
+        assert result == {"query": query_str}
+
+        assert len(received) == 2
+        assert "query" not in received[0]
+        assert received[1]["query"] == query_str
+        assert received[1]["extensions"]["persistedQuery"] == {
+            "version": 1,
+            "sha256Hash": query.query_hash,
+        }
+
+        assert transport.persisted_queries is not None
+        assert query.query_hash in transport.persisted_queries.acknowledged_hashes
+
+        # Second execution: only the hash is sent
+        result = await session.execute(gql(query1_str))
+        assert result == {"query": query_str}
+
+        assert len(received) == 3
+        assert "query" not in received[2]
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_aiohttp_persisted_queries_batch(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_apq_server(aiohttp_server, received)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"), persisted_queries=True)
+
+    async with Client(transport=transport) as session:
+
+        query1 = GraphQLRequest(query1_str)
+        query2 = GraphQLRequest(query2_str)
+
+        await session.execute(query1)
+        received.clear()
+
+        results = await session.execute_batch([query1, query2])
+
+        assert results == [
+            {"query": query1.payload["query"]},
+            {"query": query2.payload["query"]},
+        ]
+
+        # Only the query which was not found is sent again
+        assert len(received) == 2
+        assert [("query" in item) for item in received[0]] == [False, False]
+        assert len(received[1]) == 1
+        assert received[1][0]["query"] == query2.payload["query"]
+
+        received.clear()
+
+        await session.execute_batch([query1, query2])
+
+        assert len(received) == 1
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_aiohttp_persisted_queries_not_supported(aiohttp_server):
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    received: List[Any] = []
+    server = await make_apq_server(aiohttp_server, received, supported=False)
+
+    transport = AIOHTTPTransport(url=server.make_url("/"), persisted_queries=True)
+
+    async with Client(transport=transport) as session:
+
+        query = gql(query1_str)
+        query_str = query.payload["query"]
+
+        result = await session.execute(query)
+        assert result == {"query": query_str}
+
+        assert len(received) == 2
+        assert "extensions" not in received[1]
+
+        assert transport.persisted_queries is not None
+        assert not transport.persisted_queries.enabled
+
+        # Persisted queries are now disabled
+        await session.execute(query)
+
+        assert len(received) == 3
+        assert received[2] == {"query": query_str}
+
+
+@pytest.mark.aiohttp
+@pytest.mark.httpx
+@pytest.mark.asyncio
+async def test_httpx_async_persisted_queries(aiohttp_server):
+    from gql.transport.httpx import HTTPXAsyncTransport
+
+    received: List[Any] = []
+    server = await make_apq_server(aiohttp_server, received)
+
+    transport = HTTPXAsyncTransport(
+        url=str(server.make_url("/")), persisted_queries=True
+    )
+
+    async with Client(transport=transport) as session:
+
+        query = gql(query1_str)
+
+        for _ in range(2):
+            result = await session.execute(query)
+            assert result == {"query": query.payload["query"]}
+
+        assert len(received) == 3
+
+        received.clear()
+
+        results = await session.execute_batch(
+            [GraphQLRequest(query1_str), GraphQLRequest(query2_str)]
+        )
+        assert results[1] == {"query": GraphQLRequest(query2_str).payload["query"]}
+
+        assert len(received) == 2
+        assert len(received[1]) == 1
+
+
+@pytest.mark.aiohttp
+@pytest.mark.httpx
+@pytest.mark.asyncio
+async def test_httpx_persisted_queries(aiohttp_server, run_sync_test):
+    from gql.transport.httpx import HTTPXTransport
+
+    received: List[Any] = []
+    server = await make_apq_server(aiohttp_server, received)
+
+    url = str(server.make_url("/"))
+
+    def test_code():
+        transport = HTTPXTransport(url=url, persisted_queries=True)
+
+        with Client(transport=transport) as session:
+
+            query = gql(query1_str)
+
+            for _ in range(2):
+                result = session.execute(query)
+                assert result == {"query": query.payload["query"]}
+
+            assert len(received) == 3
+
+            received.clear()
+
+            session.execute_batch(
+                [GraphQLRequest(query1_str), GraphQLRequest(query2_str)]
+            )
+
+            assert len(received) == 2
+            assert len(received[1]) == 1
+
+    await run_sync_test(server, test_code)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.requests
+@pytest.mark.asyncio
+async def test_requests_persisted_queries(aiohttp_server, run_sync_test):
+    from gql.transport.requests import RequestsHTTPTransport
+
+    received: List[Any] = []
+    server = await make_apq_server(aiohttp_server, received)
+
+    url = server.make_url("/")
+
+    def test_code():
+        transport = RequestsHTTPTransport(url=url, persisted_queries=True)
+
+        with Client(transport=transport) as session:
+
+            query = gql(query1_str)
+
+            for _ in range(2):
+                result = session.execute(query)
+                assert result == {"query": query.payload["query"]}
+
+            assert len(received) == 3
+            assert "query" not in received[2]
+
+            received.clear()
+
+            session.execute_batch(
+                [GraphQLRequest(query1_str), GraphQLRequest(query2_str)]
+            )
+
+            assert len(received) == 2
+            assert len(received[1]) == 1
+
+    await run_sync_test(server, test_code)
@@ -710,3 +710,249 @@ def test_requests_sync_batch_manual():
 
         assert result_eu["continent"]["name"] == "Europe"
         assert result_af["continent"]["name"] == "Africa"
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_requests_batch_max_concurrency(aiohttp_server, run_sync_test):
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    from aiohttp import web
+
+    from gql.transport.requests import RequestsHTTPTransport
+
+    stats = {"batches": 0, "in_flight": 0, "max_in_flight": 0}
+
+    async def handler(request):
+        body = await request.json()
+
+        stats["batches"] += 1
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+
+        await asyncio.sleep(0.1)
+
+        stats["in_flight"] -= 1
+
+        return web.json_response([{"data": {"size": len(body)}} for _ in body])
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    url = server.make_url("/")
+
+    def test_code():
+        transport = RequestsHTTPTransport(url=url)
+
+        client = Client(
+            transport=transport,
+            batch_interval=0.01,
+            batch_max=2,
+            batch_max_concurrency=2,
+            batch_queue_size=4,
+        )
+
+        with client as session:
+
+            query = gql("{ size }")
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(session.execute, [query] * 4))
+
+            assert results == [{"size": 2}] * 4
+
+        assert stats["batches"] == 2
+        assert stats["max_in_flight"] == 2
+
+    await run_sync_test(server, test_code)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_requests_batch_max_bytes(aiohttp_server, run_sync_test):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from aiohttp import web
+
+    from gql.batching import BatchFlushPolicy
+    from gql.transport.requests import RequestsHTTPTransport
+
+    sizes = []
+
+    async def handler(request):
+        body = await request.json()
+
+        sizes.append(len(body))
+
+        return web.json_response([{"data": {"size": len(body)}} for _ in body])
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    url = server.make_url("/")
+
+    def test_code():
+        transport = RequestsHTTPTransport(url=url)
+
+        query = gql("{ size }")
+        size = BatchFlushPolicy.get_size(query)
+
+        client = Client(
+            transport=transport,
+            batch_interval=0.1,
+            batch_max=10,
+            batch_max_bytes=2 * size,
+        )
+
+        with client as session:
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(session.execute, [query] * 4))
+
+            assert results == [{"size": 2}] * 4
+
+        assert sizes == [2, 2]
+
+    await run_sync_test(server, test_code)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_requests_batch_sent_when_full(aiohttp_server, run_sync_test):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from aiohttp import web
+
+    from gql.transport.requests import RequestsHTTPTransport
+
+    sizes = []
+
+    async def handler(request):
+        body = await request.json()
+
+        sizes.append(len(body))
+
+        return web.json_response([{"data": {"size": len(body)}} for _ in body])
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    url = server.make_url("/")
+
+    def test_code():
+        transport = RequestsHTTPTransport(url=url)
+
+        client = Client(
+            transport=transport,
+            batch_interval=5,
+            batch_max=4,
+            batch_max_concurrency=2,
+        )
+
+        with client as session:
+
+            query = gql("{ size }")
+
+            start_time = time.monotonic()
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(session.execute, [query] * 8))
+
+            # The full batches do not wait for the end of the batch interval
+            assert time.monotonic() - start_time < 2
+
+            assert results == [{"size": 4}] * 8
+
+        assert sizes == [4, 4]
+
+    await run_sync_test(server, test_code)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_requests_batch_high_priority(aiohttp_server, run_sync_test):
+    import time
+
+    from aiohttp import web
+
+    from gql.transport.requests import RequestsHTTPTransport
+
+    async def handler(request):
+        body = await request.json()
+
+        assert isinstance(body, dict)
+
+        return web.json_response({"data": {"size": 1}})
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    url = server.make_url("/")
+
+    def test_code():
+        transport = RequestsHTTPTransport(url=url)
+
+        client = Client(transport=transport, batch_interval=5)
+
+        with client as session:
+
+            start_time = time.monotonic()
+
+            # Executed directly, without waiting for the batch interval
+            result = session.execute(gql("{ size }"), priority="high")
+
+            assert result == {"size": 1}
+            assert time.monotonic() - start_time < 2
+
+    await run_sync_test(server, test_code)
+
+
+@pytest.mark.aiohttp
+@pytest.mark.asyncio
+async def test_requests_batch_merge_queries(aiohttp_server, run_sync_test):
+    from aiohttp import web
+
+    from gql.transport.requests import RequestsHTTPTransport
+
+    received = []
+
+    async def handler(request):
+        body = await request.json()
+
+        received.append(body)
+
+        return web.json_response(
+            {"data": {"_0_continents": [], "_1_countries": [{"code": "FR"}]}}
+        )
+
+    app = web.Application()
+    app.router.add_route("POST", "/", handler)
+    server = await aiohttp_server(app)
+
+    url = server.make_url("/")
+
+    def test_code():
+        transport = RequestsHTTPTransport(url=url)
+
+        with Client(transport=transport, batch_merge_queries=True) as session:
+
+            results = session.execute_batch(
+                [
+                    GraphQLRequest("{ continents { code } }"),
+                    GraphQLRequest("{ countries { code } }"),
+                ]
+            )
+
+            assert results == [{"continents": []}, {"countries": [{"code": "FR"}]}]
+
+        # A single query, not a batch, was sent to the server
+        assert len(received) == 1
+        assert isinstance(received[0], dict)
+
+    await run_sync_test(server, test_code)
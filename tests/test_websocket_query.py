@@ -690,3 +690,29 @@ async def test_websocket_transport_closed_in_receive(server):
 
         with pytest.raises(TransportConnectionFailed):
             await session.execute(query1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("server", [server1_answers], indirect=True)
+async def test_websocket_json_codec(server, caplog):
+    import logging
+
+    from gql.json_codec import OrjsonCodec
+    from gql.transport.websockets import WebsocketsTransport
+
+    pytest.importorskip("orjson")
+
+    caplog.set_level(logging.DEBUG)
+
+    url = f"ws://{server.hostname}:{server.port}/graphql"
+
+    transport = WebsocketsTransport(url=url)
+
+    async with Client(transport=transport, json_codec=OrjsonCodec()) as session:
+
+        result = await session.execute(gql(query1_str))
+
+        assert result["continents"][0]["code"] == "AF"
+
+    # The messages encoded in bytes were sent in text frames and logged as str
+    assert '>>> {"type":"connection_init","payload":{}}' in caplog.text